@@ -0,0 +1,108 @@
+"""
+LitZentrum - Benchmark: Backups
+Vergleicht Dauer und Plattenbedarf mehrerer aufeinanderfolgender Backups
+eines synthetischen Projekts: vollständige Kopie (copytree, früheres
+Verfahren), Hardlink-Snapshots und den deduplizierenden Backup-Speicher.
+Zwischen zwei Backups werden einige JSON-Dateien geändert und eine PDF
+ergänzt.
+
+Aufruf: python benchmarks/bench_backup.py [--sources 200] [--pdf-kb 2000] [--backups 5]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from modules.sync import BackupManager
+from modules.sync.manifest import IGNORE_PATTERNS
+
+
+def synthetic_project(path: Path, sources: int, pdf_kb: int, seed: int = 42):
+    """Projekt mit `sources` Quellenordnern (PDF, .limeta, Notizen)"""
+    rng = random.Random(seed)
+    for i in range(sources):
+        folder = path / "sources" / f"quelle_{i:05d}"
+        folder.mkdir(parents=True)
+        (folder / "document.pdf").write_bytes(rng.randbytes(pdf_kb * 1024))
+        (folder / "meta.limeta").write_text(f'{{"title": "Quelle {i}"}}', encoding="utf-8")
+        (folder / "notes.linotes").write_text('{"notes": []}', encoding="utf-8")
+    (path / "project.liproj").write_text("{}", encoding="utf-8")
+
+
+def edit_project(path: Path, round_no: int, pdf_kb: int):
+    """Ändert einige Metadaten und fügt eine Quelle hinzu"""
+    rng = random.Random(round_no)
+    folders = sorted((path / "sources").iterdir())
+    for folder in rng.sample(folders, min(10, len(folders))):
+        (folder / "notes.linotes").write_text(f'{{"notes": ["Runde {round_no}"]}}', encoding="utf-8")
+    folder = path / "sources" / f"neu_{round_no:03d}"
+    folder.mkdir()
+    (folder / "document.pdf").write_bytes(rng.randbytes(pdf_kb * 1024))
+
+
+def disk_usage(path: Path) -> int:
+    """Belegte Bytes; Hardlinks werden nur einmal gezählt"""
+    seen, total = set(), 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            stat = os.lstat(os.path.join(root, name))
+            if (stat.st_dev, stat.st_ino) not in seen:
+                seen.add((stat.st_dev, stat.st_ino))
+                total += stat.st_size
+    return total
+
+
+def copytree_backup(project: Path, backup_dir: Path, number: int):
+    """Früheres BackupManager.create_backup"""
+    shutil.copytree(project, backup_dir / f"{project.name}_{number}",
+                    ignore=shutil.ignore_patterns(*IGNORE_PATTERNS))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sources", type=int, default=200, help="Quellen im Projekt")
+    parser.add_argument("--pdf-kb", type=int, default=2000, help="Größe je PDF in KB")
+    parser.add_argument("--backups", type=int, default=5, help="Backups je Verfahren")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        methods = {
+            "copytree": None,
+            "Hardlink-Snapshots": lambda project: BackupManager(project, tmp / "snapshots"),
+            "Backup-Speicher": lambda project: BackupManager(project, tmp / "repository", deduplicate=True),
+        }
+        size_mb = None
+        for name, factory in methods.items():
+            project = tmp / "Projekt"
+            if project.exists():
+                shutil.rmtree(project)
+            synthetic_project(project, args.sources, args.pdf_kb)
+            size_mb = size_mb or disk_usage(project) / (1024 * 1024)
+            manager = factory(project) if factory else None
+            target = tmp / "copytree"
+            times = []
+            for number in range(args.backups):
+                if number:
+                    edit_project(project, number, args.pdf_kb)
+                start = time.perf_counter()
+                if manager is None:
+                    copytree_backup(project, target, number)
+                else:
+                    manager.create_backup()
+                times.append(time.perf_counter() - start)
+            usage = disk_usage(manager.backup_dir if manager else target) / (1024 * 1024)
+            later = sum(times[1:]) / max(len(times) - 1, 1)
+            print(f"{name:<20} erstes {times[0]:7.2f} s  folgende Ø {later:7.2f} s  "
+                  f"Platz {usage:9.1f} MB")
+        print(f"Projekt: {args.sources} Quellen, {size_mb:.1f} MB, {args.backups} Backups")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+LitZentrum - Benchmark: BibTeX-Import und -Export
+Misst Lesen (streamend vs. bibtexparser), Anlegen der Quellen und den
+streamenden Export für eine synthetische .bib-Datei.
+
+Aufruf: python benchmarks/bench_bibtex_import.py [--entries 100000] [--create 2000]
+        [--bibtexparser] [--memory]
+"""
+import argparse
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from core import SourceManager
+from modules.bibliography.bibtex import BibTeXGenerator, BibTeXParser
+from modules.bibliography.importer import BibTeXImporter, BibTeXReader
+
+
+SURNAMES = ["M{\\\"u}ller", "Schmidt", "von Weizs{\\\"a}cker", "Weber", "Gro{\\ss}", "Smith", "van Dijk"]
+WORDS = ("soziale Ungleichheit Bildung Methode Interviews Generationen Stadt "
+         "Migration Arbeit Theorie Praxis Medien Wandel Identität").split()
+
+
+def synthetic_bib(path: Path, entries: int, seed: int = 42):
+    """Schreibt eine .bib-Datei mit `entries` Einträgen (ca. 10 % Dubletten)"""
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('@string{ zfs = "Zeitschrift f{\\"u}r Soziologie" }\n\n')
+        for i in range(entries):
+            doi = i if rng.random() > 0.1 else rng.randrange(max(i, 1))
+            title = " ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 9)))
+            authors = " and ".join(
+                f"{rng.choice(SURNAMES)}, {chr(65 + rng.randrange(26))}."
+                for _ in range(rng.randint(1, 4))
+            )
+            f.write(
+                f"@article{{key{i},\n"
+                f"  author = {{{authors}}},\n"
+                f"  title = {{{{{title.capitalize()}}}}},\n"
+                f"  journal = zfs,\n"
+                f"  year = {rng.randint(1950, 2025)},\n"
+                f"  volume = {{{rng.randint(1, 60)}}}, pages = {{{i % 300}--{i % 300 + 20}}},\n"
+                f"  doi = {{10.1000/bench.{doi}}},\n"
+                f"  abstract = {{{' '.join(rng.choice(WORDS) for _ in range(60))}}}\n"
+                f"}}\n\n"
+            )
+
+
+def timed(func, memory: bool = False):
+    """(Ergebnis, Sekunden, Spitzenspeicher in MB oder None).
+
+    Der Speicher wird in einem zweiten Durchlauf gemessen, da tracemalloc
+    die Laufzeit um ein Vielfaches verlängert.
+    """
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = None
+    if memory:
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1] / (1024 * 1024)
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def report(name: str, count: int, elapsed: float, size_mb: float, peak):
+    memory = f"  Spitze {peak:6.1f} MB" if peak is not None else ""
+    print(f"{name:<28} {elapsed:8.2f} s {count / elapsed:>10,.0f} Einträge/s "
+          f"{size_mb / elapsed:6.1f} MB/s{memory}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=100_000, help="Einträge in der Testdatei")
+    parser.add_argument("--create", type=int, default=2000,
+                        help="Einträge, für die Quellenordner angelegt werden (0 = keine)")
+    parser.add_argument("--workers", type=int, default=4, help="Schreib-Threads")
+    parser.add_argument("--bibtexparser", action="store_true", help="Vergleich mit bibtexparser.load")
+    parser.add_argument("--memory", action="store_true", help="Spitzenspeicher messen (tracemalloc)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        bib = tmp / "bench.bib"
+        synthetic_bib(bib, args.entries)
+        size_mb = bib.stat().st_size / (1024 * 1024)
+        print(f"Datei: {args.entries:,} Einträge, {size_mb:.1f} MB")
+
+        count, elapsed, peak = timed(lambda: sum(1 for _ in BibTeXReader().read(bib)), args.memory)
+        report("Streamend lesen", count, elapsed, size_mb, peak)
+
+        def export():
+            metas = BibTeXParser().iter_file(bib)
+            return BibTeXGenerator().save_bibliography(metas, tmp / "export.bib", total=args.entries)
+
+        _, elapsed, peak = timed(export, args.memory)
+        report("Lesen + streamend schreiben", args.entries, elapsed, size_mb, peak)
+
+        if args.bibtexparser:
+            import bibtexparser
+
+            def load():
+                with open(bib, encoding="utf-8") as f:
+                    return len(bibtexparser.load(f).entries)
+
+            count, elapsed, peak = timed(load, args.memory)
+            report("bibtexparser.load", count, elapsed, size_mb, peak)
+
+        if args.create:
+            small = tmp / "create.bib"
+            synthetic_bib(small, args.create, seed=7)
+            for workers in sorted({1, args.workers}):
+                manager = SourceManager(tmp / f"Projekt{workers}")
+                importer = BibTeXImporter(manager, known={}, max_workers=workers)
+                start = time.perf_counter()
+                result = importer.import_file(small)
+                elapsed = time.perf_counter() - start
+                print(f"{f'Import + Ordner ({workers} Threads)':<28} {elapsed:8.2f} s "
+                      f"{len(result.created) / elapsed:>10,.0f} Quellen/s  "
+                      f"({len(result.duplicates)} Dubletten)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+LitZentrum - Benchmark: Zitierstile
+Vergleicht die kompilierten Stil-Templates mit den früheren, von Hand
+geschriebenen Formatierer-Klassen (APA und DIN, hier als Referenz nachgebildet),
+direkt (Methode bzw. render_reference) und über den CitationStyleManager.
+
+Aufruf: python benchmarks/bench_citation_styles.py [--entries 20000] [--repeat 7]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from formats import LiMeta
+from modules.bibliography.styles import CitationStyleManager, builtin_formatter
+
+
+class LegacyFormatter:
+    """Frühere Basisklasse (styles.py vor der Template-Engine)"""
+
+    def _format_authors(self, authors: list, max_authors: int = 3) -> str:
+        if not authors:
+            return "Unbekannt"
+        if len(authors) <= max_authors:
+            if len(authors) == 1:
+                return authors[0]
+            else:
+                return ", ".join(authors[:-1]) + " & " + authors[-1]
+        else:
+            return authors[0] + " et al."
+
+
+class LegacyAPA(LegacyFormatter):
+    """Frühere APAFormatter.format_reference"""
+
+    def format_reference(self, meta: LiMeta) -> str:
+        parts = []
+        parts.append(self._format_authors(meta.authors))
+        year = f"({meta.year})" if meta.year else "(o.J.)"
+        parts.append(year + ".")
+        if meta.title:
+            title = meta.title
+            if meta.source_type == "article":
+                parts.append(f"{title}.")
+            else:
+                parts.append(f"*{title}*.")
+        if meta.journal:
+            journal_part = f"*{meta.journal}*"
+            if meta.volume:
+                journal_part += f", *{meta.volume}*"
+            if meta.issue:
+                journal_part += f"({meta.issue})"
+            if meta.pages:
+                journal_part += f", {meta.pages}"
+            parts.append(journal_part + ".")
+        elif meta.publisher:
+            parts.append(f"{meta.publisher}.")
+        if meta.doi:
+            parts.append(f"https://doi.org/{meta.doi}")
+        return " ".join(parts)
+
+
+class LegacyDIN(LegacyFormatter):
+    """Frühere DINFormatter.format_reference"""
+
+    def format_reference(self, meta: LiMeta) -> str:
+        parts = []
+        if meta.authors:
+            authors = "; ".join(meta.authors)
+            parts.append(authors + ":")
+        if meta.title:
+            parts.append(meta.title + ".")
+        if meta.journal:
+            parts.append(f"In: {meta.journal}")
+            if meta.volume:
+                parts.append(f"Bd. {meta.volume}")
+            if meta.year:
+                parts.append(f"({meta.year})")
+            if meta.pages:
+                parts.append(f"S. {meta.pages}")
+        elif meta.publisher:
+            if meta.publisher:
+                parts.append(meta.publisher)
+            if meta.year:
+                parts.append(str(meta.year))
+        if meta.isbn:
+            parts.append(f"– ISBN {meta.isbn}")
+        return " ".join(parts)
+
+
+class LegacyManager:
+    """Früherer CitationStyleManager: ein neuer Formatierer pro Aufruf"""
+
+    STYLES = {"apa": LegacyAPA, "din": LegacyDIN}
+
+    def format_reference(self, meta: LiMeta, style: str = None) -> str:
+        return self.STYLES.get(style, LegacyAPA)().format_reference(meta)
+
+
+def synthetic_metas(count: int, seed: int = 42) -> list:
+    rng = random.Random(seed)
+    names = ["Müller, Hans", "Schmidt, Anna", "Weber, Max", "Smith, John", "van Dijk, Teun"]
+    metas = []
+    for i in range(count):
+        article = rng.random() < 0.6
+        metas.append(LiMeta(
+            title=f"Titel {i} über soziale Ungleichheit",
+            authors=rng.sample(names, rng.randint(0, 4)),
+            year=rng.choice([None, rng.randint(1950, 2025)]),
+            source_type="article" if article else "book",
+            journal="Zeitschrift für Soziologie" if article else "",
+            volume=str(rng.randint(1, 60)) if article else "",
+            issue=str(rng.randint(1, 6)) if article and rng.random() < 0.7 else "",
+            pages=f"{i % 300}--{i % 300 + 20}" if article else "",
+            publisher="" if article else "Suhrkamp",
+            doi=f"10.1000/{i}" if rng.random() < 0.5 else "",
+            isbn="" if article else "978-3-16-148410-0",
+        ))
+    return metas
+
+
+def best_of(funcs: list, metas: list, repeat: int) -> list:
+    """Beste Laufzeit je Funktion (erhält die ganze Liste); Durchläufe wechseln sich ab"""
+    best = [float("inf")] * len(funcs)
+    for _ in range(repeat):
+        for i, func in enumerate(funcs):
+            start = time.perf_counter()
+            func(metas)
+            best[i] = min(best[i], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entries", type=int, default=20_000, help="Anzahl Einträge")
+    parser.add_argument("--repeat", type=int, default=7, help="Durchläufe (bester zählt)")
+    args = parser.parse_args()
+
+    metas = synthetic_metas(args.entries)
+    legacy_manager, manager = LegacyManager(), CitationStyleManager()
+    for style_id in ("apa", "din"):
+        legacy = LegacyManager.STYLES[style_id]().format_reference
+        compiled = builtin_formatter(style_id).render_reference
+        if any(legacy(meta) != compiled(meta) for meta in metas):
+            print(f"{style_id}: Ausgaben weichen ab!")
+        runs = {
+            "Formatierer": (
+                lambda items: [legacy(meta) for meta in items],
+                lambda items: [compiled(meta) for meta in items],
+            ),
+            "über Manager": (
+                lambda items: [legacy_manager.format_reference(meta, style_id) for meta in items],
+                lambda items: [manager.format_reference(meta, style_id) for meta in items],
+            ),
+        }
+        for label, funcs in runs.items():
+            old, new = best_of(list(funcs), metas, args.repeat)
+            print(f"{style_id.upper():<4} {label:<13} bisher {args.entries / old:>10,.0f} Einträge/s   "
+                  f"Template {args.entries / new:>10,.0f} Einträge/s   ({old / new:.2f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+LitZentrum - Benchmark: Tokenizer-Durchsatz
+Misst die Indexierungsgeschwindigkeit des Such-Tokenizers in MB/s.
+
+Aufruf: python benchmarks/bench_tokenizer.py [--mb 20] [--pdf datei.pdf]
+"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from modules.search.tokenizer import Tokenizer
+
+
+GERMAN_WORDS = (
+    "Die Literaturverwaltung der Universität untersucht soziale Ungleichheit "
+    "in Bildungseinrichtungen mithilfe qualitativer Methoden und Interviews. "
+    "Forschungsergebnisse zeigen, dass Zugangsbeschränkungen über Generationen "
+    "hinweg wirken; Übergänge zwischen Schulformen bleiben größtenteils stabil."
+).split()
+
+ENGLISH_WORDS = (
+    "The study examines social inequality in educational institutions using "
+    "qualitative methods and interviews. Findings indicate that access "
+    "restrictions persist across generations while transitions remain stable."
+).split()
+
+
+def synthetic_text(words, size_mb: float, seed: int = 42) -> str:
+    """Erzeugt pseudo-zufälligen Fließtext der gewünschten Größe"""
+    rng = random.Random(seed)
+    target = int(size_mb * 1024 * 1024)
+    parts, size = [], 0
+    while size < target:
+        line = " ".join(rng.choice(words) for _ in range(12))
+        parts.append(line)
+        size += len(line.encode("utf-8")) + 1
+    return "\n".join(parts)
+
+
+def measure(tokenizer: Tokenizer, text: str, rounds: int = 3):
+    """Gibt (MB/s, Tokens) des besten Durchlaufs zurück"""
+    size_mb = len(text.encode("utf-8")) / (1024 * 1024)
+    best, tokens = float("inf"), 0
+    for _ in range(rounds):
+        start = time.perf_counter()
+        tokens = sum(1 for _ in tokenizer.iter_tokens(text))
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best, tokens
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", type=float, default=10.0, help="Größe des Testtextes in MB")
+    parser.add_argument("--pdf", type=Path, help="Optional: Text dieser PDF statt synthetischem Text")
+    args = parser.parse_args()
+
+    if args.pdf:
+        from modules.pdf_workshop.text_cache import PDFTextCache
+        corpora = {"de": PDFTextCache(args.pdf).get().full_text()}
+    else:
+        corpora = {
+            "de": synthetic_text(GERMAN_WORDS, args.mb),
+            "en": synthetic_text(ENGLISH_WORDS, args.mb),
+        }
+
+    print(f"{'Sprache':<8} {'Konfiguration':<32} {'MB/s':>8} {'Tokens':>12}")
+    for language, text in corpora.items():
+        configs = {
+            "nur Faltung": Tokenizer(language, stemming=False, split_compounds=False),
+            "Faltung + Stemming": Tokenizer(language, split_compounds=False),
+            "Faltung + Stemming + Komposita": Tokenizer(language),
+        }
+        for name, tokenizer in configs.items():
+            mb_per_s, tokens = measure(tokenizer, text)
+            print(f"{language:<8} {name:<32} {mb_per_s:>8.2f} {tokens:>12,}")
+
+
+if __name__ == "__main__":
+    main()
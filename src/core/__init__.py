@@ -5,6 +5,7 @@ from .project_manager import ProjectManager, LitProject
 from .source_manager import SourceManager, LitSource
 from .event_bus import EventBus, EventType, get_event_bus
 from .settings_manager import SettingsManager, get_settings
+from .smart_collections import SmartCollection, SmartCollectionIndex, QueryError, compile_query
 
 __all__ = [
     "ProjectManager",
@@ -16,4 +17,8 @@ __all__ = [
     "get_event_bus",
     "SettingsManager",
     "get_settings",
+    "SmartCollection",
+    "SmartCollectionIndex",
+    "QueryError",
+    "compile_query",
 ]
@@ -33,6 +33,7 @@ class EventType(Enum):
     
     # Aufgaben-Events
     TASK_ADDED = "task_added"
+    TASK_UPDATED = "task_updated"
     TASK_COMPLETED = "task_completed"
     TASK_DELETED = "task_deleted"
     
@@ -35,6 +35,16 @@ class LitProject:
     @property
     def bibliography_path(self) -> Path:
         return self.path / "projekt_biblio.bib"
+    
+    @property
+    def styles_path(self) -> Path:
+        """Folder for project-specific citation styles (*.json)."""
+        return self.path / "styles"
+    
+    @property
+    def index_path(self) -> Path:
+        """Folder for rebuildable search indexes."""
+        return self.path / ".index"
 
 
 class ProjectManager:
@@ -113,6 +123,14 @@ class ProjectManager:
         
         return project
     
+    def save_project(self, project: LitProject = None):
+        """Writes the configuration of the given (or current) project."""
+        project = project or self.current_project
+        if not project:
+            return
+        project.config.update()
+        project.config.save(project.path / self.PROJECT_CONFIG_FILE)
+    
     def is_project(self, path: Path) -> bool:
         """Returns True if the given path contains a valid LitZentrum project config."""
         return (Path(path) / self.PROJECT_CONFIG_FILE).exists()
@@ -30,6 +30,7 @@ class SettingsManager:
         "ai_enabled": False,
         "ai_model": "mistral:latest",
         "ai_base_url": "http://localhost:11434",
+        "ai_embedding_model": "nomic-embed-text",
         
         # Fenster
         "window_geometry": None,
@@ -48,6 +49,9 @@ class SettingsManager:
         "auto_backup": True,
         "backup_interval_minutes": 30,
         "backup_path": None,
+        
+        # Git
+        "git_auto_commit": False,
     }
     
     def __init__(self, app_name: str = "LitZentrum"):
@@ -73,7 +77,7 @@ class SettingsManager:
                 except (json.JSONDecodeError, ValueError, TypeError) as e:
                     logging.debug(f"Fehler beim JSON-Parsing für '{key}': {e}")
                     value = default
-        elif key in ("ai_enabled", "auto_backup", "auto_generate_citation_key"):
+        elif key in ("ai_enabled", "auto_backup", "auto_generate_citation_key", "git_auto_commit"):
             if isinstance(value, str):
                 value = value.lower() == "true"
         elif key in ("pdf_zoom_default", "editor_font_size", "backup_interval_minutes"):
@@ -0,0 +1,486 @@
+"""
+LitZentrum - Smart Collections.
+Saved searches whose membership is maintained incrementally.
+"""
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import re
+
+from formats import LiMeta, LiNote, LiQuote, LiTask, LiSum
+from .event_bus import EventBus, EventType
+from .source_manager import LitSource
+
+
+class QueryError(ValueError):
+    """Raised for smart collection queries that cannot be parsed."""
+
+
+@dataclass
+class SmartCollection:
+    """A named, persistent query (e.g. ``tag:todo AND NOT verified``)."""
+    name: str
+    query: str
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "query": self.query}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SmartCollection":
+        return cls(name=data.get("name", ""), query=data.get("query", ""))
+
+
+@dataclass
+class SourceFacts:
+    """Per-source facts that collection queries are evaluated against.
+
+    Only the fact kinds required by at least one query are loaded from disk;
+    the rest keep their defaults.
+    """
+    meta: LiMeta
+    has_pdf: bool = False
+    notes: int = 0
+    quotes: int = 0
+    summaries: int = 0
+    tasks: int = 0
+    open_tasks: int = 0
+    next_due: Optional[str] = None  # earliest due date of an open task
+
+    def is_overdue(self, now: datetime) -> bool:
+        if not self.next_due:
+            return False
+        try:
+            return now > datetime.fromisoformat(self.next_due)
+        except ValueError:
+            return False
+
+
+Predicate = Callable[[SourceFacts, datetime], bool]
+
+# Fact kinds that have to be read from the source folder
+FACT_KINDS = ("pdf", "notes", "quotes", "summaries", "tasks")
+
+_TOKEN = re.compile(r'\(|\)|[\w-]+:"[^"]*"|"[^"]*"|[^\s()]+')
+_YEAR = re.compile(r"^(<=|>=|<|>|=)?(\d{1,4})$")
+
+
+def _casefold_in(needle: str, values: Iterable[str]) -> bool:
+    return any(needle in value.casefold() for value in values)
+
+
+class _QueryParser:
+    """Recursive descent parser: OR < AND (also implicit) < NOT < atom."""
+
+    def __init__(self, query: str):
+        self.tokens = _TOKEN.findall(query)
+        self.pos = 0
+        self.needs: Set[str] = set()
+        self.time_dependent = False
+
+    def parse(self) -> Predicate:
+        if not self.tokens:
+            raise QueryError("Leere Abfrage")
+        predicate = self._or()
+        if self.pos < len(self.tokens):
+            raise QueryError(f"Unerwartetes Element: {self.tokens[self.pos]}")
+        return predicate
+
+    def _peek(self) -> Optional[str]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _next(self) -> str:
+        token = self._peek()
+        if token is None:
+            raise QueryError("Unerwartetes Ende der Abfrage")
+        self.pos += 1
+        return token
+
+    def _or(self) -> Predicate:
+        parts = [self._and()]
+        while self._peek() == "OR":
+            self._next()
+            parts.append(self._and())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda facts, now: any(p(facts, now) for p in parts)
+
+    def _and(self) -> Predicate:
+        parts = [self._not()]
+        while self._peek() not in (None, ")", "OR"):
+            if self._peek() == "AND":
+                self._next()
+            parts.append(self._not())
+        if len(parts) == 1:
+            return parts[0]
+        return lambda facts, now: all(p(facts, now) for p in parts)
+
+    def _not(self) -> Predicate:
+        if self._peek() == "NOT":
+            self._next()
+            inner = self._not()
+            return lambda facts, now: not inner(facts, now)
+        return self._atom()
+
+    def _atom(self) -> Predicate:
+        token = self._next()
+        if token == "(":
+            inner = self._or()
+            if self._next() != ")":
+                raise QueryError("Fehlende schließende Klammer")
+            return inner
+        if token in (")", "AND", "OR"):
+            raise QueryError(f"Unerwartetes Element: {token}")
+
+        field, sep, value = token.partition(":")
+        if not sep:
+            field, value = "", token
+        value = value.strip('"')
+        field = field.casefold()
+        return self._field_atom(field, value)
+
+    def _field_atom(self, field: str, value: str) -> Predicate:
+        needle = value.casefold()
+        if field == "tag":
+            return lambda f, now: any(t.casefold() == needle for t in f.meta.tags)
+        if field == "author":
+            return lambda f, now: _casefold_in(needle, f.meta.authors)
+        if field == "title":
+            return lambda f, now: needle in f.meta.title.casefold()
+        if field == "type":
+            return lambda f, now: f.meta.source_type == needle
+        if field in ("lang", "language"):
+            return lambda f, now: f.meta.language == needle
+        if field == "year":
+            return self._year_atom(value)
+        if field in ("is", "has"):
+            return self._flag_atom(needle)
+        if field:
+            raise QueryError(f"Unbekanntes Feld: {field}")
+        if needle in ("verified", "overdue", "pdf"):
+            return self._flag_atom(needle)
+        # Freitext: Titel, Autoren, Tags
+        return lambda f, now: (
+            needle in f.meta.title.casefold()
+            or _casefold_in(needle, f.meta.authors)
+            or _casefold_in(needle, f.meta.tags)
+        )
+
+    def _year_atom(self, value: str) -> Predicate:
+        match = _YEAR.match(value)
+        if not match:
+            raise QueryError(f"Ungültiges Jahr: {value}")
+        op, year = match.group(1) or "=", int(match.group(2))
+        compare = {
+            "=": lambda y: y == year,
+            "<": lambda y: y < year,
+            ">": lambda y: y > year,
+            "<=": lambda y: y <= year,
+            ">=": lambda y: y >= year,
+        }[op]
+        return lambda f, now: f.meta.year is not None and compare(f.meta.year)
+
+    def _flag_atom(self, flag: str) -> Predicate:
+        if flag == "verified":
+            return lambda f, now: f.meta.verified
+        if flag == "pdf":
+            self.needs.add("pdf")
+            return lambda f, now: f.has_pdf
+        if flag in ("notes", "note"):
+            self.needs.add("notes")
+            return lambda f, now: f.notes > 0
+        if flag in ("quotes", "quote"):
+            self.needs.add("quotes")
+            return lambda f, now: f.quotes > 0
+        if flag in ("summary", "summaries"):
+            self.needs.add("summaries")
+            return lambda f, now: f.summaries > 0
+        if flag in ("tasks", "task"):
+            self.needs.add("tasks")
+            return lambda f, now: f.tasks > 0
+        if flag in ("open_tasks", "open"):
+            self.needs.add("tasks")
+            return lambda f, now: f.open_tasks > 0
+        if flag == "overdue":
+            self.needs.add("tasks")
+            self.time_dependent = True
+            return lambda f, now: f.is_overdue(now)
+        raise QueryError(f"Unbekannte Eigenschaft: {flag}")
+
+
+@dataclass
+class CompiledQuery:
+    """A parsed query plus the fact kinds it depends on."""
+    predicate: Predicate
+    needs: Set[str]
+    time_dependent: bool = False
+
+    def __call__(self, facts: SourceFacts, now: datetime) -> bool:
+        return self.predicate(facts, now)
+
+
+def compile_query(query: str) -> CompiledQuery:
+    """Parses a collection query.
+
+    Supported: ``tag:x``, ``author:x``, ``title:x``, ``type:book``,
+    ``lang:de``, ``year:2020`` / ``year:>=2015``, ``has:pdf|notes|quotes|
+    summary|tasks|open_tasks|overdue``, ``is:verified`` (or bare
+    ``verified``/``overdue``), free text, ``AND``/``OR``/``NOT`` and
+    parentheses. Adjacent terms are combined with AND.
+
+    Raises:
+        QueryError: If the query cannot be parsed.
+    """
+    parser = _QueryParser(query)
+    predicate = parser.parse()
+    return CompiledQuery(predicate, parser.needs, parser.time_dependent)
+
+
+class SmartCollectionIndex:
+    """Keeps the members of all smart collections of a project.
+
+    Facts are collected once per source when it first shows up in ``sync``
+    and afterwards only for the source named in an EventBus event; after each change just
+    that source is re-evaluated against every collection. Queries that
+    depend on the current date are re-evaluated from the cached facts when
+    the date changes (``refresh_time``).
+    """
+
+    def __init__(self, collections: Iterable[SmartCollection] = ()):
+        self.collections: Dict[str, SmartCollection] = {}
+        self.members: Dict[str, Set[str]] = {}
+        self.facts: Dict[str, SourceFacts] = {}
+        self.on_changed: Optional[Callable[[], None]] = None
+        self._compiled: Dict[str, CompiledQuery] = {}
+        self._sources: Dict[str, LitSource] = {}
+        self._evaluated_on: date = date.today()
+        self._event_bus: Optional[EventBus] = None
+        for collection in collections:
+            self.add_collection(collection)
+
+    # === Collections ===
+
+    @property
+    def needs(self) -> Set[str]:
+        needs = set()
+        for compiled in self._compiled.values():
+            needs |= compiled.needs
+        return needs
+
+    def add_collection(self, collection: SmartCollection):
+        """Adds or replaces a collection and evaluates it from cached facts.
+
+        Raises:
+            QueryError: If the query cannot be parsed.
+        """
+        compiled = compile_query(collection.query)
+        missing = compiled.needs - self.needs
+        self.collections[collection.name] = collection
+        self._compiled[collection.name] = compiled
+        if missing:
+            for key, source in self._sources.items():
+                self._load_facts(self.facts[key], source, missing)
+        self._evaluate_collection(collection.name)
+        self._notify()
+
+    def remove_collection(self, name: str):
+        self.collections.pop(name, None)
+        self._compiled.pop(name, None)
+        self.members.pop(name, None)
+        self._notify()
+
+    def to_list(self) -> List[dict]:
+        return [c.to_dict() for c in self.collections.values()]
+
+    def count(self, name: str) -> int:
+        return len(self.members.get(name, ()))
+
+    def members_of(self, name: str) -> Set[str]:
+        return set(self.members.get(name, ()))
+
+    # === Sources ===
+
+    def sync(self, sources: Iterable[LitSource]) -> bool:
+        """Matches the index with the current source list.
+
+        New sources get their facts collected, sources with changed metadata
+        are re-evaluated and missing ones are dropped; unchanged sources are
+        not touched.
+
+        Returns:
+            True if any membership changed.
+        """
+        changed = False
+        seen = set()
+        notify, self.on_changed = self.on_changed, None
+        try:
+            for source in sources:
+                seen.add(source.name)
+                facts = self.facts.get(source.name)
+                if facts is None:
+                    changed |= self.update_source(source)
+                elif facts.meta.updated_at != source.meta.updated_at:
+                    changed |= self.update_source(source, ("pdf",))
+            for key in [k for k in self.facts if k not in seen]:
+                changed |= self.remove_source(key)
+        finally:
+            self.on_changed = notify
+        if changed:
+            self._notify()
+        return changed
+
+    def update_source(self, source: LitSource, kinds: Iterable[str] = FACT_KINDS) -> bool:
+        """Refreshes facts of one source and its memberships.
+
+        Returns:
+            True if any collection gained or lost the source.
+        """
+        key = source.name
+        self._sources[key] = source
+        facts = self.facts.get(key)
+        if facts is None:
+            facts = self.facts[key] = SourceFacts(meta=source.meta)
+            kinds = FACT_KINDS
+        facts.meta = source.meta
+        self._load_facts(facts, source, self.needs & set(kinds))
+        changed = self._evaluate_source(key)
+        if changed:
+            self._notify()
+        return changed
+
+    def remove_source(self, key: str) -> bool:
+        self.facts.pop(key, None)
+        self._sources.pop(key, None)
+        changed = False
+        for members in self.members.values():
+            if key in members:
+                members.discard(key)
+                changed = True
+        if changed:
+            self._notify()
+        return changed
+
+    def refresh_time(self, today: date = None) -> bool:
+        """Re-evaluates date dependent collections once the day changed."""
+        today = today or date.today()
+        if today == self._evaluated_on:
+            return False
+        self._evaluated_on = today
+        changed = False
+        for name, compiled in self._compiled.items():
+            if compiled.time_dependent:
+                before = self.members.get(name, set())
+                self._evaluate_collection(name)
+                changed |= before != self.members[name]
+        if changed:
+            self._notify()
+        return changed
+
+    # === Evaluation ===
+
+    def _now(self) -> datetime:
+        return datetime.now()
+
+    def _evaluate_collection(self, name: str):
+        compiled = self._compiled[name]
+        now = self._now()
+        self.members[name] = {
+            key for key, facts in self.facts.items() if self._matches(compiled, facts, now)
+        }
+
+    def _evaluate_source(self, key: str) -> bool:
+        facts = self.facts[key]
+        now = self._now()
+        changed = False
+        for name, compiled in self._compiled.items():
+            members = self.members.setdefault(name, set())
+            inside = self._matches(compiled, facts, now)
+            if inside != (key in members):
+                if inside:
+                    members.add(key)
+                else:
+                    members.discard(key)
+                changed = True
+        return changed
+
+    @staticmethod
+    def _matches(compiled: CompiledQuery, facts: SourceFacts, now: datetime) -> bool:
+        try:
+            return compiled(facts, now)
+        except (AttributeError, TypeError, ValueError) as e:
+            logging.debug(f"Sammlung nicht auswertbar: {e}")
+            return False
+
+    @staticmethod
+    def _load_facts(facts: SourceFacts, source: LitSource, kinds: Set[str]):
+        """Reads the requested fact kinds from the source folder."""
+        try:
+            if "pdf" in kinds:
+                facts.has_pdf = source.has_pdf
+            if "notes" in kinds:
+                facts.notes = len(LiNote.load(source.notes_path)) if source.notes_path.exists() else 0
+            if "quotes" in kinds:
+                facts.quotes = len(LiQuote.load(source.quotes_path)) if source.quotes_path.exists() else 0
+            if "summaries" in kinds:
+                summaries = LiSum.load(source.summaries_path) if source.summaries_path.exists() else LiSum()
+                facts.summaries = len(summaries.summaries)
+            if "tasks" in kinds:
+                tasks = LiTask.load(source.tasks_path) if source.tasks_path.exists() else LiTask()
+                open_tasks = tasks.get_open()
+                facts.tasks = len(tasks.tasks)
+                facts.open_tasks = len(open_tasks)
+                due = [t.due_date for t in open_tasks if t.due_date]
+                facts.next_due = min(due) if due else None
+        except (OSError, ValueError, KeyError) as e:
+            logging.debug(f"Fakten für '{source.name}' nicht lesbar: {e}")
+
+    def _notify(self):
+        if self.on_changed:
+            self.on_changed()
+
+    # === EventBus ===
+
+    _EVENT_KINDS: Dict[EventType, Tuple[str, ...]] = {
+        EventType.SOURCE_CREATED: FACT_KINDS,
+        EventType.SOURCE_UPDATED: FACT_KINDS,
+        EventType.NOTE_ADDED: ("notes",),
+        EventType.NOTE_DELETED: ("notes",),
+        EventType.QUOTE_ADDED: ("quotes",),
+        EventType.QUOTE_DELETED: ("quotes",),
+        EventType.TASK_ADDED: ("tasks",),
+        EventType.TASK_UPDATED: ("tasks",),
+        EventType.TASK_COMPLETED: ("tasks",),
+        EventType.TASK_DELETED: ("tasks",),
+        EventType.SUMMARY_ADDED: ("summaries",),
+        EventType.SUMMARY_UPDATED: ("summaries",),
+    }
+
+    def connect(self, event_bus: EventBus):
+        """Follows source, note, quote, task and summary events."""
+        self.disconnect()
+        self._event_bus = event_bus
+        self._handlers = {
+            event_type: self._make_handler(kinds)
+            for event_type, kinds in self._EVENT_KINDS.items()
+        }
+        for event_type, handler in self._handlers.items():
+            event_bus.subscribe(event_type, handler)
+        event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        for event_type, handler in self._handlers.items():
+            self._event_bus.unsubscribe(event_type, handler)
+        self._event_bus.unsubscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+        self._event_bus = None
+
+    def _make_handler(self, kinds: Tuple[str, ...]) -> Callable:
+        def handler(source):
+            if isinstance(source, LitSource):
+                self.update_source(source, kinds)
+        return handler
+
+    def _on_source_deleted(self, source):
+        key = source.name if isinstance(source, LitSource) else str(source)
+        self.remove_source(key)
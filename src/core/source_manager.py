@@ -2,9 +2,10 @@
 LitZentrum - Source Manager.
 Manages individual literature sources.
 """
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Set
 import shutil
 import re
 
@@ -67,12 +68,14 @@ class SourceManager:
             return self.project_path / self.sources_folder
         return None
     
-    def create_source(self, meta: LiMeta, pdf_path: Path = None) -> LitSource:
+    def create_source(self, meta: LiMeta, pdf_path: Path = None,
+                      folder_name: str = None) -> LitSource:
         """Creates a new source directory with metadata and empty data files.
 
         Args:
             meta: Metadata for the new source.
             pdf_path: Optional path to a PDF to copy into the source folder.
+            folder_name: Folder to use instead of the generated name.
 
         Returns:
             The newly created LitSource instance.
@@ -84,7 +87,7 @@ class SourceManager:
             raise ValueError("Kein Projekt-Pfad gesetzt")
         
         # Ordnername generieren
-        folder_name = self._generate_folder_name(meta)
+        folder_name = folder_name or self._generate_folder_name(meta)
         source_path = self.sources_path / folder_name
         source_path.mkdir(parents=True, exist_ok=True)
         
@@ -105,6 +108,54 @@ class SourceManager:
         
         return LitSource(path=source_path, meta=meta)
     
+    def create_sources(self, metas: List[LiMeta], max_workers: int = 4,
+                       taken: Set[str] = None) -> List[LitSource]:
+        """Creates many sources at once, writing their folders in parallel.
+
+        Folder names are reserved up front so that entries with the same
+        author, year and title prefix do not overwrite each other.
+
+        Args:
+            metas: Metadata of the new sources.
+            max_workers: Number of writer threads.
+            taken: Folder names already in use (casefolded); updated in place.
+                Pass the same set for consecutive batches to avoid listing
+                the sources directory each time.
+
+        Returns:
+            The created sources, in the order of `metas`.
+
+        Raises:
+            ValueError: If no project path has been set on this manager.
+        """
+        if not self.sources_path:
+            raise ValueError("Kein Projekt-Pfad gesetzt")
+        if taken is None:
+            taken = self.folder_names()
+        names = [self.unique_folder_name(meta, taken) for meta in metas]
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            return list(pool.map(
+                lambda item: self.create_source(item[0], folder_name=item[1]),
+                zip(metas, names),
+            ))
+    
+    def folder_names(self) -> Set[str]:
+        """Returns the (casefolded) names of all existing source folders."""
+        if not self.sources_path or not self.sources_path.exists():
+            return set()
+        return {p.name.casefold() for p in self.sources_path.iterdir()}
+    
+    def unique_folder_name(self, meta: LiMeta, taken: Set[str]) -> str:
+        """Generates a folder name not in `taken` and reserves it there."""
+        base = self._generate_folder_name(meta)
+        name, counter = base, 2
+        while name.casefold() in taken:
+            name = f"{base}_{counter}"
+            counter += 1
+        taken.add(name.casefold())
+        return name
+    
     def load_source(self, path: Path) -> LitSource:
         """Loads an existing source from a directory.
 
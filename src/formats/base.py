@@ -30,6 +30,7 @@ class LitFormat(ABC):
     SCHEMA_FILE: str = ""
     
     _schema_cache: Dict[str, dict] = {}
+    _validator_cache: Dict[str, Any] = {}
     
     @classmethod
     def get_schema(cls) -> dict:
@@ -54,14 +55,30 @@ class LitFormat(ABC):
         """Creates an instance from a dictionary."""
         pass
 
+    @classmethod
+    def get_validator(cls) -> Optional[Any]:
+        """Returns a cached validator for the schema (None without schema).
+
+        Building the validator (and checking the schema itself) is far more
+        expensive than validating a single object, which matters when many
+        files are written in a row, e.g. during an import.
+        """
+        if cls.SCHEMA_FILE not in cls._validator_cache:
+            schema = cls.get_schema()
+            validator = None
+            if schema:
+                validator = jsonschema.validators.validator_for(schema)(schema)
+            cls._validator_cache[cls.SCHEMA_FILE] = validator
+        return cls._validator_cache[cls.SCHEMA_FILE]
+
     def validate(self) -> bool:
         """Validates the object against its JSON schema."""
-        schema = self.get_schema()
-        if not schema:
+        validator = self.get_validator()
+        if validator is None:
             return True  # Kein Schema = keine Validierung
         
         try:
-            jsonschema.validate(self.to_dict(), schema)
+            validator.validate(self.to_dict())
             return True
         except jsonschema.ValidationError as e:
             raise LitValidationError(f"Validierungsfehler: {e.message}")
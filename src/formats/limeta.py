@@ -12,6 +12,22 @@ from typing import List, Optional
 from .base import LitFormat, now_iso
 
 
+# Umlaute manuell ersetzen (vor NFKD, da NFKD ae/oe/ue nicht erzeugt)
+UMLAUT_MAP = {
+    "\u00e4": "ae", "\u00f6": "oe", "\u00fc": "ue", "\u00df": "ss",
+    "\u00c4": "Ae", "\u00d6": "Oe", "\u00dc": "Ue",
+}
+_UMLAUT_TABLE = str.maketrans(UMLAUT_MAP)
+
+
+def to_ascii(text: str) -> str:
+    """Transliteriert Text nach ASCII (ä -> ae, ß -> ss, é -> e)"""
+    text = text.translate(_UMLAUT_TABLE)
+    # Restliche diakritische Zeichen via NFKD entfernen
+    text = unicodedata.normalize("NFKD", text)
+    return text.encode("ascii", "ignore").decode("ascii")
+
+
 @dataclass
 class LiMeta(LitFormat):
     """Metadaten einer Literaturquelle"""
@@ -126,21 +142,7 @@ class LiMeta(LitFormat):
         """
         # Nachname: erster Autor, Nachname-Teil
         author_raw = self.first_author if self.authors else "unknown"
-        # Umlaute manuell ersetzen (vor NFKD, da NFKD ae/oe/ue nicht erzeugt)
-        umlaut_map = {
-            "ae": "ae", "oe": "oe", "ue": "ue", "ss": "ss",
-            "\u00e4": "ae", "\u00f6": "oe", "\u00fc": "ue", "\u00df": "ss",
-            "\u00c4": "Ae", "\u00d6": "Oe", "\u00dc": "Ue",
-        }
-        def _to_ascii(text: str) -> str:
-            for char, repl in umlaut_map.items():
-                text = text.replace(char, repl)
-            # Restliche diakritische Zeichen via NFKD entfernen
-            text = unicodedata.normalize("NFKD", text)
-            text = text.encode("ascii", "ignore").decode("ascii")
-            return text
-
-        author_ascii = _to_ascii(author_raw).lower().strip()
+        author_ascii = to_ascii(author_raw).lower().strip()
         # Nur Buchstaben behalten
         author_ascii = re.sub(r"[^a-z]", "", author_ascii)
         if not author_ascii:
@@ -155,7 +157,7 @@ class LiMeta(LitFormat):
             "und", "or", "and", "in", "im", "on", "of", "zu", "zur",
             "zum", "fuer", "for", "von", "with", "mit", "ueber",
         }
-        title_ascii = _to_ascii(self.title).lower()
+        title_ascii = to_ascii(self.title).lower()
         words = re.findall(r"[a-z]+", title_ascii)
         first_word = "untitled"
         for w in words:
@@ -3,7 +3,7 @@ LitZentrum - LiProj Format (.liproj)
 Projekt-Konfiguration
 """
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import List, Optional
 
 from .base import LitFormat, now_iso
 
@@ -20,6 +20,8 @@ class LiProj(LitFormat):
     citation_style: str = "apa"
     language: str = "de"
     sources_folder: str = "Quellen"
+    smart_collections: List[dict] = field(default_factory=list)  # [{"name", "query"}]
+    manuscripts: List[str] = field(default_factory=list)  # Hauptdateien, relativ zum Projekt
     schema_version: str = "1.0.0"
     created_at: str = field(default_factory=now_iso)
     updated_at: str = field(default_factory=now_iso)
@@ -32,6 +34,8 @@ class LiProj(LitFormat):
             "citation_style": self.citation_style,
             "language": self.language,
             "sources_folder": self.sources_folder,
+            "smart_collections": self.smart_collections,
+            "manuscripts": self.manuscripts,
             "created_at": self.created_at,
             "updated_at": self.updated_at,
         }
@@ -44,6 +48,8 @@ class LiProj(LitFormat):
             citation_style=data.get("citation_style", "apa"),
             language=data.get("language", "de"),
             sources_folder=data.get("sources_folder", "Quellen"),
+            smart_collections=data.get("smart_collections", []),
+            manuscripts=data.get("manuscripts", []),
             schema_version=data.get("schema_version", "1.0.0"),
             created_at=data.get("created_at", now_iso()),
             updated_at=data.get("updated_at", now_iso()),
@@ -4,9 +4,13 @@ LitZentrum - GUI Dialoge
 from .new_project_dialog import NewProjectDialog
 from .source_dialog import SourceDialog
 from .settings_dialog import SettingsDialog
+from .search_dialog import SearchDialog
+from .export_dialog import ExportDialog
 
 __all__ = [
     "NewProjectDialog",
     "SourceDialog",
     "SettingsDialog",
+    "SearchDialog",
+    "ExportDialog",
 ]
@@ -0,0 +1,124 @@
+"""
+LitZentrum - Export Dialog
+"""
+from pathlib import Path
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QGroupBox,
+    QLineEdit, QComboBox, QPushButton, QCheckBox,
+    QDialogButtonBox, QFileDialog, QMessageBox
+)
+
+from models import ExportOptions
+from modules.bibliography.export import FORMAT_SUFFIXES
+from modules.bibliography.styles import get_style_manager
+
+
+class ExportDialog(QDialog):
+    """Dialog für den Export von Quellen mit Notizen, Zitaten und Zusammenfassungen"""
+
+    FORMATS = [
+        ("word", "Word-Dokument (*.docx)"),
+        ("markdown", "Markdown (*.md)"),
+        ("html", "HTML-Datei (*.html)"),
+        ("text", "Textdatei (*.txt)"),
+        ("bibtex", "BibTeX (*.bib)"),
+    ]
+
+    def __init__(self, parent=None, citation_style: str = "apa", folder: Path = None):
+        super().__init__(parent)
+        self.folder = Path(folder) if folder else Path.home()
+        self.setWindowTitle("Quellen exportieren")
+        self.setMinimumSize(500, 380)
+        self._setup_ui()
+        self.style_combo.setCurrentIndex(max(self.style_combo.findData(citation_style), 0))
+        self._on_format_changed()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        form = QFormLayout()
+
+        self.format_combo = QComboBox()
+        for format_id, label in self.FORMATS:
+            self.format_combo.addItem(label, format_id)
+        self.format_combo.currentIndexChanged.connect(self._on_format_changed)
+        form.addRow("Format:", self.format_combo)
+
+        self.style_combo = QComboBox()
+        for style_id, name in get_style_manager().style_names().items():
+            self.style_combo.addItem(name, style_id)
+        form.addRow("Zitationsstil:", self.style_combo)
+
+        path_layout = QHBoxLayout()
+        self.path_input = QLineEdit()
+        path_layout.addWidget(self.path_input)
+        browse_btn = QPushButton("📁 Auswählen...")
+        browse_btn.clicked.connect(self._browse_path)
+        path_layout.addWidget(browse_btn)
+        form.addRow("Datei:", path_layout)
+
+        layout.addLayout(form)
+
+        # Inhalte je Quelle
+        self.content_group = QGroupBox("Je Quelle exportieren")
+        content_layout = QVBoxLayout(self.content_group)
+        self.abstracts_check = QCheckBox("Abstract")
+        self.summaries_check = QCheckBox("Zusammenfassungen")
+        self.quotes_check = QCheckBox("Zitate")
+        self.notes_check = QCheckBox("Notizen")
+        for check in (self.abstracts_check, self.summaries_check, self.quotes_check, self.notes_check):
+            check.setChecked(True)
+            content_layout.addWidget(check)
+        layout.addWidget(self.content_group)
+
+        layout.addStretch()
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok |
+            QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(self._validate_and_accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def _on_format_changed(self):
+        """Dateiendung anpassen; BibTeX enthält nur die Literaturangaben"""
+        format_id = self.format_combo.currentData()
+        bibtex = format_id == "bibtex"
+        self.content_group.setEnabled(not bibtex)
+        self.style_combo.setEnabled(not bibtex)
+        path = Path(self.path_input.text() or self.folder / "Export")
+        self.path_input.setText(str(path.with_suffix(FORMAT_SUFFIXES[format_id])))
+
+    def _browse_path(self):
+        """Zieldatei auswählen"""
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Quellen exportieren", self.path_input.text(),
+            f"{self.format_combo.currentText()};;Alle Dateien (*)"
+        )
+        if path:
+            self.path_input.setText(path)
+
+    def _validate_and_accept(self):
+        """Validiert und akzeptiert"""
+        if not self.path_input.text().strip():
+            QMessageBox.warning(self, "Fehler", "Bitte eine Zieldatei auswählen.")
+            return
+        self.accept()
+
+    def get_options(self) -> ExportOptions:
+        """Gibt die gewählten Export-Optionen zurück"""
+        path = Path(self.path_input.text().strip())
+        format_id = self.format_combo.currentData()
+        if path.suffix.lower() != FORMAT_SUFFIXES[format_id]:
+            path = path.with_name(path.name + FORMAT_SUFFIXES[format_id])
+        return ExportOptions(
+            format=format_id,
+            citation_style=self.style_combo.currentData(),
+            include_abstracts=self.abstracts_check.isChecked(),
+            include_notes=self.notes_check.isChecked(),
+            include_quotes=self.quotes_check.isChecked(),
+            include_summaries=self.summaries_check.isChecked(),
+            output_path=path,
+        )
@@ -0,0 +1,170 @@
+"""
+LitZentrum - Suchdialog
+Suche im aktuellen Projekt oder über alle zuletzt geöffneten Projekte
+"""
+from pathlib import Path
+from typing import List, Optional
+import logging
+import threading
+
+from PySide6.QtCore import Qt, Signal
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
+    QCheckBox, QTreeWidget, QTreeWidgetItem, QLabel, QHeaderView
+)
+
+from core import get_settings
+from models import SearchResult
+from modules.search.federated import get_federated_search
+from modules.search.snippets import highlight_html
+
+
+class SearchDialog(QDialog):
+    """Dialog für Metadaten- und Volltextsuche"""
+
+    result_activated = Signal(object)  # SearchResult
+    semantic_finished = Signal(object, str)  # List[SearchResult], Fehlermeldung
+
+    MATCH_LABELS = {
+        "title": "Titel",
+        "author": "Autor",
+        "tag": "Tag",
+        "abstract": "Abstract",
+        "content": "Volltext",
+        "semantic": "Semantisch",
+    }
+
+    def __init__(self, current_project: Optional[Path] = None, parent=None, source_manager=None):
+        super().__init__(parent)
+        self.current_project = current_project
+        self.source_manager = source_manager
+        self.settings = get_settings()
+        self.search = get_federated_search()
+        self.semantic_finished.connect(self._on_semantic_finished)
+        self.setWindowTitle("Suche")
+        self.setMinimumSize(800, 500)
+        self._setup_ui()
+
+    def _setup_ui(self):
+        layout = QVBoxLayout(self)
+
+        # Suchzeile
+        search_row = QHBoxLayout()
+        self.query_input = QLineEdit()
+        self.query_input.setPlaceholderText('Suchbegriffe, "exakte Phrase" oder wort NEAR/5 wort')
+        self.query_input.returnPressed.connect(self._run_search)
+        search_row.addWidget(self.query_input)
+
+        self.search_btn = QPushButton("🔍 Suchen")
+        self.search_btn.clicked.connect(self._run_search)
+        search_row.addWidget(self.search_btn)
+        layout.addLayout(search_row)
+
+        self.all_projects_check = QCheckBox("Alle zuletzt geöffneten Projekte durchsuchen")
+        self.all_projects_check.setChecked(self.current_project is None)
+        self.all_projects_check.setEnabled(self.current_project is not None)
+        layout.addWidget(self.all_projects_check)
+
+        # Semantische Suche (Embeddings über Ollama, nur im aktuellen Projekt)
+        self.semantic_check = QCheckBox("Semantische Suche (KI, aktuelles Projekt)")
+        self.semantic_check.setEnabled(
+            self.source_manager is not None and bool(self.settings.get("ai_enabled", False))
+        )
+        self.semantic_check.setToolTip(
+            f"Embedding-Modell: {self.settings.get('ai_embedding_model')} (Einstellungen → KI)"
+        )
+        self.semantic_check.toggled.connect(lambda checked: self.all_projects_check.setEnabled(
+            not checked and self.current_project is not None
+        ))
+        layout.addWidget(self.semantic_check)
+
+        # Ergebnisse
+        self.results_tree = QTreeWidget()
+        self.results_tree.setHeaderLabels(["Projekt", "Titel", "Autoren", "Jahr", "Treffer", "Ausschnitt"])
+        self.results_tree.setRootIsDecorated(False)
+        self.results_tree.header().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
+        self.results_tree.header().setSectionResizeMode(5, QHeaderView.ResizeMode.Stretch)
+        self.results_tree.itemDoubleClicked.connect(self._on_item_double_clicked)
+        layout.addWidget(self.results_tree)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet("color: #666; font-size: 11px;")
+        layout.addWidget(self.status_label)
+
+    def _projects(self) -> Optional[List[Path]]:
+        """None = alle zuletzt geöffneten Projekte"""
+        if self.all_projects_check.isChecked() or self.current_project is None:
+            return None
+        return [self.current_project]
+
+    def _run_search(self):
+        query = self.query_input.text().strip()
+        self.results_tree.clear()
+        if not query:
+            return
+        if self.semantic_check.isChecked():
+            self._run_semantic(query)
+            return
+
+        self._show_results(self.search.search(query, self._projects()))
+
+    def _show_results(self, results: List[SearchResult]):
+        for result in results:
+            item = self._create_item(result)
+            self.results_tree.addTopLevelItem(item)
+            if result.match_text:
+                # Ausschnitt mit hervorgehobener Fundstelle
+                label = QLabel(highlight_html(result.match_text, result.highlights))
+                label.setTextFormat(Qt.TextFormat.RichText)
+                self.results_tree.setItemWidget(item, 5, label)
+        self.status_label.setText(f"{len(results)} Treffer")
+
+    def _run_semantic(self, query: str):
+        """Gleicht die Embeddings ab und sucht (im Hintergrund)"""
+        self.search_btn.setEnabled(False)
+        self.status_label.setText("Semantische Suche: Quellen werden eingebettet...")
+        threading.Thread(target=self._semantic_worker, args=(query,), daemon=True).start()
+
+    def _semantic_worker(self, query: str):
+        from modules.search.semantic import create_semantic_index
+
+        manager = self.source_manager
+        try:
+            index = create_semantic_index(
+                manager.project_path / ".index", manager.sources_path, self.settings
+            )
+            index.sync(manager.get_all_sources(), manager)
+            results = index.search(query, k=20)
+        except Exception as e:
+            logging.debug(f"Semantische Suche fehlgeschlagen: {e}")
+            self.semantic_finished.emit([], str(e))
+            return
+        self.semantic_finished.emit(results, "")
+
+    def _on_semantic_finished(self, results: List[SearchResult], error: str):
+        self.search_btn.setEnabled(True)
+        if error:
+            self.status_label.setText(f"Semantische Suche fehlgeschlagen: {error}")
+            return
+        self.results_tree.clear()
+        self._show_results(results)
+
+    def _create_item(self, result: SearchResult) -> QTreeWidgetItem:
+        match = self.MATCH_LABELS.get(result.match_type, result.match_type)
+        if result.page:
+            match = f"{match}, S. {result.page}"
+        item = QTreeWidgetItem([
+            result.project or "",
+            result.title,
+            ", ".join(result.authors[:3]),
+            str(result.year) if result.year else "",
+            match,
+        ])
+        item.setToolTip(1, result.title)
+        item.setData(0, Qt.ItemDataRole.UserRole, result)
+        return item
+
+    def _on_item_double_clicked(self, item: QTreeWidgetItem, column: int):
+        result = item.data(0, Qt.ItemDataRole.UserRole)
+        if result:
+            self.result_activated.emit(result)
@@ -8,6 +8,7 @@ from PySide6.QtWidgets import (
 )
 
 from core import get_settings
+from modules.bibliography.styles import get_style_manager
 
 
 class SettingsDialog(QDialog):
@@ -49,7 +50,8 @@ class SettingsDialog(QDialog):
         citation_layout = QFormLayout(citation_group)
         
         self.citation_style_combo = QComboBox()
-        self.citation_style_combo.addItems(["APA", "MLA", "Chicago", "DIN 1505", "Harvard"])
+        for style_id, name in get_style_manager().style_names().items():
+            self.citation_style_combo.addItem(name, style_id)
         citation_layout.addRow("Standard-Stil:", self.citation_style_combo)
         
         self.auto_key_check = QCheckBox("Automatisch generieren")
@@ -100,6 +102,12 @@ class SettingsDialog(QDialog):
         self.ai_model_combo.addItems(["mistral:latest", "llama2:latest", "codellama:latest"])
         ai_form.addRow("Modell:", self.ai_model_combo)
 
+        self.ai_embedding_combo = QComboBox()
+        self.ai_embedding_combo.setEditable(True)
+        self.ai_embedding_combo.addItems(["nomic-embed-text", "mxbai-embed-large", "all-minilm"])
+        self.ai_embedding_combo.setToolTip("Modell für die semantische Suche (Suchdialog)")
+        ai_form.addRow("Embedding-Modell:", self.ai_embedding_combo)
+
         btn_layout = QHBoxLayout()
         test_btn = QPushButton("Verbindung testen")
         test_btn.clicked.connect(self._test_ai_connection)
@@ -141,6 +149,14 @@ class SettingsDialog(QDialog):
         backup_form.addRow("Backup-Ordner:", path_layout)
         
         backup_layout.addWidget(backup_group)
+        
+        git_group = QGroupBox("Git")
+        git_form = QFormLayout(git_group)
+        
+        self.git_auto_commit_check = QCheckBox("Änderungen automatisch committen (Projekte mit Git-Repository)")
+        git_form.addRow("", self.git_auto_commit_check)
+        
+        backup_layout.addWidget(git_group)
         backup_layout.addStretch()
         
         tabs.addTab(backup_tab, "Backup")
@@ -168,8 +184,7 @@ class SettingsDialog(QDialog):
         self.language_combo.setCurrentIndex(0 if lang == "de" else 1)
         
         style = self.settings.get("default_citation_style", "apa")
-        style_map = {"apa": 0, "mla": 1, "chicago": 2, "din": 3, "harvard": 4}
-        self.citation_style_combo.setCurrentIndex(style_map.get(style, 0))
+        self.citation_style_combo.setCurrentIndex(max(self.citation_style_combo.findData(style), 0))
         
         self.auto_key_check.setChecked(self.settings.get("auto_generate_citation_key", True))
         
@@ -180,11 +195,13 @@ class SettingsDialog(QDialog):
         self.ai_enabled_check.setChecked(self.settings.get("ai_enabled", False))
         self.ai_url_input.setText(self.settings.get("ai_base_url", "http://localhost:11434"))
         self.ai_model_combo.setCurrentText(self.settings.get("ai_model", "mistral:latest"))
+        self.ai_embedding_combo.setCurrentText(self.settings.get("ai_embedding_model", "nomic-embed-text"))
         
         # Backup
         self.auto_backup_check.setChecked(self.settings.get("auto_backup", True))
         self.backup_interval_spin.setValue(self.settings.get("backup_interval_minutes", 30))
         self.backup_path_input.setText(self.settings.get("backup_path", "") or "")
+        self.git_auto_commit_check.setChecked(self.settings.get("git_auto_commit", False))
     
     def _save_and_close(self):
         """Speichert Einstellungen"""
@@ -193,8 +210,7 @@ class SettingsDialog(QDialog):
         self.settings.set("theme", theme_map[self.theme_combo.currentIndex()])
         self.settings.set("language", "de" if self.language_combo.currentIndex() == 0 else "en")
         
-        style_map = {0: "apa", 1: "mla", 2: "chicago", 3: "din", 4: "harvard"}
-        self.settings.set("default_citation_style", style_map[self.citation_style_combo.currentIndex()])
+        self.settings.set("default_citation_style", self.citation_style_combo.currentData())
         self.settings.set("auto_generate_citation_key", self.auto_key_check.isChecked())
         
         # PDF
@@ -204,11 +220,13 @@ class SettingsDialog(QDialog):
         self.settings.set("ai_enabled", self.ai_enabled_check.isChecked())
         self.settings.set("ai_base_url", self.ai_url_input.text())
         self.settings.set("ai_model", self.ai_model_combo.currentText())
+        self.settings.set("ai_embedding_model", self.ai_embedding_combo.currentText())
         
         # Backup
         self.settings.set("auto_backup", self.auto_backup_check.isChecked())
         self.settings.set("backup_interval_minutes", self.backup_interval_spin.value())
         self.settings.set("backup_path", self.backup_path_input.text() or None)
+        self.settings.set("git_auto_commit", self.git_auto_commit_check.isChecked())
         
         self.settings.sync()
         self.accept()
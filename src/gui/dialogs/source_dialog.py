@@ -11,6 +11,8 @@ from PySide6.QtWidgets import (
 )
 
 from formats import LiMeta
+from modules.search.catalog import get_source_catalog
+from ..widgets.catalog_completer import CatalogCompleter
 
 
 class SourceDialog(QDialog):
@@ -24,6 +26,7 @@ class SourceDialog(QDialog):
         self.setWindowTitle("Quelle bearbeiten" if meta else "Neue Quelle")
         self.setMinimumSize(600, 550)
         self._setup_ui()
+        self._setup_completers()
         
         if meta:
             self._load_meta()
@@ -160,6 +163,16 @@ class SourceDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addWidget(buttons)
     
+    def _setup_completers(self):
+        """Vorschläge aus den bereits im Projekt verwendeten Werten"""
+        catalog = get_source_catalog()
+        self.completers = [
+            CatalogCompleter(catalog, "authors", self.authors_input, separator=";"),
+            CatalogCompleter(catalog, "tags", self.tags_input, separator=","),
+            CatalogCompleter(catalog, "journals", self.journal_input),
+            CatalogCompleter(catalog, "publishers", self.publisher_input),
+        ]
+    
     def _select_pdf(self):
         """PDF auswählen"""
         path, _ = QFileDialog.getOpenFileName(
@@ -4,18 +4,21 @@ LitZentrum - Hauptfenster
 """
 from pathlib import Path
 from typing import Optional
+import threading
 
-from PySide6.QtCore import Qt, QSize
+from PySide6.QtCore import Qt, QSize, QFileSystemWatcher, QTimer, Signal
 from PySide6.QtGui import QAction, QIcon, QKeySequence
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
     QSplitter, QMenuBar, QMenu, QToolBar, QStatusBar,
-    QFileDialog, QMessageBox, QLabel
+    QFileDialog, QMessageBox, QLabel, QInputDialog, QProgressDialog,
+    QApplication
 )
 
 from core import (
     ProjectManager, SourceManager, LitProject, LitSource,
-    EventBus, EventType, get_event_bus, get_settings
+    EventBus, EventType, get_event_bus, get_settings,
+    SmartCollection, SmartCollectionIndex, QueryError
 )
 from .panels.project_tree import ProjectTreePanel
 from .panels.source_list import SourceListPanel
@@ -25,12 +28,38 @@ from .panels.detail_panel import DetailPanel
 class MainWindow(QMainWindow):
     """LitZentrum Hauptfenster"""
     
+    # Projektarchiv (Worker-Thread -> UI)
+    archive_progress = Signal(int, int)
+    archive_finished = Signal(object, object)  # Archivpfad (None = Fehler), BackupStats
+    
     def __init__(self):
         super().__init__()
         
         self.project_manager = ProjectManager()
         self.source_manager: Optional[SourceManager] = None
         self.current_source: Optional[LitSource] = None
+        self.search_index = None  # ProjectSearchIndex des geöffneten Projekts
+        self.duplicates = None  # DuplicateDetector des geöffneten Projekts
+        self.collections: Optional[SmartCollectionIndex] = None
+        self.project_bib = None  # ProjectBibliography (projekt_biblio.bib)
+        self.citation_keys = None  # CitationKeyRegistry des geöffneten Projekts
+        self._archive_dialog: Optional[QProgressDialog] = None  # laufendes Projektarchiv
+        self.manuscripts = None  # ManuscriptScanner des geöffneten Projekts
+        self.git_worker = None  # GitWorker (Auto-Commit) des geöffneten Projekts
+        
+        # Manuskript nach dem Speichern neu abgleichen (Editoren schreiben oft mehrfach)
+        self.manuscript_watcher = QFileSystemWatcher(self)
+        self.manuscript_timer = QTimer(self)
+        self.manuscript_timer.setSingleShot(True)
+        self.manuscript_timer.setInterval(500)
+        self.manuscript_timer.timeout.connect(self._scan_manuscripts)
+        self.manuscript_watcher.fileChanged.connect(lambda _: self.manuscript_timer.start())
+        
+        # Suchindizes nach Bearbeitungen gesammelt speichern statt bei jeder Änderung
+        self.index_save_timer = QTimer(self)
+        self.index_save_timer.setSingleShot(True)
+        self.index_save_timer.setInterval(5000)
+        self.index_save_timer.timeout.connect(self._save_indexes)
         
         self.event_bus = get_event_bus()
         self.settings = get_settings()
@@ -125,12 +154,27 @@ class MainWindow(QMainWindow):
         import_pdf.triggered.connect(self._on_import_pdf)
         source_menu.addAction(import_pdf)
         
+        delete_source = QAction("Quelle &löschen...", self)
+        delete_source.triggered.connect(lambda: self._on_delete_source())
+        source_menu.addAction(delete_source)
+        
+        search = QAction("&Suchen...", self)
+        search.setShortcut("Ctrl+Shift+F")
+        search.triggered.connect(self._on_search)
+        source_menu.addAction(search)
+        
         source_menu.addSeparator()
         
-        import_bibtex = QAction("BibTeX importieren...", self)
+        import_bibtex = QAction("Literatur importieren (BibTeX, RIS, CSL-JSON)...", self)
         import_bibtex.triggered.connect(self._on_import_bibtex)
         source_menu.addAction(import_bibtex)
         
+        source_menu.addSeparator()
+        
+        find_duplicates = QAction("&Dubletten suchen...", self)
+        find_duplicates.triggered.connect(self._on_find_duplicates)
+        source_menu.addAction(find_duplicates)
+        
         # Ansicht-Menü
         view_menu = menubar.addMenu("&Ansicht")
         
@@ -146,6 +190,22 @@ class MainWindow(QMainWindow):
         export_bib.triggered.connect(self._on_export_bibliography)
         extras_menu.addAction(export_bib)
         
+        export_references = QAction("&Literaturverzeichnis erstellen...", self)
+        export_references.triggered.connect(self._on_export_references)
+        extras_menu.addAction(export_references)
+        
+        export_sources = QAction("&Quellen mit Notizen exportieren...", self)
+        export_sources.triggered.connect(self._on_export_sources)
+        extras_menu.addAction(export_sources)
+        
+        check_manuscript = QAction("&Manuskript prüfen...", self)
+        check_manuscript.triggered.connect(self._on_check_manuscript)
+        extras_menu.addAction(check_manuscript)
+        
+        create_archive = QAction("Projekt&archiv erstellen (.litzip)...", self)
+        create_archive.triggered.connect(self._on_create_archive)
+        extras_menu.addAction(create_archive)
+        
         extras_menu.addSeparator()
         
         settings = QAction("&Einstellungen...", self)
@@ -205,11 +265,32 @@ class MainWindow(QMainWindow):
         # Panel-Signale
         self.project_tree.source_selected.connect(self._on_source_selected)
         self.source_list.source_selected.connect(self._on_source_selected)
+        self.source_list.source_delete_requested.connect(self._on_delete_source)
+        self.project_tree.collection_selected.connect(self._on_collection_selected)
+        self.project_tree.collection_add_requested.connect(self._on_new_collection)
+        self.project_tree.collection_remove_requested.connect(self._on_remove_collection)
         
         # EventBus
         self.event_bus.subscribe(EventType.SOURCE_CREATED, self._on_source_changed)
         self.event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_changed)
+        self.event_bus.subscribe(EventType.SOURCE_UPDATED, self._on_source_updated)
         self.event_bus.subscribe(EventType.STATUS_MESSAGE, self._show_status)
+        
+        # Quellenkatalog (Vervollständigung, Tag-Filter) über Quellen-Events nachführen
+        from modules.search.catalog import get_source_catalog
+        get_source_catalog().connect(self.event_bus)
+        
+        # Volltext-Index nachführen, sobald PDF-Text extrahiert ist
+        from modules.pdf_workshop.text_cache import get_text_extraction_queue
+        get_text_extraction_queue().extraction_finished.connect(self._on_text_extracted)
+        
+        # Automatische Backups (Worker-Thread, Meldungen in der Statusleiste)
+        from modules.sync.scheduler import get_backup_scheduler
+        get_backup_scheduler().backup_finished.connect(self._on_backup_finished)
+        get_backup_scheduler().backup_failed.connect(self._on_backup_failed)
+        
+        self.archive_progress.connect(self._on_archive_progress)
+        self.archive_finished.connect(self._on_archive_finished)
     
     def _restore_state(self):
         """Stellt Fensterposition wieder her"""
@@ -236,18 +317,34 @@ class MainWindow(QMainWindow):
     def _load_project(self, path: Path):
         """Lädt ein Projekt"""
         try:
+            self._save_indexes()  # noch zum bisherigen Projekt
+            self._disconnect_indexes()
             project = self.project_manager.open_project(path)
             self.source_manager = SourceManager(
                 project.path, 
                 project.config.sources_folder
             )
             
+            from modules.search.engine import ProjectSearchIndex
+            self.search_index = ProjectSearchIndex(project.index_path, project.sources_path).load()
+            self.search_index.connect(self.event_bus)
+            from modules.search.dedup import DuplicateDetector
+            self.duplicates = DuplicateDetector().load(project.index_path)
+            self.duplicates.connect(self.event_bus)
+            self._setup_collections(project)
+            self._setup_project_bibliography(project)
+            
             self.settings.add_recent_project(path)
             self._update_recent_menu()
             
-            # UI aktualisieren
-            self.project_tree.set_project(project)
+            # UI aktualisieren (Baum erst nach dem Abgleich von Katalog und Sammlungen)
+            self.project_tree.clear()
+            self.source_list.set_collection(None)
             self._refresh_sources()
+            self.project_tree.set_project(project, self.collections)
+            self._setup_manuscripts(project)
+            self._configure_backups()
+            self._setup_git(project)
             
             self.project_label.setText(f"📚 {project.name}")
             self._show_status(f"Projekt geöffnet: {project.name}")
@@ -265,6 +362,142 @@ class MainWindow(QMainWindow):
         sources = self.source_manager.get_all_sources()
         self.source_list.set_sources(sources)
         self.sources_label.setText(f"{len(sources)} Quellen")
+        
+        if self.search_index is not None:
+            self.search_index.sync(sources)
+            self.search_index.save()
+            from modules.search.federated import get_federated_search
+            get_federated_search().invalidate(self.project_manager.current_project.path)
+        if self.duplicates is not None:
+            self.duplicates.sync(sources)
+            self.duplicates.save(self.project_manager.current_project.index_path)
+        if self.collections is not None:
+            self.collections.sync(sources)
+            self.collections.refresh_time()
+        if self.project_bib is not None:
+            index_path = self.project_manager.current_project.index_path
+            self.citation_keys.sync(sources)
+            self.citation_keys.save(index_path)
+            try:
+                self.project_bib.sync(sources)
+                self.project_bib.save(index_path)
+            except OSError as e:
+                self._show_status(f"Projektbibliografie nicht aktualisiert: {e}")
+        self.project_tree.refresh()
+    
+    def _setup_project_bibliography(self, project: LitProject):
+        """Zitierschlüssel und eigene Zitierstile laden, projekt_biblio.bib aktuell halten"""
+        from modules.bibliography.bibtex import BibTeXGenerator
+        from modules.bibliography.keys import get_citation_keys
+        from modules.bibliography.project_bib import ProjectBibliography
+        from modules.bibliography.styles import get_style_manager
+        get_style_manager().load_styles(project.styles_path)
+        self.citation_keys = get_citation_keys().load(project.index_path)
+        self.citation_keys.connect(self.event_bus)
+        if self.project_bib is not None:
+            self.project_bib.disconnect()
+        self.project_bib = ProjectBibliography(
+            project.bibliography_path, BibTeXGenerator(self.citation_keys)
+        ).load(project.index_path)
+        self.project_bib.connect(self.event_bus)
+    
+    def _setup_manuscripts(self, project: LitProject):
+        """Zitate der Manuskripte einlesen (inkrementell, Ergebnisse im Index-Ordner)"""
+        from modules.bibliography.manuscript import ManuscriptScanner
+        self.manuscripts = ManuscriptScanner(project.path).load(project.index_path)
+        if project.config.manuscripts:
+            self._scan_manuscripts()
+    
+    def _scan_manuscripts(self):
+        """Manuskripte abgleichen, Quote.used_in nachtragen; gibt den Bericht zurück"""
+        project = self.project_manager.current_project
+        if self.manuscripts is None or project is None:
+            return None
+        sources = self.source_list.sources
+        self.manuscripts.scan(project.config.manuscripts)
+        report = self.manuscripts.report(self.citation_keys, sources)
+        try:
+            changed = self.manuscripts.update_quotes(report, sources, self.source_manager)
+        except OSError as e:
+            changed = []
+            self._show_status(f"Zitate nicht aktualisiert: {e}")
+        self.manuscripts.save(project.index_path)
+        
+        # Atomar speichernde Editoren ersetzen die Datei; Überwachung erneuern
+        files = [str(path) for path in self.manuscripts.files]
+        watched = self.manuscript_watcher.files()
+        if watched:
+            self.manuscript_watcher.removePaths(watched)
+        if files:
+            self.manuscript_watcher.addPaths(files)
+        
+        if self.current_source is not None and self.current_source.name in {s.name for s in changed}:
+            self.detail_panel.refresh()
+        self._show_status(f"Manuskript: {report.summary()}")
+        return report
+    
+    def _setup_collections(self, project: LitProject):
+        """Smart Collections des Projekts laden und an den EventBus hängen"""
+        if self.collections is not None:
+            self.collections.disconnect()
+        self.collections = SmartCollectionIndex()
+        for data in project.config.smart_collections:
+            try:
+                self.collections.add_collection(SmartCollection.from_dict(data))
+            except QueryError as e:
+                self._show_status(f"Sammlung '{data.get('name')}' ungültig: {e}")
+        self.collections.on_changed = self._on_collections_changed
+        self.collections.connect(self.event_bus)
+    
+    def _on_collections_changed(self):
+        """Mitgliedschaften geändert - Zähler und ggf. gefilterte Liste nachführen"""
+        self.project_tree.update_counts()
+        name = self.source_list.collection_name
+        if name and self.collections is not None:
+            self.source_list.set_collection(name, self.collections.members_of(name))
+    
+    def _on_collection_selected(self, name):
+        """Sammlung im Projektbaum gewählt (None = alle Quellen)"""
+        if self.collections is None:
+            return
+        self.source_list.set_collection(name, self.collections.members_of(name) if name else None)
+    
+    def _on_new_collection(self):
+        """Neue Smart Collection anlegen"""
+        if self.collections is None:
+            return
+        
+        name, ok = QInputDialog.getText(self, "Neue Sammlung", "Name:")
+        if not ok or not name.strip():
+            return
+        query, ok = QInputDialog.getText(
+            self, "Neue Sammlung",
+            "Abfrage (z.B. tag:todo AND NOT verified, has:pdf AND NOT has:summary, has:overdue):"
+        )
+        if not ok or not query.strip():
+            return
+        
+        try:
+            self.collections.add_collection(SmartCollection(name.strip(), query.strip()))
+        except QueryError as e:
+            QMessageBox.warning(self, "Ungültige Abfrage", str(e))
+            return
+        self._save_collections()
+    
+    def _on_remove_collection(self, name: str):
+        """Smart Collection löschen"""
+        if self.collections is None:
+            return
+        self.collections.remove_collection(name)
+        if self.source_list.collection_name == name:
+            self.source_list.set_collection(None)
+        self._save_collections()
+    
+    def _save_collections(self):
+        project = self.project_manager.current_project
+        project.config.smart_collections = self.collections.to_list()
+        self.project_manager.save_project(project)
+        self.project_tree.refresh()
     
     def _update_recent_menu(self):
         """Aktualisiert das Recent-Menü"""
@@ -302,9 +535,33 @@ class MainWindow(QMainWindow):
     
     def _on_close_project(self):
         """Projekt schließen"""
+        self._save_project_bibliography()
+        self._save_indexes()
+        self._disconnect_indexes()
         self.project_manager.close_project()
         self.source_manager = None
         self.current_source = None
+        self.search_index = None
+        self.duplicates = None
+        if self.collections is not None:
+            self.collections.disconnect()
+            self.collections = None
+        if self.project_bib is not None:
+            self.project_bib.disconnect()
+            self.project_bib = None
+        from modules.bibliography.styles import get_style_manager
+        get_style_manager().reset_styles()
+        get_style_manager().invalidate()
+        if self.citation_keys is not None:
+            self.citation_keys.disconnect()
+            self.citation_keys.clear()
+            self.citation_keys = None
+        self.manuscripts = None
+        self.manuscript_timer.stop()
+        if self.manuscript_watcher.files():
+            self.manuscript_watcher.removePaths(self.manuscript_watcher.files())
+        self._configure_backups()
+        self._stop_git()
         
         self.project_tree.clear()
         self.source_list.clear()
@@ -327,9 +584,38 @@ class MainWindow(QMainWindow):
             meta = dialog.get_meta()
             pdf_path = dialog.get_pdf_path()
             source = self.source_manager.create_source(meta, pdf_path)
+            self._queue_text_extraction(source)
             self._refresh_sources()
             self.event_bus.emit(EventType.SOURCE_CREATED, source)
     
+    def _on_delete_source(self, source: LitSource = None):
+        """Quelle samt PDF, Notizen und Zitaten löschen (ohne Argument: ausgewählte)"""
+        source = source or self.current_source
+        if not self.source_manager or source is None:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst eine Quelle auswählen.")
+            return
+        
+        reply = QMessageBox.question(
+            self, "Quelle löschen",
+            f"Quelle '{source.meta.title or source.name}' mit PDF, Notizen und Zitaten löschen?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+            QMessageBox.StandardButton.No
+        )
+        if reply != QMessageBox.StandardButton.Yes:
+            return
+        
+        try:
+            self.source_manager.delete_source(source)
+        except OSError as e:
+            QMessageBox.critical(self, "Fehler", f"Quelle konnte nicht gelöscht werden:\n{e}")
+            return
+        if self.current_source is not None and self.current_source.path == source.path:
+            self.current_source = None
+            self.detail_panel.clear()
+        # Katalog, Key-Registry, Projektbibliografie und Sammlungen folgen dem Event
+        self.event_bus.emit(EventType.SOURCE_DELETED, source)
+        self._show_status(f"Quelle gelöscht: {source.name}")
+    
     def _on_import_pdf(self):
         """PDF importieren"""
         if not self.source_manager:
@@ -341,23 +627,140 @@ class MainWindow(QMainWindow):
             "PDF-Dateien (*.pdf)"
         )
         
+        imported = []
         for pdf_path in paths:
             from formats import LiMeta
             # Einfache Metadaten aus Dateiname
             name = Path(pdf_path).stem
             meta = LiMeta(title=name)
-            self.source_manager.create_source(meta, Path(pdf_path))
+            source = self.source_manager.create_source(meta, Path(pdf_path))
+            self._queue_text_extraction(source)
+            imported.append(source)
         
         if paths:
             self._refresh_sources()
             self._show_status(f"{len(paths)} PDF(s) importiert")
+            self._report_duplicates([source.name for source in imported])
+    
+    def _queue_text_extraction(self, source: LitSource):
+        """Plant die einmalige PDF-Textextraktion im Hintergrund ein"""
+        if source.has_pdf:
+            from modules.pdf_workshop.text_cache import get_text_extraction_queue
+            get_text_extraction_queue().enqueue(source.pdf_path)
+    
+    def _on_text_extracted(self, pdf_path: str):
+        """Textcache fertig - Quelle in den Volltext-Index aufnehmen"""
+        if self.search_index is None or not self.source_manager:
+            return
+        sources_path = self.source_manager.sources_path
+        source_dir = Path(pdf_path).parent
+        if source_dir.parent != sources_path:
+            return
+        try:
+            source = self.source_manager.load_source(source_dir)
+        except (OSError, ValueError):
+            return
+        if self.search_index.update_source(source):
+            self.index_save_timer.start()
+        
+        if self.duplicates is not None:
+            from modules.pdf_workshop.text_cache import PDFTextCache
+            self.duplicates.update_source(source, PDFTextCache(Path(pdf_path)).load())
+            self.index_save_timer.start()
+            suggestions = [s for s in self.duplicates.duplicates_of(source.name) if s.reason == "text"]
+            if suggestions:
+                self._show_status(f"Mögliche Dublette: {suggestions[0].describe()}")
+    
+    def _report_duplicates(self, keys: list):
+        """Zeigt Dubletten-Vorschläge für neu angelegte Quellen"""
+        if self.duplicates is None:
+            return
+        suggestions = {}
+        for key in keys:
+            for suggestion in self.duplicates.duplicates_of(key):
+                suggestions.setdefault((suggestion.keep, suggestion.merge), suggestion)
+        if suggestions:
+            self._show_duplicates(list(suggestions.values()))
+    
+    def _on_find_duplicates(self):
+        """Sucht Dubletten im ganzen Projekt"""
+        if self.duplicates is None:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
+            return
+        self.duplicates.sync(self.source_manager.get_all_sources())
+        self.duplicates.save(self.project_manager.current_project.index_path)
+        suggestions = self.duplicates.find_duplicates()
+        if suggestions:
+            self._show_duplicates(suggestions)
+        else:
+            QMessageBox.information(self, "Dubletten", "Keine Dubletten gefunden.")
+    
+    def _show_duplicates(self, suggestions: list):
+        """Listet Zusammenführungs-Vorschläge (Dublette → behalten)"""
+        lines = [s.describe() for s in suggestions[:20]]
+        if len(suggestions) > 20:
+            lines.append(f"... und {len(suggestions) - 20} weitere")
+        QMessageBox.information(
+            self, "Mögliche Dubletten",
+            "Folgende Quellen sind vermutlich Dubletten und können zusammengeführt werden:\n\n"
+            + "\n".join(lines)
+        )
     
     def _on_import_bibtex(self):
-        """BibTeX importieren"""
-        self._show_status("BibTeX-Import noch nicht implementiert")
+        """BibTeX, RIS oder CSL-JSON importieren (streamend, mit Fortschrittsanzeige)"""
+        if not self.source_manager:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
+            return
+        
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Literatur importieren", str(Path.home()),
+            "Literaturdateien (*.bib *.ris *.json);;BibTeX (*.bib);;RIS (*.ris);;"
+            "CSL-JSON (*.json);;Alle Dateien (*)"
+        )
+        if not path:
+            return
+        
+        from modules.bibliography.importer import importer_for
+        from modules.search.catalog import get_source_catalog
+        
+        try:
+            importer = importer_for(Path(path), self.source_manager, known=dict(get_source_catalog().metas))
+        except ValueError as e:
+            QMessageBox.warning(self, "Import", str(e))
+            return
+        dialog = QProgressDialog("Literatur wird importiert...", "Abbrechen", 0, 1000, self)
+        dialog.setWindowTitle("Literatur-Import")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+        
+        def progress(done: int, total: int):
+            dialog.setValue(int(done * 1000 / total) if total else 1000)
+            dialog.setLabelText(
+                f"{importer.result.entries} Einträge gelesen, "
+                f"{len(importer.result.created)} Quellen angelegt"
+            )
+            QApplication.processEvents()
+            if dialog.wasCanceled():
+                importer.cancel()
+        
+        try:
+            result = importer.import_file(Path(path), progress)
+        except OSError as e:
+            QMessageBox.critical(self, "Import-Fehler", f"Import fehlgeschlagen:\n{e}")
+            return
+        finally:
+            dialog.close()
+        
+        self._refresh_sources()
+        self._show_status(f"Import: {result.summary()}")
+        if result.errors:
+            QMessageBox.warning(
+                self, "Literatur-Import",
+                result.summary() + "\n\n" + "\n".join(result.errors[:20])
+            )
     
     def _on_export_bibliography(self):
-        """Export bibliography as BibTeX (.bib) file."""
+        """Export bibliography as BibTeX (.bib), RIS (.ris) or CSL-JSON (.json) file."""
         if not self.source_manager:
             QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
             return
@@ -371,19 +774,233 @@ class MainWindow(QMainWindow):
             self,
             "Bibliografie exportieren",
             str(Path.home() / "bibliography.bib"),
-            "BibTeX-Dateien (*.bib);;Alle Dateien (*)",
+            "BibTeX-Dateien (*.bib);;RIS (*.ris);;CSL-JSON (*.json);;Alle Dateien (*)",
         )
         if not path:
             return
 
+        from modules.bibliography.bibtex import BibTeXGenerator
+        from modules.bibliography.csl_json import CSLJSONWriter
+        from modules.bibliography.keys import get_citation_keys
+        from modules.bibliography.ris import RISWriter
+        writers = {".ris": RISWriter, ".json": CSLJSONWriter}
+        generator = writers.get(Path(path).suffix.lower(), BibTeXGenerator)(get_citation_keys())
+        dialog = QProgressDialog("Bibliografie wird exportiert...", None, 0, len(sources), self)
+        dialog.setWindowTitle("Export")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+        
+        def progress(done: int, total: int):
+            dialog.setValue(done)
+            QApplication.processEvents()
+        
         try:
-            from modules.bibliography.bibtex import BibTeXGenerator
-            generator = BibTeXGenerator()
-            metas = [src.meta for src in sources]
-            generator.save_bibliography(metas, Path(path))
-            self._show_status(f"Bibliografie exportiert: {Path(path).name} ({len(metas)} Einträge)")
+            generator.save_bibliography(sources, Path(path), progress)
+            self._show_status(f"Bibliografie exportiert: {Path(path).name} ({len(sources)} Einträge)")
         except Exception as exc:
             QMessageBox.critical(self, "Export-Fehler", f"Export fehlgeschlagen:\n{exc}")
+        finally:
+            dialog.close()
+    
+    def _on_export_references(self):
+        """Formatiertes Literaturverzeichnis im Zitierstil des Projekts speichern"""
+        if not self.source_manager:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
+            return
+
+        sources = self.source_manager.get_all_sources()
+        if not sources:
+            QMessageBox.information(self, "Export", "Das Projekt enthält keine Quellen.")
+            return
+
+        path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Literaturverzeichnis erstellen",
+            str(Path.home() / "Literaturverzeichnis.docx"),
+            "Word-Dokumente (*.docx);;HTML-Dateien (*.html);;Markdown (*.md);;Textdateien (*.txt)",
+        )
+        if not path:
+            return
+
+        from modules.bibliography.styles import get_style_manager
+        style = self.project_manager.current_project.config.citation_style
+        dialog = QProgressDialog("Literaturverzeichnis wird erstellt...", None, 0, len(sources), self)
+        dialog.setWindowTitle("Export")
+        dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        dialog.setMinimumDuration(300)
+
+        def progress(done: int, total: int):
+            dialog.setValue(done)
+            QApplication.processEvents()
+
+        try:
+            count = get_style_manager().save_bibliography(sources, Path(path), style, progress=progress)
+            self._show_status(f"Literaturverzeichnis erstellt: {Path(path).name} ({count} Einträge)")
+        except (OSError, ValueError, ImportError) as exc:
+            QMessageBox.critical(self, "Export-Fehler", f"Export fehlgeschlagen:\n{exc}")
+        finally:
+            dialog.close()
+    
+    def _on_export_sources(self):
+        """Quellen mit Notizen, Zitaten und Zusammenfassungen exportieren"""
+        if not self.source_manager:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
+            return
+
+        sources = self.source_manager.get_all_sources()
+        if not sources:
+            QMessageBox.information(self, "Export", "Das Projekt enthält keine Quellen.")
+            return
+
+        from .dialogs.export_dialog import ExportDialog
+        project = self.project_manager.current_project
+        dialog = ExportDialog(self, project.config.citation_style, project.path)
+        if not dialog.exec():
+            return
+        options = dialog.get_options()
+
+        from modules.bibliography.export import SourceExporter
+        exporter = SourceExporter(self.source_manager)
+        progress_dialog = QProgressDialog("Quellen werden exportiert...", "Abbrechen", 0, len(sources), self)
+        progress_dialog.setWindowTitle("Export")
+        progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        progress_dialog.setMinimumDuration(300)
+
+        def progress(done: int, total: int):
+            progress_dialog.setValue(done)
+            QApplication.processEvents()
+            if progress_dialog.wasCanceled():
+                exporter.cancel()
+
+        try:
+            count = exporter.export(sources, options, progress=progress)
+            if exporter.cancelled:
+                self._show_status("Export abgebrochen")
+            else:
+                self._show_status(f"Exportiert: {options.output_path.name} ({count} Quellen)")
+        except (OSError, ValueError, ImportError) as exc:
+            QMessageBox.critical(self, "Export-Fehler", f"Export fehlgeschlagen:\n{exc}")
+        finally:
+            progress_dialog.close()
+    
+    def _on_create_archive(self):
+        """Projekt als komprimiertes Einzeldatei-Archiv speichern (im Hintergrund)"""
+        project = self.project_manager.current_project
+        if project is None:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
+            return
+        if self._archive_dialog is not None:
+            self._show_status("Projektarchiv wird bereits erstellt...")
+            return
+
+        from modules.sync import BackupManager
+        from modules.sync.archive import ARCHIVE_SUFFIX
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Projektarchiv erstellen",
+            str(project.path.parent / f"{project.path.name}{ARCHIVE_SUFFIX}"),
+            f"LitZentrum-Archiv (*{ARCHIVE_SUFFIX})"
+        )
+        if not path:
+            return
+        path = Path(path)
+        if path.suffix.lower() != ARCHIVE_SUFFIX:
+            path = path.with_name(path.name + ARCHIVE_SUFFIX)
+
+        self.project_manager.save_project(project)
+        backups = BackupManager(project.path)
+        self._archive_dialog = QProgressDialog("Projektarchiv wird erstellt...", None, 0, 0, self)
+        self._archive_dialog.setWindowTitle("Projektarchiv")
+        self._archive_dialog.setMinimumDuration(300)
+        self._archive_dialog.setValue(0)
+
+        def worker():
+            archive_path = backups.create_archive(path, progress=self.archive_progress.emit)
+            self.archive_finished.emit(archive_path, backups.last_stats)
+
+        threading.Thread(target=worker, name="ProjectArchive", daemon=True).start()
+    
+    def _on_archive_progress(self, done: int, total: int):
+        """Fortschritt des Projektarchivs"""
+        if self._archive_dialog is not None:
+            self._archive_dialog.setMaximum(total)
+            self._archive_dialog.setValue(done)
+    
+    def _on_archive_finished(self, archive_path: Optional[Path], stats):
+        """Projektarchiv fertig (oder fehlgeschlagen)"""
+        if self._archive_dialog is not None:
+            self._archive_dialog.close()
+            self._archive_dialog = None
+        if archive_path is None:
+            QMessageBox.critical(self, "Archiv-Fehler", "Das Projektarchiv konnte nicht erstellt werden.")
+            return
+        self._show_status(
+            f"Archiv erstellt: {archive_path.name} ({stats.files} Dateien, "
+            f"{stats.bytes_copied / (1024 * 1024):.1f} MB, {stats.duration:.1f} s)"
+        )
+    
+    def _on_check_manuscript(self):
+        """Zitate im Manuskript gegen die Projektquellen prüfen"""
+        project = self.project_manager.current_project
+        if not self.source_manager or project is None:
+            QMessageBox.warning(self, "Hinweis", "Bitte zuerst ein Projekt öffnen.")
+            return
+
+        if not project.config.manuscripts:
+            path, _ = QFileDialog.getOpenFileName(
+                self, "Manuskript wählen", str(project.path),
+                "Manuskripte (*.tex *.md *.markdown);;Alle Dateien (*)"
+            )
+            if not path:
+                return
+            try:
+                main_file = Path(path).resolve().relative_to(project.path.resolve()).as_posix()
+            except ValueError:
+                main_file = str(Path(path).resolve())
+            project.config.manuscripts = [main_file]
+            self.project_manager.save_project(project)
+
+        report = self._scan_manuscripts()
+        lines = [report.summary()]
+        if report.missing:
+            lines.append("\nUnbekannte Keys:")
+            lines.extend(
+                f"  {key} ({', '.join(c.location for c in citations[:3])})"
+                for key, citations in list(report.missing.items())[:20]
+            )
+        if report.unused:
+            lines.append(f"\nNicht zitierte Quellen: {len(report.unused)}")
+            lines.extend(f"  {name}" for name in report.unused[:20])
+            if len(report.unused) > 20:
+                lines.append("  ...")
+        QMessageBox.information(self, "Manuskript prüfen", "\n".join(lines))
+    
+    def _on_search(self):
+        """Suchdialog (aktuelles Projekt oder alle zuletzt geöffneten)"""
+        from .dialogs.search_dialog import SearchDialog
+        project = self.project_manager.current_project
+        dialog = SearchDialog(project.path if project else None, self, self.source_manager)
+        dialog.result_activated.connect(self._on_search_result)
+        dialog.show()
+    
+    def _on_search_result(self, result):
+        """Öffnet einen Suchtreffer (ggf. im anderen Projekt) und springt zur Fundstelle"""
+        project = self.project_manager.current_project
+        if result.project_path and (
+            project is None or Path(result.project_path).resolve() != Path(project.path).resolve()
+        ):
+            self._load_project(Path(result.project_path))
+        if not self.source_manager:
+            return
+        try:
+            source = self.source_manager.load_source(result.source_path)
+        except (OSError, ValueError) as e:
+            self._show_status(f"Quelle nicht gefunden: {e}")
+            return
+        self._on_source_selected(source)
+        if result.page and result.char_start is not None:
+            self.detail_panel.pdf_tab.pdf_viewer.highlight(
+                result.page, result.char_start, result.char_end, result.rects
+            )
     
     def _on_source_selected(self, source: LitSource):
         """Quelle wurde ausgewählt"""
@@ -392,9 +1009,41 @@ class MainWindow(QMainWindow):
         self.event_bus.emit(EventType.SOURCE_SELECTED, source)
     
     def _on_source_changed(self, data=None):
-        """Quelle wurde geändert"""
+        """Quelle angelegt oder gelöscht"""
         self._refresh_sources()
     
+    def _on_source_updated(self, source: LitSource):
+        """Quelle bearbeitet - nur diesen Eintrag nachführen.
+        
+        Katalog, Suchindizes, Sammlungen, Zitierschlüssel und
+        Projektbibliografie folgen dem Event selbst; gespeichert wird
+        gesammelt über index_save_timer.
+        """
+        if not isinstance(source, LitSource) or not self.source_manager:
+            return
+        self.source_list.update_source(source)
+        self.index_save_timer.start()
+    
+    def _save_indexes(self):
+        """Volltext- und Dubletten-Index sichern (nur bei Änderungen)"""
+        self.index_save_timer.stop()
+        project = self.project_manager.current_project
+        if project is None:
+            return
+        if self.search_index is not None:
+            self.search_index.save()
+            from modules.search.federated import get_federated_search
+            get_federated_search().invalidate(project.path)
+        if self.duplicates is not None:
+            self.duplicates.save(project.index_path)
+    
+    def _disconnect_indexes(self):
+        """Suchindizes vom EventBus lösen"""
+        if self.search_index is not None:
+            self.search_index.disconnect()
+        if self.duplicates is not None:
+            self.duplicates.disconnect()
+    
     def _on_refresh(self):
         """Ansicht aktualisieren"""
         self._refresh_sources()
@@ -406,7 +1055,11 @@ class MainWindow(QMainWindow):
         """Einstellungen öffnen"""
         from .dialogs.settings_dialog import SettingsDialog
         dialog = SettingsDialog(self)
-        dialog.exec()
+        if dialog.exec():
+            self._configure_backups()
+            project = self.project_manager.current_project
+            if project is not None:
+                self._setup_git(project)
     
     def _on_about(self):
         """Über-Dialog"""
@@ -419,6 +1072,56 @@ class MainWindow(QMainWindow):
             "<p>© 2026</p>"
         )
     
+    def _configure_backups(self):
+        """Backup-Planer auf Einstellungen und geöffnetes Projekt einstellen"""
+        from modules.sync.scheduler import get_backup_scheduler
+        project = self.project_manager.current_project
+        get_backup_scheduler().configure(
+            self.settings.get("auto_backup", True),
+            self.settings.get("backup_interval_minutes", 30),
+            self.settings.get("backup_path") or None,
+            project.path if project else None,
+        )
+    
+    def _setup_git(self, project: LitProject):
+        """Auto-Commit nach Änderungen (nur mit Einstellung und vorhandenem Repository)"""
+        self._stop_git()
+        if not self.settings.get("git_auto_commit", False):
+            return
+        from modules.sync.git import GitSync, GitWorker
+        git = GitSync(project.path)
+        if not git.is_repository() or not git.is_git_available():
+            return
+        self.git_worker = GitWorker(project.path)
+        self.git_worker.committed.connect(self._on_git_committed)
+        self.git_worker.commit_failed.connect(self._on_git_failed)
+        self.git_worker.connect(self.event_bus)
+    
+    def _stop_git(self):
+        """Vorgemerkte Änderungen committen und Git-Worker beenden"""
+        if self.git_worker is not None:
+            self.git_worker.stop()
+            self.git_worker = None
+    
+    def _on_git_committed(self, result):
+        """Auto-Commit abgeschlossen"""
+        self._show_status(f"Git: {len(result.paths)} Dateien committet ({result.commit[:7]})")
+    
+    def _on_git_failed(self, error: str):
+        """Auto-Commit fehlgeschlagen"""
+        self._show_status(f"Git-Commit fehlgeschlagen: {error}")
+    
+    def _on_backup_finished(self, record):
+        """Automatisches Backup abgeschlossen"""
+        self._show_status(
+            f"Backup erstellt: {record.files} Dateien, "
+            f"{record.bytes_copied / (1024 * 1024):.1f} MB kopiert in {record.duration:.1f} s"
+        )
+    
+    def _on_backup_failed(self, project_path: str, error: str):
+        """Automatisches Backup fehlgeschlagen"""
+        self._show_status(f"Backup fehlgeschlagen: {error}")
+    
     def _show_status(self, message: str):
         """Zeigt Statusmeldung"""
         self.statusbar.showMessage(message, 5000)
@@ -426,4 +1129,16 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Beim Schließen"""
         self._save_state()
+        self._save_project_bibliography()
+        self._save_indexes()
+        from modules.sync.scheduler import get_backup_scheduler
+        get_backup_scheduler().stop(cancel=True)  # halben Snapshot verwerfen statt warten
+        self._stop_git()
         event.accept()
+    
+    def _save_project_bibliography(self):
+        """Offset-Index der Projektbibliografie sichern"""
+        project = self.project_manager.current_project
+        if self.project_bib is not None and project is not None:
+            self.citation_keys.save(project.index_path)
+            self.project_bib.save(project.index_path)
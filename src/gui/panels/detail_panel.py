@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
     QApplication
 )
 
-from core import LitSource, SourceManager
+from core import LitSource, SourceManager, EventType, get_event_bus
 from formats import LiMeta
 from ..tabs.notes_tab import NotesTab
 from ..tabs.quotes_tab import QuotesTab
@@ -213,10 +213,11 @@ class DetailPanel(QWidget):
             os.startfile(str(self.source.pdf_path))
     
     def _copy_cite_to_clipboard(self):
-        """Kopiert \\cite{bibtex_key} in die Zwischenablage"""
+        """Kopiert \\cite{key} (Key aus der Projekt-Registry) in die Zwischenablage"""
         if not self.source:
             return
-        key = self.source.meta.bibtex_key
+        from modules.bibliography.keys import get_citation_keys
+        key = get_citation_keys().key_for(self.source)
         cite_cmd = f"\\cite{{{key}}}"
         clipboard = QApplication.clipboard()
         clipboard.setText(cite_cmd)
@@ -241,6 +242,7 @@ class DetailPanel(QWidget):
             new_meta.save(self.source.path / "meta.limeta")
             self.source.meta = new_meta
             self._update_display()
+            get_event_bus().emit(EventType.SOURCE_UPDATED, self.source)
     
     def _on_quote_requested(self, text: str, page: int):
         """Zitat angefordert vom PDF-Tab"""
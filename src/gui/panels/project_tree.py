@@ -4,25 +4,30 @@ Zeigt die Projektstruktur als Baum
 """
 from pathlib import Path
 from typing import Optional
-import logging
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QTreeWidget, QTreeWidgetItem,
-    QLabel, QHeaderView
+    QLabel, QHeaderView, QMenu
 )
 
-from core import LitProject, LitSource
+from core import LitProject, LitSource, SmartCollectionIndex
+from modules.search.catalog import get_source_catalog
 
 
 class ProjectTreePanel(QWidget):
     """Panel mit Projektbaum"""
     
     source_selected = Signal(object)  # LitSource
+    collection_selected = Signal(object)  # Name der Sammlung oder None (alle Quellen)
+    collection_add_requested = Signal()
+    collection_remove_requested = Signal(str)
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.project: Optional[LitProject] = None
+        self.collections: Optional[SmartCollectionIndex] = None
+        self._collection_items = {}
         self._setup_ui()
     
     def _setup_ui(self):
@@ -40,16 +45,20 @@ class ProjectTreePanel(QWidget):
         self.tree.setIndentation(15)
         self.tree.itemClicked.connect(self._on_item_clicked)
         self.tree.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.tree.customContextMenuRequested.connect(self._on_context_menu)
         layout.addWidget(self.tree)
     
-    def set_project(self, project: LitProject):
+    def set_project(self, project: LitProject, collections: SmartCollectionIndex = None):
         """Setzt das aktuelle Projekt"""
         self.project = project
+        self.collections = collections
         self._build_tree()
     
     def _build_tree(self):
-        """Baut den Projektbaum auf"""
+        """Baut den Projektbaum auf (aus Katalog und Sammlungs-Index, ohne Projekt-Scan)"""
         self.tree.clear()
+        self._collection_items = {}
         
         if not self.project:
             return
@@ -65,29 +74,35 @@ class ProjectTreePanel(QWidget):
         sources_item.setData(0, Qt.ItemDataRole.UserRole, ("folder", "sources"))
         root.addChild(sources_item)
         
-        # Quellen laden
+        # Quellen aus dem Katalog
+        catalog = get_source_catalog()
         sources_path = self.project.sources_path
-        if sources_path.exists():
-            for folder in sorted(sources_path.iterdir()):
-                if folder.is_dir():
-                    meta_file = folder / "meta.limeta"
-                    if meta_file.exists():
-                        from formats import LiMeta
-                        try:
-                            meta = LiMeta.load(meta_file)
-                            from core import LitSource
-                            source = LitSource(path=folder, meta=meta)
-
-                            icon = "📄" if source.has_pdf else "📝"
-                            item = QTreeWidgetItem([f"{icon} {meta.first_author} ({meta.year or '?'})"])
-                            item.setToolTip(0, meta.title)
-                            item.setData(0, Qt.ItemDataRole.UserRole, ("source", source))
-                            sources_item.addChild(item)
-                        except (OSError, PermissionError, ValueError, KeyError, AttributeError) as e:
-                            logging.debug(f"Fehler beim Laden von Quelle '{folder.name}': {e}")
+        for key in sorted(catalog.metas):
+            meta = catalog.metas[key]
+            source = LitSource(path=sources_path / key, meta=meta)
+            
+            icon = "📄" if source.has_pdf else "📝"
+            item = QTreeWidgetItem([f"{icon} {meta.first_author} ({meta.year or '?'})"])
+            item.setToolTip(0, meta.title)
+            item.setData(0, Qt.ItemDataRole.UserRole, ("source", source))
+            sources_item.addChild(item)
         
         sources_item.setExpanded(True)
         
+        # Smart Collections mit Live-Zählern
+        collections_item = QTreeWidgetItem(["🔎 Sammlungen"])
+        collections_item.setData(0, Qt.ItemDataRole.UserRole, ("folder", "collections"))
+        collections_item.setToolTip(0, "Rechtsklick: neue Sammlung")
+        root.addChild(collections_item)
+        if self.collections:
+            for name, collection in self.collections.collections.items():
+                item = QTreeWidgetItem([self._collection_text(name)])
+                item.setToolTip(0, collection.query)
+                item.setData(0, Qt.ItemDataRole.UserRole, ("collection", name))
+                collections_item.addChild(item)
+                self._collection_items[name] = item
+        collections_item.setExpanded(True)
+        
         # Projekt-Notizen
         notes_item = QTreeWidgetItem(["📝 Projekt-Notizen"])
         notes_item.setData(0, Qt.ItemDataRole.UserRole, ("file", "notes"))
@@ -98,11 +113,44 @@ class ProjectTreePanel(QWidget):
         tasks_item.setData(0, Qt.ItemDataRole.UserRole, ("file", "tasks"))
         root.addChild(tasks_item)
     
+    def _collection_text(self, name: str) -> str:
+        return f"🔎 {name} ({self.collections.count(name)})"
+    
+    def update_counts(self):
+        """Aktualisiert nur die Zähler der Sammlungen"""
+        if not self.collections:
+            return
+        for name, item in self._collection_items.items():
+            if name in self.collections.collections:
+                item.setText(0, self._collection_text(name))
+    
+    def _on_context_menu(self, pos):
+        """Kontextmenü für Sammlungen"""
+        item = self.tree.itemAt(pos)
+        data = item.data(0, Qt.ItemDataRole.UserRole) if item else None
+        if not data or data[0] not in ("collection", "folder") or (
+            data[0] == "folder" and data[1] != "collections"
+        ):
+            return
+        
+        menu = QMenu(self)
+        add_action = menu.addAction("Neue Sammlung...")
+        remove_action = menu.addAction("Sammlung löschen") if data[0] == "collection" else None
+        chosen = menu.exec(self.tree.viewport().mapToGlobal(pos))
+        if chosen == add_action:
+            self.collection_add_requested.emit()
+        elif remove_action is not None and chosen == remove_action:
+            self.collection_remove_requested.emit(data[1])
+    
     def _on_item_clicked(self, item: QTreeWidgetItem, column: int):
         """Item wurde angeklickt"""
         data = item.data(0, Qt.ItemDataRole.UserRole)
         if data and data[0] == "source":
             self.source_selected.emit(data[1])
+        elif data and data[0] == "collection":
+            self.collection_selected.emit(data[1])
+        elif data and data[0] in ("project", "folder"):
+            self.collection_selected.emit(None)
     
     def _on_item_double_clicked(self, item: QTreeWidgetItem, column: int):
         """Item wurde doppelt angeklickt"""
@@ -117,6 +165,8 @@ class ProjectTreePanel(QWidget):
         """Leert den Baum"""
         self.tree.clear()
         self.project = None
+        self.collections = None
+        self._collection_items = {}
     
     def refresh(self):
         """Aktualisiert den Baum"""
@@ -2,25 +2,35 @@
 LitZentrum - Quellenliste Panel
 Zeigt alle Quellen mit Filterung
 """
-from typing import List, Optional
+from typing import List, Optional, Set
 
 from PySide6.QtCore import Qt, Signal
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem,
-    QLabel, QLineEdit, QComboBox, QPushButton
+    QLabel, QLineEdit, QComboBox, QPushButton, QMenu
 )
 
 from core import LitSource
+from modules.search.catalog import get_source_catalog
+from modules.search.tokenizer import fold
+from modules.search.trigram import SourceNameIndex
 
 
 class SourceListPanel(QWidget):
     """Panel mit Quellenliste"""
     
     source_selected = Signal(object)  # LitSource
+    source_delete_requested = Signal(object)  # LitSource
+    
+    # Reihenfolge wie im Sortier-Auswahlfeld
+    SORT_MODES = ("author", "year", "title", "created")
     
     def __init__(self, parent=None):
         super().__init__(parent)
         self.sources: List[LitSource] = []
+        self.catalog = get_source_catalog()
+        self.collection_name: Optional[str] = None
+        self.collection_keys: Optional[Set[str]] = None  # None = alle Quellen
         self._setup_ui()
     
     def _setup_ui(self):
@@ -62,6 +72,8 @@ class SourceListPanel(QWidget):
         self.list_widget.setAlternatingRowColors(True)
         self.list_widget.itemClicked.connect(self._on_item_clicked)
         self.list_widget.itemDoubleClicked.connect(self._on_item_double_clicked)
+        self.list_widget.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.list_widget.customContextMenuRequested.connect(self._on_context_menu)
         layout.addWidget(self.list_widget)
         
         # Statuszeile
@@ -72,19 +84,43 @@ class SourceListPanel(QWidget):
     def set_sources(self, sources: List[LitSource]):
         """Setzt die Quellenliste"""
         self.sources = sources
+        self.catalog.sync(sources)
+        self._update_tags()
+        self._refresh_list()
+    
+    def update_source(self, source: LitSource):
+        """Ersetzt eine einzelne (bearbeitete) Quelle, ohne die Liste neu zu laden"""
+        for i, current in enumerate(self.sources):
+            if current.name == source.name:
+                self.sources[i] = source
+                break
+        else:
+            return
+        self.catalog.add_source(source, force=True)
         self._update_tags()
         self._refresh_list()
     
+    def set_collection(self, name: Optional[str], keys: Optional[Set[str]] = None):
+        """Beschränkt die Liste auf die Mitglieder einer Sammlung (None = alle)"""
+        self.collection_name = name
+        self.collection_keys = set(keys) if name else None
+        self._refresh_list()
+    
     def _update_tags(self):
-        """Aktualisiert Tag-Filter"""
-        tags = set()
-        for source in self.sources:
-            tags.update(source.meta.tags)
-        
+        """Aktualisiert Tag-Filter (aus dem Katalog, nur bei Änderungen)"""
+        tags = self.catalog.values("tags")
+        current = [self.tag_combo.itemText(i) for i in range(1, self.tag_combo.count())]
+        if tags == current:
+            return
+        
+        selected = self.tag_combo.currentText()
+        self.tag_combo.blockSignals(True)
         self.tag_combo.clear()
         self.tag_combo.addItem("Alle Tags")
-        for tag in sorted(tags):
-            self.tag_combo.addItem(tag)
+        self.tag_combo.addItems(tags)
+        index = self.tag_combo.findText(selected)
+        self.tag_combo.setCurrentIndex(max(index, 0))
+        self.tag_combo.blockSignals(False)
     
     def _refresh_list(self):
         """Aktualisiert die Listendarstellung"""
@@ -93,8 +129,16 @@ class SourceListPanel(QWidget):
         # Filter anwenden
         search_text = self.search_input.text().lower()
         selected_tag = self.tag_combo.currentText()
+        tag_key = fold(selected_tag)
+        
+        # Fehlertolerante Treffer (Müller/Mueller/Muller, Tippfehler)
+        fuzzy_keys = set()
+        if len(search_text) >= SourceNameIndex.MIN_WORD_LENGTH:
+            fuzzy_keys = {
+                m.key for m in self.catalog.names.search(search_text, limit=len(self.sources))
+            }
         
-        filtered = []
+        filtered = {}
         for source in self.sources:
             # Textfilter
             if search_text:
@@ -103,33 +147,34 @@ class SourceListPanel(QWidget):
                     " ".join(source.meta.authors).lower() +
                     " ".join(source.meta.tags).lower()
                 )
-                if search_text not in searchable:
+                if search_text not in searchable and source.name not in fuzzy_keys:
                     continue
             
-            # Tag-Filter
+            # Sammlung
+            if self.collection_keys is not None and source.name not in self.collection_keys:
+                continue
+            
+            # Tag-Filter (Schreibvarianten zählen als derselbe Tag)
             if selected_tag != "Alle Tags":
-                if selected_tag not in source.meta.tags:
+                if tag_key not in {fold(tag) for tag in source.meta.tags}:
                     continue
             
-            filtered.append(source)
-        
-        # Sortieren
-        sort_index = self.sort_combo.currentIndex()
-        if sort_index == 0:  # Nach Autor
-            filtered.sort(key=lambda s: s.meta.first_author.lower())
-        elif sort_index == 1:  # Nach Jahr
-            filtered.sort(key=lambda s: s.meta.year or 0, reverse=True)
-        elif sort_index == 2:  # Nach Titel
-            filtered.sort(key=lambda s: s.meta.title.lower())
-        elif sort_index == 3:  # Nach Datum
-            filtered.sort(key=lambda s: s.meta.created_at, reverse=True)
+            filtered[source.name] = source
+        
+        # Sortieren: vorsortierte Reihenfolge aus dem Katalog durchlaufen
+        mode = self.SORT_MODES[max(self.sort_combo.currentIndex(), 0)]
+        ordered = [filtered.pop(key) for key in self.catalog.order(mode) if key in filtered]
+        ordered.extend(filtered.values())  # nicht im Katalog (sollte nicht vorkommen)
         
         # Liste füllen
-        for source in filtered:
+        for source in ordered:
             item = self._create_list_item(source)
             self.list_widget.addItem(item)
         
-        self.status_label.setText(f"{len(filtered)} von {len(self.sources)} Quellen")
+        status = f"{len(ordered)} von {len(self.sources)} Quellen"
+        if self.collection_name:
+            status += f" · Sammlung: {self.collection_name}"
+        self.status_label.setText(status)
     
     def _create_list_item(self, source: LitSource) -> QListWidgetItem:
         """Erstellt ein Listenelement"""
@@ -167,6 +212,18 @@ class SourceListPanel(QWidget):
             import os
             os.startfile(str(source.pdf_path))
     
+    def _on_context_menu(self, pos):
+        """Kontextmenü für eine Quelle"""
+        item = self.list_widget.itemAt(pos)
+        source = item.data(Qt.ItemDataRole.UserRole) if item else None
+        if not source:
+            return
+        
+        menu = QMenu(self)
+        delete_action = menu.addAction("Quelle löschen...")
+        if menu.exec(self.list_widget.viewport().mapToGlobal(pos)) == delete_action:
+            self.source_delete_requested.emit(source)
+    
     def _on_search(self, text: str):
         """Suche geändert"""
         self._refresh_list()
@@ -182,6 +239,9 @@ class SourceListPanel(QWidget):
     def clear(self):
         """Leert die Liste"""
         self.sources = []
+        self.catalog.clear()
+        self.collection_name = None
+        self.collection_keys = None
         self.list_widget.clear()
         self.tag_combo.clear()
         self.tag_combo.addItem("Alle Tags")
@@ -10,7 +10,7 @@ from PySide6.QtWidgets import (
     QLineEdit, QMessageBox
 )
 
-from core import LitSource, SourceManager
+from core import LitSource, SourceManager, EventType, get_event_bus
 from formats import LiNote, Note
 
 
@@ -86,6 +86,7 @@ class NotesTab(QWidget):
             self.notes.add(content, page, tags)
             self.source_manager.save_notes(self.source, self.notes)
             self._refresh()
+            get_event_bus().emit(EventType.NOTE_ADDED, self.source)
     
     def _edit_note(self, item: QListWidgetItem):
         """Notiz bearbeiten"""
@@ -103,6 +104,7 @@ class NotesTab(QWidget):
             note.updated_at = now_iso()
             self.source_manager.save_notes(self.source, self.notes)
             self._refresh()
+            get_event_bus().emit(EventType.NOTE_UPDATED, self.source)
     
     def clear(self):
         """Leert die Anzeige"""
@@ -38,6 +38,7 @@ class PDFTab(QWidget):
         # PDF-Viewer
         self.pdf_viewer = PDFViewer()
         self.pdf_viewer.page_changed.connect(self._on_page_changed)
+        self.pdf_viewer.text_ready.connect(self._update_page_info)
         self.splitter.addWidget(self.pdf_viewer)
         
         # Rechte Seite: Tools
@@ -122,6 +123,7 @@ class PDFTab(QWidget):
         self.source_manager = manager
         
         if source.has_pdf:
+            self.pdf_viewer.language = source.meta.language
             self.pdf_viewer.open_pdf(source.pdf_path)
             self._update_page_info()
         else:
@@ -160,8 +162,9 @@ class PDFTab(QWidget):
         results = self.pdf_viewer.search(query)
         
         for result in results:
-            item = QListWidgetItem(f"Seite {result['page']}")
-            item.setData(Qt.ItemDataRole.UserRole, result['page'])
+            item = QListWidgetItem(f"Seite {result['page']}: {result['context']}")
+            item.setToolTip(result["snippet"])
+            item.setData(Qt.ItemDataRole.UserRole, result)
             self.search_results.addItem(item)
         
         if not results:
@@ -169,9 +172,9 @@ class PDFTab(QWidget):
     
     def _on_search_result_clicked(self, item: QListWidgetItem):
         """Springt zu Suchergebnis"""
-        page = item.data(Qt.ItemDataRole.UserRole)
-        if page:
-            self.pdf_viewer.go_to_page(page)
+        result = item.data(Qt.ItemDataRole.UserRole)
+        if result:
+            self.pdf_viewer.highlight(result['page'], result['start'], result['end'], result['rects'])
     
     def _extract_page_text(self):
         """Extrahiert Text der aktuellen Seite"""
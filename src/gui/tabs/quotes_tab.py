@@ -10,7 +10,7 @@ from PySide6.QtWidgets import (
     QLineEdit, QComboBox, QCheckBox, QApplication
 )
 
-from core import LitSource, SourceManager
+from core import LitSource, SourceManager, EventType, get_event_bus
 from formats import LiQuote, Quote
 
 
@@ -119,6 +119,7 @@ class QuotesTab(QWidget):
             )
             self.source_manager.save_quotes(self.source, self.quotes)
             self._refresh()
+            get_event_bus().emit(EventType.QUOTE_ADDED, self.source)
     
     def _edit_quote(self, item: QListWidgetItem):
         """Zitat bearbeiten"""
@@ -137,12 +138,14 @@ class QuotesTab(QWidget):
             quote.tags = data["tags"]
             self.source_manager.save_quotes(self.source, self.quotes)
             self._refresh()
+            get_event_bus().emit(EventType.QUOTE_UPDATED, self.source)
     
     def _copy_cite_to_clipboard(self):
-        """Kopiert \\cite{bibtex_key} in die Zwischenablage"""
+        """Kopiert \\cite{key} (Key aus der Projekt-Registry) in die Zwischenablage"""
         if not self.source:
             return
-        key = self.source.meta.bibtex_key
+        from modules.bibliography.keys import get_citation_keys
+        key = get_citation_keys().key_for(self.source)
         cite_cmd = f"\\cite{{{key}}}"
         clipboard = QApplication.clipboard()
         clipboard.setText(cite_cmd)
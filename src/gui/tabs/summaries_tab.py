@@ -10,7 +10,7 @@ from PySide6.QtWidgets import (
     QLineEdit, QComboBox
 )
 
-from core import LitSource, SourceManager
+from core import LitSource, SourceManager, EventType, get_event_bus
 from formats import LiSum, Summary
 
 
@@ -118,6 +118,7 @@ class SummariesTab(QWidget):
             )
             self.source_manager.save_summaries(self.source, self.summaries)
             self._refresh()
+            get_event_bus().emit(EventType.SUMMARY_ADDED, self.source)
     
     def _edit_summary(self, item: QListWidgetItem):
         """Zusammenfassung bearbeiten"""
@@ -137,6 +138,7 @@ class SummariesTab(QWidget):
             
             self.source_manager.save_summaries(self.source, self.summaries)
             self._refresh()
+            get_event_bus().emit(EventType.SUMMARY_UPDATED, self.source)
     
     def _ai_summarize(self):
         """KI-Zusammenfassung erstellen"""
@@ -11,7 +11,7 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import QDate
 
-from core import LitSource, SourceManager
+from core import LitSource, SourceManager, EventType, get_event_bus
 from formats import LiTask, Task
 
 
@@ -133,6 +133,7 @@ class TasksTab(QWidget):
             )
             self.source_manager.save_tasks(self.source, self.tasks)
             self._refresh()
+            get_event_bus().emit(EventType.TASK_ADDED, self.source)
     
     def _edit_task(self, item: QListWidgetItem):
         """Aufgabe bearbeiten"""
@@ -151,11 +152,15 @@ class TasksTab(QWidget):
             task.tags = data["tags"]
             task.status = data["status"]
             
-            if data["status"] == "done" and not task.completed_at:
+            completed = data["status"] == "done" and not task.completed_at
+            if completed:
                 task.complete()
             
             self.source_manager.save_tasks(self.source, self.tasks)
             self._refresh()
+            get_event_bus().emit(
+                EventType.TASK_COMPLETED if completed else EventType.TASK_UPDATED, self.source
+            )
     
     def clear(self):
         """Leert die Anzeige"""
@@ -3,8 +3,10 @@ LitZentrum - GUI Widgets
 Wiederverwendbare UI-Komponenten
 """
 from .pdf_viewer import PDFViewer, PDFPageWidget
+from .catalog_completer import CatalogCompleter
 
 __all__ = [
     "PDFViewer",
     "PDFPageWidget",
+    "CatalogCompleter",
 ]
@@ -0,0 +1,69 @@
+"""
+LitZentrum - Katalog-Vervollständigung
+QCompleter für Tags, Autoren, Journals und Verlage aus dem Quellenkatalog
+"""
+from typing import Optional
+
+from PySide6.QtCore import Qt, QStringListModel
+from PySide6.QtWidgets import QCompleter, QLineEdit
+
+from modules.search.catalog import SourceCatalog
+
+
+class CatalogCompleter(QCompleter):
+    """Vervollständigt das aktuelle Element eines (ggf. mehrwertigen) Feldes.
+
+    Die Vorschläge kommen direkt aus dem Präfix-Index des Katalogs (häufigste
+    zuerst); Qt filtert nicht selbst. Bei Feldern mit Trennzeichen ("tag1,
+    tag2") wird nur das Element unter der Eingabe ersetzt.
+    """
+
+    def __init__(self, catalog: SourceCatalog, field: str, line_edit: QLineEdit,
+                 separator: Optional[str] = None, limit: int = 12):
+        super().__init__(line_edit)
+        self.catalog = catalog
+        self.field = field
+        self.separator = separator
+        self.limit = limit
+        self.line_edit = line_edit
+
+        self._model = QStringListModel(self)
+        self.setModel(self._model)
+        self.setCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+        self.setCompletionMode(QCompleter.CompletionMode.UnfilteredPopupCompletion)
+        self.setWidget(line_edit)
+
+        line_edit.textEdited.connect(self._on_text_edited)
+        self.activated[str].connect(self._insert)
+
+    def _split(self, text: str):
+        """(Vorderer Teil inkl. Trennzeichen, aktuelles Element)"""
+        if not self.separator or self.separator not in text:
+            return "", text
+        head, _, current = text.rpartition(self.separator)
+        return head + self.separator + " ", current
+
+    def _on_text_edited(self, text: str):
+        head, current = self._split(text)
+        current = current.strip()
+        if not current:
+            self.popup().hide()
+            return
+
+        taken = set()
+        if self.separator:
+            taken = {v.strip().casefold() for v in head.split(self.separator) if v.strip()}
+        suggestions = [
+            value for value in self.catalog.complete(self.field, current, self.limit + len(taken))
+            if value.casefold() not in taken and value != current
+        ][:self.limit]
+
+        self._model.setStringList(suggestions)
+        if suggestions:
+            self.complete()
+        else:
+            self.popup().hide()
+
+    def _insert(self, value: str):
+        head, _ = self._split(self.line_edit.text())
+        self.line_edit.setText(head + value)
@@ -3,7 +3,7 @@ LitZentrum - PDF Viewer Widget
 Integrierter PDF-Betrachter mit Textauswahl
 """
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Dict, List, Optional, Callable
 
 from PySide6.QtCore import Qt, Signal, QPoint, QRect
 from PySide6.QtGui import QPixmap, QImage, QPainter, QColor, QWheelEvent, QMouseEvent
@@ -19,6 +19,13 @@ try:
 except ImportError:
     HAS_PYMUPDF = False
 
+from modules.pdf_workshop.text_cache import (
+    PDFText, PDFTextCache, get_text_extraction_queue
+)
+from modules.search.fulltext import FullTextIndex
+from modules.search.snippets import SnippetBuilder
+from core import get_settings
+
 
 class PDFPageWidget(QLabel):
     """Widget für eine einzelne PDF-Seite"""
@@ -47,6 +54,7 @@ class PDFViewer(QWidget):
     
     page_changed = Signal(int)  # Aktuelle Seite
     text_selected = Signal(str, int)  # Text, Seite
+    text_ready = Signal()  # Textcache im Hintergrund fertiggestellt
     
     ZOOM_LEVELS = [50, 75, 100, 125, 150, 200, 300]
     
@@ -58,6 +66,14 @@ class PDFViewer(QWidget):
         self.page_count = 0
         self.zoom_level = 100
         self.pdf_path: Optional[Path] = None
+        self.pdf_text: Optional[PDFText] = None
+        self._text_index: Optional[FullTextIndex] = None
+        self._snippets = SnippetBuilder()
+        self._highlights: Dict[int, List[tuple]] = {}  # Seite -> Rechtecke
+        self.language = "de"
+        
+        self._extraction_queue = get_text_extraction_queue()
+        self._extraction_queue.extraction_finished.connect(self._on_text_extracted)
         
         self._setup_ui()
     
@@ -163,6 +179,13 @@ class PDFViewer(QWidget):
             self.pdf_path = path
             self.page_count = len(self.doc)
             self.current_page = 0
+            self._text_index = None
+            self._highlights = {}
+            
+            # Textcache laden oder Extraktion im Hintergrund anstoßen
+            self.pdf_text = PDFTextCache(path).load()
+            if self.pdf_text is None:
+                self._extraction_queue.enqueue(path)
             
             self.page_spin.setMaximum(self.page_count)
             self.page_spin.setValue(1)
@@ -182,6 +205,9 @@ class PDFViewer(QWidget):
             self.doc = None
         
         self.pdf_path = None
+        self.pdf_text = None
+        self._text_index = None
+        self._highlights = {}
         self.page_count = 0
         self.current_page = 0
         self._show_placeholder()
@@ -199,6 +225,10 @@ class PDFViewer(QWidget):
         img = QImage(pix.samples, pix.width, pix.height, pix.stride, QImage.Format.Format_RGB888)
         pixmap = QPixmap.fromImage(img)
         
+        rects = self._highlights.get(self.current_page)
+        if rects:
+            self._paint_highlights(pixmap, rects, zoom * 1.5)
+        
         self.page_widget.setPixmap(pixmap)
         self.page_widget.setStyleSheet("background-color: white;")
         self.page_widget.set_page_info(self.current_page, zoom)
@@ -268,10 +298,94 @@ class PDFViewer(QWidget):
             return ""
         if page is None:
             page = self.current_page
+        if self.pdf_text is not None:
+            return self.pdf_text.page_text(page)
         if 0 <= page < self.page_count:
             return self.doc[page].get_text()
         return ""
     
+    def _on_text_extracted(self, path: str):
+        """Hintergrund-Extraktion abgeschlossen"""
+        if self.pdf_path and Path(path) == self.pdf_path:
+            self.pdf_text = PDFTextCache(self.pdf_path).load()
+            self._text_index = None
+            self.text_ready.emit()
+    
+    def _ensure_text_index(self) -> Optional[FullTextIndex]:
+        """Positions-Index über das geöffnete Dokument (einmal je Dokument)"""
+        if self._text_index is not None:
+            return self._text_index
+        if self.pdf_text is None and self.pdf_path:
+            # Suche vor Abschluss der Hintergrund-Extraktion: einmalig synchron
+            try:
+                self.pdf_text = PDFTextCache(self.pdf_path).get()
+            except (OSError, ValueError, RuntimeError, ImportError):
+                return None
+        if self.pdf_text is None:
+            return None
+        self._text_index = FullTextIndex()
+        self._text_index.add_document(
+            str(self.pdf_path), [p.text for p in self.pdf_text.pages], language=self.language
+        )
+        return self._text_index
+    
+    def search(self, query: str, limit: int = 500) -> List[dict]:
+        """Sucht im Dokument: Wörter, "Phrase" oder a NEAR/k b.
+
+        Liefert je Fundstelle Seite (1-basiert), Zeichen-Offsets im
+        Seitentext und die Wortboxen für die Hervorhebung.
+        """
+        index = self._ensure_text_index()
+        if index is None:
+            return []
+        results = []
+        for hit in index.search(query, limit):
+            snippet = self._snippets.build(self.pdf_text, hit.page, hit.start, hit.end, stamp=self.pdf_text.content_hash)
+            results.append({
+                "page": hit.page + 1,
+                "start": hit.start,
+                "end": hit.end,
+                "text": self.pdf_text.page_text(hit.page)[hit.start:hit.end],
+                "context": snippet.text,
+                "snippet": snippet.html(),
+                "rects": snippet.rects,
+            })
+        return results
+    
+    def highlight(self, page: int, start: int, end: int, rects: List[tuple] = None):
+        """Springt zu einer Fundstelle (Seite 1-basiert) und hebt sie hervor.
+
+        Bereits bekannte Wortboxen (z.B. aus einem Suchergebnis) werden direkt
+        verwendet, sonst aus dem Textcache bestimmt.
+        """
+        self._highlights = {}
+        if not rects and self.pdf_text is not None:
+            rects = self.pdf_text.rects_for_range(page - 1, start, end)
+        if rects:
+            self._highlights[page - 1] = list(rects)
+        if page - 1 == self.current_page:
+            self._render_page()
+        else:
+            self.go_to_page(page)
+    
+    def clear_highlights(self):
+        """Entfernt alle Hervorhebungen"""
+        if self._highlights:
+            self._highlights = {}
+            self._render_page()
+    
+    def _paint_highlights(self, pixmap: QPixmap, rects: List[tuple], scale: float):
+        color = QColor(get_settings().get("pdf_highlight_color", "#FFFF00"))
+        color.setAlpha(90)
+        painter = QPainter(pixmap)
+        for x0, y0, x1, y1 in rects:
+            painter.fillRect(
+                QRect(int(x0 * scale), int(y0 * scale),
+                      int((x1 - x0) * scale) + 1, int((y1 - y0) * scale) + 1),
+                color,
+            )
+        painter.end()
+    
     def wheelEvent(self, event: QWheelEvent):
         if event.modifiers() == Qt.KeyboardModifier.ControlModifier:
             if event.angleDelta().y() > 0:
@@ -18,16 +18,27 @@ class SearchResult:
     match_type: str  # title, author, tag, content
     match_text: str
     relevance: float = 1.0
+    # Fundstelle im Volltext (match_type "content"): Seite 1-basiert, Offsets im Seitentext
+    page: Optional[int] = None
+    char_start: Optional[int] = None
+    char_end: Optional[int] = None
+    # Hervorgehobene Bereiche in match_text und gecachte Wortboxen der Fundstelle
+    highlights: List[tuple] = field(default_factory=list)
+    rects: List[tuple] = field(default_factory=list)
+    # Projektübergreifende Suche: Herkunftsprojekt des Treffers
+    project: Optional[str] = None
+    project_path: Optional[Path] = None
 
 
 @dataclass
 class ExportOptions:
     """Export-Optionen"""
-    format: str  # bibtex, word, markdown
+    format: str  # bibtex, word, markdown, html, text
     citation_style: str = "apa"
     include_abstracts: bool = False
     include_notes: bool = False
     include_quotes: bool = False
+    include_summaries: bool = False
     output_path: Optional[Path] = None
 
 
@@ -5,6 +5,7 @@ from .bibliography import BibTeXGenerator, BibTeXParser, CitationStyleManager
 from .pdf_workshop import PDFExtractor, PDFInfo
 from .ai import OllamaQueue, AIJob, JobStatus
 from .sync import GitSync, BackupManager
+from .search import SourceNameIndex
 
 __all__ = [
     # Bibliography
@@ -21,4 +22,6 @@ __all__ = [
     # Sync
     "GitSync",
     "BackupManager",
+    # Search
+    "SourceNameIndex",
 ]
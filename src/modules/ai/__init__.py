@@ -3,9 +3,13 @@ LitZentrum - AI Module
 Lokale KI-Integration mit Ollama
 """
 from .ollama_queue import OllamaQueue, AIJob, JobStatus
+from .embeddings import EmbeddingClient, TextChunk, chunk_text
 
 __all__ = [
     "OllamaQueue",
     "AIJob",
     "JobStatus",
+    "EmbeddingClient",
+    "TextChunk",
+    "chunk_text",
 ]
@@ -0,0 +1,126 @@
+"""
+LitZentrum - Embeddings
+Text-Chunking und gebündelte Embedding-Anfragen an ein lokales Ollama
+"""
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence
+import logging
+import re
+
+try:
+    import requests
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+
+DEFAULT_EMBEDDING_MODEL = "nomic-embed-text"
+
+_BREAK = re.compile(r"\n\s*\n|(?<=[.!?])\s+")
+
+
+@dataclass
+class TextChunk:
+    """Ausschnitt eines Textes mit Zeichen-Offsets"""
+    text: str
+    start: int
+    end: int
+
+
+def chunk_text(text: str, max_chars: int = 1200, overlap: int = 200,
+               min_chars: int = 40) -> List[TextChunk]:
+    """Zerlegt Text in überlappende Abschnitte.
+
+    Geschnitten wird bevorzugt an Absatz- oder Satzgrenzen innerhalb des
+    Fensters, sonst am letzten Leerzeichen. Sehr kurze Reste werden verworfen.
+    """
+    chunks = []
+    length = len(text)
+    start = 0
+    while start < length:
+        while start < length and text[start].isspace():
+            start += 1
+        end = min(start + max_chars, length)
+        if end < length:
+            window = text[start:end]
+            cut = None
+            for match in _BREAK.finditer(window, max_chars // 2):
+                cut = match.start()
+            if cut is None:
+                cut = window.rfind(" ", max_chars // 2)
+            if cut and cut > 0:
+                end = start + cut
+        piece = text[start:end].strip()
+        if len(piece) >= min_chars:
+            chunks.append(TextChunk(text=piece, start=start, end=end))
+        if end >= length:
+            break
+        start = max(end - overlap, start + 1)
+        # Überlappung an einer Wortgrenze beginnen lassen
+        space = text.find(" ", start, end)
+        if space != -1:
+            start = space + 1
+    return chunks
+
+
+class EmbeddingClient:
+    """Client für den Ollama-Endpunkt /api/embed.
+
+    Texte werden in Batches übertragen; ein Batch ist eine HTTP-Anfrage
+    mit mehreren Eingaben.
+    """
+
+    def __init__(self, base_url: str = "http://localhost:11434",
+                 model: str = DEFAULT_EMBEDDING_MODEL, batch_size: int = 32,
+                 timeout: float = 120):
+        if not HAS_REQUESTS:
+            raise ImportError("requests nicht installiert")
+
+        self.base_url = base_url.rstrip("/")
+        self.model = model
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._session = requests.Session()
+
+    def is_available(self) -> bool:
+        """Prüft ob der Embedding-Endpunkt erreichbar ist"""
+        try:
+            response = self._session.get(f"{self.base_url}/api/tags", timeout=2)
+            return response.status_code == 200
+        except (requests.RequestException, OSError) as e:
+            logging.debug(f"Embedding-Endpunkt nicht erreichbar: {e}")
+            return False
+
+    def _batches(self, texts: Sequence[str]) -> Iterator[Sequence[str]]:
+        for i in range(0, len(texts), self.batch_size):
+            yield texts[i:i + self.batch_size]
+
+    def embed_batch(self, texts: Sequence[str]) -> List[List[float]]:
+        """Eine Anfrage für mehrere Texte"""
+        response = self._session.post(
+            f"{self.base_url}/api/embed",
+            json={"model": self.model, "input": list(texts)},
+            timeout=self.timeout,
+        )
+        if response.status_code != 200:
+            raise RuntimeError(f"HTTP {response.status_code}")
+        embeddings = response.json().get("embeddings", [])
+        if len(embeddings) != len(texts):
+            raise RuntimeError(
+                f"Embedding-Antwort unvollständig: {len(embeddings)} von {len(texts)}"
+            )
+        return embeddings
+
+    def embed(self, texts: Sequence[str], progress=None) -> List[List[float]]:
+        """Embeddings für beliebig viele Texte (gebündelt)"""
+        vectors: List[List[float]] = []
+        for batch in self._batches(texts):
+            vectors.extend(self.embed_batch(batch))
+            if progress:
+                progress(len(vectors), len(texts))
+        return vectors
+
+    def embed_one(self, text: str) -> Optional[List[float]]:
+        """Embedding für einen einzelnen Text (z.B. Suchanfrage)"""
+        vectors = self.embed_batch([text])
+        return vectors[0] if vectors else None
@@ -2,16 +2,47 @@
 LitZentrum - Bibliographie Module
 BibTeX und Zitationsstile
 """
-from .bibtex import BibTeXGenerator, BibTeXParser
+from .base import BibliographyWriter
+from .bibtex import BibTeXGenerator, BibTeXParser, escape_latex
+from .keys import CitationKeyRegistry, get_citation_keys
+from .manuscript import ManuscriptScanner, CitationReport
+from .project_bib import ProjectBibliography
+from .importer import (
+    BibTeXReader, BibTeXImporter, SourceImporter, ImportResult, importer_for, latex_to_unicode
+)
+from .ris import RISReader, RISWriter, RISImporter
+from .csl_json import CSLJSONReader, CSLJSONWriter, CSLJSONImporter
 from .styles import (
     CitationFormatter, APAFormatter, MLAFormatter, 
     ChicagoFormatter, DINFormatter, HarvardFormatter,
-    CitationStyleManager
+    CitationStyleManager, get_style_manager
 )
+from .style_engine import StyleError, compile_template
+from .writers import DocumentWriter, open_writer
+from .export import SourceExporter
 
 __all__ = [
+    "BibliographyWriter",
     "BibTeXGenerator",
     "BibTeXParser",
+    "escape_latex",
+    "CitationKeyRegistry",
+    "get_citation_keys",
+    "ManuscriptScanner",
+    "CitationReport",
+    "ProjectBibliography",
+    "BibTeXReader",
+    "BibTeXImporter",
+    "SourceImporter",
+    "ImportResult",
+    "importer_for",
+    "RISReader",
+    "RISWriter",
+    "RISImporter",
+    "CSLJSONReader",
+    "CSLJSONWriter",
+    "CSLJSONImporter",
+    "latex_to_unicode",
     "CitationFormatter",
     "APAFormatter",
     "MLAFormatter",
@@ -19,4 +50,10 @@ __all__ = [
     "DINFormatter",
     "HarvardFormatter",
     "CitationStyleManager",
+    "get_style_manager",
+    "StyleError",
+    "compile_template",
+    "DocumentWriter",
+    "open_writer",
+    "SourceExporter",
 ]
@@ -0,0 +1,113 @@
+"""
+LitZentrum - Literatur-Writer
+Gemeinsame Basis der BibTeX-, RIS- und CSL-JSON-Writer
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Iterable, Iterator, TextIO, Union
+import io
+import os
+
+from core import LitSource
+from formats import LiMeta
+from .keys import CitationKeyRegistry
+
+
+class BibliographyWriter(ABC):
+    """Schreibt eine Literaturdatei Eintrag für Eintrag.
+
+    Die Einträge werden einzeln erzeugt und direkt in einen Datei-Handle
+    geschrieben (write/save_bibliography) oder als Generator geliefert
+    (iter_entries); die Bibliografie liegt nie komplett im Speicher.
+    Unterklassen legen das Eintragsformat (generate_entry), die Endung
+    und bei Bedarf Kopf, Trenner und Abschluss der Datei fest.
+    """
+
+    PROGRESS_EVERY = 500  # Einträge zwischen zwei Fortschrittsmeldungen
+    FILE_EXTENSION = ""
+
+    def __init__(self, keys: CitationKeyRegistry = None):
+        self.keys = keys
+
+    def key_for(self, item: Union[LitSource, LiMeta]) -> str:
+        """Zitierschlüssel eines Eintrags (aus der Registry, falls vorhanden)"""
+        if isinstance(item, LitSource):
+            if self.keys is not None:
+                return self.keys.key_for(item)
+            item = item.meta
+        return item.bibtex_key
+
+    @abstractmethod
+    def generate_entry(self, item: Union[LitSource, LiMeta], key: str = None) -> str:
+        """Ein Eintrag im Zielformat (aus einer Quelle oder LiMeta)"""
+        pass
+
+    def iter_entries(self, sources: Iterable[Union[LitSource, LiMeta]]) -> Iterator[str]:
+        """Liefert die Einträge nacheinander"""
+        for item in sources:
+            yield self.generate_entry(item)
+
+    def header(self) -> str:
+        """Text vor dem ersten Eintrag"""
+        return ""
+
+    def separator(self, count: int) -> str:
+        """Text vor einem Eintrag; count = Anzahl bereits geschriebener Einträge"""
+        return "\n\n" if count else ""
+
+    def footer(self, count: int) -> str:
+        """Text nach dem letzten Eintrag"""
+        return "\n" if count else ""
+
+    def write(self, sources: Iterable[Union[LitSource, LiMeta]], handle: TextIO,
+              progress: Callable[[int, int], None] = None, total: int = None) -> int:
+        """Schreibt die Einträge in einen geöffneten Text-Handle.
+
+        Args:
+            sources: Quellen oder Metadaten, gern auch als Generator.
+            handle: Ziel (Datei, StringIO, ...).
+            progress: Optional progress(geschrieben, gesamt).
+            total: Gesamtzahl für progress (sonst len(sources), falls bekannt).
+
+        Returns:
+            Anzahl geschriebener Einträge.
+        """
+        if total is None and hasattr(sources, "__len__"):
+            total = len(sources)
+        handle.write(self.header())
+        count = 0
+        for entry in self.iter_entries(sources):
+            handle.write(self.separator(count))
+            handle.write(entry)
+            count += 1
+            if progress and count % self.PROGRESS_EVERY == 0:
+                progress(count, total or 0)
+        handle.write(self.footer(count))
+        if progress:
+            progress(count, total or count)
+        return count
+
+    def generate_bibliography(self, sources: Iterable[Union[LitSource, LiMeta]]) -> str:
+        """Generiert komplette Bibliografie als String"""
+        buffer = io.StringIO()
+        self.write(sources, buffer)
+        return buffer.getvalue()
+
+    def save_bibliography(self, sources: Iterable[Union[LitSource, LiMeta]], path: Path,
+                          progress: Callable[[int, int], None] = None,
+                          total: int = None) -> Path:
+        """Speichert die Bibliografie atomar über eine .tmp-Datei (ohne Endung: FILE_EXTENSION)"""
+        path = Path(path)
+        if not path.suffix and self.FILE_EXTENSION:
+            path = path.with_suffix(self.FILE_EXTENSION)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        tmp_path = path.with_name(path.name + ".tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8', newline="\n") as f:
+                self.write(sources, f, progress, total)
+            os.replace(tmp_path, path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return path
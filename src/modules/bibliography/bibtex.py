@@ -2,15 +2,45 @@
 LitZentrum - BibTeX Generator
 Generiert BibTeX-Einträge aus LiMeta
 """
+from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import Iterator, List, Tuple, Union
 import logging
+import re
 
+from core import LitSource
 from formats import LiMeta
+from .base import BibliographyWriter
 
 
-class BibTeXGenerator:
-    """Generiert BibTeX-Einträge"""
+# LaTeX-Sonderzeichen in Feldwerten
+LATEX_ESCAPES = str.maketrans({
+    "\\": r"\textbackslash{}",
+    "{": r"\{",
+    "}": r"\}",
+    "&": r"\&",
+    "%": r"\%",
+    "$": r"\$",
+    "#": r"\#",
+    "_": r"\_",
+    "~": r"\textasciitilde{}",
+    "^": r"\textasciicircum{}",
+})
+
+# Felder, die wörtlich übernommen werden (url-Paket, DOI-Resolver)
+VERBATIM_FIELDS = {"doi", "url"}
+
+
+def escape_latex(value: str) -> str:
+    """Maskiert LaTeX-Sonderzeichen (& % $ # _ { } ~ ^ \\) für BibTeX"""
+    return value.translate(LATEX_ESCAPES)
+
+
+class BibTeXGenerator(BibliographyWriter):
+    """Generiert BibTeX-Einträge.
+
+    Streaming und atomares Speichern kommen von BibliographyWriter.
+    """
     
     TYPE_MAP = {
         "article": "article",
@@ -22,83 +52,65 @@ class BibTeXGenerator:
         "other": "misc",
     }
     
-    def generate_entry(self, meta: LiMeta) -> str:
-        """Generiert einen BibTeX-Eintrag"""
-        entry_type = self.TYPE_MAP.get(meta.source_type, "misc")
-        key = meta.citation_key
-        
-        lines = [f"@{entry_type}{{{key},"]
-        
-        # Titel
+    FILE_EXTENSION = ".bib"
+    
+    def fields(self, meta: LiMeta, entry_type: str) -> Iterator[Tuple[str, str]]:
+        """(Feld, Rohwert) eines Eintrags in Ausgabereihenfolge"""
         if meta.title:
-            lines.append(f'  title = {{{meta.title}}},')
-        
-        # Autoren
+            yield "title", meta.title
         if meta.authors:
-            authors = " and ".join(meta.authors)
-            lines.append(f'  author = {{{authors}}},')
-        
-        # Jahr
+            yield "author", " and ".join(meta.authors)
         if meta.year:
-            lines.append(f'  year = {{{meta.year}}},')
-        
-        # Journal (für Artikel)
+            yield "year", str(meta.year)
+        # Zeitschrift bei Artikeln, sonst Sammelwerk/Tagungsband
         if meta.journal:
-            lines.append(f'  journal = {{{meta.journal}}},')
-        
-        # Volume
+            yield ("journal" if entry_type == "article" else "booktitle"), meta.journal
         if meta.volume:
-            lines.append(f'  volume = {{{meta.volume}}},')
-        
-        # Number/Issue
+            yield "volume", meta.volume
         if meta.issue:
-            lines.append(f'  number = {{{meta.issue}}},')
-        
-        # Seiten
+            yield "number", meta.issue
         if meta.pages:
-            lines.append(f'  pages = {{{meta.pages}}},')
-        
-        # Verlag
+            yield "pages", meta.pages
         if meta.publisher:
-            lines.append(f'  publisher = {{{meta.publisher}}},')
-        
-        # DOI
+            yield "publisher", meta.publisher
         if meta.doi:
-            lines.append(f'  doi = {{{meta.doi}}},')
-        
-        # ISBN
+            yield "doi", meta.doi
         if meta.isbn:
-            lines.append(f'  isbn = {{{meta.isbn}}},')
-        
-        # URL
+            yield "isbn", meta.isbn
         if meta.url:
-            lines.append(f'  url = {{{meta.url}}},')
-        
-        # Abstract
+            yield "url", meta.url
         if meta.abstract:
-            abstract = meta.abstract.replace("\n", " ")
-            lines.append(f'  abstract = {{{abstract}}},')
-        
-        # Schließende Klammer
+            yield "abstract", meta.abstract
+        if meta.tags:
+            yield "keywords", ", ".join(meta.tags)
+    
+    def generate_entry(self, item: Union[LitSource, LiMeta], key: str = None) -> str:
+        """Generiert einen BibTeX-Eintrag (aus einer Quelle oder LiMeta)"""
+        key = key or self.key_for(item)
+        meta = item.meta if isinstance(item, LitSource) else item
+        entry_type = self.TYPE_MAP.get(meta.source_type, "misc")
+        lines = [f"@{entry_type}{{{key},"]
+        for name, value in self.fields(meta, entry_type):
+            value = " ".join(value.split())  # keine Zeilenumbrüche im Feld
+            if name not in VERBATIM_FIELDS:
+                value = escape_latex(value)
+            lines.append(f"  {name} = {{{value}}},")
         lines.append("}")
-        
         return "\n".join(lines)
     
-    def generate_bibliography(self, sources: List[LiMeta]) -> str:
-        """Generiert komplette Bibliografie"""
-        entries = [self.generate_entry(meta) for meta in sources]
-        return "\n\n".join(entries)
+    def header(self) -> str:
+        """Kommentarkopf der Datei"""
+        return (
+            "% LitZentrum BibTeX Export\n"
+            f"% Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}\n"
+        )
     
-    def save_bibliography(self, sources: List[LiMeta], path: Path):
-        """Speichert Bibliografie als .bib Datei"""
-        content = self.generate_bibliography(sources)
-        
-        path = Path(path)
-        if not path.suffix:
-            path = path.with_suffix(".bib")
-        
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    def separator(self, count: int) -> str:
+        """Leerzeile nach dem Kommentarkopf und zwischen den Einträgen"""
+        return "\n\n" if count else "\n"
+    
+    # Frühere API aus bibtex_generator.py
+    generate_file = BibliographyWriter.save_bibliography
 
 
 class BibTeXParser:
@@ -106,19 +118,16 @@ class BibTeXParser:
     
     def parse_file(self, path: Path) -> List[LiMeta]:
         """Parst eine BibTeX-Datei"""
-        import bibtexparser
-        
-        with open(path, 'r', encoding='utf-8') as f:
-            bib_database = bibtexparser.load(f)
-        
-        sources = []
-        for entry in bib_database.entries:
-            meta = self._entry_to_meta(entry)
-            sources.append(meta)
+        return list(self.iter_file(path))
+    
+    def iter_file(self, path: Path) -> Iterator[LiMeta]:
+        """Liefert die Einträge einer BibTeX-Datei nacheinander (streamend)"""
+        from .importer import BibTeXReader
         
-        return sources
+        for entry in BibTeXReader().read(Path(path)):
+            yield self.entry_to_meta(entry)
     
-    def _entry_to_meta(self, entry: dict) -> LiMeta:
+    def entry_to_meta(self, entry: dict) -> LiMeta:
         """Konvertiert BibTeX-Eintrag zu LiMeta"""
         # Typ-Mapping umgekehrt
         type_map = {
@@ -147,19 +156,31 @@ class BibTeXParser:
             logging.debug(f"Fehler beim Parsen des Jahres '{year_str}': {e}")
             year = None
         
+        # DOI ohne Resolver-Präfix (https://doi.org/, doi:)
+        doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", entry.get("doi") or "",
+                     flags=re.IGNORECASE).strip() or None
+        if doi and not doi.startswith("10."):
+            logging.debug(f"Ungültige DOI '{doi}' ignoriert")
+            doi = None
+        
+        # Schlagwörter
+        keywords = entry.get("keywords", "")
+        tags = [k.strip() for k in keywords.replace(";", ",").split(",") if k.strip()]
+        
         return LiMeta(
-            title=entry.get("title", "Untitled"),
+            title=entry.get("title") or "Untitled",
             authors=authors,
             year=year,
             source_type=source_type,
-            journal=entry.get("journal"),
+            journal=entry.get("journal") or entry.get("booktitle"),
             volume=entry.get("volume"),
             issue=entry.get("number"),
             pages=entry.get("pages"),
             publisher=entry.get("publisher"),
-            doi=entry.get("doi"),
+            doi=doi,
             isbn=entry.get("isbn"),
             url=entry.get("url"),
             abstract=entry.get("abstract"),
+            tags=tags,
             metadata_source="bibtex_import",
         )
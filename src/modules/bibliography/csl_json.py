@@ -0,0 +1,220 @@
+"""
+LitZentrum - CSL-JSON
+Streamender CSL-JSON-Leser, Export und Import (Zotero, Citavi, Pandoc)
+"""
+from typing import Iterable, Iterator, Optional, Union
+import json
+import re
+
+from core import LitSource
+from formats import LiMeta
+from .base import BibliographyWriter
+from .importer import SourceImporter, StreamReader, parse_doi, parse_language, parse_year
+
+
+_WHITESPACE = re.compile(r"[\s,]*")
+_TOKEN_END = re.compile(r'[\s,:\[\]{}"]')
+_UNTERMINATED = "Unterminated string"
+
+# CSL-Typ -> source_type (nicht aufgeführte Typen: "other")
+CSL_TYPES = {
+    "article-journal": "article", "article": "article",
+    "article-magazine": "article", "article-newspaper": "article",
+    "book": "book",
+    "chapter": "chapter", "entry-encyclopedia": "chapter", "entry-dictionary": "chapter",
+    "thesis": "thesis",
+    "paper-conference": "conference",
+    "webpage": "website", "post-weblog": "website", "post": "website",
+}
+
+# source_type -> CSL-Typ beim Export
+EXPORT_TYPES = {
+    "article": "article-journal",
+    "book": "book",
+    "chapter": "chapter",
+    "thesis": "thesis",
+    "conference": "paper-conference",
+    "website": "webpage",
+    "other": "document",
+}
+
+
+class CSLJSONReader(StreamReader):
+    """Liest die Einträge eines CSL-JSON-Arrays einzeln.
+
+    Statt json.load über die ganze Datei wird jedes Objekt mit
+    JSONDecoder.raw_decode aus dem Puffer gelesen, sobald es vollständig
+    ist. Eine Datei mit nur einem Objekt (statt Array) wird ebenfalls
+    gelesen. Defektes JSON bricht mit ValueError ab, sobald weiterer Text
+    den Fehler nicht mehr beheben kann, statt bis zum Dateiende zu puffern.
+    """
+
+    def iter_entries(self, chunks: Iterable[str]) -> Iterator[dict]:
+        decoder = json.JSONDecoder()
+        chunks = iter(chunks)
+        buf, pos, eof = "", 0, False
+        offset = 0  # Position von buf im Strom
+        in_array = None  # None: Anfang noch nicht gelesen
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end() if in_array else _skip_space(buf, pos)
+            if pos < len(buf):
+                if in_array is None:
+                    in_array = buf[pos] == "["
+                    if in_array:
+                        pos += 1
+                        continue
+                if in_array and buf[pos] == "]":
+                    return
+                try:
+                    item, pos = decoder.raw_decode(buf, pos)
+                except json.JSONDecodeError as e:
+                    if eof or _unfixable(buf, e):
+                        raise ValueError(f"Ungültiges CSL-JSON (Zeichen {offset + e.pos}): {e.msg}") from None
+                else:
+                    yield item
+                    if not in_array:
+                        return
+                    continue
+            elif eof:
+                if in_array:
+                    raise ValueError("Ungültiges CSL-JSON: Array nicht abgeschlossen")
+                return
+
+            # Mehr Text nötig
+            offset += pos
+            buf, pos = buf[pos:], 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buf += chunk
+
+
+def _unfixable(buf: str, error: json.JSONDecodeError) -> bool:
+    """Ob weiterer Text einen Parse-Fehler nicht mehr beheben kann.
+
+    Ein abgeschnittenes, sonst gültiges Objekt scheitert nur am Pufferende
+    oder in seinem letzten, noch offenen Token (tr|ue, 1.|5, ein offener
+    String). Steht hinter der Fehlerstelle schon ein Trennzeichen, ist das
+    Token abgeschlossen und der Fehler endgültig.
+    """
+    if error.msg.startswith(_UNTERMINATED):
+        return False
+    return _TOKEN_END.search(buf, error.pos + 1) is not None
+
+
+def _skip_space(buf: str, pos: int) -> int:
+    while pos < len(buf) and buf[pos].isspace():
+        pos += 1
+    return pos
+
+
+def _name(person: dict) -> str:
+    """{"family": "Weber", "given": "Max"} -> "Weber, Max" ("literal" bleibt)"""
+    if person.get("literal"):
+        return str(person["literal"])
+    family = " ".join(filter(None, (person.get("non-dropping-particle"), person.get("family"))))
+    given = person.get("given")
+    return f"{family}, {given}" if family and given else (family or given or "")
+
+
+def _text(value) -> Optional[str]:
+    if value is None or value == "":
+        return None
+    return str(value)
+
+
+def csl_to_meta(item: dict) -> LiMeta:
+    """Konvertiert einen CSL-JSON-Eintrag zu LiMeta"""
+    if not isinstance(item, dict):
+        raise ValueError("Eintrag ist kein JSON-Objekt")
+    issued = item.get("issued") or {}
+    year = None
+    if isinstance(issued, dict):
+        parts = issued.get("date-parts") or [[]]
+        if parts and parts[0]:
+            year = parse_year(parts[0][0])
+        year = year or parse_year(issued.get("raw") or issued.get("literal"))
+    keywords = item.get("keyword") or ""
+    if isinstance(keywords, list):
+        keywords = ",".join(map(str, keywords))
+    meta = LiMeta(
+        title=_text(item.get("title")) or "Untitled",
+        authors=[name for name in map(_name, item.get("author") or []) if name],
+        year=year,
+        source_type=CSL_TYPES.get(item.get("type"), "other"),
+        journal=_text(item.get("container-title")),
+        volume=_text(item.get("volume")),
+        issue=_text(item.get("issue")),
+        pages=_text(item.get("page")),
+        publisher=_text(item.get("publisher")),
+        doi=parse_doi(_text(item.get("DOI"))),
+        isbn=_text(item.get("ISBN")),
+        url=_text(item.get("URL")),
+        abstract=_text(item.get("abstract")),
+        tags=[k.strip() for k in keywords.replace(";", ",").split(",") if k.strip()],
+        metadata_source="csl_import",
+    )
+    language = parse_language(_text(item.get("language")))
+    if language:
+        meta.language = language
+    return meta
+
+
+class CSLJSONWriter(BibliographyWriter):
+    """Schreibt ein CSL-JSON-Array, Eintrag für Eintrag.
+
+    Schlüssel, Streaming und atomares Speichern kommen von BibliographyWriter.
+    """
+
+    FILE_EXTENSION = ".json"
+
+    def item(self, source: Union[LitSource, LiMeta], key: str = None) -> dict:
+        """CSL-JSON-Objekt eines Eintrags"""
+        key = key or self.key_for(source)
+        meta = source.meta if isinstance(source, LitSource) else source
+        item = {"id": key, "type": EXPORT_TYPES.get(meta.source_type, "document"), "title": meta.title}
+        if meta.authors:
+            item["author"] = [
+                {"family": family.strip(), "given": given.strip()} if given else {"literal": family.strip()}
+                for family, _, given in (author.partition(",") for author in meta.authors)
+            ]
+        if meta.year:
+            item["issued"] = {"date-parts": [[meta.year]]}
+        for name, value in (("container-title", meta.journal), ("volume", meta.volume),
+                            ("issue", meta.issue), ("page", meta.pages),
+                            ("publisher", meta.publisher), ("DOI", meta.doi),
+                            ("ISBN", meta.isbn), ("URL", meta.url), ("abstract", meta.abstract)):
+            if value:
+                item[name] = value
+        if meta.tags:
+            item["keyword"] = ", ".join(meta.tags)
+        if meta.language:
+            item["language"] = meta.language
+        return item
+
+    def generate_entry(self, source: Union[LitSource, LiMeta], key: str = None) -> str:
+        return json.dumps(self.item(source, key), ensure_ascii=False)
+
+    def header(self) -> str:
+        return "["
+
+    def separator(self, count: int) -> str:
+        """Ein Eintrag pro Zeile"""
+        return ",\n" if count else "\n"
+
+    def footer(self, count: int) -> str:
+        return "\n]\n"
+
+
+class CSLJSONImporter(SourceImporter):
+    """Importiert eine CSL-JSON-Datei"""
+
+    def reader(self) -> StreamReader:
+        return CSLJSONReader()
+
+    def entry_key(self, entry: dict) -> str:
+        return str(entry.get("id") or "") if isinstance(entry, dict) else ""
+
+    def entry_to_meta(self, entry: dict) -> LiMeta:
+        return csl_to_meta(entry)
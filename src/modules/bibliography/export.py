@@ -0,0 +1,149 @@
+"""
+LitZentrum - Quellen-Export
+Literaturangaben mit Notizen, Zitaten und Zusammenfassungen als DOCX, Markdown oder HTML
+"""
+from pathlib import Path
+from typing import Callable, Iterable
+import logging
+
+from core import LitSource, SourceManager
+from formats import LitFormatError
+from models import ExportOptions
+from .styles import CitationStyleManager, get_style_manager
+from .writers import EMPHASIS_PATTERN, DocumentWriter, open_writer
+
+
+FORMAT_SUFFIXES = {
+    "word": ".docx",
+    "markdown": ".md",
+    "html": ".html",
+    "text": ".txt",
+    "bibtex": ".bib",
+}
+
+# Zulässige Dateiendungen je Format
+FORMAT_ALIASES = {
+    "word": (".docx",),
+    "markdown": (".md", ".markdown"),
+    "html": (".html", ".htm"),
+    "text": (".txt",),
+    "bibtex": (".bib",),
+}
+
+
+class SourceExporter:
+    """Exportiert die Quellen eines Projekts in Reihenfolge des Literaturverzeichnisses.
+
+    Zu jeder Quelle werden Notizen, Zitate und Zusammenfassungen erst beim
+    Schreiben geladen und danach verworfen; zusammen mit den streamenden
+    Writern bleibt der Speicherbedarf unabhängig von der Projektgröße.
+    """
+
+    PROGRESS_EVERY = 50  # Quellen zwischen zwei Fortschrittsmeldungen
+
+    def __init__(self, source_manager: SourceManager, style_manager: CitationStyleManager = None):
+        self.source_manager = source_manager
+        self.style_manager = style_manager or get_style_manager()
+        self.cancelled = False
+
+    def cancel(self):
+        """Bricht den laufenden Export ab (eine vorhandene Datei bleibt erhalten)"""
+        self.cancelled = True
+
+    @staticmethod
+    def output_path(options: ExportOptions) -> Path:
+        """Zieldatei; ohne passende Endung wird die des Formats ergänzt.
+
+        Eine Endung, die zu einem anderen Exportformat gehört, ist ein Fehler,
+        damit etwa kein Word-Dokument unter "export.md" landet.
+        """
+        if options.output_path is None:
+            raise ValueError("Kein Zielpfad angegeben")
+        if options.format not in FORMAT_SUFFIXES:
+            raise ValueError(f"Nicht unterstütztes Format: {options.format}")
+        path = Path(options.output_path)
+        suffix = path.suffix.lower()
+        if suffix in FORMAT_ALIASES[options.format]:
+            return path
+        if any(suffix in aliases for aliases in FORMAT_ALIASES.values()):
+            raise ValueError(f"Dateiendung {path.suffix} passt nicht zum Format {options.format}")
+        return path.with_name(path.name + FORMAT_SUFFIXES[options.format])
+
+    def export(self, sources: Iterable[LitSource], options: ExportOptions,
+               title: str = "Literaturverzeichnis",
+               progress: Callable[[int, int], None] = None) -> int:
+        """Schreibt den Export; Anzahl geschriebener Quellen"""
+        self.cancelled = False
+        path = self.output_path(options)
+        sources = list(sources)
+        if options.format == "bibtex":
+            from .bibtex import BibTeXGenerator
+            from .keys import get_citation_keys
+            BibTeXGenerator(get_citation_keys()).save_bibliography(sources, path, progress)
+            return len(sources)
+
+        references = self.style_manager.ordered_references(sources, options.citation_style)
+        total = len(references)
+        writer = open_writer(path, title, options.format)
+        try:
+            if title:
+                writer.heading(title)
+            for count, (source, reference) in enumerate(references, 1):
+                self._write_source(writer, source, reference, options)
+                if progress and (count % self.PROGRESS_EVERY == 0 or count == total):
+                    progress(count, total)
+                if self.cancelled:
+                    writer.abort()
+                    return count
+        except BaseException:
+            writer.abort()
+            raise
+        writer.close()
+        return total
+
+    def _write_source(self, writer: DocumentWriter, source: LitSource, reference: str,
+                      options: ExportOptions):
+        if not (options.include_abstracts or options.include_summaries
+                or options.include_quotes or options.include_notes):
+            writer.paragraph(reference)
+            return
+
+        writer.heading(EMPHASIS_PATTERN.sub(r"\1", reference), 2)
+        if options.include_abstracts and source.meta.abstract:
+            writer.heading("Abstract", 3)
+            writer.paragraph(source.meta.abstract)
+
+        if options.include_summaries:
+            summaries = self._load(self.source_manager.get_summaries, source, "summaries")
+            if summaries:
+                writer.heading("Zusammenfassungen", 3)
+                for summary in summaries:
+                    pages = f" (S. {summary.pages})" if summary.pages else ""
+                    writer.heading(f"{summary.title}{pages}", 4)
+                    writer.paragraph(summary.content)
+
+        if options.include_quotes:
+            quotes = self._load(self.source_manager.get_quotes, source, "quotes")
+            if quotes:
+                writer.heading("Zitate", 3)
+                for quote in quotes:
+                    pages = f" (S. {quote.page_range})" if quote.page_range else ""
+                    writer.quote(f"{quote.text}{pages}")
+                    if quote.comment:
+                        writer.paragraph(quote.comment)
+
+        if options.include_notes:
+            notes = self._load(self.source_manager.get_notes, source, "notes")
+            if notes:
+                writer.heading("Notizen", 3)
+                for note in notes:
+                    page = f"S. {note.page}: " if note.page else ""
+                    writer.paragraph(f"{page}{note.content}")
+
+    @staticmethod
+    def _load(getter: Callable, source: LitSource, attribute: str) -> list:
+        try:
+            return getattr(getter(source), attribute)
+        except (OSError, ValueError, LitFormatError) as e:
+            logging.debug(f"Export: {attribute} von '{source.name}' nicht lesbar: {e}")
+            return []
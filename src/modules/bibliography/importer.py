@@ -0,0 +1,532 @@
+"""
+LitZentrum - Literatur-Import
+Streamende Leser (BibTeX; RIS und CSL-JSON in ris.py/csl_json.py), Dubletten-Abgleich
+und paralleles Anlegen der Quellen
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+import codecs
+import logging
+import re
+import unicodedata
+
+from core import LitSource, SourceManager
+from formats import LiMeta, LitFormatError
+from .bibtex import BibTeXParser
+
+
+# Standard-Makros für Monate (@string-Definitionen der Datei gehen vor)
+MONTHS = {
+    "jan": "1", "feb": "2", "mar": "3", "apr": "4", "may": "5", "jun": "6",
+    "jul": "7", "aug": "8", "sep": "9", "oct": "10", "nov": "11", "dec": "12",
+}
+
+_ENTRY_START = re.compile(r"@\s*([A-Za-z]+)\s*([{(])")
+_BRACES = re.compile(r"[{}]")
+_BRACES_PARENS = re.compile(r"[{}()]")
+_BRACES_QUOTE = re.compile(r'[{}"]')
+_FIELD_NAME = re.compile(r"\s*([^\s=,{}\"#()]+)\s*=\s*")
+_BARE_VALUE = re.compile(r"[^\s,#{}\"()]+")
+_SPACE = re.compile(r"\s*")
+_SEPARATOR = re.compile(r"\s*,?")
+
+# LaTeX-Akzente -> kombinierende Unicode-Zeichen
+_ACCENTS = {
+    '"': "\u0308", "'": "\u0301", "`": "\u0300", "^": "\u0302", "~": "\u0303",
+    "=": "\u0304", ".": "\u0307", "u": "\u0306", "v": "\u030c", "H": "\u030b",
+    "c": "\u0327", "k": "\u0328", "r": "\u030a",
+}
+_SYMBOLS = {
+    "ss": "ß", "o": "ø", "O": "Ø", "ae": "æ", "AE": "Æ", "oe": "œ", "OE": "Œ",
+    "aa": "å", "AA": "Å", "l": "ł", "L": "Ł", "i": "ı", "j": "ȷ",
+}
+_ACCENT_CMD = re.compile(
+    r"\\([\"'`^~=.]|[uvHckr](?![A-Za-z]))\s*(?:\{\s*\\?([A-Za-z])\s*\}|\\?([A-Za-z]))"
+)
+_SYMBOL_CMD = re.compile(r"\\(ss|ae|AE|oe|OE|aa|AA|[oOlL])(?![A-Za-z])(?:\{\})?\s?")
+_ESCAPED = re.compile(r"\\([&%$#_])")
+_COMMAND = re.compile(r"\\[A-Za-z]+\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def _accent(match: re.Match) -> str:
+    letter = match.group(2) or match.group(3)  # \"{\i} -> ï
+    return unicodedata.normalize("NFC", letter + _ACCENTS[match.group(1)])
+
+
+def latex_to_unicode(value: str) -> str:
+    """Wandelt LaTeX-Markup eines Feldwertes in Klartext um.
+
+    {\\"u}, \\"{u} -> ü, {\\ss} -> ß, \\& -> &; übrige Befehle und
+    Schutzklammern ({DNA}) werden entfernt, Leerraum zusammengefasst.
+    """
+    escaped = "\\" in value
+    if escaped:
+        # \{ und \} vorübergehend maskieren, damit sie das Entfernen der Klammern überstehen
+        value = value.replace("\\{", "\x01").replace("\\}", "\x02")
+        value = _ESCAPED.sub(r"\1", value)
+        value = _ACCENT_CMD.sub(_accent, value)
+        value = _SYMBOL_CMD.sub(lambda m: _SYMBOLS[m.group(1)], value)
+        value = _COMMAND.sub("", value)
+    if "{" in value or "}" in value:
+        value = value.replace("{", "").replace("}", "")
+    if escaped:
+        value = value.replace("\x01", "{").replace("\x02", "}")
+    return _WHITESPACE.sub(" ", value).strip()
+
+
+class StreamReader(ABC):
+    """Basisklasse: dekodiert eine Datei blockweise und zerlegt den Textstrom.
+
+    Unterklassen implementieren iter_entries(chunks); der Speicherbedarf
+    hängt nur von der Blockgröße und dem größten Eintrag ab, nicht von der
+    Dateigröße.
+    """
+
+    def __init__(self, chunk_size: int = 1 << 20):
+        self.chunk_size = chunk_size
+        self.bytes_read = 0
+
+    def read(self, path: Path) -> Iterator[dict]:
+        """Einträge einer Datei; `bytes_read` zeigt den Fortschritt"""
+        self.bytes_read = 0
+        with open(path, "rb") as f:
+            yield from self.iter_entries(self._chunks(f))
+
+    def parse_string(self, text: str) -> List[dict]:
+        """Alle Einträge eines Strings"""
+        return list(self.iter_entries([text]))
+
+    @abstractmethod
+    def iter_entries(self, chunks: Iterable[str]) -> Iterator[dict]:
+        """Zerlegt einen Strom von Textblöcken in Einträge"""
+        pass
+
+    def _chunks(self, f) -> Iterator[str]:
+        decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+        while True:
+            data = f.read(self.chunk_size)
+            self.bytes_read += len(data)
+            if not data:
+                tail = decoder.decode(b"", final=True)
+                if tail:
+                    yield tail
+                return
+            yield decoder.decode(data)
+
+
+class BibTeXReader(StreamReader):
+    """Liest BibTeX-Einträge stückweise, ohne die Datei ganz zu laden.
+
+    Jeder Eintrag wird erst zerlegt, wenn seine schließende Klammer im
+    Puffer liegt. Einträge werden wie bei bibtexparser als Dictionary
+    geliefert (ENTRYTYPE, ID und die Felder in Kleinbuchstaben).
+    """
+
+    def __init__(self, chunk_size: int = 1 << 20):
+        super().__init__(chunk_size)
+        self.strings: Dict[str, str] = {}
+
+    def iter_entries(self, chunks: Iterable[str]) -> Iterator[dict]:
+        """Zerlegt einen Strom von Textblöcken in Einträge"""
+        for entry_type, body in self._iter_bodies(chunks):
+            entry = self._parse_entry(entry_type.lower(), body)
+            if entry is not None:
+                yield entry
+
+    def _iter_bodies(self, chunks: Iterable[str]) -> Iterator[Tuple[str, str]]:
+        chunks = iter(chunks)
+        buf, pos, eof = "", 0, False
+        while True:
+            match = _ENTRY_START.search(buf, pos)
+            end = -1
+            if match is not None:
+                end = self._find_end(buf, match.end(), match.group(2))
+                if end >= 0:
+                    yield match.group(1), buf[match.end():end]
+                    pos = end + 1
+                    continue
+                if eof:
+                    # Unvollständiger letzter Eintrag
+                    logging.debug(f"BibTeX: Eintrag @{match.group(1)} ohne Abschluss übersprungen")
+                    pos = match.end()
+                    continue
+            elif eof:
+                return
+
+            # Mehr Text nötig: Verarbeitetes verwerfen, nächsten Block anhängen
+            if match is not None:
+                pos = match.start()
+            else:
+                at = buf.rfind("@", pos)
+                pos = at if at >= 0 else len(buf)
+            buf = buf[pos:]
+            pos = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+            else:
+                buf += chunk
+
+    @staticmethod
+    def _find_end(buf: str, start: int, opener: str) -> int:
+        """Position der schließenden Klammer eines Eintrags (-1 = fehlt)"""
+        depth = 0
+        pattern = _BRACES if opener == "{" else _BRACES_PARENS
+        for match in pattern.finditer(buf, start):
+            char = match.group()
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                if depth == 0:
+                    return match.start() if opener == "{" else -1
+                depth -= 1
+            elif char == ")" and depth == 0:
+                return match.start()
+        return -1
+
+    def _parse_entry(self, entry_type: str, body: str) -> Optional[dict]:
+        if entry_type in ("comment", "preamble"):
+            return None
+        if entry_type == "string":
+            for name, value in self._parse_fields(body).items():
+                self.strings[name] = value
+            return None
+
+        key, sep, rest = body.partition(",")
+        if "=" in key:
+            key, rest = "", body  # Eintrag ohne Schlüssel
+        entry = {"ENTRYTYPE": entry_type, "ID": key.strip()}
+        for name, value in self._parse_fields(rest).items():
+            entry[name] = latex_to_unicode(value)
+        return entry
+
+    def _parse_fields(self, text: str) -> Dict[str, str]:
+        """Felder `name = wert` (Rohwerte, Makros und # aufgelöst)"""
+        fields = {}
+        pos, length = 0, len(text)
+        while True:
+            match = _FIELD_NAME.match(text, pos)
+            if match is None:
+                break
+            name = match.group(1).lower()
+            pos = match.end()
+            parts = []
+            while pos < length:
+                char = text[pos]
+                if char == "{":
+                    end = self._closing(text, pos + 1, _BRACES)
+                    parts.append(text[pos + 1:end])
+                    pos = end + 1
+                elif char == '"':
+                    end = self._closing(text, pos + 1, _BRACES_QUOTE)
+                    parts.append(text[pos + 1:end])
+                    pos = end + 1
+                else:
+                    bare = _BARE_VALUE.match(text, pos)
+                    if bare is None:
+                        break
+                    word = bare.group()
+                    if not word.isdigit():
+                        word = self.strings.get(word.lower(), MONTHS.get(word.lower(), word))
+                    parts.append(word)
+                    pos = bare.end()
+                pos = _SPACE.match(text, pos).end()
+                if not text.startswith("#", pos):
+                    break
+                pos = _SPACE.match(text, pos + 1).end()
+            fields[name] = "".join(parts)
+            pos = _SEPARATOR.match(text, pos).end()
+        return fields
+
+    @staticmethod
+    def _closing(text: str, start: int, pattern: re.Pattern) -> int:
+        """Schließendes } bzw. " auf Klammerebene 0 (Textende, falls keins)"""
+        depth = 0
+        for match in pattern.finditer(text, start):
+            char = match.group()
+            if char == "{":
+                depth += 1
+            elif char == "}":
+                if depth == 0:
+                    return match.start()
+                depth -= 1
+            elif depth == 0:  # "
+                return match.start()
+        return len(text)
+
+
+# === Feldwerte (RIS, CSL-JSON) ===
+
+_YEAR = re.compile(r"(?<!\d)(\d{4})(?!\d)")
+_LANGUAGE = re.compile(r"([A-Za-z]{2})(?:[-_][A-Za-z]+)?")
+
+
+def parse_year(value) -> Optional[int]:
+    """Erstes plausibles Jahr aus "2020", "2020/05/01/", "Mai 2020" (sonst None)"""
+    if isinstance(value, int):
+        return value if 1000 <= value <= 2100 else None
+    for match in _YEAR.finditer(str(value or "")):
+        year = int(match.group(1))
+        if 1000 <= year <= 2100:
+            return year
+    return None
+
+
+def parse_doi(value: Optional[str]) -> Optional[str]:
+    """DOI ohne Resolver-Präfix (https://doi.org/, doi:); ungültige werden verworfen"""
+    doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", value or "", flags=re.IGNORECASE).strip()
+    if doi and not re.match(r"^10\..+/.+$", doi):
+        logging.debug(f"Ungültige DOI '{doi}' ignoriert")
+        return None
+    return doi or None
+
+
+def parse_language(value: Optional[str]) -> Optional[str]:
+    """ISO 639-1-Code aus "de", "en-US", "de_DE" (sonst None)"""
+    match = _LANGUAGE.fullmatch((value or "").strip())
+    return match.group(1).lower() if match else None
+
+
+# === Dubletten ===
+
+def normalize_doi(doi: Optional[str]) -> str:
+    """10.1000/ABC, https://doi.org/10.1000/abc, doi:10.1000/abc -> 10.1000/abc"""
+    if not doi:
+        return ""
+    doi = doi.strip().lower()
+    doi = re.sub(r"^(https?://(dx\.)?doi\.org/|doi:\s*)", "", doi)
+    return doi
+
+
+def normalize_isbn(isbn: Optional[str]) -> str:
+    """ISBN ohne Trennzeichen, ISBN-10 als ISBN-13"""
+    if not isbn:
+        return ""
+    digits = re.sub(r"[^0-9Xx]", "", isbn).upper()
+    if len(digits) == 10:
+        core = "978" + digits[:9]
+        check = (10 - sum(int(d) * (1 if i % 2 == 0 else 3) for i, d in enumerate(core)) % 10) % 10
+        digits = core + str(check)
+    return digits
+
+
+class DuplicateKeys:
+    """Kennungen (DOI, ISBN, BibTeX-Key) bekannter Quellen für den Import"""
+
+    def __init__(self):
+        self.dois: Dict[str, str] = {}
+        self.isbns: Dict[str, str] = {}
+        self.keys: Dict[str, Tuple[str, str, str]] = {}  # Key -> (Quelle, DOI, ISBN)
+
+    @classmethod
+    def from_metas(cls, metas: Dict[str, LiMeta]) -> "DuplicateKeys":
+        """Aus {Quellen-Schlüssel: LiMeta}, z.B. SourceCatalog.metas"""
+        keys = cls()
+        for name, meta in metas.items():
+            keys.add(meta, meta.bibtex_key, name)
+        return keys
+
+    def add(self, meta: LiMeta, bib_key: Optional[str], name: str):
+        doi, isbn = normalize_doi(meta.doi), normalize_isbn(meta.isbn)
+        if doi:
+            self.dois.setdefault(doi, name)
+        if isbn:
+            self.isbns.setdefault(isbn, name)
+        if bib_key:
+            self.keys.setdefault(bib_key.casefold(), (name, doi, isbn))
+
+    def match(self, meta: LiMeta, bib_key: Optional[str]) -> Optional[Tuple[str, str]]:
+        """(Feld, vorhandene Quelle) bei einer Dublette, sonst None.
+
+        Ein gleicher Zitierschlüssel allein zählt nur, wenn DOI und ISBN nicht
+        widersprechen: vorhandene Quellen tragen den erzeugten Schlüssel
+        (autor_jahr_titelwort), den auch verschiedene Werke teilen können.
+        """
+        doi = normalize_doi(meta.doi)
+        if doi and doi in self.dois:
+            return "doi", self.dois[doi]
+        isbn = normalize_isbn(meta.isbn)
+        if isbn and isbn in self.isbns:
+            return "isbn", self.isbns[isbn]
+        known = self.keys.get(bib_key.casefold()) if bib_key else None
+        if known:
+            name, known_doi, known_isbn = known
+            doi_conflict = doi and known_doi and doi != known_doi
+            isbn_conflict = isbn and known_isbn and isbn != known_isbn
+            if not (doi_conflict or isbn_conflict):
+                return "key", name
+        return None
+
+
+# === Import ===
+
+@dataclass
+class ImportResult:
+    """Ergebnis eines Literatur-Imports"""
+    entries: int = 0
+    created: List[LitSource] = field(default_factory=list)
+    duplicates: List[Tuple[str, str, str]] = field(default_factory=list)  # (Key, Feld, Quelle)
+    errors: List[str] = field(default_factory=list)
+    cancelled: bool = False  # vom Benutzer abgebrochen
+    failed: bool = False  # Schreibfehler, ab da wurde nichts mehr angelegt
+    not_imported: int = 0  # Einträge, die wegen des Schreibfehlers fehlen
+
+    def summary(self) -> str:
+        text = f"{len(self.created)} Quellen importiert, {len(self.duplicates)} Dubletten übersprungen"
+        if self.errors:
+            text += f", {len(self.errors)} Fehler"
+        if self.failed:
+            text += f"; Schreibfehler: {self.not_imported} Einträge nicht importiert"
+        if self.cancelled:
+            text += " (abgebrochen)"
+        return text
+
+
+class SourceImporter(ABC):
+    """Importiert eine Literaturdatei als Quellen eines Projekts.
+
+    Einträge werden gestreamt, gegen die vorhandenen Quellen (und bereits
+    importierte Einträge derselben Datei) per DOI, ISBN und Zitierschlüssel
+    abgeglichen und in Stapeln von `batch_size` parallel angelegt.
+    Unterklassen legen Leser und Umwandlung in LiMeta fest.
+    """
+
+    PROGRESS_EVERY = 500  # Einträge zwischen zwei Fortschrittsmeldungen
+
+    def __init__(self, source_manager: SourceManager, known: Dict[str, LiMeta] = None,
+                 batch_size: int = 256, max_workers: int = 4):
+        self.source_manager = source_manager
+        if known is None:
+            known = {s.name: s.meta for s in source_manager.get_all_sources()}
+        self.duplicates = DuplicateKeys.from_metas(known)
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+        self.result = ImportResult()
+        self._cancelled = False
+
+    def cancel(self):
+        """Bricht den laufenden Import nach dem aktuellen Stapel ab"""
+        self._cancelled = True
+
+    @abstractmethod
+    def reader(self) -> StreamReader:
+        """Neuer Leser für eine Datei"""
+        pass
+
+    @abstractmethod
+    def entry_key(self, entry: dict) -> str:
+        """Zitierschlüssel eines gelesenen Eintrags ('' wenn keiner)"""
+        pass
+
+    @abstractmethod
+    def entry_to_meta(self, entry: dict) -> LiMeta:
+        """Konvertiert einen gelesenen Eintrag zu LiMeta"""
+        pass
+
+    def import_file(self, path: Path,
+                    progress: Callable[[int, int], None] = None) -> ImportResult:
+        """Importiert eine Datei; progress(gelesene Bytes, Dateigröße)"""
+        path = Path(path)
+        total = path.stat().st_size
+        reader = self.reader()
+        self.result = result = ImportResult()
+        taken = self.source_manager.folder_names()
+        batch: List[LiMeta] = []
+
+        for entry in self._read(reader, path):
+            if self._cancelled:
+                break
+            result.entries += 1
+            if result.failed:
+                result.not_imported += 1  # nach einem Schreibfehler nur noch zählen
+                continue
+            self._add_entry(entry, batch)
+            if len(batch) >= self.batch_size:
+                self._create(batch, taken)
+                batch = []
+            if progress and result.entries % self.PROGRESS_EVERY == 0:
+                progress(reader.bytes_read, total)
+
+        if batch and not self._cancelled and not result.failed:
+            self._create(batch, taken)
+        result.cancelled = self._cancelled
+        if progress:
+            progress(total, total)
+        return result
+
+    def _read(self, reader: StreamReader, path: Path) -> Iterator[dict]:
+        """Einträge der Datei.
+
+        Nur Lesefehler (z.B. defektes JSON) werden hier abgefangen: der Strom
+        endet mit einer Fehlermeldung, Bisheriges wird noch angelegt.
+        """
+        entries = reader.read(path)
+        while True:
+            try:
+                entry = next(entries)
+            except StopIteration:
+                return
+            except ValueError as e:
+                self.result.errors.append(f"{path.name}: {e}")
+                return
+            yield entry
+
+    def _add_entry(self, entry: dict, batch: List[LiMeta]):
+        key = ""
+        try:
+            key = self.entry_key(entry)
+            meta = self.entry_to_meta(entry)
+            meta.validate()
+        except (LitFormatError, ValueError, TypeError, AttributeError) as e:
+            self.result.errors.append(f"{key or '?'}: {e}")
+            return
+        duplicate = self.duplicates.match(meta, key)
+        if duplicate:
+            self.result.duplicates.append((key, *duplicate))
+            return
+        self.duplicates.add(meta, key, key or meta.title)
+        batch.append(meta)
+
+    def _create(self, batch: List[LiMeta], taken: set):
+        try:
+            self.result.created.extend(
+                self.source_manager.create_sources(batch, self.max_workers, taken)
+            )
+        except (OSError, LitFormatError) as e:
+            logging.debug(f"Import: Stapel fehlgeschlagen: {e}")
+            self.result.errors.append(str(e))
+            self.result.failed = True
+            self.result.not_imported += len(batch)
+
+
+class BibTeXImporter(SourceImporter):
+    """Importiert eine .bib-Datei"""
+
+    def __init__(self, source_manager: SourceManager, known: Dict[str, LiMeta] = None,
+                 batch_size: int = 256, max_workers: int = 4):
+        super().__init__(source_manager, known, batch_size, max_workers)
+        self.parser = BibTeXParser()
+
+    def reader(self) -> StreamReader:
+        return BibTeXReader()
+
+    def entry_key(self, entry: dict) -> str:
+        return entry.get("ID", "")
+
+    def entry_to_meta(self, entry: dict) -> LiMeta:
+        return self.parser.entry_to_meta(entry)
+
+
+def importer_for(path: Path, source_manager: SourceManager, **kwargs) -> SourceImporter:
+    """Importer anhand der Dateiendung (.bib, .ris, .json)"""
+    from .csl_json import CSLJSONImporter
+    from .ris import RISImporter
+
+    importers = {".bib": BibTeXImporter, ".ris": RISImporter, ".json": CSLJSONImporter}
+    importer_class = importers.get(Path(path).suffix.lower())
+    if importer_class is None:
+        raise ValueError(f"Nicht unterstütztes Format: {Path(path).suffix or Path(path).name}")
+    return importer_class(source_manager, **kwargs)
@@ -0,0 +1,211 @@
+"""
+LitZentrum - Zitierschlüssel
+Projektweite Registry eindeutiger BibTeX-Keys mit a/b/c-Suffixen
+"""
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+import json
+import logging
+import os
+
+from core import LitSource, EventBus, EventType
+
+
+def key_suffix(index: int) -> str:
+    """0 -> "", 1 -> "b", 2 -> "c", ..., 25 -> "z", 26 -> "aa", ..."""
+    if index == 0:
+        return ""  # der erste Key bleibt unmarkiert ("a")
+    letters = ""
+    while index >= 0:
+        letters = chr(ord("a") + index % 26) + letters
+        index = index // 26 - 1
+    return letters
+
+
+class CitationKeyRegistry:
+    """Vergibt jeder Quelle einmalig einen eindeutigen Zitierschlüssel.
+
+    Grundlage ist LiMeta.bibtex_key; er wird nur neu berechnet, wenn sich
+    die Metadaten der Quelle ändern. Kollidieren zwei Quellen ("Smith 2020"),
+    behält die zuerst registrierte den Key, weitere erhalten die Suffixe
+    b, c, ... Einmal vergebene Keys bleiben stabil, auch wenn später Quellen
+    hinzukommen oder wegfallen. Nachschlagen in beide Richtungen ist O(1).
+    """
+
+    INDEX_FILE = "citation_keys.json"
+    VERSION = 1
+
+    def __init__(self):
+        self._keys: Dict[str, str] = {}  # Quelle -> Key
+        self._owners: Dict[str, str] = {}  # Key (casefold) -> Quelle
+        self._bases: Dict[str, Tuple[str, str]] = {}  # Quelle -> (Stempel, Basis-Key)
+        self._dirty = False
+        self._event_bus: Optional[EventBus] = None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def key_of(self, name: str) -> Optional[str]:
+        """Key einer Quelle (Ordnername), None wenn unbekannt"""
+        return self._keys.get(name)
+
+    def source_of(self, key: str) -> Optional[str]:
+        """Quelle (Ordnername) zu einem Key"""
+        return self._owners.get(key.casefold())
+
+    def key_for(self, source: LitSource) -> str:
+        """Key einer Quelle; vergibt ihn bei Bedarf"""
+        self.update_source(source)
+        return self._keys[source.name]
+
+    def keys(self) -> Dict[str, str]:
+        return dict(self._keys)
+
+    # === Abgleich ===
+
+    def sync(self, sources: Iterable[LitSource]) -> int:
+        """Gleicht mit der Quellenliste ab; Anzahl vergebener Keys.
+
+        Neue Quellen werden nach Anlagedatum registriert, damit die Suffixe
+        auch nach Verlust des Index wieder gleich vergeben werden.
+        """
+        sources = sorted(sources, key=lambda s: (s.meta.created_at, s.name))
+        seen = {source.name for source in sources}
+        changed = 0
+        for name in [n for n in self._keys if n not in seen]:
+            changed += self.remove_source(name)
+        for source in sources:
+            changed += self.update_source(source)
+        return changed
+
+    def update_source(self, source: LitSource) -> bool:
+        """Vergibt den Key neu, falls sich der Basis-Key geändert hat"""
+        name, stamp = source.name, source.meta.updated_at
+        cached = self._bases.get(name)
+        if cached is not None and cached[0] == stamp and name in self._keys:
+            return False
+
+        base = source.meta.bibtex_key
+        if cached is not None and cached[1] == base and name in self._keys:
+            self._bases[name] = (stamp, base)  # Key bleibt
+            self._dirty = True
+            return False
+
+        self._release(name)
+        key = self._assign(name, base)
+        self._bases[name] = (stamp, base)
+        self._dirty = True
+        return key is not None
+
+    def remove_source(self, name: str) -> bool:
+        if name not in self._keys:
+            return False
+        self._release(name)
+        self._bases.pop(name, None)
+        self._dirty = True
+        return True
+
+    def clear(self):
+        self._keys.clear()
+        self._owners.clear()
+        self._bases.clear()
+        self._dirty = False
+
+    def _assign(self, name: str, base: str) -> str:
+        index = 0
+        while (base + key_suffix(index)).casefold() in self._owners:
+            index += 1
+        key = base + key_suffix(index)
+        self._keys[name] = key
+        self._owners[key.casefold()] = name
+        return key
+
+    def _release(self, name: str):
+        key = self._keys.pop(name, None)
+        if key is not None and self._owners.get(key.casefold()) == name:
+            del self._owners[key.casefold()]
+
+    # === Persistenz ===
+
+    def save(self, index_dir: Path):
+        """Speichert die vergebenen Keys (nur bei Änderungen)"""
+        if not self._dirty:
+            return
+        path = Path(index_dir) / self.INDEX_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.VERSION,
+                    "keys": {
+                        name: [key, *self._bases.get(name, ("", ""))]
+                        for name, key in self._keys.items()
+                    },
+                }, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logging.debug(f"Zitierschlüssel '{path}' nicht schreibbar: {e}")
+
+    def load(self, index_dir: Path) -> "CitationKeyRegistry":
+        """Lädt gespeicherte Keys (ersetzt den bisherigen Inhalt)"""
+        self.clear()
+        path = Path(index_dir) / self.INDEX_FILE
+        if not path.exists():
+            return self
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return self
+            for name, (key, stamp, base) in data.get("keys", {}).items():
+                if key.casefold() in self._owners:
+                    continue
+                self._keys[name] = key
+                self._owners[key.casefold()] = name
+                self._bases[name] = (stamp, base)
+        except (OSError, ValueError, TypeError) as e:
+            logging.debug(f"Zitierschlüssel '{path}' nicht lesbar: {e}")
+            self.clear()
+        self._dirty = False
+        return self
+
+    # === EventBus ===
+
+    def connect(self, event_bus: EventBus):
+        """Vergibt Keys für neue und geänderte Quellen sofort"""
+        self.disconnect()
+        self._event_bus = event_bus
+        event_bus.subscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        self._event_bus.unsubscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+        self._event_bus = None
+
+    def _on_source_changed(self, source: LitSource):
+        if isinstance(source, LitSource):
+            self.update_source(source)
+
+    def _on_source_deleted(self, source):
+        self.remove_source(source.name if isinstance(source, LitSource) else str(source))
+
+
+_citation_keys: Optional[CitationKeyRegistry] = None
+
+
+def get_citation_keys() -> CitationKeyRegistry:
+    """Gibt die Key-Registry des geöffneten Projekts zurück"""
+    global _citation_keys
+    if _citation_keys is None:
+        _citation_keys = CitationKeyRegistry()
+    return _citation_keys
@@ -0,0 +1,363 @@
+"""
+LitZentrum - Manuskript-Scanner
+Findet \\cite{...} und [@key] in LaTeX-/Markdown-Manuskripten und gleicht sie mit dem Projekt ab
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+import re
+
+from core import LitSource, SourceManager
+from .keys import CitationKeyRegistry
+
+
+SUFFIXES = (".tex", ".md", ".markdown")
+
+# Ein Durchlauf pro Datei: Kommentare werden als eigene Treffer verbraucht,
+# damit darin stehende Befehle nicht zählen.
+TEX_TOKENS = re.compile(r"""
+    (?<!\\)%[^\n]*
+  | \\(?:[A-Za-z]*cite[A-Za-z]*|nocite)\*?
+    (?:\s*\[(?P<opt1>[^\]]*)\])?(?:\s*\[(?P<opt2>[^\]]*)\])?
+    \s*\{(?P<keys>[^}]*)\}
+  | \\(?:input|include|subfile)\s*\{(?P<include>[^}]+)\}
+""", re.VERBOSE)
+
+MD_KEY = r"(?:\{(?P<braced>[^}]+)\}|(?P<key>[\w][\w:.#$%&+?<>~/-]*?))(?=[.,;:!?]*(?:[^\w:.#$%&+?<>~/-]|$))"
+
+MD_TOKENS = re.compile(r"""
+    <!--.*?-->
+  | ^(?P<fence>```|~~~).*?^(?P=fence)
+  | `[^`\n]*`
+  | \[(?P<group>[^\[\]]*?(?<![\w@])-?@[^\[\]]*)\]
+  | (?<![\w@\[])@""" + MD_KEY + r"""(?:\s\[(?P<locator>[^\[\]@]*)\])?
+  | ^!include\s+(?P<include>\S+)
+  | \{\{<\s*include\s+(?P<quarto>\S+)\s*>\}\}
+""", re.VERBOSE | re.DOTALL | re.MULTILINE)
+
+# Einzelne Zitate in einer Gruppe: [vgl. @a, S. 12; @b]
+MD_GROUP_ITEM = re.compile(r"(?<![\w@])-?@" + MD_KEY + r"(?P<locator>[^;]*)")
+
+PAGE_PATTERN = re.compile(r"\d+")
+
+
+def first_page(locator: Optional[str]) -> Optional[int]:
+    """Erste Seitenzahl eines Lokators ("S. 12f.", "pp. 3-5") oder None"""
+    if not locator:
+        return None
+    match = PAGE_PATTERN.search(locator)
+    return int(match.group()) if match else None
+
+
+@dataclass(frozen=True)
+class Citation:
+    """Ein Zitat im Manuskript"""
+    key: str
+    file: str  # Pfad relativ zum Projektordner
+    line: int
+    page: Optional[int] = None
+
+    @property
+    def location(self) -> str:
+        return f"{self.file}:{self.line}"
+
+
+@dataclass
+class _FileScan:
+    """Tokenisierte Datei (wird nur bei geänderter mtime neu gelesen)"""
+    stamp: Tuple[int, int]  # (mtime_ns, Größe)
+    citations: List[Tuple[str, int, Optional[int]]]  # (Key, Zeile, Seite)
+    includes: List[str]
+
+
+@dataclass
+class CitationReport:
+    """Ergebnis eines Abgleichs mit dem Projekt"""
+    files: List[str] = field(default_factory=list)
+    parsed: int = 0  # neu eingelesene Dateien
+    used: Dict[str, List[Citation]] = field(default_factory=dict)  # Quelle -> Zitate
+    missing: Dict[str, List[Citation]] = field(default_factory=dict)  # Key -> Zitate
+    unused: List[str] = field(default_factory=list)  # nie zitierte Quellen
+
+    @property
+    def citations(self) -> int:
+        return sum(map(len, self.used.values())) + sum(map(len, self.missing.values()))
+
+    def summary(self) -> str:
+        text = (f"{self.citations} Zitate in {len(self.files)} Dateien, "
+                f"{len(self.used)} Quellen zitiert, {len(self.unused)} nicht zitiert")
+        if self.missing:
+            text += f", {len(self.missing)} unbekannte Keys"
+        return text
+
+
+def tokenize_tex(text: str) -> Tuple[List[Tuple[str, int, Optional[int]]], List[str]]:
+    """Zitate (Key, Zeile, Seite) und eingebundene Dateien einer LaTeX-Datei"""
+    citations, includes = [], []
+    line, pos = 1, 0
+    for match in TEX_TOKENS.finditer(text):
+        keys, include = match.group("keys"), match.group("include")
+        if keys is None and include is None:
+            continue  # Kommentar
+        line += text.count("\n", pos, match.start())
+        pos = match.start()
+        if include is not None:
+            includes.append(include.strip())
+            continue
+        # \cite[S. 12]{k} bzw. \cite[vgl.][S. 12]{k}: Seite steht im letzten optionalen Argument
+        page = first_page(match.group("opt2") if match.group("opt2") is not None else match.group("opt1"))
+        for key in keys.split(","):
+            key = key.strip()
+            if key and key != "*":
+                citations.append((key, line, page))
+    return citations, includes
+
+
+def tokenize_markdown(text: str) -> Tuple[List[Tuple[str, int, Optional[int]]], List[str]]:
+    """Zitate (Key, Zeile, Seite) und eingebundene Dateien einer Markdown-Datei (Pandoc-Syntax)"""
+    citations, includes = [], []
+    line, pos = 1, 0
+    for match in MD_TOKENS.finditer(text):
+        group, include = match.group("group"), match.group("include") or match.group("quarto")
+        key = match.group("braced") or match.group("key")
+        if group is None and include is None and key is None:
+            continue  # Kommentar oder Code
+        line += text.count("\n", pos, match.start())
+        pos = match.start()
+        if include is not None:
+            includes.append(include)
+        elif group is not None:
+            for item in MD_GROUP_ITEM.finditer(group):
+                citations.append((
+                    item.group("braced") or item.group("key"), line, first_page(item.group("locator"))
+                ))
+        else:
+            citations.append((key, line, first_page(match.group("locator"))))
+    return citations, includes
+
+
+TOKENIZERS = {
+    ".tex": tokenize_tex,
+    ".md": tokenize_markdown,
+    ".markdown": tokenize_markdown,
+}
+
+
+class ManuscriptScanner:
+    """Liest die Zitate eines Manuskripts inkrementell.
+
+    Ausgangspunkt sind Hauptdateien (oder Ordner); \\input, \\include,
+    \\subfile sowie !include und {{< include >}} werden verfolgt. Jede Datei
+    wird nur neu tokenisiert, wenn sich mtime oder Größe geändert haben,
+    sodass ein erneuter Scan nach dem Speichern im Wesentlichen aus stat()
+    besteht. Die Ergebnisse pro Datei werden im Index-Ordner gespeichert.
+    """
+
+    INDEX_FILE = "manuscript_citations.json"
+    VERSION = 1
+
+    def __init__(self, base_path: Path):
+        self.base_path = Path(base_path)
+        self._files: Dict[str, _FileScan] = {}
+        self._order: List[str] = []  # Dateien des letzten Scans
+        self._usage: Dict[str, list] = {}  # Quelle -> zuletzt eingetragene Verwendung
+        self._dirty = False
+        self.parsed = 0
+
+    @property
+    def files(self) -> List[Path]:
+        return [self._absolute(name) for name in self._order]
+
+    # === Scan ===
+
+    def scan(self, roots: Iterable[Path]) -> List[Path]:
+        """Liest alle Manuskriptdateien ab den Wurzeln; gibt die Dateien zurück"""
+        self.parsed = 0
+        order, seen = [], set()
+        pending = []
+        for root in roots:
+            root = self._absolute(root)
+            if root.is_dir():
+                pending.extend(sorted(
+                    path for path in root.rglob("*")
+                    if path.suffix.lower() in SUFFIXES and path.is_file()
+                ))
+            else:
+                pending.append(root)
+        pending.reverse()  # Stapel: Einbindungen werden in Lesereihenfolge abgearbeitet
+
+        while pending:
+            path = pending.pop()
+            name = self._relative(path)
+            if name in seen:
+                continue
+            seen.add(name)
+            scan = self._scan_file(path, name)
+            if scan is None:
+                continue
+            order.append(name)
+            includes = [self._resolve_include(path, include) for include in scan.includes]
+            pending.extend(reversed([p for p in includes if p is not None]))
+
+        for name in [n for n in self._files if n not in seen]:
+            del self._files[name]
+            self._dirty = True
+        if order != self._order:
+            self._order = order
+            self._dirty = True
+        return self.files
+
+    def citations(self) -> Iterable[Citation]:
+        """Alle Zitate des letzten Scans in Lesereihenfolge"""
+        for name in self._order:
+            for key, line, page in self._files[name].citations:
+                yield Citation(key, name, line, page)
+
+    def _scan_file(self, path: Path, name: str) -> Optional[_FileScan]:
+        tokenizer = TOKENIZERS.get(path.suffix.lower())
+        if tokenizer is None:
+            return None
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._files.get(name)
+        if cached is not None and cached.stamp == stamp:
+            return cached
+        try:
+            text = path.read_text(encoding="utf-8", errors="replace")
+        except OSError as e:
+            logging.debug(f"Manuskript '{path}' nicht lesbar: {e}")
+            return None
+        scan = _FileScan(stamp, *tokenizer(text))
+        self._files[name] = scan
+        self._dirty = True
+        self.parsed += 1
+        return scan
+
+    def _resolve_include(self, path: Path, include: str) -> Optional[Path]:
+        """Sucht eine eingebundene Datei neben der einbindenden, dann im Projektordner"""
+        for folder in (path.parent, self.base_path):
+            candidate = folder / include
+            if not candidate.suffix:
+                candidate = candidate.with_suffix(path.suffix)
+            if candidate.is_file():
+                return candidate
+        logging.debug(f"Eingebundene Datei '{include}' aus '{path}' nicht gefunden")
+        return None
+
+    def _relative(self, path: Path) -> str:
+        path = Path(os.path.abspath(path))
+        try:
+            return path.relative_to(self.base_path).as_posix()
+        except ValueError:
+            return str(path)
+
+    def _absolute(self, name) -> Path:
+        return Path(os.path.abspath(self.base_path / name))
+
+    # === Abgleich ===
+
+    def report(self, keys: CitationKeyRegistry, sources: Iterable[LitSource]) -> CitationReport:
+        """Löst die Keys über die Registry auf; fehlende Keys und ungenutzte Quellen"""
+        result = CitationReport(files=list(self._order), parsed=self.parsed)
+        for citation in self.citations():
+            name = keys.source_of(citation.key)
+            if name is None:
+                result.missing.setdefault(citation.key, []).append(citation)
+            else:
+                result.used.setdefault(name, []).append(citation)
+        result.unused = sorted(s.name for s in sources if s.name not in result.used)
+        return result
+
+    def update_quotes(self, report: CitationReport, sources: Iterable[LitSource],
+                      source_manager: SourceManager) -> List[LitSource]:
+        """Trägt in Quote.used_in die Manuskriptdateien ein, die das Zitat belegen.
+
+        Ein Zitat gilt als verwendet, wenn die zitierte Seite in seinem
+        Seitenbereich liegt. Nur Quellen, deren Verwendung oder Zitate-Datei
+        sich seit dem letzten Lauf geändert hat, werden geladen und
+        gespeichert. Gibt die geänderten Quellen zurück.
+        """
+        changed = []
+        sources = list(sources)
+        for name in set(self._usage) - {source.name for source in sources}:
+            del self._usage[name]
+            self._dirty = True
+        for source in sources:
+            pages = sorted({(c.file, c.page) for c in report.used.get(source.name, ()) if c.page})
+            try:
+                stamp = source.quotes_path.stat().st_mtime_ns
+            except OSError:
+                stamp = None
+            usage = [stamp, [list(item) for item in pages]]
+            if self._usage.get(source.name, [None, []]) == usage or (stamp is None and not pages):
+                continue
+
+            quotes = source_manager.get_quotes(source)
+            modified = False
+            for quote in quotes.quotes:
+                first = quote.page or 0
+                last = quote.page_end or first
+                used_in = sorted({file for file, page in pages if first and first <= page <= last})
+                if used_in != quote.used_in:
+                    quote.used_in = used_in
+                    modified = True
+            if modified:
+                source_manager.save_quotes(source, quotes)
+                usage[0] = source.quotes_path.stat().st_mtime_ns
+                changed.append(source)
+            self._usage[source.name] = usage
+            self._dirty = True
+        return changed
+
+    # === Persistenz ===
+
+    def save(self, index_dir: Path):
+        """Speichert die Scan-Ergebnisse (nur bei Änderungen)"""
+        if not self._dirty:
+            return
+        path = Path(index_dir) / self.INDEX_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.VERSION,
+                    "order": self._order,
+                    "files": {
+                        name: [list(scan.stamp), scan.citations, scan.includes]
+                        for name, scan in self._files.items()
+                    },
+                    "usage": self._usage,
+                }, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logging.debug(f"Manuskript-Index '{path}' nicht schreibbar: {e}")
+
+    def load(self, index_dir: Path) -> "ManuscriptScanner":
+        """Lädt gespeicherte Scan-Ergebnisse (fehlend/veraltet: alles wird neu gelesen)"""
+        path = Path(index_dir) / self.INDEX_FILE
+        if not path.exists():
+            return self
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION:
+                return self
+            self._files = {
+                name: _FileScan(tuple(stamp), [tuple(c) for c in citations], includes)
+                for name, (stamp, citations, includes) in data.get("files", {}).items()
+            }
+            self._order = [name for name in data.get("order", []) if name in self._files]
+            self._usage = data.get("usage", {})
+        except (OSError, ValueError, TypeError) as e:
+            logging.debug(f"Manuskript-Index '{path}' nicht lesbar: {e}")
+            self._files, self._order, self._usage = {}, [], {}
+        self._dirty = False
+        return self
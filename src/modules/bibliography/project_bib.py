@@ -0,0 +1,265 @@
+"""
+LitZentrum - Projektbibliografie
+Hält projekt_biblio.bib inkrementell aktuell (Eintrags-Offset-Index)
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import json
+import logging
+import os
+
+from core import LitSource, EventBus, EventType
+from .bibtex import BibTeXGenerator
+
+
+@dataclass
+class _Slot:
+    """Platz eines Eintrags in der .bib-Datei"""
+    offset: int
+    size: int  # Bytes inkl. Auffüllung
+    stamp: str = ""
+
+
+class ProjectBibliography:
+    """Pflegt die BibTeX-Datei eines Projekts eintragsweise.
+
+    Jeder Eintrag liegt in einem Platz fester Größe, der mit Leerzeichen
+    aufgefüllt ist (BibTeX ignoriert Text zwischen Einträgen). Ändert sich
+    eine Quelle, wird nur ihr Platz überschrieben; passt der neue Eintrag
+    nicht hinein, wird der alte Platz geleert und der Eintrag in einen
+    freien Platz oder ans Dateiende geschrieben. Die Offsets werden im
+    Index-Ordner gespeichert; passt die Datei nicht mehr dazu (extern
+    bearbeitet, Absturz), wird sie einmal komplett neu geschrieben.
+    """
+
+    INDEX_FILE = "biblio_offsets.json"
+    VERSION = 1
+    HEADER = (
+        "% LitZentrum Projektbibliografie\n"
+        "% Wird automatisch gepflegt; Änderungen von Hand gehen verloren.\n"
+    )
+    SLOT_ALIGN = 64  # Plätze in 64-Byte-Schritten ...
+    HEADROOM = 1.25  # ... mit 25 % Reserve für spätere Änderungen
+    MIN_COMPACT = 64 * 1024  # Ab so viel freiem Platz wird ggf. verdichtet
+
+    def __init__(self, bib_path: Path, generator: BibTeXGenerator = None):
+        self.bib_path = Path(bib_path)
+        self.generator = generator or BibTeXGenerator()
+        self._slots: Dict[str, _Slot] = {}
+        self._free: List[_Slot] = []
+        self._valid = False  # Datei passt zum Index
+        self._dirty = False
+        self._event_bus: Optional[EventBus] = None
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._slots
+
+    # === Abgleich ===
+
+    def sync(self, sources: Iterable[LitSource]) -> int:
+        """Gleicht die Datei mit den Quellen ab; Anzahl geschriebener Einträge"""
+        sources = list(sources)
+        if not self._valid:
+            self.rebuild(sources)
+            return len(sources)
+
+        changed = 0
+        seen = set()
+        for source in sources:
+            seen.add(source.name)
+            changed += self.update_source(source)
+        for key in [k for k in self._slots if k not in seen]:
+            changed += self.remove_source(key)
+        return changed
+
+    def update_source(self, source: LitSource, force: bool = False) -> bool:
+        """Schreibt den Eintrag einer Quelle neu (nur wenn geändert)"""
+        if not self._valid:
+            return False
+        key, stamp = source.name, source.meta.updated_at
+        slot = self._slots.get(key)
+        if slot is not None and slot.stamp == stamp and not force:
+            return False
+
+        data = self._entry_bytes(source)
+        if slot is not None and len(data) <= slot.size:
+            self._write(slot.offset, self._padded(data, slot.size))
+        else:
+            if slot is not None:
+                self._release(slot)
+            slot = self._allocate(data)
+        slot.stamp = stamp
+        self._slots[key] = slot
+        self._dirty = True
+        self._maybe_compact()
+        return True
+
+    def remove_source(self, key: str) -> bool:
+        """Entfernt den Eintrag einer Quelle"""
+        slot = self._slots.pop(key, None)
+        if slot is None or not self._valid:
+            return False
+        self._release(slot)
+        self._dirty = True
+        self._maybe_compact()
+        return True
+
+    def rebuild(self, sources: Iterable[LitSource]):
+        """Schreibt die Datei komplett neu"""
+        self._slots.clear()
+        self._free.clear()
+        self.bib_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.bib_path.with_name(self.bib_path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(self.HEADER.encode("utf-8"))
+            for source in sources:
+                data = self._entry_bytes(source)
+                size = self._slot_size(len(data))
+                self._slots[source.name] = _Slot(f.tell(), size, source.meta.updated_at)
+                f.write(self._padded(data, size))
+        os.replace(tmp_path, self.bib_path)
+        self._valid = True
+        self._dirty = True
+
+    def compact(self):
+        """Entfernt freie Plätze (liest die Einträge aus der Datei, keine Neuerzeugung)"""
+        slots = sorted(self._slots.items(), key=lambda item: item[1].offset)
+        tmp_path = self.bib_path.with_name(self.bib_path.name + ".tmp")
+        with open(self.bib_path, "rb") as src, open(tmp_path, "wb") as dst:
+            dst.write(self.HEADER.encode("utf-8"))
+            for key, slot in slots:
+                src.seek(slot.offset)
+                data = src.read(slot.size).strip()
+                size = self._slot_size(len(data))
+                self._slots[key] = _Slot(dst.tell(), size, slot.stamp)
+                dst.write(self._padded(data, size))
+        os.replace(tmp_path, self.bib_path)
+        self._free.clear()
+        self._dirty = True
+
+    def _maybe_compact(self):
+        wasted = sum(slot.size for slot in self._free)
+        if wasted > self.MIN_COMPACT and wasted > sum(s.size for s in self._slots.values()):
+            self.compact()
+
+    # === Plätze ===
+
+    def _entry_bytes(self, source: LitSource) -> bytes:
+        return self.generator.generate_entry(source).encode("utf-8")
+
+    def _slot_size(self, length: int) -> int:
+        needed = int((length + 2) * self.HEADROOM)
+        return -(-needed // self.SLOT_ALIGN) * self.SLOT_ALIGN
+
+    @staticmethod
+    def _padded(data: bytes, size: int) -> bytes:
+        """\\n + Eintrag + \\n, mit Leerzeichen auf `size` Bytes aufgefüllt"""
+        return b"\n" + data + b"\n" + b" " * (size - len(data) - 2)
+
+    def _allocate(self, data: bytes) -> _Slot:
+        """Schreibt einen Eintrag in einen freien Platz oder ans Dateiende"""
+        for i, free in enumerate(self._free):
+            if len(data) + 2 <= free.size:
+                del self._free[i]
+                self._write(free.offset, self._padded(data, free.size))
+                return _Slot(free.offset, free.size)
+        size = self._slot_size(len(data))
+        with open(self.bib_path, "ab") as f:
+            f.seek(0, os.SEEK_END)
+            offset = f.tell()
+            f.write(self._padded(data, size))
+        return _Slot(offset, size)
+
+    def _release(self, slot: _Slot):
+        """Leert einen Platz und merkt ihn zur Wiederverwendung vor"""
+        self._write(slot.offset, b" " * (slot.size - 1) + b"\n")
+        self._free.append(_Slot(slot.offset, slot.size))
+
+    def _write(self, offset: int, data: bytes):
+        with open(self.bib_path, "r+b") as f:
+            f.seek(offset)
+            f.write(data)
+
+    def _file_state(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = self.bib_path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    # === Persistenz ===
+
+    def save(self, index_dir: Path):
+        """Speichert den Offset-Index (nur bei Änderungen)"""
+        if not self._dirty or not self._valid:
+            return
+        path = Path(index_dir) / self.INDEX_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.VERSION,
+                    "file": self._file_state(),
+                    "slots": {k: [s.offset, s.size, s.stamp] for k, s in self._slots.items()},
+                    "free": [[s.offset, s.size] for s in self._free],
+                }, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logging.debug(f"Bibliografie-Index '{path}' nicht schreibbar: {e}")
+
+    def load(self, index_dir: Path) -> "ProjectBibliography":
+        """Lädt den Offset-Index (fehlend/veraltet: Neuaufbau beim nächsten sync)"""
+        path = Path(index_dir) / self.INDEX_FILE
+        if not path.exists():
+            return self
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            state = self._file_state()
+            if data.get("version") != self.VERSION or state is None or list(state) != data.get("file"):
+                return self
+            self._slots = {k: _Slot(*v) for k, v in data.get("slots", {}).items()}
+            self._free = [_Slot(*v) for v in data.get("free", [])]
+            self._valid = True
+        except (OSError, ValueError, TypeError) as e:
+            logging.debug(f"Bibliografie-Index '{path}' nicht lesbar: {e}")
+        self._dirty = False
+        return self
+
+    # === EventBus ===
+
+    def connect(self, event_bus: EventBus):
+        """Schreibt Einträge bei Quellen-Events sofort nach"""
+        self.disconnect()
+        self._event_bus = event_bus
+        event_bus.subscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        self._event_bus.unsubscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+        self._event_bus = None
+
+    def _on_source_changed(self, source: LitSource):
+        if isinstance(source, LitSource):
+            try:
+                self.update_source(source, force=True)
+            except OSError as e:
+                logging.debug(f"Projektbibliografie nicht aktualisiert: {e}")
+
+    def _on_source_deleted(self, source):
+        key = source.name if isinstance(source, LitSource) else str(source)
+        try:
+            self.remove_source(key)
+        except OSError as e:
+            logging.debug(f"Projektbibliografie nicht aktualisiert: {e}")
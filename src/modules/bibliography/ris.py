@@ -0,0 +1,193 @@
+"""
+LitZentrum - RIS
+Streamender RIS-Leser, Export und Import (Zotero, Citavi, EndNote)
+"""
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import re
+
+from core import LitSource
+from formats import LiMeta
+from .base import BibliographyWriter
+from .importer import SourceImporter, StreamReader, parse_doi, parse_language, parse_year
+
+
+_TAG_LINE = re.compile(r"([A-Z][A-Z0-9]) {1,2}-(?: (.*))?$")
+_PAGE_RANGE = re.compile(r"\s*(?:--|–|-)\s*")
+
+# RIS-Typ -> source_type (nicht aufgeführte Typen: "other")
+RIS_TYPES = {
+    "JOUR": "article", "JFULL": "article", "MGZN": "article", "NEWS": "article", "EJOUR": "article",
+    "BOOK": "book", "EBOOK": "book", "EDBOOK": "book",
+    "CHAP": "chapter", "ECHAP": "chapter",
+    "THES": "thesis",
+    "CONF": "conference", "CPAPER": "conference",
+    "ELEC": "website", "WEB": "website", "BLOG": "website",
+}
+
+# Zeitschrift bzw. Sammelwerk (bei Kapiteln zusätzlich BT)
+CONTAINER_TAGS = ("T2", "JO", "JF", "JA", "J2")
+
+# source_type -> RIS-Typ beim Export
+EXPORT_TYPES = {
+    "article": "JOUR",
+    "book": "BOOK",
+    "chapter": "CHAP",
+    "thesis": "THES",
+    "conference": "CPAPER",
+    "website": "ELEC",
+    "other": "GEN",
+}
+
+
+class RISReader(StreamReader):
+    """Liest RIS-Datensätze zeilenweise.
+
+    Ein Datensatz reicht von "TY  - " bis "ER  - " und wird als Dictionary
+    Tag -> Liste der Werte geliefert (Tags wie AU und KW kommen mehrfach
+    vor). Zeilen ohne Tag setzen den vorherigen Wert fort.
+    """
+
+    def iter_entries(self, chunks: Iterable[str]) -> Iterator[Dict[str, List[str]]]:
+        record: Optional[Dict[str, List[str]]] = None
+        values: Optional[List[str]] = None
+        for line in self._lines(chunks):
+            match = _TAG_LINE.match(line)
+            if match is None:
+                if values and line.strip():
+                    values[-1] = f"{values[-1]} {line.strip()}".strip()
+                continue
+            tag, value = match.group(1), (match.group(2) or "").strip()
+            if tag == "TY":
+                if record:
+                    yield record  # Datensatz ohne ER
+                record, values = {"TY": [value]}, None
+            elif record is None:
+                continue  # Text außerhalb eines Datensatzes
+            elif tag == "ER":
+                yield record
+                record = values = None
+            else:
+                values = record.setdefault(tag, [])
+                values.append(value)
+        if record:
+            yield record
+
+    @staticmethod
+    def _lines(chunks: Iterable[str]) -> Iterator[str]:
+        rest = ""
+        for chunk in chunks:
+            lines = (rest + chunk).split("\n")
+            rest = lines.pop()
+            for line in lines:
+                yield line.rstrip("\r")
+        if rest:
+            yield rest.rstrip("\r")
+
+
+def _first(record: Dict[str, List[str]], *tags: str) -> Optional[str]:
+    for tag in tags:
+        for value in record.get(tag, ()):
+            if value:
+                return value
+    return None
+
+
+def ris_to_meta(record: Dict[str, List[str]]) -> LiMeta:
+    """Konvertiert einen RIS-Datensatz zu LiMeta"""
+    source_type = RIS_TYPES.get(_first(record, "TY") or "", "other")
+    pages = None
+    start, end = _first(record, "SP"), _first(record, "EP")
+    if start:
+        pages = f"{start}-{end}" if end and end != start else start
+    isbn = None
+    serial = _first(record, "SN")
+    if serial and source_type != "article" and len(re.sub(r"[^0-9Xx]", "", serial)) in (10, 13):
+        isbn = serial  # bei Zeitschriften steht in SN die ISSN
+    tags = [k.strip() for value in record.get("KW", ()) for k in value.split(";") if k.strip()]
+    meta = LiMeta(
+        title=_first(record, "TI", "T1", "CT", "BT") or "Untitled",
+        authors=[a for a in record.get("AU", []) + record.get("A1", []) if a],
+        year=parse_year(_first(record, "PY", "Y1", "DA")),
+        source_type=source_type,
+        journal=_first(record, *CONTAINER_TAGS, *(("BT",) if source_type == "chapter" else ())),
+        volume=_first(record, "VL"),
+        issue=_first(record, "IS"),
+        pages=pages,
+        publisher=_first(record, "PB"),
+        doi=parse_doi(_first(record, "DO")),
+        isbn=isbn,
+        url=_first(record, "UR"),
+        abstract=_first(record, "AB", "N2"),
+        tags=tags,
+        metadata_source="ris_import",
+    )
+    language = parse_language(_first(record, "LA"))
+    if language:
+        meta.language = language
+    return meta
+
+
+def _split_pages(pages: str) -> Tuple[str, str]:
+    """Seitenbereich "12--20" -> ("12", "20"), einzelne Seite -> ("12", "")"""
+    parts = _PAGE_RANGE.split(pages.strip(), 1)
+    return parts[0], (parts[1] if len(parts) > 1 else "")
+
+
+class RISWriter(BibliographyWriter):
+    """Schreibt RIS-Datensätze.
+
+    Schlüssel, Streaming und atomares Speichern (write, save_bibliography)
+    kommen von BibliographyWriter; nur das Eintragsformat unterscheidet sich.
+    """
+
+    FILE_EXTENSION = ".ris"
+
+    def generate_entry(self, item: Union[LitSource, LiMeta], key: str = None) -> str:
+        """Ein RIS-Datensatz (aus einer Quelle oder LiMeta)"""
+        key = key or self.key_for(item)
+        meta = item.meta if isinstance(item, LitSource) else item
+        ris_type = EXPORT_TYPES.get(meta.source_type, "GEN")
+        lines = [("TY", ris_type), ("ID", key)]
+        lines.extend(("AU", author) for author in meta.authors)
+        lines.append(("TI", meta.title))
+        if meta.journal:
+            lines.append(("JO" if ris_type == "JOUR" else "T2", meta.journal))
+        if meta.year:
+            lines.append(("PY", str(meta.year)))
+        if meta.volume:
+            lines.append(("VL", meta.volume))
+        if meta.issue:
+            lines.append(("IS", meta.issue))
+        if meta.pages:
+            start, end = _split_pages(meta.pages)
+            lines.append(("SP", start))
+            if end:
+                lines.append(("EP", end))
+        if meta.publisher:
+            lines.append(("PB", meta.publisher))
+        if meta.doi:
+            lines.append(("DO", meta.doi))
+        if meta.isbn:
+            lines.append(("SN", meta.isbn))
+        if meta.url:
+            lines.append(("UR", meta.url))
+        if meta.abstract:
+            lines.append(("AB", meta.abstract))
+        lines.extend(("KW", tag) for tag in meta.tags)
+        if meta.language:
+            lines.append(("LA", meta.language))
+        text = "\n".join(f"{tag}  - {' '.join(str(value).split())}" for tag, value in lines)
+        return text + "\nER  - "
+
+
+class RISImporter(SourceImporter):
+    """Importiert eine .ris-Datei"""
+
+    def reader(self) -> StreamReader:
+        return RISReader()
+
+    def entry_key(self, entry: dict) -> str:
+        return _first(entry, "ID") or ""
+
+    def entry_to_meta(self, entry: dict) -> LiMeta:
+        return ris_to_meta(entry)
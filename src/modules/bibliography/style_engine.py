@@ -0,0 +1,414 @@
+"""
+LitZentrum - Stil-Engine
+Übersetzt deklarative Zitations-Templates einmalig in Python-Funktionen
+"""
+from dataclasses import dataclass, field, fields
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from formats import LiMeta
+from .writers import EMPHASIS_PATTERN
+
+
+class StyleError(ValueError):
+    """Fehlerhaftes Template oder fehlerhafte Stildefinition"""
+
+
+# === Filter ===
+# Jeder Filter ist eine Fabrik: sie erhält beim Kompilieren das Argument
+# (Text nach "=") und liefert die Funktion, die den Feldwert umwandelt.
+
+def _filter_etal(arg: str) -> Callable:
+    """Autoren "A, B & C"; mehr als N (Standard 3): "A et al." """
+    limit = int(arg or 3)
+
+    def etal(authors) -> str:
+        if not authors:
+            return "Unbekannt"
+        if len(authors) == 1:
+            return authors[0]
+        if len(authors) <= limit:
+            return ", ".join(authors[:-1]) + " & " + authors[-1]
+        return authors[0] + " et al."
+    return etal
+
+
+def _filter_first(arg: str) -> Callable:
+    """Erstes Element einer Liste"""
+    return lambda value: value[0] if value else ""
+
+
+def _filter_join(arg: str) -> Callable:
+    """Liste mit Trennzeichen verbinden (Standard ", ")"""
+    separator = arg or ", "
+    return lambda value: separator.join(value) if value else ""
+
+
+def _filter_family(arg: str) -> Callable:
+    """Nachname aus "Nachname, Vorname" (bei Listen: vom ersten Eintrag)"""
+    def family(value) -> str:
+        if isinstance(value, list):
+            value = value[0] if value else ""
+        return value.split(",")[0].strip() if value else ""
+    return family
+
+
+def _filter_upper(arg: str) -> Callable:
+    return lambda value: _text(value).upper()
+
+
+def _filter_lower(arg: str) -> Callable:
+    return lambda value: _text(value).lower()
+
+
+def _filter_plain(arg: str) -> Callable:
+    """Entfernt *kursiv*-Markierungen"""
+    return lambda value: EMPHASIS_PATTERN.sub(r"\1", _text(value))
+
+
+# Filter, die der Compiler direkt als Ausdruck einsetzt: (Name oder meta.feld,
+# Argument) -> Ausdruck; spart den Funktionsaufruf je Eintrag
+INLINE_FILTERS: Dict[str, Callable[[str, str], str]] = {
+    "etal": lambda value, arg: (
+        f"((({value}[0] if len({value}) == 1 else ', '.join({value}[:-1]) + ' & ' + {value}[-1])"
+        f" if len({value}) <= {int(arg or 3)} else {value}[0] + ' et al.') if {value} else 'Unbekannt')"
+    ),
+    "first": lambda value, arg: f"({value} or ('',))[0]",
+    "join": lambda value, arg: f"{(arg or ', ')!r}.join({value})",
+}
+
+# Filter, deren Ergebnis nie leer ist
+NONEMPTY_FILTERS = frozenset({"etal"})
+
+# Filter, deren Ergebnis genau dann leer ist, wenn die Liste leer ist
+EMPTY_PRESERVING_FILTERS = frozenset({"join"})
+
+FILTERS: Dict[str, Callable[[str], Callable]] = {
+    "etal": _filter_etal,
+    "first": _filter_first,
+    "join": _filter_join,
+    "family": _filter_family,
+    "upper": _filter_upper,
+    "lower": _filter_lower,
+    "plain": _filter_plain,
+}
+
+
+def _text(value) -> str:
+    if not value:
+        return ""
+    if isinstance(value, list):
+        return ", ".join(value)
+    return str(value)
+
+
+# Felder, die Templates verwenden dürfen (page = Seitenangabe beim Zitat);
+# Text- und Zahlenfelder setzt der f-String direkt ein, Listen über _text
+FIELDS = frozenset(f.name for f in fields(LiMeta)) | {"first_author", "citation_key", "page"}
+_SCALAR_FIELDS = frozenset(
+    f.name for f in fields(LiMeta) if f.type in (str, int, Optional[str], Optional[int])
+) | {"first_author", "citation_key", "page"}
+
+
+# === Parser ===
+
+@dataclass
+class _Field:
+    name: str
+    filters: List[Tuple[str, str]] = field(default_factory=list)
+    default: Optional[str] = None
+
+
+@dataclass
+class _Branch:
+    types: Tuple[str, ...] = ()
+    negate: bool = False
+    nodes: List = field(default_factory=list)
+
+
+@dataclass
+class _Group:
+    branches: List[_Branch] = field(default_factory=list)
+
+
+Node = Union[str, _Field, _Group]
+
+class _Parser:
+    """Template-Syntax:
+
+    {feld}                 Wert des Feldes (leer, wenn nicht gesetzt)
+    {feld:filter=arg}      Filter anwenden (mehrere: {a:f1:f2})
+    {feld|Text}            Ersatztext, wenn das Feld leer ist
+    [ ... ]                optionale Gruppe: entfällt, wenn ein Feld darin leer ist
+    [ A || B ]             Alternativen: die erste vollständige wird verwendet
+    [article,book? ... ]   Alternative nur für diese Quellentypen (!article? = alle außer)
+    \\[ \\] \\{ \\} \\|         Sonderzeichen als Text
+    """
+
+    def __init__(self, template: str):
+        self.text = template
+        self.pos = 0
+
+    def parse(self) -> List[Node]:
+        nodes = self._sequence(top=True)
+        if self.pos < len(self.text):
+            self._error(f"unerwartetes '{self.text[self.pos]}'")
+        return nodes
+
+    def _error(self, message: str):
+        raise StyleError(f"Template-Fehler an Position {self.pos}: {message} in {self.text!r}")
+
+    def _sequence(self, top: bool = False) -> List[Node]:
+        nodes: List[Node] = []
+        literal = []
+        text = self.text
+        while self.pos < len(text):
+            char = text[self.pos]
+            if char == "\\" and self.pos + 1 < len(text):
+                literal.append(text[self.pos + 1])
+                self.pos += 2
+                continue
+            if char == "]" or (char == "|" and text.startswith("||", self.pos)):
+                if top:
+                    self._error(f"'{char}' außerhalb einer Gruppe")
+                break
+            if char in "{[":
+                if literal:
+                    nodes.append("".join(literal))
+                    literal = []
+                nodes.append(self._field() if char == "{" else self._group())
+                continue
+            if char == "}":
+                self._error("'}' ohne '{'")
+            literal.append(char)
+            self.pos += 1
+        if literal:
+            nodes.append("".join(literal))
+        return nodes
+
+    def _field(self) -> _Field:
+        end = self.text.find("}", self.pos)
+        if end < 0:
+            self._error("'{' ohne '}'")
+        spec = self.text[self.pos + 1:end]
+        self.pos = end + 1
+        spec, bar, default = spec.partition("|")
+        name, *filter_specs = spec.split(":")
+        name = name.strip()
+        if name not in FIELDS:
+            self._error(f"unbekanntes Feld '{name}'")
+        filters = []
+        for filter_spec in filter_specs:
+            filter_name, _, arg = filter_spec.partition("=")
+            if filter_name.strip() not in FILTERS:
+                self._error(f"unbekannter Filter '{filter_name}'")
+            filters.append((filter_name.strip(), arg))
+        return _Field(name, filters, default if bar else None)
+
+    def _group(self) -> _Group:
+        self.pos += 1  # "["
+        group = _Group()
+        while True:
+            branch = _Branch()
+            head = self.text[self.pos:self.pos + 64]
+            question = head.find("?")
+            if question > 0 and all(c.isalnum() or c in ",_!" for c in head[:question]):
+                types = head[:question]
+                branch.negate = types.startswith("!")
+                branch.types = tuple(t for t in types.lstrip("!").split(",") if t)
+                self.pos += question + 1
+            branch.nodes = self._sequence()
+            group.branches.append(branch)
+            if self.text.startswith("||", self.pos):
+                self.pos += 2
+                continue
+            if self.pos >= len(self.text):
+                self._error("'[' ohne ']'")
+            self.pos += 1  # "]"
+            return group
+
+
+# === Compiler ===
+
+class _Compiler:
+    """Erzeugt aus dem Syntaxbaum den Quelltext einer render(meta, page)-Funktion.
+
+    Jede Gruppe wird zu einer if/elif-Kette, die ihren Text einer lokalen
+    Variablen zuweist; jede Ebene (Zweig bzw. das ganze Template) ist ein
+    einziger f-String aus Text, Feldern und diesen Variablen. Das Ergebnis
+    entsteht so ohne schrittweises Verketten. Felder werden erst dort
+    gelesen, wo eine Gruppe sie prüft oder ausgibt; ein geprüftes Feld wird
+    im Zweig unverändert eingesetzt, nur Felder außerhalb von Gruppen werden
+    auf '' normalisiert.
+    """
+
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, object] = {"_text": _text}
+        self.counter = 0
+
+    def compile(self, nodes: List[Node], name: str) -> Callable:
+        text = self._sequence(nodes, {}, 1)
+        body = "".join(f"    {line}\n" for line in self.lines)
+        source = f"def render(meta, page=None):\n{body}    return {text}{_strip_call(nodes)}\n"
+        code = compile(source, f"<Zitierstil {name}>", "exec")
+        exec(code, self.namespace)
+        render = self.namespace["render"]
+        render.source = source
+        return render
+
+    def _emit(self, line: str, depth: int):
+        self.lines.append("    " * (depth - 1) + line)
+
+    def _var(self, prefix: str) -> str:
+        var = f"{prefix}{self.counter}"
+        self.counter += 1
+        return var
+
+    def _load(self, node: _Field, scope: Dict[Tuple, str], depth: int, guard: bool) -> str:
+        """Liest den (gefilterten) Feldwert in eine lokale Variable.
+
+        guard: der Wert wird nur als Bedingung bzw. in deren Zweig verwendet.
+        """
+        key = (node.name, tuple(node.filters), node.default)
+        var = scope.get(key)
+        if var is not None:
+            return var
+        expr = "page" if node.name == "page" else f"meta.{node.name}"
+        if guard and not node.filters and node.default is None and node.name in _SCALAR_FIELDS:
+            # Attribute lesen ist billiger als eine zusätzliche Variable
+            scope[key] = expr
+            return expr
+        for filter_name, arg in node.filters:
+            if filter_name in INLINE_FILTERS:
+                if not expr.replace("meta.", "", 1).isidentifier():
+                    # Inline-Filter verwenden den Wert mehrfach
+                    tmp = self._var("t")
+                    self._emit(f"{tmp} = {expr}", depth)
+                    expr = tmp
+                expr = INLINE_FILTERS[filter_name](expr, arg)
+                continue
+            func = f"_f{len(self.namespace)}"
+            self.namespace[func] = FILTERS[filter_name](arg)
+            expr = f"{func}({expr})"
+        if not node.filters and node.name not in _SCALAR_FIELDS:
+            expr = f"_text({expr})"
+        if node.default is not None:
+            expr = f"({expr}) or {node.default!r}" if node.filters else f"{expr} or {node.default!r}"
+        elif not guard and node.name in _SCALAR_FIELDS:
+            expr = f"{expr} or ''"
+        var = self._var("v")
+        self._emit(f"{var} = {expr}", depth)
+        scope[key] = var
+        return var
+
+    def _sequence(self, nodes: List[Node], scope: Dict[Tuple, str], depth: int,
+                  guarded: bool = False) -> str:
+        """Ausdruck für Text, Felder und Gruppen einer Ebene (ein f-String)"""
+        for node in nodes:
+            if isinstance(node, _Field):
+                self._load(node, scope, depth, guarded and node.default is None)
+        parts = []
+        for node in nodes:
+            if isinstance(node, _Group):
+                parts.append((self._group(node, scope, depth), True))
+            elif isinstance(node, _Field):
+                parts.append((scope[(node.name, tuple(node.filters), node.default)], True))
+            else:
+                parts.append((node, False))
+        if not parts:
+            return "''"
+        if all(not is_code for _, is_code in parts):
+            return repr("".join(text for text, _ in parts))
+        if len(parts) == 1 and parts[0][0].startswith("g"):
+            return parts[0][0]  # nur eine Gruppe: deren Text (immer str)
+        return "f" + repr("".join(
+            f"{{{text}}}" if is_code else text.replace("{", "{{").replace("}", "}}")
+            for text, is_code in parts
+        ))
+
+    def _group(self, group: _Group, scope: Dict[Tuple, str], depth: int) -> str:
+        """if/elif-Kette über die Alternativen; Name der Variablen mit dem Text"""
+        var = self._var("g")
+        chain_scope = dict(scope)  # gilt auch in den folgenden Zweigen
+        first, closed = True, False
+        for branch in group.branches:
+            mark = len(self.lines)
+            conditions = []
+            if branch.types:
+                if len(branch.types) == 1:
+                    test = "!=" if branch.negate else "=="
+                    types = repr(branch.types[0])
+                else:
+                    test = "not in" if branch.negate else "in"
+                    types = repr(branch.types)
+                conditions.append(f"meta.source_type {test} {types}")
+            for node in branch.nodes:
+                if isinstance(node, _Field) and node.default is None:
+                    if node.filters and all(f in EMPTY_PRESERVING_FILTERS for f, _ in node.filters):
+                        # Die Liste selbst prüfen; umgewandelt wird erst im Zweig
+                        conditions.append(f"meta.{node.name}")
+                        continue
+                    conditions.append(self._load(node, chain_scope, depth + (not first), guard=True))
+            if not first and len(self.lines) > mark:
+                # Bedingung braucht vorab gelesene Werte: else + if statt elif
+                self.lines.insert(mark, "    " * (depth - 1) + "else:")
+                depth += 1
+                first = True
+            if conditions:
+                self._emit(f"{'if' if first else 'elif'} {' and '.join(conditions)}:", depth)
+            elif not first:
+                self._emit("else:", depth)
+            body_depth = depth + 1 if conditions or not first else depth
+            text = self._sequence(branch.nodes, dict(chain_scope), body_depth, guarded=True)
+            self._emit(f"{var} = {text}", body_depth)
+            first = False
+            if not conditions:
+                closed = True
+                break
+        if not closed:
+            self._emit("else:", depth)
+            self._emit(f"{var} = ''", depth + 1)
+        return var
+
+
+def _edge(nodes: List[Node], leading: bool, guarded: bool = False) -> Tuple[bool, bool]:
+    """(kann mit Leerraum aus dem Template beginnen/enden, kann leer sein).
+
+    Feldwerte selbst werden nicht beschnitten; ein Feld zählt nur, wenn es
+    sicher nicht leer ist (in einer Gruppe geprüft, Ersatztext, etal).
+    """
+    space = False
+    for node in (nodes if leading else reversed(nodes)):
+        if isinstance(node, str):
+            char = node[0] if leading else node[-1]
+            return space or char.isspace(), False
+        if isinstance(node, _Field):
+            if node.default:
+                char = node.default[0] if leading else node.default[-1]
+                return space or char.isspace(), False
+            if guarded or (node.filters and node.filters[-1][0] in NONEMPTY_FILTERS):
+                return space, False
+            continue
+        empty = not any(not branch.types and all(
+            not isinstance(n, _Field) or n.default is not None for n in branch.nodes
+        ) for branch in node.branches)
+        for branch in node.branches:
+            branch_space, branch_empty = _edge(branch.nodes, leading, guarded=True)
+            space = space or branch_space
+            empty = empty or branch_empty
+        if not empty:
+            return space, False
+    return space, True
+
+
+def _strip_call(nodes: List[Node]) -> str:
+    """Nur den Rand beschneiden, an dem Leerraum aus Gruppen stehen kann"""
+    left, right = _edge(nodes, True)[0], _edge(nodes, False)[0]
+    if left and right:
+        return ".strip()"
+    return ".lstrip()" if left else ".rstrip()" if right else ""
+
+
+def compile_template(template: str, name: str = "") -> Callable[..., str]:
+    """Übersetzt ein Template in eine Funktion render(meta, page=None) -> str"""
+    return _Compiler().compile(_Parser(template).parse(), name or template[:30])
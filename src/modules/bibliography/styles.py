@@ -2,308 +2,342 @@
 LitZentrum - Zitationsstile
 Formatiert Zitate nach verschiedenen Stilen (APA, MLA, Chicago, DIN, Harvard)
 """
-from abc import ABC, abstractmethod
-from typing import Optional
+from functools import lru_cache
+from operator import itemgetter
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple, Union
+import json
+import logging
 
+from core import LitSource
 from formats import LiMeta
+from modules.search.collation import collation_key, name_sort_key
+from .style_engine import StyleError, compile_template
+from .writers import open_writer
 
 
-class CitationFormatter(ABC):
-    """Abstrakte Basisklasse für Zitationsformatierer"""
-    
-    @abstractmethod
+# Eingebaute Stile. Syntax der Templates: siehe style_engine._Parser.
+# Eigene Stile liegen als JSON-Dateien gleichen Aufbaus im Ordner
+# "styles" des Projekts (Dateiname = Stil-ID).
+BUILTIN_STYLES: Dict[str, dict] = {
+    "apa": {
+        "name": "APA (7th Edition)",
+        "reference": (
+            "{authors:etal} ({year|o.J.})."
+            "[article? {title}.|| *{title}*.]"
+            "[ *{journal}*[, *{volume}*][({issue})][, {pages}].|| {publisher}.]"
+            "[ https://doi.org/{doi}]"
+        ),
+        "inline": "({first_author}, {year|o.J.}[, S. {page}])",
+    },
+    "mla": {
+        "name": "MLA (9th Edition)",
+        "reference": (
+            "[{authors:first}.]"
+            "[article? \"{title}.\"|| *{title}*.]"
+            "[ *{journal}*[, vol. {volume}][, no. {issue}][, {year}][, pp. {pages}].|| {publisher}, {year|n.d.}.]"
+        ),
+        "inline": "({first_author}[ {page}])",
+    },
+    "chicago": {
+        "name": "Chicago",
+        "reference": (
+            "{authors:etal}."
+            "[article? \"{title}.\"|| *{title}*.]"
+            "[ *{journal}*[ {volume}][, no. {issue}][ ({year})][: {pages}].|| {publisher}, {year|n.d.}.]"
+        ),
+        "inline": "({first_author} {year|n.d.}[, {page}])",
+    },
+    "din": {
+        "name": "DIN 1505-2",
+        "reference": (
+            "[{authors:join=; }:]"
+            "[ {title}.]"
+            "[ In: {journal}[ Bd. {volume}][ ({year})][ S. {pages}]|| {publisher}[ {year}]]"
+            "[ – ISBN {isbn}]"
+        ),
+        "inline": "\\[{first_author} {year|o.J.}[, S. {page}]\\]",
+    },
+    "harvard": {
+        "name": "Harvard",
+        "reference": (
+            "{authors:etal} ({year|n.d.})"
+            "[article? '{title}',|| *{title}*,]"
+            "[ *{journal}*[, {volume}][({issue})][, pp. {pages}].|| {publisher}.]"
+        ),
+        "inline": "({first_author}, {year|n.d.}[, p. {page}])",
+    },
+}
+
+
+class CitationFormatter:
+    """Zitierstil aus zwei Templates (Literaturverzeichnis und Inline-Zitat).
+
+    Die Templates werden einmal in Python-Funktionen übersetzt (gleiche
+    Templates teilen sich die Übersetzung); ein neuer Stil braucht daher nur
+    eine Definition, keine eigene Klasse. Unterklassen für eingebaute Stile
+    setzen STYLE_ID.
+    """
+
+    STYLE_ID: Optional[str] = None
+
+    def __init__(self, style_id: str = None, name: str = None,
+                 reference: str = None, inline: str = None):
+        style_id = style_id or self.STYLE_ID
+        if reference is None or inline is None:
+            if style_id not in BUILTIN_STYLES:
+                raise StyleError(f"Stil '{style_id}': keine Templates angegeben")
+            builtin = BUILTIN_STYLES[style_id]
+            name = name or builtin["name"]
+            reference = reference if reference is not None else builtin["reference"]
+            inline = inline if inline is not None else builtin["inline"]
+        self.style_id = style_id
+        self.name = name or style_id
+        self.reference = reference
+        self.inline = inline
+        self._reference = _compile(reference, f"{style_id}.reference")
+        self._inline = _compile(inline, f"{style_id}.inline")
+
+    @classmethod
+    def from_dict(cls, style_id: str, data: dict) -> "CitationFormatter":
+        try:
+            return cls(style_id, data.get("name") or style_id, data["reference"], data["inline"])
+        except (KeyError, TypeError, AttributeError) as e:
+            raise StyleError(f"Stil '{style_id}': Definition unvollständig ({e})")
+
+    def to_dict(self) -> dict:
+        return {"name": self.name, "reference": self.reference, "inline": self.inline}
+
     def format_reference(self, meta: LiMeta) -> str:
         """Formatiert Literaturverzeichnis-Eintrag"""
-        pass
-    
-    @abstractmethod
+        return self._reference(meta)
+
     def format_inline(self, meta: LiMeta, page: Optional[int] = None) -> str:
         """Formatiert Inline-Zitat"""
-        pass
-    
-    def _format_authors(self, authors: list, max_authors: int = 3) -> str:
-        """Formatiert Autorenliste"""
-        if not authors:
-            return "Unbekannt"
-        
-        if len(authors) <= max_authors:
-            if len(authors) == 1:
-                return authors[0]
-            else:
-                return ", ".join(authors[:-1]) + " & " + authors[-1]
-        else:
-            return authors[0] + " et al."
+        return self._inline(meta, page)
+
+    def format_full(self, meta: LiMeta) -> str:
+        """Name aus der früheren citation_styles.py"""
+        return self.format_reference(meta)
+
+    @property
+    def render_reference(self) -> Callable[[LiMeta], str]:
+        """Die kompilierte Funktion selbst (ein Aufruf weniger je Eintrag),
+        solange eine Unterklasse format_reference nicht überschreibt"""
+        if type(self).format_reference is CitationFormatter.format_reference:
+            return self._reference
+        return self.format_reference
+
+
+@lru_cache(maxsize=256)
+def _compile(template: str, name: str) -> Callable[..., str]:
+    return compile_template(template, name)
 
 
 class APAFormatter(CitationFormatter):
-    """APA 7th Edition Style"""
-    
-    def format_reference(self, meta: LiMeta) -> str:
-        parts = []
-        
-        # Autoren
-        authors = self._format_authors(meta.authors)
-        parts.append(authors)
-        
-        # Jahr
-        year = f"({meta.year})" if meta.year else "(o.J.)"
-        parts.append(year + ".")
-        
-        # Titel
-        if meta.title:
-            title = meta.title
-            if meta.source_type == "article":
-                parts.append(f"{title}.")
-            else:
-                parts.append(f"*{title}*.")
-        
-        # Journal (für Artikel)
-        if meta.journal:
-            journal_part = f"*{meta.journal}*"
-            if meta.volume:
-                journal_part += f", *{meta.volume}*"
-            if meta.issue:
-                journal_part += f"({meta.issue})"
-            if meta.pages:
-                journal_part += f", {meta.pages}"
-            parts.append(journal_part + ".")
-        
-        # Verlag (für Bücher)
-        elif meta.publisher:
-            parts.append(f"{meta.publisher}.")
-        
-        # DOI
-        if meta.doi:
-            parts.append(f"https://doi.org/{meta.doi}")
-        
-        return " ".join(parts)
-    
-    def format_inline(self, meta: LiMeta, page: Optional[int] = None) -> str:
-        author = meta.first_author
-        year = meta.year or "o.J."
-        
-        if page:
-            return f"({author}, {year}, S. {page})"
-        return f"({author}, {year})"
+    """APA Style (7th Edition)"""
+    STYLE_ID = "apa"
 
 
 class MLAFormatter(CitationFormatter):
-    """MLA 9th Edition Style"""
-    
-    def format_reference(self, meta: LiMeta) -> str:
-        parts = []
-        
-        # Autoren (Nachname, Vorname)
-        if meta.authors:
-            parts.append(meta.authors[0] + ".")
-        
-        # Titel
-        if meta.title:
-            if meta.source_type == "article":
-                parts.append(f'"{meta.title}."')
-            else:
-                parts.append(f"*{meta.title}*.")
-        
-        # Container (Journal)
-        if meta.journal:
-            container = f"*{meta.journal}*"
-            if meta.volume:
-                container += f", vol. {meta.volume}"
-            if meta.issue:
-                container += f", no. {meta.issue}"
-            if meta.year:
-                container += f", {meta.year}"
-            if meta.pages:
-                container += f", pp. {meta.pages}"
-            parts.append(container + ".")
-        
-        # Verlag
-        elif meta.publisher:
-            parts.append(f"{meta.publisher}, {meta.year or 'n.d.'}.")
-        
-        return " ".join(parts)
-    
-    def format_inline(self, meta: LiMeta, page: Optional[int] = None) -> str:
-        author = meta.first_author
-        if page:
-            return f"({author} {page})"
-        return f"({author})"
+    """MLA Style (9th Edition)"""
+    STYLE_ID = "mla"
 
 
 class ChicagoFormatter(CitationFormatter):
-    """Chicago Manual of Style (Notes-Bibliography)"""
-    
-    def format_reference(self, meta: LiMeta) -> str:
-        parts = []
-        
-        # Autoren
-        authors = self._format_authors(meta.authors)
-        parts.append(authors + ".")
-        
-        # Titel
-        if meta.title:
-            if meta.source_type == "article":
-                parts.append(f'"{meta.title}."')
-            else:
-                parts.append(f"*{meta.title}*.")
-        
-        # Journal
-        if meta.journal:
-            journal_part = f"*{meta.journal}*"
-            if meta.volume:
-                journal_part += f" {meta.volume}"
-            if meta.issue:
-                journal_part += f", no. {meta.issue}"
-            if meta.year:
-                journal_part += f" ({meta.year})"
-            if meta.pages:
-                journal_part += f": {meta.pages}"
-            parts.append(journal_part + ".")
-        
-        # Verlag
-        elif meta.publisher:
-            location = ""  # Chicago braucht eigentlich Ort
-            parts.append(f"{location}{meta.publisher}, {meta.year or 'n.d.'}.")
-        
-        return " ".join(parts)
-    
-    def format_inline(self, meta: LiMeta, page: Optional[int] = None) -> str:
-        author = meta.first_author
-        year = meta.year or "n.d."
-        if page:
-            return f"({author} {year}, {page})"
-        return f"({author} {year})"
+    """Chicago Style"""
+    STYLE_ID = "chicago"
 
 
 class DINFormatter(CitationFormatter):
-    """DIN 1505-2 Style (German Standard)"""
-    
-    def format_reference(self, meta: LiMeta) -> str:
-        parts = []
-        
-        # Autoren
-        if meta.authors:
-            authors = "; ".join(meta.authors)
-            parts.append(authors + ":")
-        
-        # Titel
-        if meta.title:
-            parts.append(meta.title + ".")
-        
-        # Bei Artikeln
-        if meta.journal:
-            parts.append(f"In: {meta.journal}")
-            if meta.volume:
-                parts.append(f"Bd. {meta.volume}")
-            if meta.year:
-                parts.append(f"({meta.year})")
-            if meta.pages:
-                parts.append(f"S. {meta.pages}")
-        
-        # Bei Büchern
-        elif meta.publisher:
-            if meta.publisher:
-                parts.append(meta.publisher)
-            if meta.year:
-                parts.append(str(meta.year))
-        
-        # ISBN
-        if meta.isbn:
-            parts.append(f"– ISBN {meta.isbn}")
-        
-        return " ".join(parts)
-    
-    def format_inline(self, meta: LiMeta, page: Optional[int] = None) -> str:
-        author = meta.first_author
-        year = meta.year or "o.J."
-        if page:
-            return f"[{author} {year}, S. {page}]"
-        return f"[{author} {year}]"
+    """DIN 1505-2"""
+    STYLE_ID = "din"
 
 
 class HarvardFormatter(CitationFormatter):
     """Harvard Style"""
-    
-    def format_reference(self, meta: LiMeta) -> str:
-        parts = []
-        
-        # Autoren
-        authors = self._format_authors(meta.authors)
-        parts.append(authors)
-        
-        # Jahr
-        year = f"({meta.year})" if meta.year else "(n.d.)"
-        parts.append(year)
-        
-        # Titel
-        if meta.title:
-            if meta.source_type == "article":
-                parts.append(f"'{meta.title}',")
-            else:
-                parts.append(f"*{meta.title}*,")
-        
-        # Journal
-        if meta.journal:
-            journal_part = f"*{meta.journal}*"
-            if meta.volume:
-                journal_part += f", {meta.volume}"
-            if meta.issue:
-                journal_part += f"({meta.issue})"
-            if meta.pages:
-                journal_part += f", pp. {meta.pages}"
-            parts.append(journal_part + ".")
-        
-        # Verlag
-        elif meta.publisher:
-            parts.append(f"{meta.publisher}.")
-        
-        return " ".join(parts)
-    
-    def format_inline(self, meta: LiMeta, page: Optional[int] = None) -> str:
-        author = meta.first_author
-        year = meta.year or "n.d."
-        if page:
-            return f"({author}, {year}, p. {page})"
-        return f"({author}, {year})"
+    STYLE_ID = "harvard"
+
+
+BUILTIN_FORMATTERS: Dict[str, type] = {
+    cls.STYLE_ID: cls
+    for cls in (APAFormatter, MLAFormatter, ChicagoFormatter, DINFormatter, HarvardFormatter)
+}
+
+
+@lru_cache(maxsize=None)
+def builtin_formatter(style_id: str) -> CitationFormatter:
+    """Geteilte Instanz eines eingebauten Stils (für den Manager)"""
+    return BUILTIN_FORMATTERS[style_id]()
+
+
+def load_styles(directory: Path) -> Dict[str, CitationFormatter]:
+    """Lädt eigene Stile (*.json) aus einem Ordner; fehlerhafte werden übersprungen"""
+    styles = {}
+    directory = Path(directory)
+    if not directory.is_dir():
+        return styles
+    for path in sorted(directory.glob("*.json")):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                styles[path.stem] = CitationFormatter.from_dict(path.stem, json.load(f))
+        except (OSError, ValueError) as e:
+            logging.debug(f"Zitierstil '{path}' nicht geladen: {e}")
+    return styles
 
 
 class CitationStyleManager:
-    """Verwaltet Zitationsstile"""
+    """Verwaltet Zitationsstile.
+
+    Eingebaute Stile werden einmal kompiliert und geteilt; eigene Stile
+    kommen über register_style/load_styles hinzu. Formatierte Einträge
+    werden je (Quelle, Stil) zusammen mit dem Sortierschlüssel gecacht und
+    erst neu erzeugt, wenn sich updated_at der Quelle ändert.
+    """
     
-    STYLES = {
-        "apa": APAFormatter,
-        "mla": MLAFormatter,
-        "chicago": ChicagoFormatter,
-        "din": DINFormatter,
-        "harvard": HarvardFormatter,
-    }
+    STYLE_NAMES = {style_id: data["name"] for style_id, data in BUILTIN_STYLES.items()}
     
-    STYLE_NAMES = {
-        "apa": "APA (7th Edition)",
-        "mla": "MLA (9th Edition)",
-        "chicago": "Chicago",
-        "din": "DIN 1505-2",
-        "harvard": "Harvard",
-    }
+    PROGRESS_EVERY = 500
     
     def __init__(self, default_style: str = "apa"):
         self.default_style = default_style
+        self._formatters: Dict[str, CitationFormatter] = {}  # eigene Stile
+        self._resolved: Dict[str, CitationFormatter] = {}  # Stil-ID -> Formatierer
+        self._renderers: Dict[str, Callable[[LiMeta], str]] = {}  # Stil-ID -> render_reference
+        # (Quelle, Stil) -> (updated_at, Sortierschlüssel, Eintrag)
+        self._references: Dict[Tuple[str, str], Tuple[str, Tuple, str]] = {}
     
     def get_formatter(self, style: str = None) -> CitationFormatter:
-        """Gibt Formatierer für Stil zurück"""
+        """Gibt Formatierer für Stil zurück (unbekannte Stile: APA)"""
         style = style or self.default_style
-        formatter_class = self.STYLES.get(style, APAFormatter)
-        return formatter_class()
+        formatter = self._resolved.get(style)
+        if formatter is None:
+            formatter = self._formatters.get(style)
+            if formatter is None:
+                formatter = builtin_formatter(style if style in BUILTIN_STYLES else "apa")
+            self._resolved[style] = formatter
+        return formatter
+    
+    def register_style(self, style_id: str, definition: Union[dict, CitationFormatter]) -> CitationFormatter:
+        """Fügt einen eigenen Stil hinzu oder ersetzt einen vorhandenen"""
+        formatter = definition
+        if not isinstance(formatter, CitationFormatter):
+            formatter = CitationFormatter.from_dict(style_id, definition)
+        self._formatters[style_id] = formatter
+        self._invalidate_style(style_id)
+        return formatter
+    
+    def load_styles(self, directory: Path) -> int:
+        """Registriert alle Stile aus einem Ordner; Anzahl geladener Stile"""
+        styles = load_styles(directory)
+        for style_id, formatter in styles.items():
+            self.register_style(style_id, formatter)
+        return len(styles)
+    
+    def reset_styles(self):
+        """Entfernt alle eigenen Stile"""
+        for style_id in list(self._formatters):
+            self._invalidate_style(style_id)
+        self._formatters.clear()
+    
+    def style_names(self) -> Dict[str, str]:
+        """Stil-ID -> Anzeigename (eingebaute und eigene)"""
+        names = dict(self.STYLE_NAMES)
+        names.update({style_id: f.name for style_id, f in self._formatters.items()})
+        return names
     
     def format_reference(self, meta: LiMeta, style: str = None) -> str:
         """Formatiert Literaturverzeichnis-Eintrag"""
-        return self.get_formatter(style).format_reference(meta)
+        return self._renderer(style or self.default_style)(meta)
     
     def format_inline(self, meta: LiMeta, page: int = None, style: str = None) -> str:
         """Formatiert Inline-Zitat"""
         return self.get_formatter(style).format_inline(meta, page)
     
-    @classmethod
-    def available_styles(cls) -> list:
+    # === Literaturverzeichnis ===
+    
+    @staticmethod
+    def sort_key(meta: LiMeta) -> Tuple:
+        """Erster Autor (DIN 5007), Jahr, Titel; Einträge ohne Autor zuletzt"""
+        author = name_sort_key(meta.authors[0]) if meta.authors else ()
+        return (not meta.authors, author, meta.year or 0, collation_key(meta.title or "")[0])
+    
+    def format_source(self, source: Union[LitSource, LiMeta], style: str = None) -> str:
+        """Literaturverzeichnis-Eintrag einer Quelle (gecacht)"""
+        return self._entry(source, style or self.default_style)[1]
+    
+    def format_bibliography(self, sources: Iterable[Union[LitSource, LiMeta]],
+                            style: str = None) -> List[str]:
+        """Formatiert und sortiert alle Einträge eines Literaturverzeichnisses"""
+        return [text for _, text in self.ordered_references(sources, style)]
+    
+    def ordered_references(self, sources: Iterable[Union[LitSource, LiMeta]],
+                           style: str = None) -> List[Tuple[Union[LitSource, LiMeta], str]]:
+        """(Quelle, Eintrag)-Paare in der Reihenfolge des Literaturverzeichnisses"""
+        style = style or self.default_style
+        entries = [(*self._entry(source, style), source) for source in sources]
+        entries.sort(key=itemgetter(0))
+        return [(source, text) for _, text, source in entries]
+    
+    def save_bibliography(self, sources: Iterable[Union[LitSource, LiMeta]], path: Path,
+                          style: str = None, title: str = "Literaturverzeichnis",
+                          progress: Callable[[int, int], None] = None) -> int:
+        """Schreibt das Literaturverzeichnis als .txt, .md, .html oder .docx"""
+        references = self.format_bibliography(sources, style)
+        total = len(references)
+        with open_writer(path, title) as writer:
+            if title:
+                writer.heading(title)
+            for count, text in enumerate(references, 1):
+                writer.paragraph(text)
+                if progress and (count % self.PROGRESS_EVERY == 0 or count == total):
+                    progress(count, total)
+        return total
+    
+    def invalidate(self, name: str = None):
+        """Verwirft gecachte Einträge einer Quelle (ohne Name: alle)"""
+        if name is None:
+            self._references.clear()
+            return
+        for cache_key in [k for k in self._references if k[0] == name]:
+            del self._references[cache_key]
+    
+    def _renderer(self, style: str) -> Callable[[LiMeta], str]:
+        renderer = self._renderers.get(style)
+        if renderer is None:
+            renderer = self._renderers[style] = self.get_formatter(style).render_reference
+        return renderer
+    
+    def _invalidate_style(self, style: str):
+        self._resolved.clear()
+        self._renderers.clear()
+        for cache_key in [k for k in self._references if k[1] == style]:
+            del self._references[cache_key]
+    
+    def _entry(self, source: Union[LitSource, LiMeta], style: str) -> Tuple[Tuple, str]:
+        if isinstance(source, LiMeta):
+            return self.sort_key(source), self._renderer(style)(source)
+        meta = source.meta
+        cache_key = (source.name, style)
+        cached = self._references.get(cache_key)
+        if cached is not None and cached[0] == meta.updated_at:
+            return cached[1], cached[2]
+        sort_key = self.sort_key(meta)
+        text = self._renderer(style)(meta)
+        self._references[cache_key] = (meta.updated_at, sort_key, text)
+        return sort_key, text
+    
+    def available_styles(self) -> list:
         """Gibt verfügbare Stile zurück"""
-        return list(cls.STYLES.keys())
+        return list(self.style_names())
+
+
+_style_manager: Optional[CitationStyleManager] = None
+
+
+def get_style_manager() -> CitationStyleManager:
+    """Gibt den globalen CitationStyleManager zurück"""
+    global _style_manager
+    if _style_manager is None:
+        _style_manager = CitationStyleManager()
+    return _style_manager
@@ -0,0 +1,264 @@
+"""
+LitZentrum - Dokument-Writer
+Schreibt Überschriften und Absätze fortlaufend als Text, Markdown, HTML oder DOCX
+"""
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import List, Tuple
+from xml.sax.saxutils import escape
+import html
+import io
+import os
+import re
+import zipfile
+
+try:
+    import docx
+    HAS_DOCX = True
+except ImportError:
+    HAS_DOCX = False
+
+
+EMPHASIS_PATTERN = re.compile(r"\*([^*\n]+)\*")
+INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def split_emphasis(text: str) -> List[Tuple[str, bool]]:
+    """Zerlegt "*kursiv*"-Markierungen der Zitationsstile in (Text, kursiv)-Stücke"""
+    parts = []
+    pos = 0
+    for match in EMPHASIS_PATTERN.finditer(text):
+        if match.start() > pos:
+            parts.append((text[pos:match.start()], False))
+        parts.append((match.group(1), True))
+        pos = match.end()
+    if pos < len(text):
+        parts.append((text[pos:], False))
+    return parts
+
+
+class DocumentWriter(ABC):
+    """Abstrakte Basisklasse: schreibt Absatz für Absatz in eine temporäre Datei.
+
+    Erst close() ersetzt die Zieldatei; bricht das Schreiben mit einer
+    Exception ab, bleibt eine vorhandene Datei unverändert.
+    """
+
+    def __init__(self, path: Path, title: str = ""):
+        self.path = Path(path)
+        self.title = title
+        self._tmp_path = self.path.with_name(self.path.name + ".tmp")
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+    def __enter__(self) -> "DocumentWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @abstractmethod
+    def heading(self, text: str, level: int = 1):
+        """Überschrift der Ebene `level`"""
+        pass
+
+    @abstractmethod
+    def paragraph(self, text: str):
+        """Absatz (*kursiv* wird übernommen, soweit das Format es kann)"""
+        pass
+
+    @abstractmethod
+    def quote(self, text: str):
+        """Eingerückter Zitatblock"""
+        pass
+
+    def close(self):
+        self._finish()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        try:
+            self._finish()
+        finally:
+            self._tmp_path.unlink(missing_ok=True)
+
+    def _finish(self):
+        pass
+
+
+class TextWriter(DocumentWriter):
+    """Markdown (*kursiv* bleibt erhalten)"""
+
+    MARKUP = True
+
+    def __init__(self, path: Path, title: str = ""):
+        super().__init__(path, title)
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+
+    def heading(self, text: str, level: int = 1):
+        if self.MARKUP:
+            self._file.write(f"{'#' * level} {text}\n\n")
+        else:
+            underline = ("=" if level == 1 else "-") * len(text)
+            self._file.write(f"{text}\n{underline}\n\n")
+
+    def paragraph(self, text: str):
+        if not self.MARKUP:
+            text = EMPHASIS_PATTERN.sub(r"\1", text)
+        self._file.write(text + "\n\n")
+
+    def quote(self, text: str):
+        if not self.MARKUP:
+            text = EMPHASIS_PATTERN.sub(r"\1", text)
+        prefix = "> " if self.MARKUP else "    "
+        self._file.write("".join(prefix + line + "\n" for line in text.split("\n")) + "\n")
+
+    def _finish(self):
+        self._file.close()
+
+
+class PlainTextWriter(TextWriter):
+    """Reiner Text ohne Markierungen"""
+
+    MARKUP = False
+
+
+class HTMLWriter(DocumentWriter):
+    """Eigenständige HTML-Seite"""
+
+    def __init__(self, path: Path, title: str = ""):
+        super().__init__(path, title)
+        self._file = open(self._tmp_path, "w", encoding="utf-8")
+        self._file.write(
+            "<!DOCTYPE html>\n<html lang=\"de\">\n<head>\n<meta charset=\"utf-8\">\n"
+            f"<title>{html.escape(title)}</title>\n</head>\n<body>\n"
+        )
+
+    def heading(self, text: str, level: int = 1):
+        level = min(max(level, 1), 6)
+        self._file.write(f"<h{level}>{html.escape(text)}</h{level}>\n")
+
+    def paragraph(self, text: str):
+        self._file.write(f"<p>{self._inline(text)}</p>\n")
+
+    def quote(self, text: str):
+        self._file.write(f"<blockquote><p>{self._inline(text)}</p></blockquote>\n")
+
+    @staticmethod
+    def _inline(text: str) -> str:
+        body = "".join(
+            f"<i>{html.escape(part)}</i>" if italic else html.escape(part)
+            for part, italic in split_emphasis(text)
+        )
+        return body.replace("\n", "<br>\n")
+
+    def _finish(self):
+        if not self._file.closed:
+            self._file.write("</body>\n</html>\n")
+            self._file.close()
+
+
+class DocxWriter(DocumentWriter):
+    """Word-Dokument, dessen Text direkt ins ZIP gestreamt wird.
+
+    Formatvorlagen und Seitenformat stammen aus einem leeren Dokument von
+    python-docx; nur word/document.xml wird Absatz für Absatz geschrieben,
+    sodass auch sehr lange Dokumente nicht im Speicher aufgebaut werden.
+    """
+
+    def __init__(self, path: Path, title: str = ""):
+        if not HAS_DOCX:
+            raise ImportError("python-docx ist nicht installiert (pip install python-docx)")
+        super().__init__(path, title)
+        self._zip = zipfile.ZipFile(self._tmp_path, "w", zipfile.ZIP_DEFLATED)
+        with zipfile.ZipFile(self._base_package(title)) as base:
+            for item in base.infolist():
+                data = base.read(item)
+                if item.filename == "word/document.xml":
+                    document = data.decode("utf-8")
+                else:
+                    self._zip.writestr(item, data)
+        head, body = document.split("<w:body>", 1)
+        self._tail = body[body.index("<w:sectPr"):]
+        self._file = io.TextIOWrapper(self._zip.open("word/document.xml", "w"), encoding="utf-8")
+        self._file.write(head + "<w:body>")
+
+    def heading(self, text: str, level: int = 1):
+        style = "Title" if level <= 0 else f"Heading{min(level, 9)}"
+        self._file.write(self._paragraph_xml([(text, False)], style))
+
+    def paragraph(self, text: str):
+        self._file.write(self._paragraph_xml(split_emphasis(text)))
+
+    def quote(self, text: str):
+        self._file.write(self._paragraph_xml(split_emphasis(text), "Quote"))
+
+    @staticmethod
+    def _base_package(title: str) -> io.BytesIO:
+        """Leeres Dokument von python-docx mit gesetzten Dokumenteigenschaften"""
+        document = docx.Document()
+        properties = document.core_properties
+        properties.title = INVALID_XML.sub("", title)
+        properties.author = "LitZentrum"
+        properties.comments = ""
+        buffer = io.BytesIO()
+        document.save(buffer)
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def _escape(text: str) -> str:
+        return escape(INVALID_XML.sub("", text))
+
+    def _paragraph_xml(self, parts: List[Tuple[str, bool]], style: str = None) -> str:
+        properties = f'<w:pPr><w:pStyle w:val="{style}"/></w:pPr>' if style else ""
+        runs = []
+        for part, italic in parts:
+            lines = "<w:br/>".join(
+                f'<w:t xml:space="preserve">{self._escape(line)}</w:t>' for line in part.split("\n")
+            )
+            runs.append(f"<w:r>{'<w:rPr><w:i/></w:rPr>' if italic else ''}{lines}</w:r>")
+        return f"<w:p>{properties}{''.join(runs)}</w:p>"
+
+    def _finish(self):
+        if self._zip is None:
+            return
+        try:
+            if not self._file.closed:
+                self._file.write(self._tail)
+                self._file.close()
+        finally:
+            self._zip.close()
+            self._zip = None
+
+
+WRITERS = {
+    ".md": TextWriter,
+    ".txt": PlainTextWriter,
+    ".html": HTMLWriter,
+    ".htm": HTMLWriter,
+    ".docx": DocxWriter,
+}
+
+
+FORMAT_WRITERS = {
+    "word": DocxWriter,
+    "markdown": TextWriter,
+    "html": HTMLWriter,
+    "text": PlainTextWriter,
+}
+
+
+def open_writer(path: Path, title: str = "", format: str = None) -> DocumentWriter:
+    """Wählt den Writer anhand des Formats oder, ohne Format, der Dateiendung"""
+    if format is not None:
+        writer_class = FORMAT_WRITERS.get(format)
+        if writer_class is None:
+            raise ValueError(f"Nicht unterstütztes Format: {format}")
+        return writer_class(path, title)
+    writer_class = WRITERS.get(Path(path).suffix.lower())
+    if writer_class is None:
+        raise ValueError(f"Nicht unterstütztes Format: {Path(path).suffix or Path(path).name}")
+    return writer_class(path, title)
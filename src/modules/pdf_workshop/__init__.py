@@ -3,10 +3,20 @@ LitZentrum - PDF Workshop Module
 PDF-Verarbeitung und -Analyse
 """
 from .extractor import PDFExtractor, PDFInfo, extract_pdf_metadata, extract_pdf_text
+from .text_cache import (
+    PDFTextCache, PDFText, PageText, get_pdf_text,
+    TextExtractionQueue, get_text_extraction_queue
+)
 
 __all__ = [
     "PDFExtractor",
     "PDFInfo",
     "extract_pdf_metadata",
     "extract_pdf_text",
+    "PDFTextCache",
+    "PDFText",
+    "PageText",
+    "get_pdf_text",
+    "TextExtractionQueue",
+    "get_text_extraction_queue",
 ]
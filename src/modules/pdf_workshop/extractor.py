@@ -13,6 +13,8 @@ try:
 except ImportError:
     HAS_PYMUPDF = False
 
+from .text_cache import PDFText, get_pdf_text
+
 
 @dataclass
 class PDFInfo:
@@ -27,12 +29,14 @@ class PDFInfo:
 class PDFExtractor:
     """Extrahiert Inhalte aus PDFs"""
     
-    def __init__(self, path: Path):
+    def __init__(self, path: Path, use_cache: bool = True):
         if not HAS_PYMUPDF:
             raise ImportError("PyMuPDF nicht installiert. Bitte 'pip install PyMuPDF' ausführen.")
         
         self.path = Path(path)
         self.doc = None
+        self.use_cache = use_cache
+        self._cached_text: Optional[PDFText] = None
     
     def open(self):
         """Öffnet das PDF"""
@@ -71,8 +75,22 @@ class PDFExtractor:
             self.open()
         return len(self.doc)
     
+    def _text_cache(self) -> Optional[PDFText]:
+        """Gibt den Textcache zurück (einmalige Extraktion aller Seiten)"""
+        if not self.use_cache:
+            return None
+        if self._cached_text is None:
+            self._cached_text = get_pdf_text(self.path)
+        return self._cached_text
+    
     def extract_text(self, page_num: int = None) -> str:
         """Extrahiert Text aus PDF"""
+        cached = self._text_cache()
+        if cached is not None:
+            if page_num is not None:
+                return cached.page_text(page_num)
+            return cached.full_text()
+        
         if not self.doc:
             self.open()
         
@@ -90,6 +108,10 @@ class PDFExtractor:
     
     def extract_text_range(self, start_page: int, end_page: int) -> str:
         """Extrahiert Text aus Seitenbereich"""
+        cached = self._text_cache()
+        if cached is not None:
+            return cached.text_range(start_page, end_page)
+        
         if not self.doc:
             self.open()
         
@@ -138,8 +160,12 @@ def extract_pdf_metadata(path: Path) -> Optional[PDFInfo]:
 
 def extract_pdf_text(path: Path, max_pages: int = 10) -> str:
     """Extrahiert Text aus den ersten Seiten"""
+    cached = get_pdf_text(path)
+    if cached is not None:
+        return cached.text_range(0, max_pages - 1)
+    
     try:
-        with PDFExtractor(path) as extractor:
+        with PDFExtractor(path, use_cache=False) as extractor:
             page_count = min(extractor.get_page_count(), max_pages)
             return extractor.extract_text_range(0, page_count - 1)
     except (OSError, PermissionError, ValueError, RuntimeError, ImportError) as e:
@@ -0,0 +1,354 @@
+"""
+LitZentrum - PDF-Textcache
+Seitenweiser Text- und Wortbox-Cache als Sidecar-Datei neben der Quell-PDF
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+
+try:
+    import fitz  # PyMuPDF
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+from PySide6.QtCore import QObject, Signal
+
+
+# Bei Änderungen an der Extraktion erhöhen - alte Caches werden dann neu erzeugt
+EXTRACTOR_VERSION = 1
+
+CACHE_SUFFIX = ".textcache"
+
+# Wortbox: x0, y0, x1, y1, Start-Offset, End-Offset (im Seitentext)
+WordBox = Tuple[float, float, float, float, int, int]
+
+
+@dataclass
+class PageText:
+    """Text und Wortboxen einer Seite"""
+    text: str
+    words: List[WordBox] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        return {"text": self.text, "words": [list(w) for w in self.words]}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PageText":
+        return cls(
+            text=data.get("text", ""),
+            words=[tuple(w) for w in data.get("words", [])],
+        )
+
+
+@dataclass
+class PDFText:
+    """Extrahierter Text einer kompletten PDF"""
+    content_hash: str
+    pages: List[PageText] = field(default_factory=list)
+    extractor_version: int = EXTRACTOR_VERSION
+    file_size: int = 0
+    file_mtime_ns: int = 0
+
+    @property
+    def page_count(self) -> int:
+        return len(self.pages)
+
+    def page_text(self, page_num: int) -> str:
+        """Text einer Seite (0-basiert)"""
+        if 0 <= page_num < len(self.pages):
+            return self.pages[page_num].text
+        return ""
+
+    def text_range(self, start_page: int, end_page: int) -> str:
+        """Text eines Seitenbereichs (0-basiert, inklusive)"""
+        end_page = min(end_page, len(self.pages) - 1)
+        return "\n\n".join(self.pages[i].text for i in range(max(0, start_page), end_page + 1))
+
+    def full_text(self) -> str:
+        """Text aller Seiten"""
+        return "\n\n".join(p.text for p in self.pages)
+
+    def rects_for_range(self, page_num: int, start: int, end: int) -> List[Tuple[float, float, float, float]]:
+        """Wortboxen (PDF-Koordinaten), die einen Zeichenbereich der Seite überdecken"""
+        if not 0 <= page_num < len(self.pages):
+            return []
+        return [
+            (x0, y0, x1, y1)
+            for x0, y0, x1, y1, w_start, w_end in self.pages[page_num].words
+            if w_start < end and w_end > start
+        ]
+
+    def to_dict(self) -> dict:
+        return {
+            "extractor_version": self.extractor_version,
+            "content_hash": self.content_hash,
+            "file_size": self.file_size,
+            "file_mtime_ns": self.file_mtime_ns,
+            "pages": [p.to_dict() for p in self.pages],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "PDFText":
+        return cls(
+            content_hash=data.get("content_hash", ""),
+            pages=[PageText.from_dict(p) for p in data.get("pages", [])],
+            extractor_version=data.get("extractor_version", 0),
+            file_size=data.get("file_size", 0),
+            file_mtime_ns=data.get("file_mtime_ns", 0),
+        )
+
+
+def file_hash(path: Path, chunk_size: int = 1024 * 1024) -> str:
+    """SHA-256 einer Datei (blockweise gelesen)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _page_words(page, text: str) -> List[WordBox]:
+    """Ordnet die Wörter einer Seite ihren Zeichen-Offsets im Seitentext zu"""
+    words = []
+    cursor = 0
+    for x0, y0, x1, y1, word, *_ in page.get_text("words"):
+        start = text.find(word, cursor)
+        if start < 0:
+            # Abweichende Lesereihenfolge: ab Seitenanfang erneut suchen
+            start = text.find(word)
+        if start < 0:
+            continue
+        end = start + len(word)
+        cursor = end
+        words.append((round(x0, 2), round(y0, 2), round(x1, 2), round(y1, 2), start, end))
+    return words
+
+
+# Prozessweiter Speicher-Cache der zuletzt genutzten Dokumente
+_memory_cache: "OrderedDict[str, PDFText]" = OrderedDict()
+_memory_lock = threading.Lock()
+_MEMORY_CACHE_SIZE = 16
+
+
+class PDFTextCache:
+    """Sidecar-Cache (<pdf>.textcache) mit seitenweisem Text und Wortboxen.
+
+    Der Cache ist an den Inhalts-Hash der PDF und die Extraktor-Version
+    gebunden. Größe und mtime der PDF werden mitgespeichert, damit der
+    Hash nur neu berechnet werden muss, wenn sich die Datei geändert hat.
+    """
+
+    def __init__(self, pdf_path: Path):
+        self.pdf_path = Path(pdf_path)
+
+    @property
+    def cache_path(self) -> Path:
+        return self.pdf_path.with_name(self.pdf_path.name + CACHE_SUFFIX)
+
+    def _stat(self) -> Tuple[int, int]:
+        stat = self.pdf_path.stat()
+        return stat.st_size, stat.st_mtime_ns
+
+    def _is_current(self, data: PDFText) -> bool:
+        """Prüft ob Cache-Daten zur aktuellen PDF passen"""
+        if data.extractor_version != EXTRACTOR_VERSION:
+            return False
+        size, mtime_ns = self._stat()
+        if data.file_size == size and data.file_mtime_ns == mtime_ns:
+            return True
+        # Datei angefasst - nur der Inhalts-Hash entscheidet
+        if data.file_size == size and data.content_hash == file_hash(self.pdf_path):
+            data.file_mtime_ns = mtime_ns
+            self._write(data)
+            return True
+        return False
+
+    def load(self) -> Optional[PDFText]:
+        """Lädt gültige Cache-Daten oder None"""
+        if not self.pdf_path.exists():
+            return None
+
+        key = str(self.cache_path)
+        with _memory_lock:
+            cached = _memory_cache.get(key)
+        if cached is not None and self._is_current(cached):
+            with _memory_lock:
+                _memory_cache.move_to_end(key)
+            return cached
+
+        if not self.cache_path.exists():
+            return None
+
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = PDFText.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError) as e:
+            logging.debug(f"Textcache '{self.cache_path}' nicht lesbar: {e}")
+            return None
+
+        if not self._is_current(data):
+            return None
+
+        self._remember(data)
+        return data
+
+    def is_valid(self) -> bool:
+        """True wenn ein aktueller Cache vorliegt"""
+        return self.load() is not None
+
+    def extract(self) -> PDFText:
+        """Extrahiert alle Seiten aus der PDF (ohne Cache)"""
+        if not HAS_PYMUPDF:
+            raise ImportError("PyMuPDF nicht installiert. Bitte 'pip install PyMuPDF' ausführen.")
+
+        size, mtime_ns = self._stat()
+        pages = []
+        with fitz.open(str(self.pdf_path)) as doc:
+            for page in doc:
+                text = page.get_text()
+                pages.append(PageText(text=text, words=_page_words(page, text)))
+
+        return PDFText(
+            content_hash=file_hash(self.pdf_path),
+            pages=pages,
+            file_size=size,
+            file_mtime_ns=mtime_ns,
+        )
+
+    def get(self) -> PDFText:
+        """Gibt Cache-Daten zurück und extrahiert bei Bedarf einmalig"""
+        data = self.load()
+        if data is None:
+            data = self.extract()
+            self.save(data)
+        return data
+
+    def save(self, data: PDFText):
+        """Speichert Cache-Daten als Sidecar-Datei"""
+        self._write(data)
+        self._remember(data)
+
+    def _write(self, data: PDFText):
+        # Erst in temporäre Datei schreiben, damit Leser nie halbe Dateien sehen
+        tmp_path = self.cache_path.with_name(self.cache_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.cache_path)
+        except OSError as e:
+            logging.debug(f"Textcache '{self.cache_path}' nicht schreibbar: {e}")
+
+    def _remember(self, data: PDFText):
+        key = str(self.cache_path)
+        with _memory_lock:
+            _memory_cache[key] = data
+            _memory_cache.move_to_end(key)
+            while len(_memory_cache) > _MEMORY_CACHE_SIZE:
+                _memory_cache.popitem(last=False)
+
+    def invalidate(self):
+        """Verwirft den Cache"""
+        with _memory_lock:
+            _memory_cache.pop(str(self.cache_path), None)
+        if self.cache_path.exists():
+            try:
+                self.cache_path.unlink()
+            except OSError as e:
+                logging.debug(f"Textcache '{self.cache_path}' nicht löschbar: {e}")
+
+
+def get_pdf_text(pdf_path: Path) -> Optional[PDFText]:
+    """Gibt (ggf. neu extrahierten) Text einer PDF zurück, None bei Fehlern"""
+    try:
+        return PDFTextCache(pdf_path).get()
+    except (OSError, PermissionError, ValueError, RuntimeError, ImportError) as e:
+        logging.debug(f"Fehler beim Extrahieren von PDF-Text aus '{pdf_path}': {e}")
+        return None
+
+
+class TextExtractionQueue(QObject):
+    """Hintergrund-Extraktion für den PDF-Textcache"""
+
+    extraction_finished = Signal(str)  # pdf_path
+    extraction_failed = Signal(str, str)  # pdf_path, error
+
+    _instance = None
+
+    def __init__(self):
+        super().__init__()
+        self._queue: queue.Queue = queue.Queue()
+        self._pending: set = set()
+        self._pending_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "TextExtractionQueue":
+        """Gibt die Singleton-Instanz zurück"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def enqueue(self, pdf_path: Path) -> bool:
+        """Plant die Extraktion ein; False wenn bereits gecacht oder geplant"""
+        key = str(Path(pdf_path))
+        with self._pending_lock:
+            if key in self._pending:
+                return False
+            if PDFTextCache(pdf_path).is_valid():
+                return False
+            self._pending.add(key)
+
+        self._queue.put(key)
+        self._ensure_worker()
+        return True
+
+    def is_pending(self, pdf_path: Path) -> bool:
+        with self._pending_lock:
+            return str(Path(pdf_path)) in self._pending
+
+    def _ensure_worker(self):
+        with self._worker_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        """Arbeitet die Queue ab und beendet sich, wenn sie leer ist"""
+        while True:
+            try:
+                key = self._queue.get(timeout=1)
+            except queue.Empty:
+                with self._worker_lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            try:
+                PDFTextCache(Path(key)).get()
+                self.extraction_finished.emit(key)
+            except Exception as e:
+                logging.debug(f"Textextraktion fehlgeschlagen für '{key}': {e}")
+                self.extraction_failed.emit(key, str(e))
+            finally:
+                with self._pending_lock:
+                    self._pending.discard(key)
+                self._queue.task_done()
+
+    def wait(self):
+        """Blockiert bis alle geplanten Extraktionen erledigt sind"""
+        self._queue.join()
+
+
+def get_text_extraction_queue() -> TextExtractionQueue:
+    """Gibt die globale Extraktions-Queue zurück"""
+    return TextExtractionQueue.instance()
@@ -0,0 +1,54 @@
+"""
+LitZentrum - Such-Module
+Indizes für die Suche in Quellen
+"""
+from .tokenizer import Tokenizer, Token, fold, fold_umlauts, get_tokenizer
+from .trigram import TrigramIndex, SourceNameIndex, FuzzyMatch, fold_name, fold_title
+from .fulltext import FullTextIndex, FullTextHit
+from .engine import ProjectSearchIndex
+from .vector_index import VectorIndex, VectorEntry, VectorMatch, HAS_NUMPY
+from .semantic import SemanticIndex, create_semantic_index
+from .dedup import DuplicateDetector, MergeSuggestion, MinHasher, LSHIndex
+from .federated import FederatedSearch, ProjectSnapshot, get_federated_search
+from .prefix_index import PrefixIndex
+from .catalog import SourceCatalog, get_source_catalog
+from .collation import collation_key, name_sort_key, split_name
+from .snippets import Snippet, SnippetBuilder, highlight_html
+
+__all__ = [
+    "Tokenizer",
+    "Token",
+    "fold",
+    "fold_umlauts",
+    "get_tokenizer",
+    "TrigramIndex",
+    "SourceNameIndex",
+    "FuzzyMatch",
+    "fold_name",
+    "fold_title",
+    "FullTextIndex",
+    "FullTextHit",
+    "ProjectSearchIndex",
+    "VectorIndex",
+    "VectorEntry",
+    "VectorMatch",
+    "HAS_NUMPY",
+    "SemanticIndex",
+    "create_semantic_index",
+    "DuplicateDetector",
+    "MergeSuggestion",
+    "MinHasher",
+    "LSHIndex",
+    "FederatedSearch",
+    "ProjectSnapshot",
+    "get_federated_search",
+    "PrefixIndex",
+    "SourceCatalog",
+    "get_source_catalog",
+    "collation_key",
+    "name_sort_key",
+    "split_name",
+    "Snippet",
+    "SnippetBuilder",
+    "highlight_html",
+]
@@ -0,0 +1,203 @@
+"""
+LitZentrum - Quellenkatalog
+Speicherhaltiger Katalog der Metadaten eines Projekts mit inkrementellen Indizes
+"""
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from core import LitSource, EventBus, EventType
+from formats import LiMeta
+from .collation import collation_key, name_sort_key
+from .prefix_index import PrefixIndex
+from .trigram import SourceNameIndex
+
+
+def _field_values(meta: LiMeta) -> Dict[str, Tuple[str, ...]]:
+    return {
+        "tags": tuple(meta.tags),
+        "authors": tuple(meta.authors),
+        "journals": (meta.journal,) if meta.journal else (),
+        "publishers": (meta.publisher,) if meta.publisher else (),
+    }
+
+
+def _sort_keys(meta: LiMeta) -> Dict[str, tuple]:
+    """Sortierschlüssel einer Quelle je Sortierung (einmal pro Änderung)"""
+    title = collation_key(meta.title)
+    author = (0, name_sort_key(meta.authors[0])) if meta.authors else (1, ())
+    return {
+        "author": (author, meta.year or 0, title),
+        "year": (-(meta.year or 0), author, title),
+        "title": (title, author),
+        "created": (meta.created_at,),
+    }
+
+
+class SourceCatalog:
+    """Metadaten aller Quellen eines Projekts plus daraus abgeleitete Indizes.
+
+    Änderungen werden pro Quelle eingetragen (add_source/remove_source oder
+    über den EventBus); die Präfix-Indizes für Tags, Autoren, Journals und
+    Verlage sowie der Trigramm-Index werden dabei nur um die Differenz
+    aktualisiert, nie komplett neu aufgebaut.
+    """
+
+    FIELDS = ("tags", "authors", "journals", "publishers")
+    # Sortierung -> absteigend?
+    SORT_MODES = {"author": False, "year": False, "title": False, "created": True}
+
+    def __init__(self):
+        self.metas: Dict[str, LiMeta] = {}
+        self.prefixes: Dict[str, PrefixIndex] = {f: PrefixIndex() for f in self.FIELDS}
+        self.names = SourceNameIndex()
+        self._values: Dict[str, Dict[str, Tuple[str, ...]]] = {}
+        self._stamps: Dict[str, str] = {}
+        # Vorsortierte Reihenfolgen: je Sortierung sortierte (Schlüssel, Quelle)
+        self._sort_keys: Dict[str, Dict[str, tuple]] = {}
+        self._sorted: Dict[str, List[tuple]] = {mode: [] for mode in self.SORT_MODES}
+        self._orders: Dict[str, List[str]] = {}
+        self._event_bus: Optional[EventBus] = None
+
+    def __len__(self) -> int:
+        return len(self.metas)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.metas
+
+    def add_source(self, source: LitSource, force: bool = False) -> bool:
+        """Nimmt eine Quelle auf; False wenn sie unverändert ist"""
+        return self.set_meta(source.name, source.meta, force)
+
+    def set_meta(self, key: str, meta: LiMeta, force: bool = False) -> bool:
+        """Trägt (geänderte) Metadaten unter `key` ein"""
+        if not force and self._stamps.get(key) == meta.updated_at and key in self.metas:
+            return False
+
+        old = self._values.get(key, {})
+        new = _field_values(meta)
+        for field in self.FIELDS:
+            if old.get(field, ()) != new[field]:
+                self.prefixes[field].update(old.get(field, ()), new[field])
+
+        self.metas[key] = meta
+        self._values[key] = new
+        self._stamps[key] = meta.updated_at
+        self.names.add_source(key, meta)
+        self._update_sort_keys(key, _sort_keys(meta))
+        return True
+
+    def remove_source(self, key: str) -> bool:
+        """Entfernt eine Quelle samt ihren Index-Einträgen"""
+        if key not in self.metas:
+            return False
+        for field, values in self._values.pop(key).items():
+            for value in values:
+                self.prefixes[field].remove(value)
+        del self.metas[key]
+        del self._stamps[key]
+        self.names.remove_source(key)
+        self._update_sort_keys(key, None)
+        return True
+
+    def sync(self, sources: Iterable[LitSource]) -> int:
+        """Gleicht mit der aktuellen Quellenliste ab; Anzahl der Änderungen"""
+        changed = 0
+        seen = set()
+        for source in sources:
+            seen.add(source.name)
+            changed += self.add_source(source)
+        for key in [k for k in self.metas if k not in seen]:
+            changed += self.remove_source(key)
+        return changed
+
+    def clear(self):
+        self.metas.clear()
+        self._values.clear()
+        self._stamps.clear()
+        for index in self.prefixes.values():
+            index.clear()
+        self.names = SourceNameIndex()
+        self._sort_keys.clear()
+        for entries in self._sorted.values():
+            entries.clear()
+        self._orders.clear()
+
+    def complete(self, field: str, prefix: str, limit: int = 10) -> List[str]:
+        """Vervollständigungen für ein Feld, häufigste zuerst"""
+        return [value for value, _ in self.prefixes[field].complete(prefix, limit)]
+
+    def values(self, field: str) -> List[str]:
+        """Alle Werte eines Feldes, alphabetisch"""
+        return self.prefixes[field].values()
+
+    # === Sortierung ===
+
+    def sort_key(self, key: str, mode: str) -> tuple:
+        """Gecachter Sortierschlüssel einer Quelle"""
+        return self._sort_keys[key][mode]
+
+    def order(self, mode: str) -> List[str]:
+        """Alle Quellen-Schlüssel in der Reihenfolge einer Sortierung.
+
+        Die Reihenfolgen werden bei jeder Änderung per bisect nachgeführt;
+        ein Wechsel der Sortierung kostet daher nur O(n), nie ein Sortieren.
+        """
+        order = self._orders.get(mode)
+        if order is None:
+            entries = self._sorted[mode]
+            if self.SORT_MODES[mode]:
+                entries = reversed(entries)
+            order = self._orders[mode] = [key for _, key in entries]
+        return order
+
+    def _update_sort_keys(self, key: str, keys: Optional[Dict[str, tuple]]):
+        old = self._sort_keys.pop(key, None)
+        if old == keys:
+            if keys is not None:
+                self._sort_keys[key] = keys
+            return
+        for mode, entries in self._sorted.items():
+            if old is not None:
+                del entries[bisect_left(entries, (old[mode], key))]
+            if keys is not None:
+                insort(entries, (keys[mode], key))
+        if keys is not None:
+            self._sort_keys[key] = keys
+        self._orders.clear()
+
+    # === EventBus ===
+
+    def connect(self, event_bus: EventBus):
+        """Hält den Katalog über Quellen-Events aktuell"""
+        self.disconnect()
+        self._event_bus = event_bus
+        event_bus.subscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        self._event_bus.unsubscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+        self._event_bus = None
+
+    def _on_source_changed(self, source: LitSource):
+        if isinstance(source, LitSource):
+            self.add_source(source, force=True)
+
+    def _on_source_deleted(self, source):
+        key = source.name if isinstance(source, LitSource) else str(source)
+        self.remove_source(key)
+
+
+_source_catalog: Optional[SourceCatalog] = None
+
+
+def get_source_catalog() -> SourceCatalog:
+    """Gibt den Katalog des geöffneten Projekts zurück"""
+    global _source_catalog
+    if _source_catalog is None:
+        _source_catalog = SourceCatalog()
+    return _source_catalog
@@ -0,0 +1,80 @@
+"""
+LitZentrum - Sortierschlüssel
+Deutsche Sortierung nach DIN 5007 inkl. Namenszusätzen (von, van, de ...)
+"""
+from functools import lru_cache
+from typing import Tuple
+import re
+import unicodedata
+
+from formats.limeta import to_ascii
+
+
+# Namenszusätze, die beim Sortieren hinter den Nachnamen treten
+# ("von Goethe" sortiert unter G, "van der Waals" unter W)
+PARTICLES = frozenset({
+    "von", "vom", "zu", "zum", "zur", "van", "der", "den", "de", "del", "della",
+    "di", "da", "das", "dos", "du", "des", "la", "le", "ten", "ter", "te", "op",
+})
+
+_NON_WORD = re.compile(r"[^\w\s]+")
+_SPACES = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=65536)
+def collation_key(text: str, names: bool = False) -> Tuple[str, str]:
+    """Sortierschlüssel nach DIN 5007.
+
+    Variante 1 (Wörterbücher, Titel): Umlaute wie Grundbuchstaben
+    ("Äpfel" bei "Apfel"), ß wie ss. Variante 2 (`names=True`, Namenslisten):
+    ä = ae, ö = oe, ü = ue, so dass "Müller" direkt bei "Mueller" steht.
+    Groß-/Kleinschreibung und Satzzeichen zählen nicht; bei Gleichstand
+    entscheidet die zweite Stelle (Schreibweise), damit die Reihenfolge
+    stabil bleibt.
+    """
+    text = unicodedata.normalize("NFKC", text).casefold()
+    spaced = _SPACES.sub(" ", _NON_WORD.sub(" ", text)).strip()
+    if names:
+        primary = to_ascii(spaced)
+    else:
+        decomposed = unicodedata.normalize("NFKD", spaced.replace("ß", "ss"))
+        primary = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return primary, spaced
+
+
+def split_name(name: str) -> Tuple[str, str, str]:
+    """Zerlegt einen Autorennamen in (Nachname, Vorname, Zusätze).
+
+    Versteht "Nachname, Vorname", "von Nachname, Vorname",
+    "Nachname, Vorname von" und "Vorname von Nachname".
+    """
+    name = name.strip()
+    if "," in name:
+        last, _, first = name.partition(",")
+        last_words, first_words = last.split(), first.split()
+    else:
+        words = name.split()
+        # Erster Zusatz (nicht am Anfang) beginnt den Nachnamen
+        cut = next(
+            (i for i, w in enumerate(words[1:-1], 1) if w.casefold() in PARTICLES),
+            max(len(words) - 1, 0),
+        )
+        first_words, last_words = words[:cut], words[cut:]
+
+    particles = []
+    while len(last_words) > 1 and last_words[0].casefold() in PARTICLES:
+        particles.append(last_words.pop(0))
+    while first_words and first_words[-1].casefold() in PARTICLES:
+        particles.insert(0, first_words.pop())
+    return " ".join(last_words), " ".join(first_words), " ".join(particles)
+
+
+@lru_cache(maxsize=65536)
+def name_sort_key(name: str) -> Tuple:
+    """Sortierschlüssel eines Autors: Nachname, Vorname, dann Zusätze"""
+    last, first, particles = split_name(name)
+    return (
+        collation_key(last, names=True),
+        collation_key(first, names=True),
+        collation_key(particles, names=True),
+    )
@@ -0,0 +1,400 @@
+"""
+LitZentrum - Dubletten-Erkennung
+MinHash-Signaturen über Titel/Autoren und PDF-Anfang, LSH-Buckets für Kandidaten
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import json
+import logging
+import os
+import random
+import zlib
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+from core import LitSource, EventBus, EventType
+from formats.limeta import LiMeta
+from modules.pdf_workshop.text_cache import PDFText, PDFTextCache
+from .tokenizer import get_tokenizer
+from .trigram import author_surname, fold_name, fold_title
+
+
+_PRIME = (1 << 31) - 1  # Mersenne-Primzahl für die Permutationen
+_MAX_HASH = (1 << 32) - 1
+
+Signature = Tuple[int, ...]
+
+
+def meta_shingles(meta: LiMeta, size: int = 4) -> Set[str]:
+    """Zeichen-Shingles über normalisierten Titel und Nachnamen"""
+    title = fold_title(meta.title or "")
+    surnames = sorted(fold_name(author_surname(a)) for a in meta.authors)
+    text = f"{title} {' '.join(s for s in surnames if s)}".strip()
+    if len(text) < size:
+        return {text} if text else set()
+    return {text[i:i + size] for i in range(len(text) - size + 1)}
+
+
+def text_shingles(text: str, language: str = "de", size: int = 3) -> Set[str]:
+    """Wort-Shingles über normalisierte Terme (Zeilenumbrüche/Silbentrennung egal)"""
+    terms = get_tokenizer(language).terms(text)
+    if len(terms) < size:
+        return {" ".join(terms)} if terms else set()
+    return {" ".join(terms[i:i + size]) for i in range(len(terms) - size + 1)}
+
+
+class MinHasher:
+    """MinHash mit universellen Hashfunktionen (a*x + b) mod p"""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(0, _PRIME) for _ in range(num_perm)]
+        if HAS_NUMPY:
+            self._a_np = np.array(self._a, dtype=np.uint64)[:, None]
+            self._b_np = np.array(self._b, dtype=np.uint64)[:, None]
+
+    def signature(self, shingles: Iterable[str]) -> Optional[Signature]:
+        """MinHash-Signatur; None bei leerer Menge"""
+        hashes = [zlib.crc32(s.encode("utf-8")) & _MAX_HASH for s in shingles]
+        if not hashes:
+            return None
+        if HAS_NUMPY:
+            values = np.array(hashes, dtype=np.uint64)[None, :]
+            minima = ((self._a_np * values + self._b_np) % _PRIME).min(axis=1)
+            return tuple(int(v) for v in minima)
+        return tuple(
+            min((a * h + b) % _PRIME for h in hashes)
+            for a, b in zip(self._a, self._b)
+        )
+
+    @staticmethod
+    def similarity(first: Signature, second: Signature) -> float:
+        """Geschätzter Jaccard-Koeffizient zweier Signaturen"""
+        if not first or not second:
+            return 0.0
+        same = sum(1 for x, y in zip(first, second) if x == y)
+        return same / len(first)
+
+
+class LSHIndex:
+    """Locality Sensitive Hashing über Bänder einer MinHash-Signatur.
+
+    Zwei Signaturen landen mindestens einmal im selben Bucket, wenn ein
+    komplettes Band übereinstimmt; die Schwelle liegt bei etwa
+    (1/bands) ** (1/rows).
+    """
+
+    def __init__(self, bands: int = 32, rows: int = 4):
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[int, Set[str]]] = [{} for _ in range(bands)]
+        self._keys: Dict[str, List[int]] = {}
+
+    def _band_hashes(self, signature: Signature) -> List[int]:
+        r = self.rows
+        return [hash(signature[i * r:(i + 1) * r]) for i in range(self.bands)]
+
+    def add(self, key: str, signature: Signature):
+        self.remove(key)
+        hashes = self._band_hashes(signature)
+        for band, value in enumerate(hashes):
+            self._buckets[band].setdefault(value, set()).add(key)
+        self._keys[key] = hashes
+
+    def remove(self, key: str):
+        hashes = self._keys.pop(key, None)
+        if hashes is None:
+            return
+        for band, value in enumerate(hashes):
+            bucket = self._buckets[band].get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band][value]
+
+    def candidates(self, signature: Signature) -> Set[str]:
+        """Schlüssel, die sich mindestens einen Bucket mit der Signatur teilen"""
+        found: Set[str] = set()
+        for band, value in enumerate(self._band_hashes(signature)):
+            found |= self._buckets[band].get(value, set())
+        return found
+
+    def candidate_pairs(self) -> Set[Tuple[str, str]]:
+        """Alle Kandidatenpaare (ein Durchlauf über die Buckets)"""
+        pairs: Set[Tuple[str, str]] = set()
+        for buckets in self._buckets:
+            for bucket in buckets.values():
+                if len(bucket) < 2:
+                    continue
+                members = sorted(bucket)
+                for i, first in enumerate(members):
+                    for second in members[i + 1:]:
+                        pairs.add((first, second))
+        return pairs
+
+
+@dataclass
+class MergeSuggestion:
+    """Vorschlag, zwei Quellen zusammenzuführen"""
+    keep: str  # Ordnername der zu behaltenden Quelle
+    merge: str  # Ordnername der Dublette
+    score: float  # 0.0 - 1.0
+    reason: str  # doi, meta, text
+
+    def describe(self) -> str:
+        labels = {"doi": "gleiche DOI", "meta": "Titel/Autoren", "text": "PDF-Text"}
+        return f"{self.merge} → {self.keep} ({labels.get(self.reason, self.reason)}, {self.score:.0%})"
+
+
+@dataclass
+class _Entry:
+    stamp: str
+    doi: Optional[str]
+    quality: int
+    meta_sig: Optional[Signature]
+    text_sig: Optional[Signature]
+
+
+class DuplicateDetector:
+    """Findet Dubletten über MinHash/LSH in nahezu linearer Zeit.
+
+    Zwei getrennte Signaturen je Quelle: normalisierter Titel + Nachnamen
+    (findet umbenannte oder leicht abweichende Einträge) und die ersten
+    Seiten des PDF-Textes (findet Preprint und Verlagsversion mit
+    unterschiedlichen Metadaten).
+    """
+
+    INDEX_FILE = "minhash.json"
+    TEXT_PAGES = 3
+    VERSION = 2  # bei geänderter Normalisierung erhöhen
+
+    def __init__(self, meta_threshold: float = 0.7, text_threshold: float = 0.5,
+                 num_perm: int = 128):
+        self.meta_threshold = meta_threshold
+        self.text_threshold = text_threshold
+        self.hasher = MinHasher(num_perm)
+        rows = 4
+        self.meta_lsh = LSHIndex(num_perm // rows, rows)
+        self.text_lsh = LSHIndex(num_perm // rows, rows)
+        self._entries: Dict[str, _Entry] = {}
+        self._dirty = False
+        self._event_bus: Optional[EventBus] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @staticmethod
+    def _quality(meta: LiMeta) -> int:
+        """Vollständigkeit der Metadaten - die bessere Quelle wird behalten"""
+        score = 4 if meta.verified else 0
+        score += 2 if meta.doi else 0
+        for value in (meta.year, meta.journal, meta.publisher, meta.authors, meta.isbn):
+            score += 1 if value else 0
+        return score
+
+    @staticmethod
+    def _source_stamp(source) -> str:
+        """Metadaten-Stand plus Dateistand der PDF (ohne Hash-Berechnung)"""
+        stamp = source.meta.updated_at
+        if source.has_pdf:
+            stat = source.pdf_path.stat()
+            stamp += f":{stat.st_size}:{stat.st_mtime_ns}"
+        return stamp
+
+    def add(self, key: str, meta: LiMeta, pdf_text: PDFText = None, stamp: str = ""):
+        """Berechnet die Signaturen einer Quelle aus Metadaten und PDF-Text"""
+        meta_sig = self.hasher.signature(meta_shingles(meta))
+        text_sig = None
+        if pdf_text is not None:
+            head = pdf_text.text_range(0, self.TEXT_PAGES - 1)
+            text_sig = self.hasher.signature(text_shingles(head, meta.language))
+
+        self._store(key, _Entry(
+            stamp=stamp,
+            doi=(meta.doi or "").lower() or None,
+            quality=self._quality(meta),
+            meta_sig=meta_sig,
+            text_sig=text_sig,
+        ))
+
+    def update_source(self, source, pdf_text: PDFText = None) -> bool:
+        """Aktualisiert eine Quelle; unverändert (gleicher Stempel) wird übersprungen.
+
+        Ohne übergebenen Text wird der PDF-Textcache gelesen; ist die
+        Extraktion noch nicht fertig, zählt vorerst nur die Metadaten-Signatur.
+        """
+        stamp = self._source_stamp(source)
+        current = self._entries.get(source.name)
+        if pdf_text is None:
+            if current is not None and current.stamp == stamp:
+                return False
+            if source.has_pdf:
+                pdf_text = PDFTextCache(source.pdf_path).load()
+        if source.has_pdf and pdf_text is None:
+            # Beim nächsten Abgleich erneut nach dem Textcache sehen
+            stamp += ":pending"
+        self.add(source.name, source.meta, pdf_text, stamp)
+        return True
+
+    def _store(self, key: str, entry: _Entry):
+        self.remove(key)
+        self._entries[key] = entry
+        if entry.meta_sig:
+            self.meta_lsh.add(key, entry.meta_sig)
+        if entry.text_sig:
+            self.text_lsh.add(key, entry.text_sig)
+        self._dirty = True
+
+    def remove(self, key: str):
+        if self._entries.pop(key, None) is not None:
+            self.meta_lsh.remove(key)
+            self.text_lsh.remove(key)
+            self._dirty = True
+
+    def sync(self, sources: Iterable) -> int:
+        """Gleicht mit den Quellen ab; Anzahl geänderter Einträge"""
+        seen = set()
+        changed = 0
+        for source in sources:
+            seen.add(source.name)
+            if self.update_source(source):
+                changed += 1
+        for key in [k for k in self._entries if k not in seen]:
+            self.remove(key)
+            changed += 1
+        return changed
+
+    # --- EventBus ---
+
+    def connect(self, event_bus: EventBus):
+        """Hält die Signaturen über Quellen-Events aktuell (Speichern übernimmt der Aufrufer)"""
+        self.disconnect()
+        self._event_bus = event_bus
+        event_bus.subscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        self._event_bus.unsubscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+        self._event_bus = None
+
+    def _on_source_changed(self, source: LitSource):
+        if isinstance(source, LitSource):
+            self.update_source(source)
+
+    def _on_source_deleted(self, source):
+        self.remove(source.name if isinstance(source, LitSource) else str(source))
+
+    def _suggest(self, first: str, second: str) -> Optional[MergeSuggestion]:
+        a, b = self._entries[first], self._entries[second]
+        if a.doi and b.doi and a.doi != b.doi:
+            return None  # Verschiedene DOIs: bewusst getrennte Werke
+
+        if a.doi and a.doi == b.doi:
+            score, reason = 1.0, "doi"
+        else:
+            meta_score = MinHasher.similarity(a.meta_sig, b.meta_sig)
+            text_score = MinHasher.similarity(a.text_sig, b.text_sig)
+            if text_score >= self.text_threshold and text_score >= meta_score:
+                score, reason = text_score, "text"
+            elif meta_score >= self.meta_threshold:
+                score, reason = meta_score, "meta"
+            else:
+                return None
+
+        keep, merge = (first, second) if a.quality >= b.quality else (second, first)
+        return MergeSuggestion(keep=keep, merge=merge, score=score, reason=reason)
+
+    def _doi_pairs(self) -> Set[Tuple[str, str]]:
+        by_doi: Dict[str, List[str]] = {}
+        for key, entry in self._entries.items():
+            if entry.doi:
+                by_doi.setdefault(entry.doi, []).append(key)
+        pairs = set()
+        for keys in by_doi.values():
+            keys.sort()
+            pairs.update((x, y) for i, x in enumerate(keys) for y in keys[i + 1:])
+        return pairs
+
+    def find_duplicates(self) -> List[MergeSuggestion]:
+        """Alle Zusammenführungs-Vorschläge im Projekt, beste zuerst"""
+        pairs = self.meta_lsh.candidate_pairs() | self.text_lsh.candidate_pairs() | self._doi_pairs()
+        suggestions = [s for s in (self._suggest(x, y) for x, y in sorted(pairs)) if s]
+        suggestions.sort(key=lambda s: (-s.score, s.merge))
+        return suggestions
+
+    def duplicates_of(self, key: str) -> List[MergeSuggestion]:
+        """Vorschläge für eine einzelne (z.B. gerade importierte) Quelle"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return []
+        candidates: Set[str] = set()
+        if entry.meta_sig:
+            candidates |= self.meta_lsh.candidates(entry.meta_sig)
+        if entry.text_sig:
+            candidates |= self.text_lsh.candidates(entry.text_sig)
+        if entry.doi:
+            candidates |= {k for k, e in self._entries.items() if e.doi == entry.doi}
+        candidates.discard(key)
+        suggestions = [s for s in (self._suggest(*sorted((key, other))) for other in candidates) if s]
+        suggestions.sort(key=lambda s: -s.score)
+        return suggestions
+
+    # --- Persistenz ---
+
+    def save(self, index_dir: Path):
+        """Speichert die Signaturen (nur bei Änderungen)"""
+        if not self._dirty:
+            return
+        path = Path(index_dir) / self.INDEX_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "version": self.VERSION,
+                    "num_perm": self.hasher.num_perm,
+                    "entries": {
+                        key: [e.stamp, e.doi, e.quality, e.meta_sig, e.text_sig]
+                        for key, e in self._entries.items()
+                    },
+                }, f, separators=(",", ":"))
+            os.replace(tmp_path, path)
+            self._dirty = False
+        except OSError as e:
+            logging.debug(f"Dubletten-Index '{path}' nicht schreibbar: {e}")
+
+    def load(self, index_dir: Path) -> "DuplicateDetector":
+        """Lädt gespeicherte Signaturen (fehlend/veraltet: leer)"""
+        path = Path(index_dir) / self.INDEX_FILE
+        if not path.exists():
+            return self
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != self.VERSION or data.get("num_perm") != self.hasher.num_perm:
+                return self
+            for key, (stamp, doi, quality, meta_sig, text_sig) in data.get("entries", {}).items():
+                self._store(key, _Entry(
+                    stamp, doi, quality,
+                    tuple(meta_sig) if meta_sig else None,
+                    tuple(text_sig) if text_sig else None,
+                ))
+        except (OSError, ValueError, TypeError) as e:
+            logging.debug(f"Dubletten-Index '{path}' nicht lesbar: {e}")
+        self._dirty = False
+        return self
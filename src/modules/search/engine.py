@@ -0,0 +1,242 @@
+"""
+LitZentrum - Projekt-Volltextsuche
+Hält den Volltext-Index eines Projekts aktuell und liefert SearchResults
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import json
+import logging
+import os
+
+from core import LitSource, EventBus, EventType
+from models import SearchResult
+from modules.pdf_workshop.text_cache import PDFText, PDFTextCache
+from .fulltext import FullTextIndex, FullTextHit
+from .snippets import Snippet, SnippetBuilder
+
+
+class ProjectSearchIndex:
+    """Persistenter Volltext-Index über alle PDFs eines Projekts.
+
+    Schlüssel ist der Ordnername der Quelle, damit der Index beim
+    Verschieben des Projekts gültig bleibt. Neben den Postings werden Titel,
+    Autoren, Jahr und Dateistand der PDF gespeichert; unveränderte Quellen
+    werden beim Abgleich übersprungen, ohne ihren Textcache zu laden.
+    """
+
+    INDEX_FILE = "fulltext.json"
+
+    def __init__(self, index_dir: Path, sources_path: Path):
+        self.index_dir = Path(index_dir)
+        self.sources_path = Path(sources_path)
+        self.index = FullTextIndex()
+        self.sources: Dict[str, dict] = {}
+        self.snippets = SnippetBuilder()
+        self._dirty = False
+        self._event_bus: Optional[EventBus] = None
+
+    @property
+    def index_file(self) -> Path:
+        return self.index_dir / self.INDEX_FILE
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def load(self) -> "ProjectSearchIndex":
+        """Lädt den gespeicherten Index (fehlend oder defekt: leer)"""
+        if not self.index_file.exists():
+            return self
+        try:
+            with open(self.index_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.index = FullTextIndex.from_dict(data.get("fulltext", {}))
+            self.sources = {k: v for k, v in data.get("sources", {}).items() if k in self.index}
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logging.debug(f"Volltext-Index '{self.index_file}' nicht lesbar: {e}")
+            self.index = FullTextIndex()
+            self.sources = {}
+        return self
+
+    def save(self):
+        """Speichert den Index, falls er sich geändert hat"""
+        if not self._dirty:
+            return
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.index_file.with_name(self.INDEX_FILE + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(
+                    {"fulltext": self.index.to_dict(), "sources": self.sources},
+                    f, ensure_ascii=False, separators=(",", ":"),
+                )
+            os.replace(tmp_path, self.index_file)
+            self._dirty = False
+        except OSError as e:
+            logging.debug(f"Volltext-Index '{self.index_file}' nicht schreibbar: {e}")
+
+    @staticmethod
+    def _pdf_stat(pdf_path: Path) -> Optional[List[int]]:
+        try:
+            stat = pdf_path.stat()
+        except OSError:
+            return None
+        return [stat.st_size, stat.st_mtime_ns]
+
+    def _source_info(self, source) -> dict:
+        meta = source.meta
+        return {
+            "title": meta.title,
+            "authors": list(meta.authors),
+            "year": meta.year,
+            "language": meta.language,
+            "pdf_file": source.pdf_path.name,
+            "pdf_stat": self._pdf_stat(source.pdf_path),
+        }
+
+    def update_source(self, source, pdf_text: PDFText = None) -> bool:
+        """Indexiert eine Quelle aus ihrem Textcache.
+
+        Ist die PDF seit der letzten Indexierung unverändert, werden nur die
+        Metadaten abgeglichen. Ohne gültigen Cache (Extraktion noch
+        ausstehend) passiert nichts. Rückgabe True wenn der Index geändert wurde.
+        """
+        key = source.name
+        if not source.has_pdf:
+            return self.remove_source(key)
+
+        info = self._source_info(source)
+        stored = self.sources.get(key)
+        if (pdf_text is None and stored is not None and key in self.index
+                and stored.get("pdf_stat") == info["pdf_stat"]
+                and stored.get("language") == info["language"]):
+            if stored == info:
+                return False
+            self.sources[key] = info
+            self._dirty = True
+            return True
+
+        if pdf_text is None:
+            pdf_text = PDFTextCache(source.pdf_path).load()
+        if pdf_text is None:
+            return False
+
+        stamp = f"{pdf_text.content_hash}:{info['language']}"
+        if self.index.stamp(key) != stamp:
+            self.index.add_document(
+                key, [p.text for p in pdf_text.pages],
+                language=info["language"], stamp=stamp,
+            )
+        self.sources[key] = info
+        self._dirty = True
+        return True
+
+    def remove_source(self, key: str) -> bool:
+        """Entfernt eine Quelle (Ordnername) aus dem Index"""
+        if key not in self.index and key not in self.sources:
+            return False
+        self.index.remove_document(key)
+        self.sources.pop(key, None)
+        self._dirty = True
+        return True
+
+    def sync(self, sources: Iterable) -> int:
+        """Gleicht den Index mit den Quellen ab; Anzahl geänderter Einträge"""
+        changed = 0
+        seen = set()
+        for source in sources:
+            seen.add(source.name)
+            if self.update_source(source):
+                changed += 1
+        for key in [k for k in self.index.keys if k not in seen]:
+            self.remove_source(key)
+            changed += 1
+        return changed
+
+    # === EventBus ===
+
+    def connect(self, event_bus: EventBus):
+        """Hält den Index über Quellen-Events aktuell (Speichern übernimmt der Aufrufer)"""
+        self.disconnect()
+        self._event_bus = event_bus
+        event_bus.subscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        event_bus.subscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        self._event_bus.unsubscribe(EventType.SOURCE_CREATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_UPDATED, self._on_source_changed)
+        self._event_bus.unsubscribe(EventType.SOURCE_DELETED, self._on_source_deleted)
+        self._event_bus = None
+
+    def _on_source_changed(self, source: LitSource):
+        if isinstance(source, LitSource):
+            self.update_source(source)
+
+    def _on_source_deleted(self, source):
+        key = source.name if isinstance(source, LitSource) else str(source)
+        self.remove_source(key)
+
+    def search(self, query: str, limit: int = 100, max_snippets: int = None) -> List[SearchResult]:
+        """Volltextsuche ("phrase", a NEAR/k b, Wörter).
+
+        Je Quelle werden höchstens `max_snippets` Ausschnitte geliefert (ein
+        Ergebnis pro Ausschnitt, Fundstellen in match_text hervorgehoben).
+        """
+        if max_snippets is None:
+            max_snippets = self.snippets.max_snippets
+        by_key: Dict[str, List[FullTextHit]] = {}
+        for hit in self.index.search(query):
+            by_key.setdefault(hit.key, []).append(hit)
+
+        results = []
+        for key, hits in by_key.items():
+            snippets = self.snippets_for(key, hits, max_snippets)
+            if snippets:
+                results.extend(self._result(hits[0], s) for s in snippets)
+            else:
+                # Textcache nicht verfügbar: Fundstellen ohne Ausschnitt
+                results.extend(self._result(h) for h in hits[:max_snippets])
+            if limit and len(results) >= limit:
+                break
+        return results[:limit] if limit else results
+
+    def snippets_for(self, key: str, hits: List[FullTextHit],
+                     max_snippets: int = None) -> List[Snippet]:
+        """Ausschnitte zu Fundstellen einer Quelle (gecacht je Indexstand)"""
+        return self.snippets.snippets(
+            hits, lambda: self._load_text(key), stamp=(key, self.index.stamp(key)),
+            max_snippets=max_snippets,
+        )
+
+    def _load_text(self, key: str) -> Optional[PDFText]:
+        """Textcache einer indexierten Quelle (nur für Ausschnitte)"""
+        folder = self.sources_path / key
+        pdf_file = self.sources.get(key, {}).get("pdf_file")
+        pdf_path = folder / pdf_file if pdf_file else next(folder.glob("*.pdf"), None)
+        if pdf_path is None:
+            return None
+        return PDFTextCache(pdf_path).load()
+
+    def _result(self, hit: FullTextHit, snippet: Snippet = None) -> SearchResult:
+        info = self.sources.get(hit.key, {})
+        result = SearchResult(
+            source_path=self.sources_path / hit.key,
+            title=info.get("title", hit.key),
+            authors=info.get("authors", []),
+            year=info.get("year"),
+            match_type="content",
+            match_text="",
+            relevance=hit.score,
+            page=hit.page + 1,
+            char_start=hit.start,
+            char_end=hit.end,
+        )
+        if snippet is not None:
+            result.page = snippet.page + 1
+            result.char_start, result.char_end = snippet.hit_start, snippet.hit_end
+            result.match_text = snippet.text
+            result.highlights = snippet.highlights
+            result.rects = snippet.rects
+        return result
@@ -0,0 +1,287 @@
+"""
+LitZentrum - Projektübergreifende Suche
+Durchsucht mehrere Projekte schreibgeschützt und führt die Rangfolgen zusammen
+"""
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import heapq
+import logging
+import math
+import os
+import threading
+import time
+
+from core.settings_manager import get_settings
+from formats import LiMeta, LiProj
+from formats.base import LitFormatError
+from models import SearchResult
+from .engine import ProjectSearchIndex
+from .fulltext import FullTextIndex
+
+
+PROJECT_CONFIG_FILE = "projekt_config.liproj"
+META_FILE = "meta.limeta"
+
+# Metadaten-Felder werden als "Seiten" eines Dokuments indexiert
+META_FIELDS = ("title", "author", "tag", "abstract")
+FIELD_WEIGHTS = {"title": 3.0, "author": 2.0, "tag": 1.5, "abstract": 1.0}
+
+
+def _mtime_ns(path: Path) -> int:
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+class ProjectSnapshot:
+    """Schreibgeschützte Sicht auf ein Projekt ohne GUI und ProjectManager.
+
+    Liest Konfiguration, alle meta.limeta und den gespeicherten Volltext-Index
+    (.index/fulltext.json). Beim Auffrischen werden nur geänderte Dateien neu
+    gelesen; es wird nie etwas in das Projekt geschrieben.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.name = self.path.name
+        self.sources_path = self.path / "Quellen"
+        self.index_dir = self.path / ".index"
+        self.meta_index = FullTextIndex()
+        self.metas: Dict[str, LiMeta] = {}
+        self.fulltext: Optional[ProjectSearchIndex] = None
+        self._meta_mtimes: Dict[str, int] = {}
+        self._config_mtime = -1
+        self._fulltext_mtime = -1
+        self._lock = threading.Lock()
+        self.refreshed_at = 0.0
+        self.generation = 0  # Zählt Änderungen (für Ergebnis-Caches)
+
+    @staticmethod
+    def is_project(path: Path) -> bool:
+        return (Path(path) / PROJECT_CONFIG_FILE).exists()
+
+    def refresh(self) -> bool:
+        """Liest geänderte Dateien neu ein; True wenn sich etwas geändert hat"""
+        with self._lock:
+            changed = self._refresh_config()
+            changed |= self._refresh_metas()
+            changed |= self._refresh_fulltext()
+            self.refreshed_at = time.monotonic()
+            if changed:
+                self.generation += 1
+            return changed
+
+    def _refresh_config(self) -> bool:
+        config_path = self.path / PROJECT_CONFIG_FILE
+        mtime = _mtime_ns(config_path)
+        if mtime == self._config_mtime:
+            return False
+        self._config_mtime = mtime
+        try:
+            config = LiProj.load(config_path)
+        except (LitFormatError, OSError, ValueError) as e:
+            logging.debug(f"Projekt '{self.path}' nicht lesbar: {e}")
+            return False
+        self.name = config.name
+        self.sources_path = self.path / config.sources_folder
+        return True
+
+    def _refresh_metas(self) -> bool:
+        changed = False
+        seen = set()
+        try:
+            entries = list(os.scandir(self.sources_path))
+        except OSError:
+            entries = []
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            key = entry.name
+            meta_path = Path(entry.path) / META_FILE
+            mtime = _mtime_ns(meta_path)
+            if not mtime:
+                continue
+            seen.add(key)
+            if self._meta_mtimes.get(key) == mtime:
+                continue
+            try:
+                meta = LiMeta.load(meta_path)
+            except (LitFormatError, OSError, ValueError) as e:
+                logging.debug(f"Metadaten '{meta_path}' nicht lesbar: {e}")
+                continue
+            self._meta_mtimes[key] = mtime
+            self.metas[key] = meta
+            self.meta_index.add_document(key, [
+                meta.title or "",
+                " ".join(meta.authors),
+                " ".join(meta.tags),
+                meta.abstract or "",
+            ], language=meta.language)
+            changed = True
+
+        for key in [k for k in self.metas if k not in seen]:
+            del self.metas[key]
+            self._meta_mtimes.pop(key, None)
+            self.meta_index.remove_document(key)
+            changed = True
+        return changed
+
+    def _refresh_fulltext(self) -> bool:
+        index_file = self.index_dir / ProjectSearchIndex.INDEX_FILE
+        mtime = _mtime_ns(index_file)
+        if mtime == self._fulltext_mtime:
+            return False
+        self._fulltext_mtime = mtime
+        self.fulltext = ProjectSearchIndex(self.index_dir, self.sources_path).load() if mtime else None
+        return True
+
+    def search(self, query: str, limit: int = 50) -> List[SearchResult]:
+        """Sucht in Metadaten und Volltext; ein Ergebnis je Quelle, beste zuerst"""
+        with self._lock:
+            best: Dict[str, Tuple[float, str, str]] = {}
+            for hit in self.meta_index.search(query):
+                field = META_FIELDS[hit.page]
+                weight = FIELD_WEIGHTS[field]
+                if hit.key not in best or best[hit.key][0] < weight:
+                    text = self._field_text(hit.key, hit.page)
+                    best[hit.key] = (weight, field, text)
+
+            content: Dict[str, list] = {}
+            if self.fulltext is not None:
+                for hit in self.fulltext.index.search(query):
+                    content.setdefault(hit.key, []).append(hit)
+
+            results = []
+            for key in set(best) | set(content):
+                meta = self.metas.get(key)
+                if meta is None:
+                    continue
+                weight, field, text = best.get(key, (0.0, "content", ""))
+                hits = content.get(key, [])
+                first = hits[0] if hits else None
+                results.append(SearchResult(
+                    source_path=self.sources_path / key,
+                    title=meta.title,
+                    authors=list(meta.authors),
+                    year=meta.year,
+                    match_type=field,
+                    match_text=text,
+                    relevance=weight + math.log1p(len(hits)),
+                    page=first.page + 1 if first else None,
+                    char_start=first.start if first else None,
+                    char_end=first.end if first else None,
+                    project=self.name,
+                    project_path=self.path,
+                ))
+            results.sort(key=lambda r: (-r.relevance, r.title))
+            results = results[:limit]
+
+            # Ausschnitte nur für die gelieferten Ergebnisse
+            for result in results:
+                hits = content.get(result.source_path.name)
+                if not hits:
+                    continue
+                snippets = self.fulltext.snippets_for(result.source_path.name, hits[:1])
+                if snippets:
+                    snippet = snippets[0]
+                    result.page = snippet.page + 1
+                    result.char_start, result.char_end = snippet.hit_start, snippet.hit_end
+                    result.rects = snippet.rects
+                    if result.match_type == "content":
+                        result.match_text = snippet.text
+                        result.highlights = snippet.highlights
+        return results
+
+    def _field_text(self, key: str, field_index: int) -> str:
+        meta = self.metas[key]
+        if field_index == 0:
+            return meta.title
+        if field_index == 1:
+            return ", ".join(meta.authors)
+        if field_index == 2:
+            return ", ".join(meta.tags)
+        return (meta.abstract or "")[:200]
+
+
+class FederatedSearch:
+    """Suche über mehrere Projekte (standardmäßig die zuletzt geöffneten).
+
+    Pro Projekt wird ein ProjectSnapshot gecacht und höchstens alle
+    `max_age` Sekunden auf Änderungen geprüft. Wiederholte Anfragen werden
+    aus einem kleinen Ergebnis-Cache bedient, solange sich kein Projekt
+    geändert hat.
+    """
+
+    RESULT_CACHE_SIZE = 32
+
+    def __init__(self, max_age: float = 5.0, max_workers: int = 4):
+        self.max_age = max_age
+        self.max_workers = max_workers
+        self._snapshots: Dict[Path, ProjectSnapshot] = {}
+        self._lock = threading.Lock()
+        self._results: "OrderedDict[tuple, List[SearchResult]]" = OrderedDict()
+
+    def snapshot(self, path: Path) -> Optional[ProjectSnapshot]:
+        """Gecachter, bei Bedarf aufgefrischter Snapshot eines Projekts"""
+        path = Path(path).resolve()
+        if not ProjectSnapshot.is_project(path):
+            return None
+        with self._lock:
+            snapshot = self._snapshots.get(path)
+            if snapshot is None:
+                snapshot = self._snapshots[path] = ProjectSnapshot(path)
+        if time.monotonic() - snapshot.refreshed_at >= self.max_age or not snapshot.refreshed_at:
+            snapshot.refresh()
+        return snapshot
+
+    def invalidate(self, path: Path = None):
+        """Erzwingt erneutes Prüfen (eines oder aller Projekte)"""
+        with self._lock:
+            targets = [self._snapshots.get(Path(path).resolve())] if path else list(self._snapshots.values())
+        for snapshot in targets:
+            if snapshot is not None:
+                snapshot.refreshed_at = 0.0
+
+    def search(self, query: str, projects: Iterable[Path] = None,
+               limit: int = 50) -> List[SearchResult]:
+        """Durchsucht alle Projekte parallel und mischt die Rangfolgen"""
+        query = query.strip()
+        if not query:
+            return []
+        if projects is None:
+            projects = get_settings().get_recent_projects()
+        paths = list(dict.fromkeys(Path(p).resolve() for p in projects))
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            snapshots = [s for s in pool.map(self.snapshot, paths) if s is not None]
+
+        cache_key = (query, limit, tuple((s.path, s.generation) for s in snapshots))
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return list(cached)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            ranked = list(pool.map(lambda s: s.search(query, limit), snapshots))
+
+        merged = list(heapq.merge(*ranked, key=lambda r: (-r.relevance, r.title)))[:limit]
+        with self._lock:
+            self._results[cache_key] = merged
+            while len(self._results) > self.RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        return list(merged)
+
+
+_federated_search: Optional[FederatedSearch] = None
+
+
+def get_federated_search() -> FederatedSearch:
+    """Gibt die globale FederatedSearch-Instanz zurück"""
+    global _federated_search
+    if _federated_search is None:
+        _federated_search = FederatedSearch()
+    return _federated_search
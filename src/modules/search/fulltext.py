@@ -0,0 +1,288 @@
+"""
+LitZentrum - Volltext-Index
+Positionsbasierter invertierter Index für Phrasen- und NEAR/k-Suche
+"""
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence, Set, Tuple
+import json
+import os
+import re
+
+from .tokenizer import get_tokenizer
+
+
+INDEX_VERSION = 2  # bei geänderter Tokenisierung erhöhen (alte Indizes werden neu aufgebaut)
+
+# "phrase" | wort NEAR/3 wort | wort
+_QUERY = re.compile(r'"([^"]+)"|(\S+)\s+NEAR/(\d+)\s+(\S+)|(\S+)')
+
+
+@dataclass
+class FullTextHit:
+    """Fundstelle im Volltext"""
+    key: Hashable
+    page: int  # 0-basiert
+    start: int  # Zeichen-Offset im Seitentext
+    end: int
+    position: int  # Wortposition im Dokument
+    score: float = 1.0
+
+
+@dataclass
+class _Document:
+    """Interne Dokumentdaten: Sprache, Stempel und Positions-Tabelle"""
+    language: str
+    stamp: str
+    # Je Wortposition drei Einträge: Seite, Start, Ende
+    positions: array
+
+
+class FullTextIndex:
+    """Invertierter Index Term -> Dokument -> Wortpositionen.
+
+    Zu jeder Wortposition speichert das Dokument Seite und Zeichen-Offsets,
+    sodass Phrasen und Näherungsanfragen vollständig aus dem Index
+    beantwortet werden und trotzdem im PDF hervorgehoben werden können.
+    """
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[Hashable, array]] = {}
+        self._docs: Dict[Hashable, _Document] = {}
+        self._doc_terms: Dict[Hashable, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._docs
+
+    @property
+    def keys(self) -> List[Hashable]:
+        return list(self._docs)
+
+    @property
+    def languages(self) -> Set[str]:
+        return {doc.language for doc in self._docs.values()}
+
+    def stamp(self, key: Hashable) -> Optional[str]:
+        """Stempel (z.B. Inhalts-Hash), mit dem ein Dokument indexiert wurde"""
+        doc = self._docs.get(key)
+        return doc.stamp if doc else None
+
+    def add_document(self, key: Hashable, pages: Sequence[str],
+                     language: str = "de", stamp: str = ""):
+        """Indexiert (oder ersetzt) ein Dokument aus seinen Seitentexten"""
+        self.remove_document(key)
+        tokenizer = get_tokenizer(language)
+
+        positions = array("i")
+        doc_postings: Dict[str, array] = {}
+        base = 0
+        for page_num, text in enumerate(pages):
+            last = -1
+            for token in tokenizer.iter_tokens(text):
+                position = base + token.position
+                if token.position != last:
+                    positions.extend((page_num, token.start, token.end))
+                    last = token.position
+                posting = doc_postings.get(token.term)
+                if posting is None:
+                    posting = doc_postings[token.term] = array("i")
+                if not posting or posting[-1] != position:
+                    posting.append(position)
+            base = len(positions) // 3
+
+        for term, posting in doc_postings.items():
+            self._postings.setdefault(term, {})[key] = posting
+        self._doc_terms[key] = set(doc_postings)
+        self._docs[key] = _Document(language=language, stamp=stamp, positions=positions)
+
+    def remove_document(self, key: Hashable):
+        """Entfernt ein Dokument"""
+        if key not in self._docs:
+            return
+        for term in self._doc_terms.pop(key, ()):
+            docs = self._postings.get(term)
+            if docs is not None:
+                docs.pop(key, None)
+                if not docs:
+                    del self._postings[term]
+        del self._docs[key]
+
+    def _hit(self, key: Hashable, position: int, length: int = 1) -> FullTextHit:
+        table = self._docs[key].positions
+        first, last = position * 3, (position + length - 1) * 3
+        page, start = table[first], table[first + 1]
+        end = table[last + 2] if table[last] == page else start
+        return FullTextHit(key=key, page=page, start=start, end=end, position=position)
+
+    def _query_terms(self, text: str) -> Dict[str, List[str]]:
+        """Anfrage je Dokumentsprache tokenisieren"""
+        return {lang: get_tokenizer(lang).terms(text) for lang in self.languages}
+
+    def _has_terms(self, text: str) -> bool:
+        return any(self._query_terms(text).values())
+
+    def _candidates(self, terms_by_lang: Dict[str, List[str]]) -> Iterable[Tuple[Hashable, List[array]]]:
+        """Dokumente, die alle Terme enthalten, mit ihren Positionslisten"""
+        for lang, terms in terms_by_lang.items():
+            if not terms:
+                continue
+            postings = [self._postings.get(term) for term in terms]
+            if not all(postings):
+                continue
+            smallest = min(postings, key=len)
+            for key in smallest:
+                if self._docs[key].language != lang:
+                    continue
+                if all(key in p for p in postings):
+                    yield key, [p[key] for p in postings]
+
+    def search_phrase(self, phrase: str, limit: int = None) -> List[FullTextHit]:
+        """Exakte Phrase (aufeinanderfolgende Wortpositionen)"""
+        hits = []
+        for key, lists in self._candidates(self._query_terms(phrase)):
+            following = [set(p) for p in lists[1:]]
+            for position in lists[0]:
+                if all(position + i + 1 in s for i, s in enumerate(following)):
+                    hits.append(self._hit(key, position, len(lists)))
+        return self._rank(hits, limit)
+
+    def search_near(self, first: str, second: str, distance: int,
+                    limit: int = None) -> List[FullTextHit]:
+        """NEAR/k: beide Begriffe höchstens k Wörter voneinander entfernt"""
+        hits = []
+        for lang in self.languages:
+            tokenizer = get_tokenizer(lang)
+            a_terms, b_terms = tokenizer.terms(first), tokenizer.terms(second)
+            if len(a_terms) != 1 or len(b_terms) != 1:
+                continue
+            for key, (a_list, b_list) in self._candidates({lang: [a_terms[0], b_terms[0]]}):
+                hits.extend(self._near(key, a_list, b_list, distance))
+        return self._rank(hits, limit)
+
+    def _near(self, key: Hashable, a_list: array, b_list: array,
+              distance: int) -> List[FullTextHit]:
+        """Merge zweier sortierter Positionslisten"""
+        hits = []
+        j = 0
+        for a in a_list:
+            while j < len(b_list) and b_list[j] < a - distance:
+                j += 1
+            k = j
+            while k < len(b_list) and b_list[k] <= a + distance:
+                b = b_list[k]
+                if b != a:
+                    start, end = min(a, b), max(a, b)
+                    hits.append(self._hit(key, start, end - start + 1))
+                    break
+                k += 1
+        return hits
+
+    def search_terms(self, text: str, limit: int = None) -> List[FullTextHit]:
+        """Alle Wörter (UND-Verknüpfung), Treffer an jedem Vorkommen des ersten Wortes"""
+        hits = []
+        for key, lists in self._candidates(self._query_terms(text)):
+            for position in lists[0]:
+                hits.append(self._hit(key, position))
+        return self._rank(hits, limit)
+
+    def search(self, query: str, limit: int = None) -> List[FullTextHit]:
+        """Sucht mit einfacher Syntax: "phrase", a NEAR/k b, einzelne Wörter.
+
+        Mehrere Teile werden UND-verknüpft; zurückgegeben werden die
+        Fundstellen aller Teile in Dokumenten, die jeden Teil enthalten.
+        """
+        parts: List[List[FullTextHit]] = []
+        for match in _QUERY.finditer(query):
+            phrase, near_a, near_k, near_b, word = match.groups()
+            if near_a:
+                # Ohne Wort auf einer Seite (z.B. "-") bleibt nur die andere
+                a_empty, b_empty = not self._has_terms(near_a), not self._has_terms(near_b)
+                if a_empty or b_empty:
+                    word = None if a_empty and b_empty else (near_b if a_empty else near_a)
+                else:
+                    parts.append(self.search_near(near_a, near_b, int(near_k)))
+                    continue
+            text = phrase or word
+            # Teile ohne Suchbegriffe (nur Satzzeichen) schränken nicht ein
+            if not text or not self._has_terms(text):
+                continue
+            parts.append(self.search_phrase(text) if phrase else self.search_terms(text))
+        if not parts:
+            return []
+
+        common = set.intersection(*({h.key for h in part} for part in parts))
+        hits = [h for part in parts for h in part if h.key in common]
+        return self._rank(hits, limit)
+
+    @staticmethod
+    def _rank(hits: List[FullTextHit], limit: int = None) -> List[FullTextHit]:
+        """Score = Trefferzahl im Dokument; innerhalb eines Dokuments Lesereihenfolge"""
+        counts: Dict[Hashable, int] = {}
+        for hit in hits:
+            counts[hit.key] = counts.get(hit.key, 0) + 1
+        for hit in hits:
+            hit.score = float(counts[hit.key])
+        hits.sort(key=lambda h: (-h.score, str(h.key), h.position))
+        return hits[:limit] if limit else hits
+
+    # --- Persistenz ---
+
+    def to_dict(self) -> dict:
+        return {
+            "version": INDEX_VERSION,
+            "docs": {
+                str(key): {
+                    "language": doc.language,
+                    "stamp": doc.stamp,
+                    "positions": doc.positions.tolist(),
+                }
+                for key, doc in self._docs.items()
+            },
+            "postings": {
+                term: {str(key): posting.tolist() for key, posting in docs.items()}
+                for term, docs in self._postings.items()
+            },
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "FullTextIndex":
+        index = cls()
+        if data.get("version") != INDEX_VERSION:
+            return index
+        for key, doc in data.get("docs", {}).items():
+            index._docs[key] = _Document(
+                language=doc.get("language", "de"),
+                stamp=doc.get("stamp", ""),
+                positions=array("i", doc.get("positions", [])),
+            )
+            index._doc_terms[key] = set()
+        for term, docs in data.get("postings", {}).items():
+            index._postings[term] = {key: array("i", p) for key, p in docs.items()}
+            for key in docs:
+                index._doc_terms.setdefault(key, set()).add(term)
+        return index
+
+    def save(self, path: Path):
+        """Speichert den Index als JSON (atomar)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "FullTextIndex":
+        """Lädt einen Index; leerer Index bei fehlender/ungültiger Datei"""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls.from_dict(json.load(f))
+        except (OSError, ValueError, TypeError):
+            return cls()
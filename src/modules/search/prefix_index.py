@@ -0,0 +1,102 @@
+"""
+LitZentrum - Präfix-Index
+Sortiertes Array mit Häufigkeiten für die Autovervollständigung
+"""
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Tuple
+import heapq
+
+from .tokenizer import fold
+
+
+class PrefixIndex:
+    """Präfixsuche über Werte (Tags, Autoren, Journals ...) mit Häufigkeiten.
+
+    Die gefalteten Schlüssel ("Müller" -> "muller") liegen in einem sortierten
+    Array; alle Werte mit einem Präfix bilden darin einen zusammenhängenden
+    Bereich, der per bisect gefunden wird. Schreibvarianten desselben
+    Schlüssels werden zusammengezählt, angezeigt wird die häufigste.
+    """
+
+    _END = "\U0010ffff"
+
+    def __init__(self):
+        self._keys: List[str] = []
+        self._spellings: Dict[str, Dict[str, int]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, value: str) -> bool:
+        return fold(value) in self._counts
+
+    def add(self, value: str, count: int = 1):
+        """Erhöht die Häufigkeit eines Wertes"""
+        value = value.strip()
+        key = fold(value)
+        if not key:
+            return
+        spellings = self._spellings.get(key)
+        if spellings is None:
+            spellings = self._spellings[key] = {}
+            self._counts[key] = 0
+            insort(self._keys, key)
+        spellings[value] = spellings.get(value, 0) + count
+        self._counts[key] += count
+
+    def remove(self, value: str, count: int = 1):
+        """Verringert die Häufigkeit; Werte ohne Vorkommen werden ausgetragen"""
+        value = value.strip()
+        key = fold(value)
+        spellings = self._spellings.get(key)
+        if spellings is None or value not in spellings:
+            return
+        spellings[value] -= count
+        if spellings[value] <= 0:
+            del spellings[value]
+        self._counts[key] -= count
+        if not spellings or self._counts[key] <= 0:
+            del self._spellings[key]
+            del self._counts[key]
+            del self._keys[bisect_left(self._keys, key)]
+
+    def update(self, old: Iterable[str], new: Iterable[str]):
+        """Trägt den Wechsel von `old` zu `new` ein (z.B. geänderte Tags)"""
+        for value in old:
+            self.remove(value)
+        for value in new:
+            self.add(value)
+
+    def count(self, value: str) -> int:
+        return self._counts.get(fold(value), 0)
+
+    def display(self, key: str) -> str:
+        """Häufigste Schreibweise eines gefalteten Schlüssels"""
+        spellings = self._spellings[key]
+        return max(spellings, key=lambda s: (spellings[s], s))
+
+    def _range(self, prefix: str) -> Tuple[int, int]:
+        prefix = fold(prefix)
+        lo = bisect_left(self._keys, prefix)
+        hi = bisect_left(self._keys, prefix + self._END, lo)
+        return lo, hi
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Werte mit Präfix, häufigste zuerst: [(Wert, Anzahl), ...]"""
+        lo, hi = self._range(prefix)
+        keys = self._keys[lo:hi]
+        if limit and len(keys) > limit:
+            keys = heapq.nsmallest(limit, keys, key=lambda k: (-self._counts[k], k))
+        else:
+            keys.sort(key=lambda k: (-self._counts[k], k))
+        return [(self.display(k), self._counts[k]) for k in keys]
+
+    def values(self) -> List[str]:
+        """Alle Werte in alphabetischer (gefalteter) Reihenfolge"""
+        return [self.display(k) for k in self._keys]
+
+    def clear(self):
+        self._keys.clear()
+        self._spellings.clear()
+        self._counts.clear()
@@ -0,0 +1,162 @@
+"""
+LitZentrum - Semantische Suche
+Embeddings für PDF-Text, Abstracts, Notizen und Zitate einer Quelle
+"""
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List
+import hashlib
+
+from formats import LiMeta
+from formats.base import LitFormatError
+from models import SearchResult
+from modules.ai.embeddings import DEFAULT_EMBEDDING_MODEL, EmbeddingClient, chunk_text
+from modules.pdf_workshop.text_cache import PDFTextCache
+from .vector_index import VectorEntry, VectorIndex
+
+
+# Gespeicherter Textausschnitt je Chunk (nur zur Anzeige)
+PREVIEW_CHARS = 300
+
+
+class SemanticIndex:
+    """Embedding-Pipeline eines Projekts.
+
+    Jede Quelle wird in Chunks zerlegt (PDF-Text seitenweise, Abstract,
+    Notizen, Zitate) und nur neu eingebettet, wenn sich ihr Inhalt oder das
+    Modell geändert hat. Vektoren liegen in `<index_dir>/embeddings.npy`.
+    """
+
+    def __init__(self, index_dir: Path, sources_path: Path,
+                 client: EmbeddingClient, approximate: bool = False):
+        self.sources_path = Path(sources_path)
+        self.client = client
+        self.vectors = VectorIndex(index_dir, approximate=approximate).load()
+        if self.vectors.model != client.model:
+            # Vektoren verschiedener Modelle sind nicht vergleichbar
+            self.vectors.clear(client.model)
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def collect_chunks(self, source, manager) -> List[VectorEntry]:
+        """Alle einzubettenden Textstücke einer Quelle"""
+        key = source.name
+        entries = []
+
+        if source.meta.abstract:
+            entries.append(VectorEntry(key, "abstract", text=source.meta.abstract))
+
+        if source.has_pdf:
+            pdf_text = PDFTextCache(source.pdf_path).load()
+            if pdf_text is not None:
+                for page_num, page in enumerate(pdf_text.pages):
+                    for chunk in chunk_text(page.text):
+                        entries.append(VectorEntry(
+                            key, "pdf", page=page_num + 1,
+                            start=chunk.start, end=chunk.end, text=chunk.text,
+                        ))
+
+        for note in manager.get_notes(source).notes:
+            if note.content.strip():
+                entries.append(VectorEntry(key, "note", ref=note.id, page=note.page, text=note.content))
+
+        for quote in manager.get_quotes(source).quotes:
+            text = quote.text if not quote.comment else f"{quote.text}\n{quote.comment}"
+            entries.append(VectorEntry(key, "quote", ref=quote.id, page=quote.page, text=text))
+
+        return entries
+
+    def _stamp(self, entries: List[VectorEntry]) -> str:
+        digest = hashlib.sha1(self.client.model.encode("utf-8"))
+        for entry in entries:
+            digest.update(f"\0{entry.kind}\0{entry.ref}\0{entry.page}\0".encode("utf-8"))
+            digest.update(entry.text.encode("utf-8"))
+        return digest.hexdigest()
+
+    def update_source(self, source, manager) -> bool:
+        """Bettet eine Quelle (neu) ein; False wenn unverändert"""
+        entries = self.collect_chunks(source, manager)
+        stamp = self._stamp(entries)
+        if self.vectors.stamps.get(source.name) == stamp:
+            return False
+
+        vectors = self.client.embed([e.text for e in entries]) if entries else []
+        self.vectors.remove(source.name)
+        for entry in entries:
+            entry.text = entry.text[:PREVIEW_CHARS]
+        self.vectors.add(entries, vectors)
+        self.vectors.stamps[source.name] = stamp
+        return True
+
+    def remove_source(self, key: str):
+        self.vectors.remove(key)
+
+    def sync(self, sources: Iterable, manager,
+             progress: Callable[[int, int], None] = None) -> int:
+        """Gleicht alle Quellen ab; Anzahl neu eingebetteter Quellen"""
+        sources = list(sources)
+        changed = 0
+        for i, source in enumerate(sources):
+            if self.update_source(source, manager):
+                changed += 1
+            if progress:
+                progress(i + 1, len(sources))
+
+        known = {source.name for source in sources}
+        for key in [k for k in self.vectors.stamps if k not in known]:
+            self.remove_source(key)
+        self.save()
+        return changed
+
+    def save(self):
+        self.vectors.save()
+
+    def search(self, query: str, k: int = 10) -> List[SearchResult]:
+        """Semantische Suche: die k ähnlichsten Chunks"""
+        if not len(self.vectors):
+            return []
+        query_vector = self.client.embed_one(query)
+        if query_vector is None:
+            return []
+
+        results = []
+        metas: Dict[str, LiMeta] = {}
+        for match in self.vectors.search(query_vector, k):
+            entry = match.entry
+            meta = metas.get(entry.key)
+            if meta is None:
+                meta = metas[entry.key] = self._load_meta(entry.key)
+            results.append(SearchResult(
+                source_path=self.sources_path / entry.key,
+                title=meta.title,
+                authors=meta.authors,
+                year=meta.year,
+                match_type="semantic",
+                match_text=entry.text,
+                relevance=match.score,
+                page=entry.page,
+                char_start=entry.start if entry.kind == "pdf" else None,
+                char_end=entry.end if entry.kind == "pdf" else None,
+            ))
+        return results
+
+    def _load_meta(self, key: str) -> LiMeta:
+        meta_path = self.sources_path / key / "meta.limeta"
+        try:
+            return LiMeta.load(meta_path)
+        except (LitFormatError, OSError, ValueError):
+            return LiMeta(title=key)
+
+
+def create_semantic_index(index_dir: Path, sources_path: Path, settings=None,
+                          approximate: bool = False) -> SemanticIndex:
+    """SemanticIndex mit Ollama-URL (ai_base_url) und Embedding-Modell
+    (ai_embedding_model) aus den Einstellungen"""
+    if settings is None:
+        from core import get_settings
+        settings = get_settings()
+    client = EmbeddingClient(
+        base_url=settings.get("ai_base_url") or "http://localhost:11434",
+        model=settings.get("ai_embedding_model") or DEFAULT_EMBEDDING_MODEL,
+    )
+    return SemanticIndex(index_dir, sources_path, client, approximate=approximate)
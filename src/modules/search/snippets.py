@@ -0,0 +1,200 @@
+"""
+LitZentrum - Textausschnitte
+Ausschnitte mit hervorgehobenen Fundstellen aus den Wort-Offsets des Textcaches
+"""
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Callable, Hashable, Iterable, List, Optional, Tuple
+import html
+
+from modules.pdf_workshop.text_cache import PDFText
+
+
+Rect = Tuple[float, float, float, float]
+
+
+@dataclass
+class Snippet:
+    """Ausschnitt einer Seite rund um eine oder mehrere Fundstellen"""
+    page: int  # 0-basiert
+    start: int  # Offsets des Ausschnitts im Seitentext
+    end: int
+    text: str
+    highlights: List[Tuple[int, int]] = field(default_factory=list)  # relativ zu text
+    rects: List[Rect] = field(default_factory=list)  # Wortboxen der Fundstellen
+    cut_start: bool = False
+    cut_end: bool = False
+
+    @property
+    def hit_start(self) -> int:
+        """Offset der ersten Fundstelle im Seitentext"""
+        return self.start + self.highlights[0][0] if self.highlights else self.start
+
+    @property
+    def hit_end(self) -> int:
+        return self.start + self.highlights[-1][1] if self.highlights else self.end
+
+    def html(self) -> str:
+        """Ausschnitt als HTML, Fundstellen fett"""
+        return highlight_html(self.text, self.highlights,
+                              "… " if self.cut_start else "", " …" if self.cut_end else "")
+
+    def merge(self, other: "Snippet") -> bool:
+        """Vereinigt einen überlappenden Ausschnitt derselben Seite"""
+        if other.page != self.page or other.start > self.end or other.end < self.start:
+            return False
+        if other.start < self.start:
+            return other.merge(self) and self._copy(other)
+        shift = other.start - self.start
+        if other.end > self.end:
+            self.text += other.text[self.end - other.start:]
+            self.end = other.end
+            self.cut_end = other.cut_end
+        spans = set(self.highlights) | {(s + shift, e + shift) for s, e in other.highlights}
+        self.highlights = sorted(spans)
+        self.rects = self.rects + [r for r in other.rects if r not in self.rects]
+        return True
+
+    def _copy(self, other: "Snippet") -> bool:
+        self.__dict__.update(other.__dict__)
+        return True
+
+
+def highlight_html(text: str, highlights: Iterable[Tuple[int, int]],
+                   prefix: str = "", suffix: str = "") -> str:
+    """Escaped HTML mit <b> um die angegebenen Bereiche"""
+    parts = [html.escape(prefix)]
+    pos = 0
+    for start, end in sorted(highlights):
+        if start < pos:
+            start = pos
+        if end <= start:
+            continue
+        parts.append(html.escape(text[pos:start]))
+        parts.append(f"<b>{html.escape(text[start:end])}</b>")
+        pos = end
+    parts.append(html.escape(text[pos:]))
+    parts.append(html.escape(suffix))
+    return "".join(parts)
+
+
+class SnippetBuilder:
+    """Erzeugt Ausschnitte für Fundstellen (Seite, Start, Ende).
+
+    Die Fenstergrenzen werden per bisect über die gespeicherten Wort-Offsets
+    des Textcaches bestimmt, nicht durch Durchsuchen des Seitentextes. Fertige
+    Ausschnitte samt Wortboxen werden unter (Dokument-Stempel, Seite, Start,
+    Ende) gecacht; bei einem Treffer im Cache muss der Textcache der PDF gar
+    nicht erst geladen werden.
+    """
+
+    def __init__(self, context_words: int = 8, max_snippets: int = 3, cache_size: int = 2048):
+        self.context_words = context_words
+        self.max_snippets = max_snippets
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[tuple, Snippet]" = OrderedDict()
+        self._page_words: "OrderedDict[tuple, Tuple[List[int], list]]" = OrderedDict()
+
+    def snippets(self, hits: Iterable, load_text: Callable[[], Optional[PDFText]],
+                 stamp: Hashable = None, max_snippets: int = None) -> List[Snippet]:
+        """Bis zu max_snippets Ausschnitte für die Fundstellen eines Dokuments.
+
+        `hits` brauchen die Attribute page (0-basiert), start und end, in
+        Lesereihenfolge. `load_text` wird nur bei Cache-Fehlern (höchstens
+        einmal) aufgerufen. Überlappende Ausschnitte werden zusammengefasst.
+        `max_snippets` gilt nur für diesen Aufruf.
+        """
+        if max_snippets is None:
+            max_snippets = self.max_snippets
+        result: List[Snippet] = []
+        pdf_text: Optional[PDFText] = None
+        loaded = False
+        for hit in hits:
+            key = (stamp, hit.page, hit.start, hit.end)
+            snippet = self._cache.get(key) if stamp is not None else None
+            if snippet is None:
+                if not loaded:
+                    pdf_text, loaded = load_text(), True
+                if pdf_text is None:
+                    break
+                snippet = self.build(pdf_text, hit.page, hit.start, hit.end, stamp)
+                if stamp is not None:
+                    self._remember(key, snippet)
+            else:
+                self._cache.move_to_end(key)
+
+            # Kopie, damit das Zusammenfassen den Cache nicht verändert
+            snippet = replace(snippet, highlights=list(snippet.highlights), rects=list(snippet.rects))
+            if result and result[-1].merge(snippet):
+                continue
+            if len(result) >= max_snippets:
+                break
+            result.append(snippet)
+        return result
+
+    def build(self, pdf_text: PDFText, page: int, start: int, end: int,
+              stamp: Hashable = None) -> Snippet:
+        """Ausschnitt für eine einzelne Fundstelle"""
+        text = pdf_text.page_text(page)
+        words = pdf_text.pages[page].words if 0 <= page < pdf_text.page_count else []
+        if words:
+            starts, words = self._sorted_words(stamp, page, words)
+            first_hit = max(bisect_right(starts, start) - 1, 0)
+            last_hit = max(bisect_left(starts, end) - 1, first_hit)
+            first = max(first_hit - self.context_words, 0)
+            last = min(last_hit + self.context_words, len(words) - 1)
+            win_start, win_end = words[first][4], max(words[last][5], end)
+            rects = [
+                (x0, y0, x1, y1)
+                for x0, y0, x1, y1, w_start, w_end in words[first_hit:last_hit + 1]
+                if w_start < end and w_end > start
+            ]
+            cut_end = last < len(words) - 1
+        else:
+            # Ohne Wortboxen: Fenster nach Zeichen
+            chars = self.context_words * 7
+            win_start, win_end = max(start - chars, 0), min(end + chars, len(text))
+            rects = []
+            cut_end = win_end < len(text)
+
+        win_start = min(win_start, start)
+        excerpt = text[win_start:win_end].replace("\n", " ")
+        return Snippet(
+            page=page,
+            start=win_start,
+            end=win_end,
+            text=excerpt,
+            highlights=[(start - win_start, end - win_start)],
+            rects=rects,
+            cut_start=win_start > 0,
+            cut_end=cut_end,
+        )
+
+    def _sorted_words(self, stamp: Hashable, page: int, words: list) -> Tuple[List[int], list]:
+        """Wortboxen einer Seite nach Startoffset sortiert, samt Offsets (gecacht).
+
+        Bei abweichender Lesereihenfolge (Spalten, Fußnoten) stehen die
+        Wörter im Textcache nicht immer in Textreihenfolge; bisect braucht
+        aufsteigende Offsets.
+        """
+        key = (stamp, page)
+        cached = self._page_words.get(key) if stamp is not None else None
+        if cached is None:
+            if any(a[4] > b[4] for a, b in zip(words, words[1:])):
+                words = sorted(words, key=lambda w: w[4])
+            cached = ([w[4] for w in words], words)
+            if stamp is not None:
+                self._page_words[key] = cached
+                while len(self._page_words) > 64:
+                    self._page_words.popitem(last=False)
+        return cached
+
+    def _remember(self, key: tuple, snippet: Snippet):
+        self._cache[key] = snippet
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    def clear(self):
+        self._cache.clear()
+        self._page_words.clear()
@@ -0,0 +1,160 @@
+"""
+LitZentrum - Tokenizer
+Sprachabhängige Normalisierung für alle Such-Indizes:
+Unicode-Faltung, Umlaute, leichtes Stemming (de/en), Kompositazerlegung
+"""
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+import re
+import unicodedata
+
+from formats.limeta import to_ascii
+
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_DIGRAPHS = re.compile(r"([aou])e")
+
+
+class Token(NamedTuple):
+    """Ein Token mit Position im Originaltext"""
+    term: str  # Normalisierter Suchterm
+    position: int  # Wortposition (Kompositateile teilen die Position des Wortes)
+    start: int  # Zeichen-Offset im Originaltext
+    end: int
+    is_part: bool = False  # Teil eines zerlegten Kompositums
+
+
+@lru_cache(maxsize=65536)
+def fold(word: str) -> str:
+    """Unicode-Faltung eines Wortes: casefold, ü -> ue, é -> e, ß -> ss"""
+    word = unicodedata.normalize("NFKC", word).casefold()
+    return to_ascii(word)
+
+
+def fold_umlauts(word: str) -> str:
+    """ae/oe/ue -> a/o/u auf einem gefalteten Wort (Müller = Mueller = Muller).
+
+    Nur für deutsche Texte und Personennamen; in anderen Sprachen sind das
+    echte Buchstabenfolgen ("queue", "does").
+    """
+    return _DIGRAPHS.sub(r"\1", word)
+
+
+def stem_german(word: str) -> str:
+    """Leichter deutscher Stemmer (angelehnt an CISTEM).
+
+    Je Endungsklasse wird höchstens eine Endung entfernt, von außen nach
+    innen: -n/-s, dann -e, dann -em/-er/-nd. Kein Wiederholen, damit
+    Wortstämme nicht angefressen werden ("Test" bleibt "test").
+    """
+    if len(word) > 3 and word[-1] in "ns":
+        word = word[:-1]
+    if len(word) > 3 and word[-1] == "e":
+        word = word[:-1]
+    if len(word) > 5 and word[-2:] in ("em", "er", "nd"):
+        word = word[:-2]
+    return word
+
+
+def stem_english(word: str) -> str:
+    """Leichter englischer Stemmer (S-Stemmer plus -ing/-ed)"""
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") and not word.endswith(("eies", "aies")):
+        return word[:-3] + "y"
+    if word.endswith("es") and not word.endswith(("aes", "ees", "oes")):
+        word = word[:-1]
+    elif word.endswith("s") and not word.endswith(("us", "ss")):
+        word = word[:-1]
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("ed") and not word.endswith("eed"):
+        return word[:-2]
+    return word
+
+
+STEMMERS = {
+    "de": stem_german,
+    "en": stem_english,
+}
+
+
+class Tokenizer:
+    """Zerlegt Text in normalisierte Suchterme.
+
+    Deutsche Komposita werden ohne Wörterbuch zerlegt: Ab einer Mindestlänge
+    werden alle Wortenden als zusätzliche Terme an derselben Position
+    indexiert ("literaturverwaltung" -> "verwaltung", "waltung", ...). Da
+    deutsche Komposita rechtsköpfig sind, findet so eine Suche nach dem
+    Grundwort auch das Kompositum.
+    """
+
+    MIN_COMPOUND_LENGTH = 10
+    MIN_HEAD_LENGTH = 5
+    MIN_MODIFIER_LENGTH = 4
+
+    def __init__(self, language: str = "de", stemming: bool = True,
+                 split_compounds: bool = True):
+        self.language = language if language in STEMMERS else "other"
+        self._stem = STEMMERS.get(self.language) if stemming else None
+        self.split_compounds = split_compounds and self.language == "de"
+        self.fold_umlauts = self.language == "de"
+        # Wort -> (Term, Kompositateile); begrenzt, da Vokabular endlich ist
+        self._cache: Dict[str, Tuple[str, Tuple[str, ...]]] = {}
+
+    def _analyze(self, word: str) -> Tuple[str, Tuple[str, ...]]:
+        cached = self._cache.get(word)
+        if cached is None:
+            term = fold(word)
+            if self.fold_umlauts:
+                term = fold_umlauts(term)
+            if self._stem:
+                term = self._stem(term)
+            cached = (term, tuple(self.compound_parts(term)))
+            if len(self._cache) < 200000:
+                self._cache[word] = cached
+        return cached
+
+    def normalize(self, word: str) -> str:
+        """Faltet und stemmt ein einzelnes Wort"""
+        return self._analyze(word)[0]
+
+    def compound_parts(self, term: str) -> List[str]:
+        """Wortenden eines (normalisierten) Kompositums"""
+        if not self.split_compounds or len(term) < self.MIN_COMPOUND_LENGTH:
+            return []
+        last = len(term) - self.MIN_HEAD_LENGTH
+        return [term[i:] for i in range(self.MIN_MODIFIER_LENGTH, last + 1)]
+
+    def iter_tokens(self, text: str) -> Iterator[Token]:
+        """Erzeugt Tokens inkl. Kompositateilen"""
+        position = 0
+        for match in _WORD.finditer(text):
+            term, parts = self._analyze(match.group())
+            if not term:
+                continue
+            start, end = match.span()
+            yield Token(term, position, start, end)
+            for part in parts:
+                yield Token(part, position, start, end, is_part=True)
+            position += 1
+
+    def tokenize(self, text: str) -> List[Token]:
+        """Liste aller Tokens eines Textes"""
+        return list(self.iter_tokens(text))
+
+    def terms(self, text: str) -> List[str]:
+        """Suchterme einer Anfrage (ohne Kompositateile)"""
+        return [t.term for t in self.iter_tokens(text) if not t.is_part]
+
+
+_tokenizers: Dict[str, Tokenizer] = {}
+
+
+def get_tokenizer(language: str = "de") -> Tokenizer:
+    """Gibt den (geteilten) Tokenizer für eine Sprache zurück (LiMeta.language)"""
+    language = (language or "de").lower()
+    tokenizer = _tokenizers.get(language)
+    if tokenizer is None:
+        tokenizer = _tokenizers[language] = Tokenizer(language)
+    return tokenizer
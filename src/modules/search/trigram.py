@@ -0,0 +1,223 @@
+"""
+LitZentrum - Trigramm-Index
+Fehlertolerante Suche über normalisierte Autorennamen und Titel
+"""
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+import re
+
+from formats.limeta import LiMeta
+from .tokenizer import fold, fold_umlauts
+
+
+_NON_ALPHA = re.compile(r"[^a-z0-9]+")
+
+
+def fold_name(text: str) -> str:
+    """Normalisiert Personennamen für den Trigramm-Vergleich.
+
+    Nutzt die Faltung des Tokenizers (Umlaut-Transliteration aus LiMeta,
+    danach ae/oe/ue -> a/o/u), damit "Müller", "Mueller" und "Muller"
+    denselben Schlüssel erhalten.
+    """
+    return fold_umlauts(fold_title(text))
+
+
+def fold_title(text: str) -> str:
+    """Normalisiert Titelwörter für den Trigramm-Vergleich (ohne ae/oe/ue-Zusammenzug)"""
+    return _NON_ALPHA.sub(" ", fold(text)).strip()
+
+
+def author_surname(author: str) -> str:
+    """Nachname eines Autors ("Müller, H." und "Hans Müller" -> "Müller")"""
+    author = author.strip()
+    if "," in author:
+        return author.split(",")[0].strip()
+    parts = author.split()
+    return parts[-1] if parts else ""
+
+
+def trigrams(term: str) -> Set[str]:
+    """Trigramme eines Terms (mit Rand-Padding)"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+@dataclass
+class FuzzyMatch:
+    """Treffer einer fehlertoleranten Suche"""
+    key: Hashable
+    score: float  # 0.0 - 1.0
+    field: str  # author, title
+    matched: str  # Normalisierter Term, der getroffen wurde
+
+
+class TrigramIndex:
+    """Invertierter Index Trigramm -> Terme -> Dokumente.
+
+    Identische Terme werden nur einmal gespeichert; die Ähnlichkeit ist der
+    Jaccard-Koeffizient der Trigramm-Mengen.
+    """
+
+    def __init__(self):
+        self._terms: List[Optional[str]] = []
+        self._term_ids: Dict[str, int] = {}
+        self._term_sizes: List[int] = []
+        self._term_docs: Dict[int, Set[Hashable]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._doc_terms: Dict[Hashable, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_terms)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._doc_terms
+
+    def add(self, key: Hashable, terms: Iterable[str]):
+        """Indexiert (bereits normalisierte) Terme für ein Dokument"""
+        self.remove(key)
+        term_ids = set()
+        for term in terms:
+            if not term:
+                continue
+            term_id = self._term_ids.get(term)
+            if term_id is None:
+                term_id = self._add_term(term)
+            self._term_docs[term_id].add(key)
+            term_ids.add(term_id)
+        if term_ids:
+            self._doc_terms[key] = term_ids
+
+    def _add_term(self, term: str) -> int:
+        term_id = len(self._terms)
+        grams = trigrams(term)
+        self._terms.append(term)
+        self._term_sizes.append(len(grams))
+        self._term_ids[term] = term_id
+        self._term_docs[term_id] = set()
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(term_id)
+        return term_id
+
+    def remove(self, key: Hashable):
+        """Entfernt ein Dokument; verwaiste Terme werden ausgetragen"""
+        term_ids = self._doc_terms.pop(key, None)
+        if not term_ids:
+            return
+        for term_id in term_ids:
+            docs = self._term_docs[term_id]
+            docs.discard(key)
+            if not docs:
+                self._drop_term(term_id)
+
+    def _drop_term(self, term_id: int):
+        term = self._terms[term_id]
+        for gram in trigrams(term):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(term_id)
+                if not posting:
+                    del self._postings[gram]
+        del self._term_docs[term_id]
+        del self._term_ids[term]
+        # ID bleibt als Lücke bestehen, damit andere IDs stabil bleiben
+        self._terms[term_id] = None
+
+    def similar_terms(self, term: str, min_similarity: float = 0.3) -> List[Tuple[str, float]]:
+        """Findet ähnliche Terme (Jaccard über Trigramme), bester zuerst"""
+        if not term:
+            return []
+        grams = trigrams(term)
+        overlap: Dict[int, int] = {}
+        for gram in grams:
+            for term_id in self._postings.get(gram, ()):
+                overlap[term_id] = overlap.get(term_id, 0) + 1
+
+        results = []
+        query_size = len(grams)
+        for term_id, common in overlap.items():
+            score = common / (query_size + self._term_sizes[term_id] - common)
+            if score >= min_similarity:
+                results.append((self._terms[term_id], score))
+        results.sort(key=lambda r: (-r[1], r[0]))
+        return results
+
+    def lookup(self, term: str, min_similarity: float = 0.3) -> Dict[Hashable, Tuple[float, str]]:
+        """Dokumente mit ähnlichem Term -> (bester Score, getroffener Term)"""
+        hits: Dict[Hashable, Tuple[float, str]] = {}
+        for matched, score in self.similar_terms(term, min_similarity):
+            for key in self._term_docs[self._term_ids[matched]]:
+                if key not in hits or hits[key][0] < score:
+                    hits[key] = (score, matched)
+        return hits
+
+
+class SourceNameIndex:
+    """Fehlertolerante Suche über Autoren und Titel von Quellen"""
+
+    MIN_WORD_LENGTH = 3
+
+    def __init__(self, min_similarity: float = 0.4):
+        self.min_similarity = min_similarity
+        self.authors = TrigramIndex()
+        self.titles = TrigramIndex()
+
+    def __len__(self) -> int:
+        return max(len(self.authors), len(self.titles))
+
+    def add_source(self, key: Hashable, meta: LiMeta):
+        """Indexiert (oder aktualisiert) eine Quelle"""
+        author_terms = set()
+        for author in meta.authors:
+            surname = fold_name(author_surname(author))
+            if surname:
+                author_terms.add(surname)
+        self.authors.add(key, author_terms)
+
+        words = fold_title(meta.title or "").split()
+        self.titles.add(key, {w for w in words if len(w) >= self.MIN_WORD_LENGTH})
+
+    def remove_source(self, key: Hashable):
+        """Entfernt eine Quelle aus dem Index"""
+        self.authors.remove(key)
+        self.titles.remove(key)
+
+    def search_authors(self, query: str, limit: int = 20) -> List[FuzzyMatch]:
+        """Sucht nach Autor ("Mueller", "Müller, H.", "Muler")"""
+        surname = fold_name(author_surname(query))
+        hits = self.authors.lookup(surname, self.min_similarity)
+        matches = [FuzzyMatch(key, score, "author", term) for key, (score, term) in hits.items()]
+        return self._top(matches, limit)
+
+    def search_titles(self, query: str, limit: int = 20) -> List[FuzzyMatch]:
+        """Sucht nach Titelwörtern; Score = Mittel über alle Suchwörter"""
+        words = [w for w in fold_title(query).split() if len(w) >= self.MIN_WORD_LENGTH]
+        if not words:
+            return []
+
+        totals: Dict[Hashable, float] = {}
+        best_terms: Dict[Hashable, str] = {}
+        for word in words:
+            for key, (score, term) in self.titles.lookup(word, self.min_similarity).items():
+                totals[key] = totals.get(key, 0.0) + score
+                best_terms.setdefault(key, term)
+
+        matches = [
+            FuzzyMatch(key, total / len(words), "title", best_terms[key])
+            for key, total in totals.items()
+        ]
+        return self._top(matches, limit)
+
+    def search(self, query: str, limit: int = 20) -> List[FuzzyMatch]:
+        """Kombinierte Suche über Autoren und Titel (bester Treffer je Quelle)"""
+        best: Dict[Hashable, FuzzyMatch] = {}
+        for match in self.search_authors(query, limit) + self.search_titles(query, limit):
+            current = best.get(match.key)
+            if current is None or match.score > current.score:
+                best[match.key] = match
+        return self._top(list(best.values()), limit)
+
+    @staticmethod
+    def _top(matches: List[FuzzyMatch], limit: int) -> List[FuzzyMatch]:
+        matches.sort(key=lambda m: -m.score)
+        return matches[:limit]
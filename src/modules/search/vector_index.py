@@ -0,0 +1,307 @@
+"""
+LitZentrum - Vektor-Index
+Memory-mapped Embedding-Matrix mit Kosinus-Top-k und optionalem SimHash-Vorfilter
+"""
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+import json
+import logging
+import os
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+@dataclass
+class VectorEntry:
+    """Metadaten zu einer Zeile der Embedding-Matrix"""
+    key: str  # Ordnername der Quelle
+    kind: str  # pdf, abstract, note, quote
+    ref: Optional[str] = None  # Notiz-/Zitat-ID
+    page: Optional[int] = None  # 1-basiert
+    start: int = 0
+    end: int = 0
+    text: str = ""
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "VectorEntry":
+        return cls(**{k: data.get(k) for k in cls.__dataclass_fields__ if k in data})
+
+
+@dataclass
+class VectorMatch:
+    """Treffer der Ähnlichkeitssuche"""
+    entry: VectorEntry
+    score: float  # Kosinus-Ähnlichkeit
+
+
+class SimHashIndex:
+    """Approximativer Vorfilter über Zufallshyperebenen (SimHash).
+
+    Jeder Vektor wird auf eine 64-Bit-Signatur abgebildet; Kandidaten sind
+    die Zeilen mit dem geringsten Hamming-Abstand zur Anfrage. Die Signaturen
+    werden aus der Matrix abgeleitet und nicht gespeichert.
+    """
+
+    BITS = 64
+
+    def __init__(self, dim: int, seed: int = 42):
+        rng = np.random.default_rng(seed)
+        self.planes = rng.standard_normal((dim, self.BITS)).astype(np.float32)
+        self._weights = (1 << np.arange(self.BITS, dtype=np.uint64)).astype(np.uint64)
+        self.codes = np.zeros(0, dtype=np.uint64)
+
+    def signatures(self, vectors: "np.ndarray") -> "np.ndarray":
+        bits = (vectors @ self.planes) > 0
+        return (bits.astype(np.uint64) * self._weights).sum(axis=1, dtype=np.uint64)
+
+    def rebuild(self, vectors: "np.ndarray"):
+        self.codes = self.signatures(vectors) if len(vectors) else np.zeros(0, dtype=np.uint64)
+
+    def append(self, vectors: "np.ndarray"):
+        self.codes = np.concatenate([self.codes, self.signatures(vectors)])
+
+    def candidates(self, query: "np.ndarray", count: int) -> "np.ndarray":
+        """Zeilen mit kleinstem Hamming-Abstand zur Anfrage"""
+        code = self.signatures(query[None, :])[0]
+        xor = np.bitwise_xor(self.codes, code)
+        distances = np.unpackbits(xor.view(np.uint8).reshape(-1, 8), axis=1).sum(axis=1)
+        if count >= len(distances):
+            return np.arange(len(distances))
+        return np.argpartition(distances, count)[:count]
+
+
+class VectorIndex:
+    """Normierte Embeddings als .npy-Matrix (memory-mapped) plus JSON-Metadaten.
+
+    Die Matrix wächst in Blöcken; gelöschte Zeilen werden nur markiert und
+    beim Speichern kompaktiert, sobald ein Viertel der Zeilen frei ist.
+    """
+
+    MATRIX_FILE = "embeddings.npy"
+    META_FILE = "embeddings.json"
+    GROWTH = 1024
+
+    def __init__(self, index_dir: Path, approximate: bool = False):
+        if not HAS_NUMPY:
+            raise ImportError("numpy nicht installiert. Bitte 'pip install numpy' ausführen.")
+
+        self.index_dir = Path(index_dir)
+        self.approximate = approximate
+        self.model = ""
+        self.dim = 0
+        self.entries: List[Optional[VectorEntry]] = []
+        self.stamps: Dict[str, str] = {}  # Quelle -> Inhalts-Stempel
+        self._rows: Dict[str, List[int]] = {}
+        self._matrix: Optional["np.ndarray"] = None
+        self._alive: Optional["np.ndarray"] = None
+        self._simhash: Optional[SimHashIndex] = None
+
+    @property
+    def matrix_path(self) -> Path:
+        return self.index_dir / self.MATRIX_FILE
+
+    @property
+    def meta_path(self) -> Path:
+        return self.index_dir / self.META_FILE
+
+    def __len__(self) -> int:
+        return sum(len(rows) for rows in self._rows.values())
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    # --- Laden / Speichern ---
+
+    def load(self) -> "VectorIndex":
+        """Öffnet Matrix (memory-mapped) und Metadaten, falls vorhanden"""
+        if not self.meta_path.exists() or not self.matrix_path.exists():
+            return self
+        try:
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.model = data.get("model", "")
+            self.dim = data.get("dim", 0)
+            self.stamps = data.get("stamps", {})
+            self.entries = [
+                VectorEntry.from_dict(e) if e is not None else None
+                for e in data.get("entries", [])
+            ]
+            self._matrix = np.load(self.matrix_path, mmap_mode="r+")
+        except (OSError, ValueError, TypeError) as e:
+            logging.debug(f"Vektor-Index '{self.index_dir}' nicht lesbar: {e}")
+            self._reset()
+            return self
+
+        if self._matrix.shape[0] < len(self.entries) or (self.dim and self._matrix.shape[1] != self.dim):
+            self._reset()
+            return self
+        self._rebuild_lookup()
+        return self
+
+    def save(self):
+        """Schreibt Metadaten und synchronisiert die Matrix auf die Platte"""
+        if self._matrix is None:
+            return
+        if self.entries and self.entries.count(None) * 4 > len(self.entries):
+            self.compact()
+        self._matrix.flush()
+        tmp_path = self.meta_path.with_name(self.META_FILE + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({
+                    "model": self.model,
+                    "dim": self.dim,
+                    "stamps": self.stamps,
+                    "entries": [e.to_dict() if e else None for e in self.entries],
+                }, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp_path, self.meta_path)
+        except OSError as e:
+            logging.debug(f"Vektor-Index '{self.index_dir}' nicht schreibbar: {e}")
+
+    def _reset(self):
+        self.model = ""
+        self.dim = 0
+        self.entries = []
+        self.stamps = {}
+        self._rows = {}
+        self._matrix = None
+        self._alive = None
+        self._simhash = None
+
+    def clear(self, model: str = ""):
+        """Verwirft alle Vektoren (z.B. bei Modellwechsel)"""
+        self._matrix = None
+        for path in (self.matrix_path, self.meta_path):
+            if path.exists():
+                path.unlink()
+        self._reset()
+        self.model = model
+
+    def _rebuild_lookup(self):
+        self._rows = {}
+        for row, entry in enumerate(self.entries):
+            if entry is not None:
+                self._rows.setdefault(entry.key, []).append(row)
+        self._alive = np.array([e is not None for e in self.entries], dtype=bool)
+        self._simhash = None
+
+    # --- Matrix-Verwaltung ---
+
+    def _open_matrix(self, rows: int):
+        """Legt die Matrix-Datei mit Kapazität für mindestens `rows` Zeilen an"""
+        capacity = max(self.GROWTH, rows)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        old = self._matrix
+        used = len(self.entries)
+        if old is not None:
+            capacity = max(capacity, 2 * old.shape[0])
+            tmp_path = self.matrix_path.with_name(self.MATRIX_FILE + ".tmp")
+            new = np.lib.format.open_memmap(
+                tmp_path, mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+            )
+            new[:used] = old[:used]
+            new.flush()
+            del new
+            self._matrix = None
+            del old
+            os.replace(tmp_path, self.matrix_path)
+        else:
+            np.lib.format.open_memmap(
+                self.matrix_path, mode="w+", dtype=np.float32, shape=(capacity, self.dim)
+            ).flush()
+        self._matrix = np.load(self.matrix_path, mmap_mode="r+")
+
+    def add(self, entries: Sequence[VectorEntry], vectors) -> None:
+        """Fügt normierte Vektoren mit Metadaten hinzu"""
+        if not entries:
+            return
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(entries):
+            raise ValueError("Anzahl Vektoren passt nicht zu den Einträgen")
+        if not self.dim:
+            self.dim = vectors.shape[1]
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Dimension {vectors.shape[1]} statt {self.dim}")
+
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.maximum(norms, 1e-12)
+
+        start = len(self.entries)
+        end = start + len(entries)
+        if self._matrix is None or self._matrix.shape[0] < end:
+            self._open_matrix(end)
+        self._matrix[start:end] = vectors
+
+        for offset, entry in enumerate(entries):
+            self.entries.append(entry)
+            self._rows.setdefault(entry.key, []).append(start + offset)
+        self._alive = np.concatenate([
+            self._alive if self._alive is not None else np.zeros(0, dtype=bool),
+            np.ones(len(entries), dtype=bool),
+        ])
+        if self._simhash is not None:
+            self._simhash.append(vectors)
+
+    def remove(self, key: str):
+        """Entfernt alle Vektoren einer Quelle"""
+        for row in self._rows.pop(key, ()):
+            self.entries[row] = None
+            self._alive[row] = False
+        self.stamps.pop(key, None)
+
+    def compact(self):
+        """Schreibt die Matrix ohne gelöschte Zeilen neu"""
+        keep = [row for row, entry in enumerate(self.entries) if entry is not None]
+        vectors = np.array(self._matrix[keep]) if keep else np.zeros((0, self.dim), dtype=np.float32)
+        self.entries = [self.entries[row] for row in keep]
+        self._matrix = None
+        if self.matrix_path.exists():
+            self.matrix_path.unlink()
+        self._open_matrix(len(keep))
+        self._matrix[:len(keep)] = vectors
+        self._rebuild_lookup()
+
+    # --- Suche ---
+
+    def _active(self) -> Tuple["np.ndarray", "np.ndarray"]:
+        used = len(self.entries)
+        return self._matrix[:used], self._alive[:used]
+
+    def search(self, query, k: int = 10, keys: Sequence[str] = None,
+               candidates: int = None) -> List[VectorMatch]:
+        """Kosinus-Top-k; mit approximate=True nur über SimHash-Kandidaten"""
+        if self._matrix is None or not self.entries:
+            return []
+        query = np.asarray(query, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        matrix, alive = self._active()
+
+        if self.approximate:
+            if self._simhash is None or len(self._simhash.codes) != len(matrix):
+                self._simhash = SimHashIndex(self.dim)
+                self._simhash.rebuild(np.asarray(matrix))
+            rows = self._simhash.candidates(query, candidates or max(20 * k, 200))
+            rows = rows[alive[rows]]
+        else:
+            rows = np.flatnonzero(alive)
+        if keys is not None:
+            wanted = {row for key in keys for row in self._rows.get(key, ())}
+            rows = np.array([r for r in rows if r in wanted], dtype=np.int64)
+        if not len(rows):
+            return []
+
+        scores = matrix[rows] @ query
+        if k < len(scores):
+            top = np.argpartition(-scores, k)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return [VectorMatch(self.entries[rows[i]], float(scores[i])) for i in top]
@@ -0,0 +1,228 @@
+"""
+LitZentrum - Projektarchiv
+Komprimiertes Einzeldatei-Archiv (.litzip) eines Projekts
+"""
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Iterator, List, Optional, Type, TypeVar
+import json
+import logging
+import os
+import shutil
+import zipfile
+
+from core import LitSource, ProjectManager, SourceManager
+from formats import LiMeta, LiNote, LiProj, LiQuote, LiSum, LiTask
+from formats.base import LitFormat
+from .manifest import walk_project
+
+
+ARCHIVE_SUFFIX = ".litzip"
+
+# Bereits komprimierte Formate werden unverändert (ZIP_STORED) abgelegt
+STORED_SUFFIXES = {
+    ".pdf", ".png", ".jpg", ".jpeg", ".gif", ".webp", ".zip", ".gz", ".xz", ".bz2",
+    ".docx", ".xlsx", ".pptx", ".odt", ".epub", ".mp3", ".mp4", ARCHIVE_SUFFIX,
+}
+
+COMPRESS_LEVEL = 6
+
+# Block, in dem Dateien ins Archiv gestreamt werden (bestimmt den Speicherbedarf)
+COPY_BLOCK_SIZE = 1 << 20
+
+T = TypeVar("T", bound=LitFormat)
+
+
+def create_archive(project_path: Path, archive_path: Path,
+                   progress: Callable[[int, int], None] = None) -> int:
+    """Schreibt ein Projekt als .litzip; Anzahl archivierter Dateien.
+
+    Das Archiv wird direkt (über eine .tmp-Datei) auf die Platte gestreamt,
+    jede Datei blockweise; der Speicherbedarf hängt nicht von der
+    Projektgröße ab. PDFs und andere komprimierte Formate werden
+    unverändert abgelegt, die übrigen (JSON-)Dateien beim Schreiben
+    komprimiert.
+    """
+    project_path, archive_path = Path(project_path), Path(archive_path)
+    entries = list(walk_project(project_path))
+    total = sum(1 for _, entry in entries if not entry.is_dir())
+    tmp_path = archive_path.with_name(archive_path.name + ".tmp")
+    archive_path.parent.mkdir(parents=True, exist_ok=True)
+
+    done = 0
+    try:
+        with zipfile.ZipFile(tmp_path, "w", zipfile.ZIP_DEFLATED, compresslevel=COMPRESS_LEVEL) as zf:
+            for rel, entry in entries:
+                info = zipfile.ZipInfo.from_file(entry.path, rel)
+                if entry.is_dir():
+                    zf.writestr(info, b"")
+                    continue
+                stored = Path(rel).suffix.lower() in STORED_SUFFIXES
+                info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                with open(entry.path, "rb") as src, zf.open(info, "w") as dest:
+                    shutil.copyfileobj(src, dest, COPY_BLOCK_SIZE)
+                done += 1
+                if progress:
+                    progress(done, total)
+        os.replace(tmp_path, archive_path)
+    except BaseException:
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
+        raise
+    return total
+
+
+class ArchivePath(zipfile.Path):
+    """zipfile.Path mit glob() (für LitSource.pdf_path)"""
+
+    def glob(self, pattern: str) -> Iterator["ArchivePath"]:
+        return (child for child in self.iterdir() if fnmatch(child.name, pattern))
+
+
+class ProjectArchive:
+    """Lesezugriff auf ein .litzip-Archiv.
+
+    Einzelne Dateien und Quellen werden über das zentrale Verzeichnis des
+    ZIP direkt angesprungen, ohne das Archiv zu entpacken.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.zip = zipfile.ZipFile(self.path)
+        self.root = ArchivePath(self.zip)
+        self._config: Optional[LiProj] = None
+
+    def close(self):
+        self.zip.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def names(self) -> List[str]:
+        return self.zip.namelist()
+
+    @property
+    def config(self) -> LiProj:
+        """Projekt-Konfiguration aus dem Archiv"""
+        if self._config is None:
+            self._config = load_format(LiProj, self.root / ProjectManager.PROJECT_CONFIG_FILE)
+        return self._config
+
+    def source_manager(self) -> "ArchiveSourceManager":
+        """Schreibgeschützter SourceManager auf den Quellen im Archiv"""
+        return ArchiveSourceManager(self)
+
+    def source_names(self) -> List[str]:
+        folder = self.root / self.config.sources_folder
+        if not folder.exists():
+            return []
+        return sorted(child.name for child in folder.iterdir() if child.is_dir())
+
+    def extract(self, target: Path):
+        """Entpackt das ganze Archiv nach `target`"""
+        self.zip.extractall(target)
+
+    def restore_source(self, name: str, project_path: Path) -> Path:
+        """Stellt eine einzelne Quelle in `project_path` wieder her.
+
+        Nur die Einträge der Quelle werden gelesen; ein vorhandener Ordner
+        wird erst nach erfolgreichem Entpacken ersetzt.
+        """
+        prefix = f"{self.config.sources_folder}/{name}/"
+        members = [info for info in self.zip.infolist() if info.filename.startswith(prefix)]
+        if not members:
+            raise KeyError(f"Quelle '{name}' nicht im Archiv")
+
+        target = Path(project_path) / self.config.sources_folder / name
+        tmp_dir = target.with_name(f".{name}.restore")
+        root = tmp_dir.resolve()
+        if root.parent != target.parent.resolve():
+            raise ValueError(f"Ungültiger Quellenname im Archiv: {name!r}")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        try:
+            for info in members:
+                path = tmp_dir / _member_path(info.filename[len(prefix):])
+                if not path.resolve().is_relative_to(root):
+                    raise ValueError(f"Ungültiger Pfad im Archiv: {info.filename}")
+                if info.is_dir():
+                    path.mkdir(parents=True, exist_ok=True)
+                    continue
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with self.zip.open(info) as src, open(path, "wb") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+            if target.exists():
+                shutil.rmtree(target)
+            os.replace(tmp_dir, target)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        return target
+
+
+def _member_path(name: str) -> str:
+    """Relativer Pfad eines ZIP-Eintrags; absolute Pfade und ".." werden abgelehnt"""
+    normalized = name.replace("\\", "/")
+    parts = normalized.split("/")
+    if normalized.startswith("/") or ".." in parts or ":" in parts[0]:
+        raise ValueError(f"Ungültiger Pfad im Archiv: {name}")
+    return name
+
+
+def load_format(cls: Type[T], path: zipfile.Path) -> T:
+    """Lädt eine .li*-Datei aus dem Archiv"""
+    if not path.exists():
+        raise FileNotFoundError(f"Datei nicht im Archiv: {path.at}")
+    return cls.from_dict(json.loads(path.read_text(encoding="utf-8")))
+
+
+class ArchiveSourceManager(SourceManager):
+    """SourceManager, der ein Projektarchiv schreibgeschützt liest.
+
+    LitSource.path ist hier ein ArchivePath; PDFs lassen sich über
+    `source.pdf_path.read_bytes()` öffnen (z.B. fitz.open(stream=...)).
+    """
+
+    def __init__(self, archive: ProjectArchive):
+        self.archive = archive
+        self.project_path = archive.root
+        self.sources_folder = archive.config.sources_folder
+
+    def load_source(self, path: ArchivePath) -> LitSource:
+        try:
+            meta = load_format(LiMeta, path / self.META_FILE)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Keine Metadaten in: {path.at}") from None
+        return LitSource(path=path, meta=meta)
+
+    def _load(self, cls: Type[T], path: ArchivePath) -> T:
+        try:
+            return load_format(cls, path)
+        except FileNotFoundError:
+            return cls()
+        except ValueError as e:
+            logging.debug(f"Archiv: '{path.at}' nicht lesbar: {e}")
+            return cls()
+
+    def get_notes(self, source: LitSource) -> LiNote:
+        return self._load(LiNote, source.notes_path)
+
+    def get_quotes(self, source: LitSource) -> LiQuote:
+        return self._load(LiQuote, source.quotes_path)
+
+    def get_tasks(self, source: LitSource) -> LiTask:
+        return self._load(LiTask, source.tasks_path)
+
+    def get_summaries(self, source: LitSource) -> LiSum:
+        return self._load(LiSum, source.summaries_path)
+
+    def _read_only(self, *args, **kwargs):
+        raise PermissionError(f"Projektarchiv ist schreibgeschützt: {self.archive.path}")
+
+    create_source = create_sources = delete_source = _read_only
+    save_notes = save_quotes = save_tasks = save_summaries = _read_only
@@ -0,0 +1,339 @@
+"""
+LitZentrum - Backup
+Inkrementelle Snapshot-Backups mit Hardlinks
+"""
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from datetime import datetime
+import logging
+import os
+import shutil
+import threading
+import time
+import zipfile
+
+from .archive import ARCHIVE_SUFFIX, ProjectArchive, create_archive
+from .manifest import ChangeManifest, copy_with_digest, file_digest, walk_project
+from .repository import BackupRepository
+
+
+class BackupCancelled(Exception):
+    """Das Backup wurde über BackupManager.cancel() abgebrochen"""
+    pass
+
+
+@dataclass
+class BackupStats:
+    """Kennzahlen des letzten Backups"""
+    files: int = 0
+    linked: int = 0          # per Hardlink bzw. aus dem Backup-Speicher übernommen
+    copied: int = 0
+    bytes_total: int = 0
+    bytes_copied: int = 0
+    duration: float = 0.0    # Sekunden
+
+
+class BackupManager:
+    """Lokale Backup-Verwaltung.
+
+    Jedes Backup ist ein vollständiger Ordner im Stil von rsync --link-dest:
+    unveränderte Dateien sind Hardlinks auf den vorherigen Snapshot, nur
+    geänderte Dateien werden kopiert. Ein Manifest (ChangeManifest) je
+    Snapshot erlaubt die Erkennung von Änderungen über Größe und mtime.
+    Löschen eines Snapshots lässt die übrigen unberührt.
+
+    Mit `deduplicate=True` ist `backup_dir` stattdessen ein BackupRepository
+    (inhaltsadressiert, von mehreren Projekten nutzbar); Backups sind dann
+    die Manifest-Dateien des Speichers.
+
+    cancel() bricht ein laufendes Backup nach dem aktuellen Block ab; der
+    halbe Snapshot (.<Name>.tmp) wird gelöscht. Reste abgebrochener Läufe
+    (z.B. nach einem Absturz) räumt das nächste Backup auf.
+    """
+
+    def __init__(self, project_path: Path, backup_dir: Path = None, deduplicate: bool = False,
+                 throttle: Callable[[int], None] = None):
+        self.project_path = Path(project_path)
+        self.backup_dir = Path(backup_dir) if backup_dir else self.project_path.parent / "backups"
+        self.throttle = throttle  # z.B. IOThrottle; wird je kopiertem Block aufgerufen
+        self.repository = BackupRepository(self.backup_dir, throttle=self._on_block) if deduplicate else None
+        self.last_stats: Optional[BackupStats] = None
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Bricht das laufende Backup ab (threadsicher)"""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set()
+
+    def _on_block(self, nbytes: int):
+        """Nach jedem gelesenen Block: Abbruch prüfen, dann drosseln"""
+        if self._cancel.is_set():
+            raise BackupCancelled()
+        if self.throttle:
+            self.throttle(nbytes)
+
+    def create_backup(self, name: str = None) -> Optional[Path]:
+        """Erstellt Backup des Projekts"""
+        if self.repository is not None:
+            return self._create_in_repository(name)
+
+        # Backup-Verzeichnis erstellen
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self._remove_stale_snapshots()
+
+        backup_path = self._new_backup_path(name)
+        tmp_path = backup_path.with_name(f".{backup_path.name}.tmp")
+        previous_path, previous = self.latest_snapshot()
+
+        started = time.perf_counter()
+        stats = BackupStats()
+        try:
+            tmp_path.mkdir()
+            manifest = self._write_snapshot(tmp_path, previous_path, previous, stats)
+            manifest.save(tmp_path / ChangeManifest.FILE_NAME)
+            os.replace(tmp_path, backup_path)
+        except BackupCancelled:
+            logging.debug(f"Backup von '{self.project_path}' abgebrochen")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return None
+        except (OSError, shutil.Error) as e:
+            logging.debug(f"Backup-Fehler: {e}")
+            shutil.rmtree(tmp_path, ignore_errors=True)
+            return None
+        stats.duration = time.perf_counter() - started
+        self.last_stats = stats
+        return backup_path
+
+    def _create_in_repository(self, name: str = None) -> Optional[Path]:
+        started = time.perf_counter()
+        stats = BackupStats()
+        try:
+            backup_path = self.repository.create_snapshot(self.project_path, name, stats)
+        except BackupCancelled:
+            # Schon abgelegte Objekte ohne Manifest entfernt prune()
+            logging.debug(f"Backup von '{self.project_path}' abgebrochen")
+            return None
+        except OSError as e:
+            logging.debug(f"Backup-Fehler: {e}")
+            return None
+        stats.duration = time.perf_counter() - started
+        self.last_stats = stats
+        return backup_path
+
+    def create_archive(self, archive_path: Path = None, name: str = None,
+                       progress: Callable[[int, int], None] = None) -> Optional[Path]:
+        """Erstellt ein komprimiertes Einzeldatei-Archiv (.litzip) des Projekts.
+
+        Ohne `archive_path` landet es neben den Backups in `backup_dir`;
+        `progress(archivierte Dateien, Dateien gesamt)` meldet den Fortschritt.
+        """
+        if archive_path is None:
+            self.backup_dir.mkdir(parents=True, exist_ok=True)
+            archive_path = self._new_backup_path(name, ARCHIVE_SUFFIX)
+        archive_path = Path(archive_path)
+
+        started = time.perf_counter()
+        try:
+            files = create_archive(self.project_path, archive_path, progress)
+        except (OSError, ValueError) as e:
+            logging.debug(f"Archiv-Fehler: {e}")
+            return None
+        size = archive_path.stat().st_size
+        self.last_stats = BackupStats(files=files, copied=files, bytes_copied=size,
+                                      duration=time.perf_counter() - started)
+        return archive_path
+
+    def list_archives(self) -> List[Path]:
+        """Listet die Projektarchive in `backup_dir` (neueste zuerst)"""
+        if not self.backup_dir.exists():
+            return []
+        archives = list(self.backup_dir.glob(f"{self.project_path.name}*{ARCHIVE_SUFFIX}"))
+        archives.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        return archives
+
+    def restore_source(self, archive_path: Path, source_name: str) -> bool:
+        """Stellt eine einzelne Quelle aus einem Archiv wieder her"""
+        try:
+            with ProjectArchive(archive_path) as archive:
+                archive.restore_source(source_name, self.project_path)
+            return True
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            logging.debug(f"Restore von '{source_name}' aus '{archive_path}' fehlgeschlagen: {e}")
+            return False
+
+    def _remove_stale_snapshots(self):
+        """Löscht halbe Snapshots (.<Projekt>_*.tmp) abgebrochener Läufe"""
+        for stale in self.backup_dir.glob(f".{self.project_path.name}_*.tmp"):
+            if stale.is_dir():
+                logging.debug(f"Backup: unvollständigen Snapshot '{stale.name}' entfernt")
+                shutil.rmtree(stale, ignore_errors=True)
+
+    def _new_backup_path(self, name: str = None, suffix: str = "") -> Path:
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        if name:
+            backup_name = f"{self.project_path.name}_{name}_{timestamp}"
+        else:
+            backup_name = f"{self.project_path.name}_{timestamp}"
+
+        backup_path = self.backup_dir / f"{backup_name}{suffix}"
+        counter = 2
+        while backup_path.exists():
+            backup_path = self.backup_dir / f"{backup_name}_{counter}{suffix}"
+            counter += 1
+        return backup_path
+
+    def _write_snapshot(self, target: Path, previous_path: Optional[Path],
+                        previous: Optional[ChangeManifest], stats: BackupStats) -> ChangeManifest:
+        """Schreibt den Snapshot nach `target` und liefert sein Manifest"""
+        manifest = ChangeManifest()
+        for rel, entry in walk_project(self.project_path):
+            destination = target / rel
+            if entry.is_dir():
+                destination.mkdir()
+                manifest.dirs.append(rel)
+                continue
+
+            stat = entry.stat()
+            stats.files += 1
+            stats.bytes_total += stat.st_size
+            known = previous.entry(rel, stat) if previous else None
+            if known and self._link(previous_path / rel, destination, stat.st_size):
+                manifest.files[rel] = known
+                stats.linked += 1
+                continue
+
+            # Gleiche Größe, andere mtime: vielleicht nur berührt. Erst hashen
+            # und bei gleichem Inhalt direkt verlinken, statt zu kopieren
+            old = previous.files.get(rel) if previous else None
+            if old and old[0] == stat.st_size:
+                try:
+                    digest = file_digest(Path(entry.path), self._on_block)
+                except OSError as e:
+                    logging.debug(f"Backup: '{rel}' nicht lesbar: {e}")
+                    digest = None
+                if digest == old[2] and self._link(previous_path / rel, destination, stat.st_size):
+                    manifest.files[rel] = [stat.st_size, stat.st_mtime_ns, digest]
+                    stats.linked += 1
+                    continue
+
+            # Geändert: kopieren und dabei hashen
+            digest = copy_with_digest(Path(entry.path), destination, self._on_block)
+            stats.copied += 1
+            stats.bytes_copied += stat.st_size
+            manifest.files[rel] = [stat.st_size, stat.st_mtime_ns, digest]
+        return manifest
+
+    @staticmethod
+    def _link(source: Path, target: Path, size: int) -> bool:
+        """Hardlink auf die Datei des vorherigen Snapshots.
+
+        Schlägt fehl (False), wenn die Datei dort fehlt oder verändert wurde
+        oder das Dateisystem keine Hardlinks kennt; dann wird kopiert.
+        """
+        try:
+            if source.stat().st_size != size:
+                return False
+            os.link(source, target)
+            return True
+        except OSError as e:
+            logging.debug(f"Backup: Hardlink auf '{source}' nicht möglich: {e}")
+            return False
+
+    def latest_snapshot(self) -> Tuple[Optional[Path], Optional[ChangeManifest]]:
+        """Neuester Snapshot mit Manifest (ältere Backups ohne Manifest zählen nicht)"""
+        for backup in self.list_backups():
+            if self.repository is not None:
+                manifest = self.repository.load_snapshot(backup)
+            else:
+                manifest = ChangeManifest.load(backup / ChangeManifest.FILE_NAME)
+            if manifest is not None:
+                return backup, manifest
+        return None, None
+
+    def has_changes(self) -> bool:
+        """Hat sich das Projekt seit dem letzten Snapshot geändert?"""
+        _, manifest = self.latest_snapshot()
+        return manifest is None or manifest.differs_from(self.project_path)
+
+    def list_backups(self) -> List[Path]:
+        """Listet alle Backups"""
+        if self.repository is not None:
+            return self.repository.snapshots(self.repository.project_key(self.project_path))
+        if not self.backup_dir.exists():
+            return []
+
+        backups = []
+        prefix = self.project_path.name
+        for item in self.backup_dir.iterdir():
+            if item.is_dir() and item.name.startswith(prefix):
+                backups.append(item)
+
+        # Nach Datum sortieren (neueste zuerst)
+        backups.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+        return backups
+
+    def restore_backup(self, backup_path: Path) -> bool:
+        """Stellt Backup wieder her"""
+        if not backup_path.exists():
+            return False
+
+        # Aktuelles Projekt sichern
+        temp_backup = self.project_path.parent / f"{self.project_path.name}_before_restore"
+        try:
+            if temp_backup.exists():
+                shutil.rmtree(temp_backup)
+            self.project_path.rename(temp_backup)
+        except OSError as e:
+            logging.debug(f"Restore-Fehler: Projekt nicht verschiebbar: {e}")
+            return False
+
+        try:
+            # Backup wiederherstellen (Kopien, keine Hardlinks in den Snapshot)
+            if self.repository is not None:
+                self.repository.restore(backup_path, self.project_path)
+            else:
+                shutil.copytree(
+                    backup_path, self.project_path,
+                    ignore=shutil.ignore_patterns(ChangeManifest.FILE_NAME),
+                )
+        except (OSError, shutil.Error, ValueError) as e:
+            # Halb wiederhergestelltes Projekt verwerfen, altes zurückholen
+            logging.debug(f"Restore-Fehler: {e}")
+            shutil.rmtree(self.project_path, ignore_errors=True)
+            temp_backup.rename(self.project_path)
+            return False
+
+        # Temporäres Backup löschen
+        shutil.rmtree(temp_backup, ignore_errors=True)
+        return True
+
+    def delete_backup(self, backup_path: Path) -> bool:
+        """Löscht ein Backup (Hardlinks anderer Snapshots bleiben gültig)"""
+        if self.repository is not None:
+            if not self.repository.delete_snapshot(backup_path):
+                return False
+            self.repository.prune()
+            return True
+        if backup_path.exists() and backup_path.is_dir():
+            try:
+                shutil.rmtree(backup_path)
+                return True
+            except (OSError, PermissionError, shutil.Error) as e:
+                logging.debug(f"Fehler beim Löschen des Backups '{backup_path}': {e}")
+        return False
+
+    def cleanup_old_backups(self, keep_count: int = 10):
+        """Löscht alte Backups, behält die neuesten"""
+        if self.repository is not None:
+            self.repository.prune(self.repository.project_key(self.project_path), keep_count)
+            return
+
+        backups = self.list_backups()
+
+        if len(backups) > keep_count:
+            for old_backup in backups[keep_count:]:
+                self.delete_backup(old_backup)
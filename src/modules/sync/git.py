@@ -0,0 +1,432 @@
+"""
+LitZentrum - Git-Integration
+Projektversionierung mit Git, Auto-Commit im Hintergrund
+"""
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Set
+from concurrent.futures import Future
+from datetime import datetime
+import functools
+import logging
+import queue
+import subprocess
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+from core import EventBus, EventType, LitSource
+
+
+@functools.lru_cache(maxsize=None)
+def git_available() -> bool:
+    """Prüft einmal pro Sitzung, ob Git installiert ist"""
+    try:
+        result = subprocess.run(
+            ["git", "--version"],
+            capture_output=True,
+            text=True,
+        )
+        return result.returncode == 0
+    except (OSError, subprocess.SubprocessError, FileNotFoundError) as e:
+        logging.debug(f"Git nicht verfügbar: {e}")
+        return False
+
+
+@dataclass
+class StatusEntry:
+    """Ein Eintrag aus `git status --porcelain=v2`"""
+    path: str
+    kind: str                       # changed, renamed, unmerged, untracked, ignored
+    index: str = "."                # X: Zustand im Index
+    worktree: str = "."             # Y: Zustand im Arbeitsverzeichnis
+    orig_path: Optional[str] = None  # bei Umbenennungen
+
+    @property
+    def staged(self) -> bool:
+        return self.kind in ("changed", "renamed") and self.index != "."
+
+
+@dataclass
+class GitStatus:
+    """Ergebnis von `git status --porcelain=v2 --branch -z`"""
+    commit: Optional[str] = None    # None vor dem ersten Commit
+    branch: Optional[str] = None    # None bei losgelöstem HEAD
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    entries: List[StatusEntry] = field(default_factory=list)
+
+    @property
+    def clean(self) -> bool:
+        return not any(e.kind != "ignored" for e in self.entries)
+
+
+def parse_status_v2(output: str) -> GitStatus:
+    """Zerlegt die NUL-getrennte Ausgabe von `git status --porcelain=v2 -z`"""
+    status = GitStatus()
+    records = output.split("\0")
+    i = 0
+    while i < len(records):
+        record = records[i]
+        i += 1
+        if not record:
+            continue
+        if record.startswith("# "):
+            key, _, value = record[2:].partition(" ")
+            if key == "branch.oid":
+                status.commit = None if value == "(initial)" else value
+            elif key == "branch.head":
+                status.branch = None if value == "(detached)" else value
+            elif key == "branch.upstream":
+                status.upstream = value
+            elif key == "branch.ab":
+                ahead, _, behind = value.partition(" ")
+                status.ahead, status.behind = int(ahead.lstrip("+")), int(behind.lstrip("-"))
+            continue
+
+        kind = record[0]
+        if kind in "?!":
+            status.entries.append(StatusEntry(
+                path=record[2:], kind="untracked" if kind == "?" else "ignored",
+                index=kind, worktree=kind,
+            ))
+        elif kind == "1":
+            fields = record.split(" ", 8)
+            status.entries.append(StatusEntry(fields[8], "changed", fields[1][0], fields[1][1]))
+        elif kind == "2":
+            fields = record.split(" ", 9)
+            orig_path = records[i] if i < len(records) else None
+            i += 1
+            status.entries.append(StatusEntry(fields[9], "renamed", fields[1][0], fields[1][1], orig_path))
+        elif kind == "u":
+            fields = record.split(" ", 10)
+            status.entries.append(StatusEntry(fields[10], "unmerged", fields[1][0], fields[1][1]))
+        else:
+            logging.debug(f"Git-Status: unbekannter Eintrag '{record[:20]}'")
+    return status
+
+
+@dataclass
+class CommitResult:
+    """Ergebnis eines (Auto-)Commits"""
+    paths: List[str] = field(default_factory=list)  # committete Pfade (relativ zum Repository)
+    commit: Optional[str] = None    # None: nichts zu committen oder Fehler
+    error: Optional[str] = None
+    duration: float = 0.0
+
+
+class GitSync:
+    """Git-Integration für Projektversionierung"""
+
+    def __init__(self, project_path: Path):
+        self.project_path = Path(project_path)
+        self.git_dir = self.project_path / ".git"
+
+    def is_git_available(self) -> bool:
+        """Prüft ob Git installiert ist (einmal pro Sitzung)"""
+        return git_available()
+
+    def is_repository(self) -> bool:
+        """Prüft ob Projekt ein Git-Repository ist"""
+        return self.git_dir.exists()
+
+    def init(self) -> bool:
+        """Initialisiert Git-Repository"""
+        if not self.is_git_available():
+            return False
+
+        if self.is_repository():
+            return True
+
+        try:
+            result = subprocess.run(
+                ["git", "init"],
+                cwd=str(self.project_path),
+                capture_output=True,
+                text=True,
+            )
+
+            if result.returncode == 0:
+                # .gitignore erstellen
+                self._create_gitignore()
+                return True
+        except (OSError, subprocess.SubprocessError, PermissionError) as e:
+            logging.debug(f"Fehler beim Git-Init: {e}")
+        return False
+
+    def _create_gitignore(self):
+        """Erstellt .gitignore"""
+        gitignore = self.project_path / ".gitignore"
+        content = """# LitZentrum
+__pycache__/
+*.pyc
+.DS_Store
+Thumbs.db
+
+# Temporäre Dateien
+*.tmp
+*.bak
+~$*
+
+# Caches (werden automatisch neu erzeugt)
+*.textcache
+.index/
+
+# Große PDF-Dateien (optional)
+# *.pdf
+"""
+        gitignore.write_text(content, encoding="utf-8")
+
+    def _git(self, *args: str, stdin: str = None) -> subprocess.CompletedProcess:
+        """Führt einen Git-Befehl im Projekt aus (Pfadangaben wörtlich, ohne Glob)"""
+        return subprocess.run(
+            ["git", "--literal-pathspecs", *args],
+            cwd=str(self.project_path),
+            input=stdin,
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+        )
+
+    def status(self) -> Optional[GitStatus]:
+        """Gibt den Git-Status strukturiert zurück"""
+        if not self.is_repository():
+            return None
+
+        try:
+            result = self._git("status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all")
+            if result.returncode != 0:
+                logging.debug(f"Fehler beim Git-Status: {result.stderr.strip()}")
+                return None
+            return parse_status_v2(result.stdout)
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.debug(f"Fehler beim Git-Status: {e}")
+            return None
+
+    def add_all(self) -> bool:
+        """Staged alle Änderungen"""
+        try:
+            result = subprocess.run(
+                ["git", "add", "-A"],
+                cwd=str(self.project_path),
+                capture_output=True,
+            )
+            return result.returncode == 0
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.debug(f"Fehler beim Git-Add: {e}")
+            return False
+
+    def commit(self, message: str = None) -> bool:
+        """Erstellt Commit"""
+        if not message:
+            message = f"LitZentrum Auto-Commit: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+
+        try:
+            result = subprocess.run(
+                ["git", "commit", "-m", message],
+                cwd=str(self.project_path),
+                capture_output=True,
+            )
+            return result.returncode == 0
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.debug(f"Fehler beim Git-Commit: {e}")
+            return False
+
+    def commit_paths(self, paths: Iterable[Path], message: str = None) -> CommitResult:
+        """Committet nur die Änderungen unter den angegebenen Pfaden.
+
+        Welche Dateien sich geändert haben, liefert `git status`; Ordner
+        umfassen alles darunter. Gestaged und committet werden genau diese
+        Dateien (auch gelöschte), andere gestagte Änderungen bleiben im Index.
+        """
+        started = time.perf_counter()
+        result = CommitResult()
+        prefixes = self._relative(paths)
+        status = self.status()
+        if status is None:
+            result.error = "Kein Git-Repository"
+            return result
+
+        changed = set()
+        for entry in status.entries:
+            if entry.kind == "ignored":
+                continue
+            for path in (entry.path, entry.orig_path):
+                if path and any(p == "" or path == p or path.startswith(p.rstrip("/") + "/") for p in prefixes):
+                    changed.add(path)
+        if not changed:
+            result.duration = time.perf_counter() - started
+            return result
+
+        if not message:
+            message = f"LitZentrum Auto-Commit: {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        pathspec = "\0".join(sorted(changed)) + "\0"
+        try:
+            for args in (("add", "-A"), ("commit", "-m", message)):
+                done = self._git(*args, "--pathspec-from-file=-", "--pathspec-file-nul", stdin=pathspec)
+                if done.returncode != 0:
+                    result.error = (done.stderr or done.stdout).strip() or f"git {args[0]} fehlgeschlagen"
+                    return result
+            head = self._git("rev-parse", "HEAD")
+            result.commit = head.stdout.strip() or None
+            result.paths = sorted(changed)
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.debug(f"Fehler beim Git-Commit: {e}")
+            result.error = str(e)
+        result.duration = time.perf_counter() - started
+        return result
+
+    def _relative(self, paths: Iterable[Path]) -> Set[str]:
+        """Pfade relativ zum Projekt ("/"-getrennt; "" = ganzes Projekt)"""
+        root = self.project_path.resolve()
+        relative = set()
+        for path in paths:
+            try:
+                rel = Path(path).resolve().relative_to(root).as_posix()
+            except ValueError:
+                logging.debug(f"Git: '{path}' liegt außerhalb des Projekts")
+                continue
+            relative.add("" if rel == "." else rel)
+        return relative
+
+    def auto_commit(self, message: str = None, paths: Iterable[Path] = None) -> bool:
+        """Add + Commit in einem Schritt (mit `paths` nur diese Pfade)"""
+        if paths is not None:
+            result = self.commit_paths(paths, message)
+            return result.error is None
+        return self.add_all() and self.commit(message)
+
+
+_STOP = object()
+
+
+class GitWorker(QObject):
+    """Langlebiger Thread für Git-Befehle eines Projekts.
+
+    touch() merkt geänderte Pfade vor; erst wenn QUIET_PERIOD Sekunden
+    lang nichts mehr hinzukommt, entsteht daraus ein gemeinsamer Commit
+    (nur dieser Pfade). submit() führt beliebige Git-Aufrufe im selben
+    Thread aus, sodass sich Befehle nie überschneiden. Die Signale werden
+    im Worker-Thread ausgelöst.
+    """
+
+    committed = Signal(object)  # CommitResult
+    commit_failed = Signal(str)  # Fehlermeldung
+
+    QUIET_PERIOD = 5.0  # Sekunden ohne Änderung bis zum Commit
+
+    # Änderungen an Quellen und ihren Dateien
+    TOUCH_EVENTS = (
+        EventType.SOURCE_CREATED, EventType.SOURCE_UPDATED, EventType.SOURCE_DELETED,
+        EventType.NOTE_ADDED, EventType.NOTE_UPDATED, EventType.NOTE_DELETED,
+        EventType.QUOTE_ADDED, EventType.QUOTE_UPDATED, EventType.QUOTE_DELETED,
+        EventType.TASK_ADDED, EventType.TASK_UPDATED, EventType.TASK_COMPLETED, EventType.TASK_DELETED,
+        EventType.SUMMARY_ADDED, EventType.SUMMARY_UPDATED,
+    )
+
+    def __init__(self, project_path: Path, quiet_period: float = None):
+        super().__init__()
+        self.git = GitSync(project_path)
+        self.quiet_period = self.QUIET_PERIOD if quiet_period is None else quiet_period
+        self._jobs: queue.Queue = queue.Queue()
+        self._pending: Set[Path] = set()
+        self._deadline = 0.0
+        self._lock = threading.Lock()
+        self._event_bus: Optional[EventBus] = None
+        self._thread = threading.Thread(target=self._worker, name="GitWorker", daemon=True)
+        self._thread.start()
+
+    # === Aufträge ===
+
+    def touch(self, *paths: Path):
+        """Merkt Pfade für den nächsten Commit vor und verschiebt ihn"""
+        with self._lock:
+            self._pending.update(Path(p) for p in paths)
+            self._deadline = time.monotonic() + self.quiet_period
+        self._jobs.put(None)  # Worker neu planen lassen
+
+    def pending(self) -> List[Path]:
+        with self._lock:
+            return sorted(self._pending)
+
+    def submit(self, func: Callable[[GitSync], object]) -> Future:
+        """Führt func(GitSync) im Worker aus, z.B. submit(GitSync.status)"""
+        future = Future()
+        self._jobs.put((future, func))
+        return future
+
+    def flush(self) -> Future:
+        """Committet vorgemerkte Pfade sofort (Future mit CommitResult oder None)"""
+        return self.submit(lambda git: self._commit_pending(force=True))
+
+    def stop(self, timeout: float = 10.0):
+        """Committet Vorgemerktes und beendet den Worker"""
+        self.disconnect()
+        if self._thread.is_alive():
+            self._jobs.put(_STOP)
+            self._thread.join(timeout)
+
+    # === EventBus ===
+
+    def connect(self, event_bus: EventBus):
+        """Vormerken bei jeder Änderung an Quellen, Notizen, Zitaten usw."""
+        self.disconnect()
+        self._event_bus = event_bus
+        for event_type in self.TOUCH_EVENTS:
+            event_bus.subscribe(event_type, self._on_changed)
+        event_bus.subscribe(EventType.PROJECT_SAVED, self._on_changed)
+
+    def disconnect(self):
+        if self._event_bus is None:
+            return
+        for event_type in self.TOUCH_EVENTS:
+            self._event_bus.unsubscribe(event_type, self._on_changed)
+        self._event_bus.unsubscribe(EventType.PROJECT_SAVED, self._on_changed)
+        self._event_bus = None
+
+    def _on_changed(self, data=None):
+        # Ohne Quelle (z.B. gelöscht per Name) wird das ganze Projekt geprüft
+        self.touch(data.path if isinstance(data, LitSource) else self.git.project_path)
+
+    # === Worker ===
+
+    def _worker(self):
+        while True:
+            with self._lock:
+                timeout = max(0.0, self._deadline - time.monotonic()) if self._pending else None
+            try:
+                job = self._jobs.get(timeout=timeout)
+            except queue.Empty:
+                job = None
+
+            if job is _STOP:
+                self._commit_pending(force=True)
+                return
+            if job is not None:
+                future, func = job
+                if future.set_running_or_notify_cancel():
+                    try:
+                        future.set_result(func(self.git))
+                    except Exception as e:
+                        future.set_exception(e)
+            self._commit_pending()
+
+    def _commit_pending(self, force: bool = False) -> Optional[CommitResult]:
+        with self._lock:
+            if not self._pending or (not force and time.monotonic() < self._deadline):
+                return None
+            paths, self._pending = self._pending, set()
+
+        try:
+            result = self.git.commit_paths(paths)
+        except Exception as e:
+            result = CommitResult(error=str(e))
+        if result.error:
+            logging.debug(f"Git-Auto-Commit fehlgeschlagen: {result.error}")
+            self.commit_failed.emit(result.error)
+        elif result.commit:
+            self.committed.emit(result)
+        return result
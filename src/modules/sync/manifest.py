@@ -0,0 +1,141 @@
+"""
+LitZentrum - Backup-Manifest
+Dateiliste mit Größe, Änderungszeit und SHA-256 eines Projektstands
+"""
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import shutil
+
+
+# Nicht gesicherte Dateien und Ordner (wie bisher bei copytree)
+IGNORE_PATTERNS = ("__pycache__", "*.pyc", ".git", "*.tmp", "*.textcache", ".index")
+
+BLOCK_SIZE = 1 << 20
+
+
+def _ignored(name: str) -> bool:
+    return any(fnmatch(name, pattern) for pattern in IGNORE_PATTERNS)
+
+
+def walk_project(root: Path) -> Iterator[Tuple[str, os.DirEntry]]:
+    """Alle gesicherten Einträge (Ordner vor ihrem Inhalt) als (relativer Pfad, DirEntry).
+
+    Relative Pfade verwenden "/" als Trenner; das Manifest ist damit
+    zwischen Betriebssystemen austauschbar.
+    """
+    stack = [("", Path(root))]
+    while stack:
+        prefix, folder = stack.pop()
+        try:
+            with os.scandir(folder) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError as e:
+            logging.debug(f"Backup: Ordner '{folder}' nicht lesbar: {e}")
+            continue
+        for entry in entries:
+            if _ignored(entry.name) or entry.name == ChangeManifest.FILE_NAME:
+                continue
+            rel = f"{prefix}{entry.name}"
+            yield rel, entry
+            if entry.is_dir():
+                stack.append((rel + "/", Path(entry.path)))
+
+
+def file_digest(path: Path, throttle: Callable[[int], None] = None) -> str:
+    """SHA-256 einer Datei (blockweise gelesen, `throttle` wie bei copy_with_digest)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(BLOCK_SIZE), b""):
+            digest.update(block)
+            if throttle:
+                throttle(len(block))
+    return digest.hexdigest()
+
+
+def copy_with_digest(source: Path, target: Path,
+                     throttle: Callable[[int], None] = None) -> str:
+    """Kopiert eine Datei samt Zeitstempeln und liefert dabei ihren SHA-256.
+
+    `throttle` wird nach jedem Block mit dessen Größe aufgerufen (IOThrottle).
+    """
+    digest = hashlib.sha256()
+    with open(source, "rb") as src, open(target, "wb") as dst:
+        for block in iter(lambda: src.read(BLOCK_SIZE), b""):
+            digest.update(block)
+            dst.write(block)
+            if throttle:
+                throttle(len(block))
+    shutil.copystat(source, target)
+    return digest.hexdigest()
+
+
+class ChangeManifest:
+    """Manifest eines Backups.
+
+    Je Datei wird [Größe, mtime_ns, SHA-256] gespeichert. Stimmen Größe und
+    Änderungszeit einer Projektdatei mit dem Manifest überein, gilt sie als
+    unverändert und wird nicht erneut gelesen.
+    """
+
+    FILE_NAME = ".litbackup.json"
+    VERSION = 1
+
+    def __init__(self, files: Dict[str, List] = None, dirs: List[str] = None,
+                 created: str = None):
+        self.files: Dict[str, List] = files if files is not None else {}
+        self.dirs: List[str] = dirs if dirs is not None else []
+        self.created = created or datetime.now().isoformat(timespec="seconds")
+
+    def entry(self, rel: str, stat: os.stat_result) -> Optional[List]:
+        """Manifest-Eintrag, falls die Datei laut Größe und mtime unverändert ist"""
+        entry = self.files.get(rel)
+        if entry and entry[0] == stat.st_size and entry[1] == stat.st_mtime_ns:
+            return entry
+        return None
+
+    def differs_from(self, root: Path) -> bool:
+        """Hat sich das Projekt seit diesem Manifest geändert? (nur stat, kein Lesen)"""
+        seen = 0
+        for rel, entry in walk_project(root):
+            if entry.is_dir():
+                continue
+            try:
+                if self.entry(rel, entry.stat()) is None:
+                    return True
+            except OSError:
+                return True
+            seen += 1
+        return seen != len(self.files)
+
+    @property
+    def total_size(self) -> int:
+        return sum(entry[0] for entry in self.files.values())
+
+    def to_dict(self) -> dict:
+        return {"version": self.VERSION, "created": self.created,
+                "dirs": self.dirs, "files": self.files}
+
+    def save(self, path: Path):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: Path) -> Optional["ChangeManifest"]:
+        """Liest ein Manifest; None, falls es fehlt oder unbrauchbar ist"""
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logging.debug(f"Backup-Manifest '{path}' nicht lesbar: {e}")
+            return None
+        if not isinstance(data, dict) or data.get("version") != cls.VERSION:
+            return None
+        return cls(data.get("files") or {}, data.get("dirs") or [], data.get("created"))
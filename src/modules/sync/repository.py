@@ -0,0 +1,278 @@
+"""
+LitZentrum - Backup-Speicher
+Inhaltsadressierter, deduplizierender Speicher für Projekt-Snapshots
+"""
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional, Tuple
+from datetime import datetime
+import hashlib
+import logging
+import os
+import threading
+
+from .manifest import ChangeManifest, walk_project
+
+
+class SnapshotManifest(ChangeManifest):
+    """Manifest eines Snapshots im Backup-Speicher.
+
+    Je Datei wird [Größe, mtime_ns, [Chunk-Hashes]] gespeichert; der Inhalt
+    liegt in den Objekten des Speichers.
+    """
+
+
+class BackupRepository:
+    """Deduplizierender Backup-Speicher (auch für mehrere Projekte).
+
+    Dateien werden in Blöcke fester Größe zerlegt und unter ihrem SHA-256
+    in objects/ abgelegt; ein Snapshot ist nur ein Manifest unter
+    snapshots/<Projekt-Schlüssel>/ (siehe project_key). Gleiche Dateien (z.B. dieselbe PDF in mehreren
+    Snapshots oder Projekten) belegen damit nur einmal Platz. Objekte ohne
+    Verweis aus einem Manifest entfernt prune().
+    """
+
+    OBJECTS_DIR = "objects"
+    SNAPSHOTS_DIR = "snapshots"
+    CHUNK_SIZE = 4 << 20
+
+    # Anlegen und Aufräumen nicht gleichzeitig (sonst könnte prune() Objekte
+    # eines noch nicht gespeicherten Snapshots löschen)
+    _lock = threading.Lock()
+
+    def __init__(self, root: Path, workers: int = None, throttle: Callable[[int], None] = None):
+        self.root = Path(root)
+        self.objects_dir = self.root / self.OBJECTS_DIR
+        self.snapshots_dir = self.root / self.SNAPSHOTS_DIR
+        self.workers = workers or min(8, (os.cpu_count() or 2))
+        self.throttle = throttle  # wird je gelesenem Block mit dessen Größe aufgerufen
+
+    # --- Objekte ---
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def _store_chunk(self, data: bytes) -> Tuple[str, int]:
+        """Legt einen Block ab; (Hash, neu geschriebene Bytes)"""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.object_path(digest)
+        if path.exists():
+            return digest, 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+        return digest, len(data)
+
+    def _store_file(self, path: Path) -> Tuple[List[str], int]:
+        """Zerlegt eine Datei in Blöcke; (Hashes, neu geschriebene Bytes)"""
+        chunks, written = [], 0
+        with open(path, "rb") as f:
+            for data in iter(lambda: f.read(self.CHUNK_SIZE), b""):
+                digest, new = self._store_chunk(data)
+                chunks.append(digest)
+                written += new
+                if self.throttle:
+                    self.throttle(len(data))
+        return chunks, written
+
+    # --- Snapshots ---
+
+    @staticmethod
+    def project_key(project_path: Path) -> str:
+        """Ordnername der Snapshots eines Projekts.
+
+        Name plus Hash des absoluten Pfads: gleichnamige Projektordner an
+        verschiedenen Orten teilen sich sonst ihre Snapshots.
+        """
+        resolved = Path(project_path).resolve()
+        digest = hashlib.sha256(os.path.normcase(str(resolved)).encode("utf-8")).hexdigest()
+        return f"{resolved.name}_{digest[:12]}"
+
+    def project_dir(self, project_key: str) -> Path:
+        return self.snapshots_dir / project_key
+
+    def snapshots(self, project_key: str = None) -> List[Path]:
+        """Manifeste eines Projekts (oder aller Projekte), neueste zuerst"""
+        folders = [self.project_dir(project_key)] if project_key else (
+            [p for p in self.snapshots_dir.iterdir() if p.is_dir()] if self.snapshots_dir.exists() else []
+        )
+        paths = [p for folder in folders if folder.is_dir() for p in folder.glob("*.json")]
+        paths.sort(key=lambda p: p.stat().st_mtime_ns, reverse=True)
+        return paths
+
+    def load_snapshot(self, path: Path) -> Optional[SnapshotManifest]:
+        return SnapshotManifest.load(path)
+
+    def create_snapshot(self, project_path: Path, name: str = None, stats=None) -> Path:
+        """Sichert ein Projekt; Pfad des neuen Manifests.
+
+        Dateien, deren Größe und mtime zum letzten Snapshot des Projekts
+        passen, werden nicht gelesen; alle übrigen werden parallel gehasht
+        und nur fehlende Blöcke geschrieben. `stats` (BackupStats) wird
+        gefüllt, falls angegeben.
+        """
+        project_path = Path(project_path)
+        key = self.project_key(project_path)
+        folder = self.project_dir(key)
+        previous = None
+        latest = self.snapshots(key)
+        if latest:
+            previous = self.load_snapshot(latest[0])
+
+        manifest = SnapshotManifest()
+        changed: List[Tuple[str, Path, os.stat_result]] = []
+        with self._lock:
+            for rel, entry in walk_project(project_path):
+                if entry.is_dir():
+                    manifest.dirs.append(rel)
+                    continue
+                stat = entry.stat()
+                if stats is not None:
+                    stats.files += 1
+                    stats.bytes_total += stat.st_size
+                known = previous.entry(rel, stat) if previous else None
+                if known and all(self.object_path(d).exists() for d in known[2]):
+                    manifest.files[rel] = known
+                    if stats is not None:
+                        stats.linked += 1
+                else:
+                    changed.append((rel, Path(entry.path), stat))
+
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = pool.map(lambda item: self._store_file(item[1]), changed)
+                for (rel, _, stat), (chunks, written) in zip(changed, results):
+                    manifest.files[rel] = [stat.st_size, stat.st_mtime_ns, chunks]
+                    if stats is not None:
+                        if written:
+                            stats.copied += 1
+                            stats.bytes_copied += written
+                        else:
+                            stats.linked += 1
+
+            folder.mkdir(parents=True, exist_ok=True)
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            base = f"{timestamp}_{name}" if name else timestamp
+            path, counter = folder / f"{base}.json", 2
+            while path.exists():
+                path, counter = folder / f"{base}_{counter}.json", counter + 1
+            manifest.save(path)
+        return path
+
+    def restore(self, snapshot_path: Path, target: Path):
+        """Stellt einen Snapshot in den (neuen) Ordner `target` wieder her"""
+        manifest = self.load_snapshot(snapshot_path)
+        if manifest is None:
+            raise ValueError(f"Snapshot '{snapshot_path}' nicht lesbar")
+        target = Path(target)
+        target.mkdir(parents=True, exist_ok=True)
+        for rel in manifest.dirs:
+            (target / rel).mkdir(parents=True, exist_ok=True)
+
+        def restore_file(item):
+            rel, (size, mtime_ns, chunks) = item
+            path = target / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "wb") as f:
+                for digest in chunks:
+                    with open(self.object_path(digest), "rb") as chunk:
+                        f.write(chunk.read())
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            list(pool.map(restore_file, manifest.files.items()))
+
+    def delete_snapshot(self, snapshot_path: Path) -> bool:
+        """Löscht ein Manifest (Objekte entfernt erst prune())"""
+        try:
+            Path(snapshot_path).unlink()
+            return True
+        except OSError as e:
+            logging.debug(f"Snapshot '{snapshot_path}' nicht löschbar: {e}")
+            return False
+
+    # --- Wartung ---
+
+    def _references(self, snapshot_paths: Iterable[Path]) -> Counter:
+        """Verweiszähler je Objekt über die angegebenen Manifeste"""
+        counts = Counter()
+        for path in snapshot_paths:
+            manifest = self.load_snapshot(path)
+            if manifest is None:
+                continue
+            for entry in manifest.files.values():
+                counts.update(entry[2])
+        return counts
+
+    def prune(self, project_key: str = None, keep_count: int = None) -> Tuple[int, int]:
+        """Entfernt alte Snapshots und nicht mehr referenzierte Objekte.
+
+        Mit `keep_count` werden die ältesten Snapshots von `project_key`
+        (bzw. jedes Projekts) gelöscht; die Verweiszähler ihrer Objekte
+        sinken entsprechend. Liefert (gelöschte Objekte, freigegebene Bytes).
+        """
+        with self._lock:
+            if keep_count is not None:
+                projects = [project_key] if project_key else (
+                    [p.name for p in self.snapshots_dir.iterdir() if p.is_dir()]
+                    if self.snapshots_dir.exists() else []
+                )
+                for project in projects:
+                    for old in self.snapshots(project)[keep_count:]:
+                        self.delete_snapshot(old)
+
+            counts = self._references(self.snapshots())
+            removed = freed = 0
+            if not self.objects_dir.exists():
+                return removed, freed
+            for folder in self.objects_dir.iterdir():
+                for path in folder.iterdir():
+                    if counts[folder.name + path.name] > 0:
+                        continue
+                    try:
+                        size = path.stat().st_size
+                        path.unlink()
+                    except OSError as e:
+                        logging.debug(f"Backup-Objekt '{path}' nicht löschbar: {e}")
+                        continue
+                    removed += 1
+                    freed += size
+        return removed, freed
+
+    def verify(self, snapshot_paths: Iterable[Path] = None) -> List[str]:
+        """Prüft alle referenzierten Objekte (parallel); Liste der Fehler"""
+        paths = list(snapshot_paths) if snapshot_paths is not None else self.snapshots()
+        problems = []
+        for path in paths:
+            manifest = self.load_snapshot(path)
+            if manifest is None:
+                problems.append(f"{path.name}: Manifest nicht lesbar")
+                continue
+            for rel, (size, _, chunks) in manifest.files.items():
+                stored = sum(self._size(d) for d in chunks)
+                if stored != size:
+                    problems.append(f"{path.name}: {rel} unvollständig ({stored} von {size} Bytes)")
+
+        def check(digest: str) -> Optional[str]:
+            try:
+                with open(self.object_path(digest), "rb") as f:
+                    actual = hashlib.sha256(f.read()).hexdigest()
+            except OSError:
+                return f"Objekt {digest} fehlt"
+            return None if actual == digest else f"Objekt {digest} beschädigt"
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            problems.extend(p for p in pool.map(check, self._references(paths)) if p)
+        return problems
+
+    def _size(self, digest: str) -> int:
+        try:
+            return self.object_path(digest).stat().st_size
+        except OSError:
+            return 0
+
+    def disk_usage(self) -> int:
+        """Belegter Platz in Bytes (Objekte und Manifeste)"""
+        return sum(p.stat().st_size for p in self.root.rglob("*") if p.is_file())
@@ -0,0 +1,257 @@
+"""
+LitZentrum - Backup-Planer
+Automatische Backups im Hintergrund (auto_backup, backup_interval_minutes)
+"""
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+import threading
+import time
+
+from PySide6.QtCore import QObject, Signal
+
+from .backup import BackupManager
+
+
+class IOThrottle:
+    """Begrenzt den Durchsatz eines Backups (Bytes pro Sekunde).
+
+    Wird nach jedem gelesenen Block mit dessen Größe aufgerufen und schläft,
+    sobald der Durchschnitt über der Grenze liegt; die Platte bleibt so für
+    die Oberfläche (PDF-Ansicht, Speichern) verfügbar. Threadsicher.
+    """
+
+    def __init__(self, bytes_per_second: int):
+        self.bytes_per_second = bytes_per_second
+        self.slept = 0.0
+        self._bytes = 0
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def __call__(self, nbytes: int):
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            self._bytes += nbytes
+            delay = self._bytes / self.bytes_per_second - (time.monotonic() - self._started)
+            if delay > 0:
+                self.slept += delay
+        if delay > 0:
+            time.sleep(delay)
+
+
+@dataclass
+class BackupRecord:
+    """Ein Lauf des Backup-Planers"""
+    project: str
+    started_at: float             # time.time()
+    duration: float = 0.0         # Sekunden
+    path: Optional[str] = None    # None: übersprungen oder fehlgeschlagen
+    skipped: bool = False         # Projekt seit dem letzten Snapshot unverändert
+    error: Optional[str] = None
+    files: int = 0
+    bytes_total: int = 0
+    bytes_copied: int = 0
+    throttled: float = 0.0        # Sekunden, die die Drosselung gewartet hat
+
+
+class BackupScheduler(QObject):
+    """Führt Backups des geöffneten Projekts im festen Intervall aus.
+
+    Ein Worker-Thread wartet bis zum nächsten Termin und sichert nur, wenn
+    sich das Projekt laut Manifest des letzten Snapshots geändert hat. Die
+    Signale werden im Worker-Thread ausgelöst (Qt stellt sie der
+    Oberfläche zu); history() und summary() liefern die Messwerte.
+    """
+
+    backup_started = Signal(str)  # project_path
+    backup_finished = Signal(object)  # BackupRecord
+    backup_failed = Signal(str, str)  # project_path, error
+
+    KEEP_COUNT = 10
+    MAX_BYTES_PER_SECOND = 40 << 20
+    HISTORY_SIZE = 100
+
+    _instance = None
+
+    def __init__(self, max_bytes_per_second: int = None):
+        super().__init__()
+        self.max_bytes_per_second = (
+            self.MAX_BYTES_PER_SECOND if max_bytes_per_second is None else max_bytes_per_second
+        )
+        self.enabled = False
+        self.interval = 30 * 60.0
+        self.project_path: Optional[Path] = None
+        self.backup_dir: Optional[Path] = None
+        self._records: deque = deque(maxlen=self.HISTORY_SIZE)
+        self._next_due = 0.0
+        self._force = False
+        self._cancelled = False  # stop(cancel=True): laufendes Backup abbrechen, keins mehr starten
+        self._manager: Optional[BackupManager] = None  # Manager des laufenden Backups
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def instance(cls) -> "BackupScheduler":
+        """Gibt die Singleton-Instanz zurück"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def configure(self, enabled: bool, interval_minutes: int, backup_dir: Path = None,
+                  project_path: Path = None):
+        """Übernimmt Einstellungen und Projekt; startet oder beendet den Worker.
+
+        Der nächste Termin liegt ein Intervall nach dem Aufruf.
+        """
+        with self._lock:
+            self.enabled = bool(enabled)
+            self.interval = max(1, int(interval_minutes)) * 60.0
+            self.backup_dir = Path(backup_dir) if backup_dir else None
+            self.project_path = Path(project_path) if project_path else None
+            self._next_due = time.monotonic() + self.interval
+            self._cancelled = False
+            active = self.enabled and self.project_path is not None
+        if active:
+            self._ensure_worker()
+        self._wake.set()
+
+    def trigger(self):
+        """Sichert sofort (im Worker), auch ohne Änderung"""
+        with self._lock:
+            self._force = True
+            self._cancelled = False
+        self._ensure_worker()
+        self._wake.set()
+
+    def stop(self, cancel: bool = False, timeout: float = None):
+        """Beendet den Worker und wartet auf ihn.
+
+        Ohne `cancel` wird ein laufendes oder per trigger() angefordertes
+        Backup noch abgeschlossen. Mit `cancel` (beim Beenden der Anwendung)
+        bricht das laufende Backup nach dem aktuellen Block ab und löscht
+        seinen halben Snapshot; ein angefordertes startet nicht mehr.
+        `timeout` begrenzt das Warten; was dann noch übrig ist, räumt das
+        nächste Backup auf.
+        """
+        with self._lock:
+            self.enabled = False
+            thread = self._thread
+            manager = None
+            if cancel:
+                self._force = False
+                self._cancelled = True
+                manager = self._manager
+        if manager is not None:
+            manager.cancel()
+        self._wake.set()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def is_running(self) -> bool:
+        """Läuft gerade ein Backup?"""
+        return self._run_lock.locked()
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="BackupScheduler", daemon=True)
+                self._thread.start()
+
+    def _worker(self):
+        """Wartet auf den nächsten Termin; endet, wenn nichts mehr zu tun ist"""
+        while True:
+            with self._lock:
+                force = self._force
+                active = self.project_path is not None and (self.enabled or force)
+                if not active:
+                    self._thread = None
+                    return
+                delay = 0.0 if force else self._next_due - time.monotonic()
+            if delay > 0:
+                self._wake.wait(delay)
+                self._wake.clear()
+                continue
+
+            with self._lock:
+                self._force = False
+                self._next_due = time.monotonic() + self.interval
+            try:
+                self.run_once(force=force)
+            except Exception as e:
+                logging.debug(f"Backup-Planer: unerwarteter Fehler: {e}")
+
+    def run_once(self, force: bool = False) -> Optional[BackupRecord]:
+        """Ein Backup-Lauf im aufrufenden Thread (None ohne Projekt oder nach stop(cancel=True))"""
+        with self._lock:
+            project_path, backup_dir = self.project_path, self.backup_dir
+        if project_path is None:
+            return None
+
+        with self._run_lock:
+            throttle = IOThrottle(self.max_bytes_per_second)
+            manager = BackupManager(project_path, backup_dir, throttle=throttle)
+            with self._lock:
+                if self._cancelled:
+                    return None
+                self._manager = manager
+            try:
+                record = BackupRecord(project=str(project_path), started_at=time.time())
+                started = time.perf_counter()
+                if not force and not manager.has_changes():
+                    record.skipped = True
+                    record.duration = time.perf_counter() - started
+                    self._records.append(record)
+                    return record
+
+                self.backup_started.emit(str(project_path))
+                path = manager.create_backup()
+                record.duration = time.perf_counter() - started
+                record.throttled = throttle.slept
+                if path is None:
+                    record.error = "Backup abgebrochen" if manager.cancelled else "Backup fehlgeschlagen"
+                    self._records.append(record)
+                    self.backup_failed.emit(str(project_path), record.error)
+                    return record
+
+                if not manager.cancelled:
+                    manager.cleanup_old_backups(self.KEEP_COUNT)
+                stats = manager.last_stats
+                record.path = str(path)
+                record.files = stats.files
+                record.bytes_total = stats.bytes_total
+                record.bytes_copied = stats.bytes_copied
+                self._records.append(record)
+            finally:
+                with self._lock:
+                    self._manager = None
+        self.backup_finished.emit(record)
+        return record
+
+    def history(self) -> List[BackupRecord]:
+        """Die letzten Läufe (älteste zuerst)"""
+        return list(self._records)
+
+    def summary(self) -> Dict[str, float]:
+        """Kennzahlen über alle gespeicherten Läufe"""
+        records = list(self._records)
+        done = [r for r in records if r.path]
+        return {
+            "runs": len(done),
+            "skipped": sum(1 for r in records if r.skipped),
+            "failed": sum(1 for r in records if r.error),
+            "bytes_copied": sum(r.bytes_copied for r in done),
+            "duration": sum(r.duration for r in done),
+            "throttled": sum(r.throttled for r in done),
+            "last_duration": done[-1].duration if done else 0.0,
+            "last_bytes_copied": done[-1].bytes_copied if done else 0,
+        }
+
+
+def get_backup_scheduler() -> BackupScheduler:
+    """Gibt den globalen Backup-Planer zurück"""
+    return BackupScheduler.instance()
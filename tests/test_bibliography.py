@@ -0,0 +1,672 @@
+"""
+LitZentrum - Tests für BibTeX-Import und -Export
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Pfad hinzufügen
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import unittest
+
+
+SAMPLE_BIB = r"""
+% Kommentar mit user@example.org
+@string{ zfs = "Zeitschrift f{\"u}r Soziologie" }
+
+@Article{mueller_2020_bildung,
+  author   = {M{\"u}ller, Hans and von Goethe, Johann},
+  title    = "{Bildung} und Gro{\ss}stadt \& mehr",
+  journal  = zfs # " (Sonderheft)",
+  year     = 2020,
+  month    = mar,
+  keywords = {Bildung, Stadt},
+  doi      = {https://doi.org/10.1000/ABC}
+}
+
+@book(weber_1922_wirtschaft, title = {Wirtschaft und Gesellschaft (Grundriss)},
+      author = {Weber, Max}, year = {1922}, isbn = {3-16-148410-0})
+
+@comment{ wird ignoriert }
+"""
+
+
+class TestBibTeXImport(unittest.TestCase):
+    """Tests für den streamenden BibTeX-Import"""
+
+    def test_streaming_reader(self):
+        from modules.bibliography.importer import BibTeXReader
+
+        entries = BibTeXReader().parse_string(SAMPLE_BIB)
+        self.assertEqual([e["ID"] for e in entries], ["mueller_2020_bildung", "weber_1922_wirtschaft"])
+        article = entries[0]
+        self.assertEqual(article["author"], "Müller, Hans and von Goethe, Johann")
+        self.assertEqual(article["title"], "Bildung und Großstadt & mehr")
+        self.assertEqual(article["journal"], "Zeitschrift für Soziologie (Sonderheft)")
+        self.assertEqual(article["month"], "3")
+        self.assertEqual(entries[1]["title"], "Wirtschaft und Gesellschaft (Grundriss)")
+
+        # Blockgrenzen mitten in Einträgen ändern nichts
+        chunks = [SAMPLE_BIB[i:i + 5] for i in range(0, len(SAMPLE_BIB), 5)]
+        self.assertEqual(list(BibTeXReader().iter_entries(chunks)), entries)
+
+    def test_import_with_duplicates(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.bibliography.importer import BibTeXImporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SourceManager(Path(tmpdir))
+            manager.create_source(LiMeta(title="Vorhanden", doi="10.1000/abc"))
+            bib = Path(tmpdir) / "import.bib"
+            bib.write_text(
+                SAMPLE_BIB
+                + "@book{weber2, title={Anders}, isbn={978-3-16-148410-0}}\n"
+                + "@misc{neu_1, title={Gleicher Titel}, author={Neu, A.}}\n"
+                + "@misc{neu_2, title={Gleicher Titel}, author={Neu, A.}}\n",
+                encoding="utf-8",
+            )
+
+            calls = []
+            importer = BibTeXImporter(manager, batch_size=2)
+            result = importer.import_file(bib, lambda done, total: calls.append((done, total)))
+
+            self.assertEqual(result.entries, 5)
+            self.assertEqual(
+                [(key, reason) for key, reason, _ in result.duplicates],
+                [("mueller_2020_bildung", "doi"), ("weber2", "isbn")],
+            )
+            self.assertEqual(len(result.created), 3)
+            self.assertEqual(calls[-1], (bib.stat().st_size, bib.stat().st_size))
+
+            # Gleiche Ordnernamen überschreiben sich nicht
+            names = sorted(s.name for s in manager.get_all_sources())
+            self.assertEqual(len(names), 4)
+            self.assertIn("NeuoJ_Gleicher_Titel_2", names)
+            weber = next(s for s in result.created if s.meta.authors == ["Weber, Max"])
+            self.assertEqual(weber.meta.year, 1922)
+            self.assertEqual(weber.meta.source_type, "book")
+
+    def test_key_match_with_conflicting_ids(self):
+        from formats import LiMeta
+        from modules.bibliography.importer import DuplicateKeys
+
+        # Vorhandene Quellen tragen den erzeugten Schlüssel autor_jahr_titelwort
+        keys = DuplicateKeys.from_metas({
+            "a": LiMeta(title="Bildung heute", authors=["Müller, Hans"], year=2020, doi="10.1/a"),
+            "b": LiMeta(title="Bildung morgen", authors=["Weber, Max"], year=2020, isbn="3-16-148410-0"),
+        })
+        self.assertEqual(keys.match(LiMeta(title="Bildung heute", doi="10.1/A"), "x"), ("doi", "a"))
+        self.assertEqual(keys.match(LiMeta(title="X"), "mueller_2020_bildung"), ("key", "a"))
+        # Gleicher Schlüssel, andere DOI/ISBN: verschiedene Werke
+        self.assertIsNone(keys.match(LiMeta(title="X", doi="10.1/other"), "mueller_2020_bildung"))
+        self.assertIsNone(keys.match(LiMeta(title="X", isbn="978-0-306-40615-7"), "weber_2020_bildung"))
+        self.assertEqual(keys.match(LiMeta(title="X", doi="10.1/b"), "weber_2020_bildung"), ("key", "b"))
+
+    def test_write_error_is_not_a_cancel(self):
+        from unittest import mock
+        from core import SourceManager
+        from modules.bibliography.importer import BibTeXImporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SourceManager(Path(tmpdir))
+            bib = Path(tmpdir) / "import.bib"
+            bib.write_text(
+                "".join(f"@misc{{e{i}, title={{Eintrag {i}}}}}\n" for i in range(5)),
+                encoding="utf-8",
+            )
+
+            importer = BibTeXImporter(manager, batch_size=2)
+            with mock.patch.object(manager, "create_sources", side_effect=OSError("Datenträger voll")):
+                result = importer.import_file(bib)
+
+            self.assertTrue(result.failed)
+            self.assertFalse(result.cancelled)
+            self.assertEqual((result.entries, result.not_imported), (5, 5))
+            self.assertEqual(result.errors, ["Datenträger voll"])
+            self.assertIn("5 Einträge nicht importiert", result.summary())
+            self.assertNotIn("abgebrochen", result.summary())
+
+
+class TestBibTeXExport(unittest.TestCase):
+    """Tests für den streamenden BibTeX-Export"""
+
+    def test_escaping_and_roundtrip(self):
+        from formats import LiMeta
+        from modules.bibliography import BibTeXGenerator, BibTeXReader
+
+        meta = LiMeta(
+            title="Kosten & Nutzen_{2} bei 50% $x$", authors=["Müller, Hans"], year=2020,
+            journal="Sammelband", source_type="chapter", doi="10.1000/a_b", tags=["Bildung"],
+        )
+        entry = BibTeXGenerator().generate_entry(meta)
+        self.assertIn(r"title = {Kosten \& Nutzen\_\{2\} bei 50\% \$x\$},", entry)
+        self.assertIn("booktitle = {Sammelband},", entry)
+        self.assertIn("doi = {10.1000/a_b},", entry)
+        self.assertTrue(entry.startswith("@inbook{"))
+
+        parsed = BibTeXReader().parse_string(entry)[0]
+        self.assertEqual(parsed["title"], meta.title)
+
+    def test_streaming_write(self):
+        import io
+        from formats import LiMeta
+        from modules.bibliography import BibTeXGenerator
+
+        metas = (LiMeta(title=f"Titel {i}", year=2000 + i % 20) for i in range(1200))
+        calls = []
+        buffer = io.StringIO()
+        count = BibTeXGenerator().write(metas, buffer, lambda done, total: calls.append(done), total=1200)
+
+        self.assertEqual(count, 1200)
+        self.assertEqual(buffer.getvalue().count("\n@"), 1200)
+        self.assertEqual(calls, [500, 1000, 1200])
+
+
+class TestProjectBibliography(unittest.TestCase):
+    """Tests für die inkrementell gepflegte projekt_biblio.bib"""
+
+    def test_incremental_updates(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.bibliography import BibTeXReader
+        from modules.bibliography.project_bib import ProjectBibliography
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            manager = SourceManager(tmp)
+            sources = [
+                manager.create_source(LiMeta(title=f"Titel {i}", authors=[f"Autor{i}, A."], year=2000 + i))
+                for i in range(3)
+            ]
+            bib = ProjectBibliography(tmp / "projekt_biblio.bib")
+            self.assertEqual(bib.sync(sources), 3)
+            self.assertEqual(bib.sync(sources), 0)
+            before = bib.bib_path.read_bytes()
+
+            # Kleine Änderung: nur der eigene Platz wird überschrieben
+            sources[1].meta.title = "Titel Eins"
+            sources[1].meta.update()
+            self.assertEqual(bib.sync(sources), 1)
+            after = bib.bib_path.read_bytes()
+            self.assertEqual(len(after), len(before))
+            self.assertEqual(after[:bib._slots[sources[1].name].offset],
+                             before[:bib._slots[sources[1].name].offset])
+
+            # Zu groß für den Platz: wandert ans Ende, alter Platz wird frei
+            sources[0].meta.abstract = "lang " * 100
+            sources[0].meta.update()
+            bib.update_source(sources[0])
+            bib.remove_source(sources[2].name)
+            titles = [e["title"] for e in BibTeXReader().read(bib.bib_path)]
+            self.assertEqual(sorted(titles), ["Titel 0", "Titel Eins"])
+
+            # Index übersteht Neustart; externe Änderung erzwingt Neuaufbau
+            bib.save(tmp / ".index")
+            reloaded = ProjectBibliography(bib.bib_path).load(tmp / ".index")
+            self.assertEqual(reloaded.sync(sources[:2]), 0)
+            with open(bib.bib_path, "a", encoding="utf-8") as f:
+                f.write("@misc{fremd, title={Von Hand}}\n")
+            stale = ProjectBibliography(bib.bib_path).load(tmp / ".index")
+            self.assertEqual(stale.sync(sources[:2]), 2)
+            self.assertEqual(len(list(BibTeXReader().read(bib.bib_path))), 2)
+
+
+class TestCitationKeys(unittest.TestCase):
+    """Tests für die projektweite Key-Registry"""
+
+    def test_collision_suffixes(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.bibliography import BibTeXGenerator, CitationKeyRegistry
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            manager = SourceManager(tmp)
+            first, second = [
+                manager.create_source(LiMeta(title="Studie", authors=["Smith, John"], year=2020,
+                                             created_at=f"2024-01-0{i + 1}T00:00:00"),
+                                      folder_name=f"Smith_{i}")
+                for i in range(2)
+            ]
+            base = first.meta.bibtex_key
+            registry = CitationKeyRegistry()
+            self.assertEqual(registry.sync([second, first]), 2)
+            self.assertEqual(registry.key_of(first.name), base)
+            self.assertEqual(registry.key_of(second.name), base + "b")
+            self.assertEqual(registry.source_of(base + "B"), second.name)
+            self.assertIn(f"{{{base}b,", BibTeXGenerator(registry).generate_entry(second))
+
+            # Vergebene Keys bleiben stabil
+            third = manager.create_source(LiMeta(title="Studie", authors=["Smith, J."], year=2020),
+                                       folder_name="Smith_2")
+            self.assertEqual(registry.key_for(third), base + "c")
+            registry.remove_source(first.name)
+            self.assertEqual(registry.key_of(second.name), base + "b")
+            self.assertIsNone(registry.source_of(base))
+
+            registry.save(tmp / ".index")
+            reloaded = CitationKeyRegistry().load(tmp / ".index")
+            self.assertEqual(reloaded.keys(), registry.keys())
+            self.assertEqual(reloaded.sync([second, third]), 0)
+
+
+class TestBibliographyFormatting(unittest.TestCase):
+    """Tests für das formatierte Literaturverzeichnis"""
+
+    def test_memoized_sorted_bibliography(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.bibliography import CitationStyleManager
+        from modules.bibliography.styles import BUILTIN_STYLES, CitationFormatter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SourceManager(Path(tmpdir))
+            sources = [
+                manager.create_source(LiMeta(title=title, authors=authors, year=year, source_type="book"))
+                for title, authors, year in [
+                    ("Zweiter Band", ["Özdemir, Ayşe"], 2019),
+                    ("Ohne Autor", [], 2001),
+                    ("Erster Band", ["Oberhuber, Karl"], 2020),
+                    ("Frühwerk", ["Özdemir, Ayşe"], 2005),
+                ]
+            ]
+            styles = CitationStyleManager()
+            self.assertIs(styles.get_formatter("din"), styles.get_formatter("din"))
+            calls = []
+
+            class Counting(CitationFormatter):
+                def format_reference(self, meta):
+                    calls.append(meta)
+                    return super().format_reference(meta)
+
+            styles.register_style("apa", Counting.from_dict("apa", BUILTIN_STYLES["apa"]))
+
+            references = styles.format_bibliography(sources, "apa")
+            self.assertEqual(
+                [r.split("*")[1] for r in references],
+                ["Erster Band", "Frühwerk", "Zweiter Band", "Ohne Autor"],
+            )
+
+            # Unveränderte Quellen werden nicht neu formatiert
+            self.assertEqual(len(calls), 4)
+            calls.clear()
+            self.assertEqual(styles.format_bibliography(sources, "apa"), references)
+            self.assertEqual(calls, [])
+            sources[1].meta.authors = ["Adam, A."]
+            sources[1].meta.update()
+            self.assertTrue(styles.format_bibliography(sources, "apa")[0].startswith("Adam, A."))
+            self.assertEqual(len(calls), 1)
+
+    def test_save_formats(self):
+        from formats import LiMeta
+        from modules.bibliography import CitationStyleManager
+        from modules.bibliography.writers import HAS_DOCX, DocumentWriter
+
+        metas = [LiMeta(title="Kosten <& Nutzen>", authors=["Weber, Max"], year=1922, source_type="book")]
+        styles = CitationStyleManager()
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            with self.assertRaises(TypeError):
+                DocumentWriter(tmp / "abstrakt.txt")
+            styles.save_bibliography(metas, tmp / "lit.html")
+            self.assertIn("<p>Weber, Max (1922). <i>Kosten &lt;&amp; Nutzen&gt;</i>.</p>",
+                          (tmp / "lit.html").read_text(encoding="utf-8"))
+            styles.save_bibliography(metas, tmp / "lit.txt")
+            self.assertIn("Weber, Max (1922). Kosten <& Nutzen>.",
+                          (tmp / "lit.txt").read_text(encoding="utf-8"))
+            with self.assertRaises(ValueError):
+                styles.save_bibliography(metas, tmp / "lit.pdf")
+            self.assertEqual(sorted(p.name for p in tmp.iterdir()), ["lit.html", "lit.txt"])
+
+            if HAS_DOCX:
+                import docx
+                styles.save_bibliography(metas, tmp / "lit.docx", "din")
+                paragraphs = docx.Document(str(tmp / "lit.docx")).paragraphs
+                self.assertEqual(paragraphs[0].text, "Literaturverzeichnis")
+                self.assertEqual(paragraphs[1].text, "Weber, Max: Kosten <& Nutzen>.")
+
+
+class TestStyleEngine(unittest.TestCase):
+    """Tests für die Template-Stil-Engine"""
+
+    def test_template_syntax(self):
+        from formats import LiMeta
+        from modules.bibliography import StyleError, compile_template
+
+        render = compile_template(
+            "{authors:family:upper}[ ({year})][book? *{title}*|| {title}][, {publisher|o.V.}]\\[{page}\\]"
+        )
+        meta = LiMeta(title="Titel", authors=["Weber, Max"], source_type="book")
+        self.assertEqual(render(meta, 12), "WEBER *Titel*, o.V.[12]")
+        meta.source_type, meta.year = "article", 1922
+        self.assertEqual(render(meta), "WEBER (1922) Titel, o.V.[]")
+        self.assertIn("def render", render.source)
+
+        for template in ("{unbekannt}", "{title:fehlt}", "[offen", "zu]", "{title"):
+            with self.assertRaises(StyleError):
+                compile_template(template)
+
+    def test_user_styles(self):
+        import json
+        from formats import LiMeta
+        from modules.bibliography import CitationStyleManager
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            styles_dir = Path(tmpdir)
+            (styles_dir / "kurz.json").write_text(json.dumps({
+                "name": "Kurzbeleg",
+                "reference": "{authors:join= / } {year|o.J.}: {title}",
+                "inline": "{first_author} {year}[: {page}]",
+            }), encoding="utf-8")
+            (styles_dir / "kaputt.json").write_text('{"reference": "[x"}', encoding="utf-8")
+
+            styles = CitationStyleManager()
+            self.assertEqual(styles.load_styles(styles_dir), 1)
+            self.assertEqual(styles.style_names()["kurz"], "Kurzbeleg")
+            meta = LiMeta(title="Titel", authors=["A, B.", "C, D."], year=2001)
+            self.assertEqual(styles.format_reference(meta, "kurz"), "A, B. / C, D. 2001: Titel")
+            self.assertEqual(styles.format_inline(meta, 5, "kurz"), "A 2001: 5")
+
+            styles.reset_styles()
+            self.assertNotIn("kurz", styles.available_styles())
+            self.assertEqual(styles.get_formatter("kurz").style_id, "apa")
+
+    def test_formatter_classes(self):
+        from formats import LiMeta
+        from modules.bibliography import APAFormatter, CitationFormatter, CitationStyleManager, DINFormatter
+
+        meta = LiMeta(title="Titel", authors=["Weber, Max"], year=1922, source_type="book", publisher="Mohr")
+        apa = APAFormatter()
+        self.assertIsInstance(apa, CitationFormatter)
+        self.assertIsNot(apa, APAFormatter())
+        self.assertEqual(apa.format_full(meta), "Weber, Max (1922). *Titel*. Mohr.")
+        self.assertEqual(DINFormatter().format_inline(meta, 3), "[Weber 1922, S. 3]")
+        # Rand nur beschnitten, wo das Template Leerraum erzeugt
+        self.assertEqual(DINFormatter().format_reference(LiMeta(title="Titel")), "Titel.")
+
+        class Upper(APAFormatter):
+            def format_reference(self, meta):
+                return super().format_reference(meta).upper()
+
+        self.assertEqual(Upper().format_full(meta), "WEBER, MAX (1922). *TITEL*. MOHR.")
+        styles = CitationStyleManager()
+        styles.register_style("upper", Upper())
+        self.assertEqual(styles.format_source(meta, "upper"), "WEBER, MAX (1922). *TITEL*. MOHR.")
+        self.assertEqual(styles.format_reference(meta, "apa"), apa.format_reference(meta))
+
+
+
+class TestManuscriptScanner(unittest.TestCase):
+    """Tests für den Zitat-Abgleich mit LaTeX-/Markdown-Manuskripten"""
+
+    def test_tokenizers(self):
+        from modules.bibliography.manuscript import tokenize_markdown, tokenize_tex
+
+        citations, includes = tokenize_tex(
+            "\\cite{a, b} % \\cite{kommentar}\n"
+            "\\parencite[vgl.][S. 12f.]{c}\\nocite{*}\n"
+            "\\input{kapitel/eins} 50\\% \\textcite[p. 5]{d}\n"
+        )
+        self.assertEqual(citations, [("a", 1, None), ("b", 1, None), ("c", 2, 12), ("d", 3, 5)])
+        self.assertEqual(includes, ["kapitel/eins"])
+
+        citations, includes = tokenize_markdown(
+            "Wie gezeigt [vgl. @smith2020, S. 12; @{doe:2019}].\n"
+            "@miller [S. 3] schreibt an a@b.de. <!-- [@kommentar] -->\n"
+            "```\n[@code]\n```\n"
+            "!include teil2.md\n"
+        )
+        self.assertEqual(citations, [("smith2020", 1, 12), ("doe:2019", 1, None), ("miller", 2, 3)])
+        self.assertEqual(includes, ["teil2.md"])
+
+    def test_incremental_scan_and_quotes(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.bibliography import CitationKeyRegistry, ManuscriptScanner
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            manager = SourceManager(tmp)
+            cited = manager.create_source(LiMeta(title="Studie", authors=["Smith, John"], year=2020))
+            unused = manager.create_source(LiMeta(title="Buch", authors=["Doe, Jane"], year=2019))
+            quotes = manager.get_quotes(cited)
+            quotes.add("Zitat", page=10).page_end = 14
+            quotes.add("Anderes Zitat", page=40)
+            manager.save_quotes(cited, quotes)
+            registry = CitationKeyRegistry()
+            registry.sync([cited, unused])
+            key = registry.key_of(cited.name)
+
+            (tmp / "text").mkdir()
+            (tmp / "arbeit.tex").write_text("\\input{text/kapitel}\n\\cite{unbekannt}\n", encoding="utf-8")
+            (tmp / "text" / "kapitel.tex").write_text(f"\\cite[S. 12]{{{key}}}\n", encoding="utf-8")
+
+            scanner = ManuscriptScanner(tmp)
+            self.assertEqual(len(scanner.scan(["arbeit.tex"])), 2)
+            report = scanner.report(registry, [cited, unused])
+            self.assertEqual([c.location for c in report.used[cited.name]], ["text/kapitel.tex:1"])
+            self.assertEqual(list(report.missing), ["unbekannt"])
+            self.assertEqual(report.unused, [unused.name])
+
+            self.assertEqual(scanner.update_quotes(report, [cited, unused], manager), [cited])
+            used_in = [q.used_in for q in manager.get_quotes(cited).quotes]
+            self.assertEqual(used_in, [["text/kapitel.tex"], []])
+            self.assertEqual(scanner.update_quotes(report, [cited, unused], manager), [])
+
+            # Unveränderte Dateien werden nicht erneut gelesen, auch nach dem Neuladen
+            scanner.save(tmp / ".index")
+            scanner = ManuscriptScanner(tmp).load(tmp / ".index")
+            scanner.scan(["arbeit.tex"])
+            self.assertEqual(scanner.parsed, 0)
+            (tmp / "text" / "kapitel.tex").write_text("Zitat entfernt\n", encoding="utf-8")
+            scanner.scan(["arbeit.tex"])
+            self.assertEqual(scanner.parsed, 1)
+            report = scanner.report(registry, [cited, unused])
+            self.assertEqual(report.unused, sorted([cited.name, unused.name]))
+            scanner.update_quotes(report, [cited, unused], manager)
+            self.assertEqual([q.used_in for q in manager.get_quotes(cited).quotes], [[], []])
+
+
+class TestSourceExport(unittest.TestCase):
+    """Tests für den Export mit Notizen, Zitaten und Zusammenfassungen"""
+
+    def test_export_in_citation_order(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from models import ExportOptions
+        from modules.bibliography import CitationStyleManager, SourceExporter
+        from modules.bibliography.writers import HAS_DOCX
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            manager = SourceManager(tmp)
+            weber = manager.create_source(LiMeta(title="Wirtschaft", authors=["Weber, Max"], year=1922,
+                                                 source_type="book", abstract="Grundriss"))
+            arendt = manager.create_source(LiMeta(title="Vita activa", authors=["Arendt, Hannah"], year=1958,
+                                                  source_type="book"))
+            notes = manager.get_notes(weber)
+            notes.add("Idealtypus\nzweite Zeile", page=9)
+            manager.save_notes(weber, notes)
+            quotes = manager.get_quotes(weber)
+            quotes.add("Macht bedeutet ...", page=28)
+            manager.save_quotes(weber, quotes)
+            summaries = manager.get_summaries(weber)
+            summaries.add("Kapitel 1", "Soziologische Grundbegriffe", pages="1-30")
+            manager.save_summaries(weber, summaries)
+
+            exporter = SourceExporter(manager, CitationStyleManager())
+            options = ExportOptions(format="markdown", include_abstracts=True, include_notes=True,
+                                    include_quotes=True, include_summaries=True, output_path=tmp / "export")
+            self.assertEqual(exporter.export([weber, arendt], options), 2)
+            text = (tmp / "export.md").read_text(encoding="utf-8")
+            self.assertLess(text.index("## Arendt"), text.index("## Weber"))
+            for part in ("### Abstract\n\nGrundriss", "#### Kapitel 1 (S. 1-30)",
+                         "> Macht bedeutet ... (S. 28)", "S. 9: Idealtypus\nzweite Zeile"):
+                self.assertIn(part, text)
+
+            # Das Format bestimmt den Writer; eine fremde Endung wird abgelehnt
+            self.assertEqual(SourceExporter.output_path(ExportOptions("html", output_path=tmp / "a.htm")),
+                             tmp / "a.htm")
+            self.assertEqual(SourceExporter.output_path(ExportOptions("text", output_path=tmp / "a.2024")),
+                             tmp / "a.2024.txt")
+            with self.assertRaises(ValueError):
+                exporter.export([weber], ExportOptions("word", output_path=tmp / "export.md"))
+            with self.assertRaises(ValueError):
+                exporter.export([weber], ExportOptions("pdf", output_path=tmp / "export.pdf"))
+
+            # Abbruch lässt eine vorhandene Datei unverändert
+            exporter.export([weber, arendt], options, progress=lambda done, total: exporter.cancel())
+            self.assertTrue(exporter.cancelled)
+            self.assertEqual((tmp / "export.md").read_text(encoding="utf-8"), text)
+
+            if HAS_DOCX:
+                import docx
+                options.format, options.output_path = "word", tmp / "export.docx"
+                exporter.export([weber, arendt], options)
+                document = docx.Document(str(tmp / "export.docx"))
+                styles = [(p.style.name, p.text) for p in document.paragraphs]
+                self.assertEqual(styles[0], ("Heading 1", "Literaturverzeichnis"))
+                self.assertIn(("Quote", "Macht bedeutet ... (S. 28)"), styles)
+                self.assertIn(("Normal", "S. 9: Idealtypus\nzweite Zeile"), styles)
+                self.assertEqual(document.core_properties.title, "Literaturverzeichnis")
+
+
+SAMPLE_RIS = """TY  - JOUR
+ID  - weber1922
+AU  - Weber, Max
+AU  - Winckelmann, Johannes
+TI  - Wirtschaft und
+  Gesellschaft
+JO  - Archiv für Sozialwissenschaft
+PY  - 1922/01/01/
+VL  - 47
+SP  - 1
+EP  - 30
+DO  - https://doi.org/10.1000/WEBER
+SN  - 0003-9012
+KW  - Soziologie; Herrschaft
+LA  - de-DE
+ER  - 
+
+TY  - BOOK
+TI  - Vita activa
+AU  - Arendt, Hannah
+PY  - 1958
+SN  - 3-492-23623-X
+"""
+
+SAMPLE_CSL = """[
+  {"id": "arendt1958", "type": "book", "title": "Vita activa",
+   "author": [{"family": "Arendt", "given": "Hannah"}, {"literal": "Institut für Sozialforschung"}],
+   "issued": {"date-parts": [[1958, 3]]}, "ISBN": "9783492236232", "keyword": "Politik, Arbeit"},
+  {"id": "mead", "type": "article-journal", "title": "Mind, Self & Society", "volume": 3,
+   "container-title": "Journal", "issued": {"raw": "1934"}, "DOI": "10.1000/mead", "language": "en-US"}
+]"""
+
+
+class TestRISAndCSLJSON(unittest.TestCase):
+    """Tests für RIS und CSL-JSON (Lesen, Schreiben, Import)"""
+
+    def test_ris_reader_and_writer(self):
+        from modules.bibliography import RISReader, RISWriter
+        from modules.bibliography.ris import ris_to_meta
+
+        records = RISReader().parse_string(SAMPLE_RIS)
+        chunks = [SAMPLE_RIS[i:i + 5] for i in range(0, len(SAMPLE_RIS), 5)]
+        self.assertEqual(list(RISReader().iter_entries(chunks)), records)
+        self.assertEqual(len(records), 2)  # letzter Datensatz ohne ER
+
+        weber = ris_to_meta(records[0])
+        self.assertEqual(weber.title, "Wirtschaft und Gesellschaft")
+        self.assertEqual(weber.authors, ["Weber, Max", "Winckelmann, Johannes"])
+        self.assertEqual((weber.year, weber.pages, weber.doi), (1922, "1-30", "10.1000/WEBER"))
+        self.assertEqual((weber.isbn, weber.language, weber.tags), (None, "de", ["Soziologie", "Herrschaft"]))
+        arendt = ris_to_meta(records[1])
+        self.assertEqual((arendt.source_type, arendt.isbn), ("book", "3-492-23623-X"))
+
+        text = RISWriter().generate_bibliography([weber, arendt])
+        again = [ris_to_meta(r) for r in RISReader().parse_string(text)]
+        for original, parsed in zip([weber, arendt], again):
+            for name in ("title", "authors", "year", "source_type", "journal", "pages", "doi", "isbn", "tags"):
+                self.assertEqual(getattr(parsed, name), getattr(original, name), name)
+
+    def test_csl_json_streaming(self):
+        from modules.bibliography import CSLJSONReader, CSLJSONWriter
+        from modules.bibliography.csl_json import csl_to_meta
+
+        items = CSLJSONReader().parse_string(SAMPLE_CSL)
+        self.assertEqual(items, __import__("json").loads(SAMPLE_CSL))
+        chunks = [SAMPLE_CSL[i:i + 7] for i in range(0, len(SAMPLE_CSL), 7)]
+        self.assertEqual(list(CSLJSONReader().iter_entries(chunks)), items)
+        self.assertEqual(CSLJSONReader().parse_string('{"id": "a", "title": "T"}'), [{"id": "a", "title": "T"}])
+        with self.assertRaises(ValueError):
+            CSLJSONReader().parse_string('[{"id": "a"}, {"id": ')
+
+        # Ein Syntaxfehler bricht sofort ab, ohne den Rest der Datei zu puffern
+        read = []
+
+        def broken():
+            yield '[{"id": "a"}, {"id": x}, '
+            for i in range(1000):
+                read.append(i)
+                yield '{"id": "b"}, '
+
+        with self.assertRaises(ValueError):
+            list(CSLJSONReader().iter_entries(broken()))
+        self.assertEqual(read, [])
+
+        arendt, mead = map(csl_to_meta, items)
+        self.assertEqual(arendt.authors, ["Arendt, Hannah", "Institut für Sozialforschung"])
+        self.assertEqual((arendt.year, arendt.tags), (1958, ["Politik", "Arbeit"]))
+        self.assertEqual((mead.year, mead.volume, mead.language), (1934, "3", "en"))
+
+        text = CSLJSONWriter().generate_bibliography([arendt, mead])
+        self.assertEqual([csl_to_meta(i).authors for i in CSLJSONReader().parse_string(text)],
+                         [arendt.authors, mead.authors])
+
+    def test_import_shares_dedup(self):
+        from core import SourceManager
+        from modules.bibliography import importer_for
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            (tmp / "a.ris").write_text(SAMPLE_RIS, encoding="utf-8")
+            (tmp / "b.json").write_text(SAMPLE_CSL, encoding="utf-8")
+            manager = SourceManager(tmp / "projekt")
+
+            result = importer_for(tmp / "a.ris", manager, batch_size=1).import_file(tmp / "a.ris")
+            self.assertEqual((result.entries, len(result.created), result.errors), (2, 2, []))
+            self.assertEqual(result.created[0].meta.metadata_source, "ris_import")
+
+            # Vita activa ist per ISBN (ISBN-10 = ISBN-13) schon vorhanden
+            result = importer_for(tmp / "b.json", manager).import_file(tmp / "b.json")
+            self.assertEqual([c.meta.title for c in result.created], ["Mind, Self & Society"])
+            self.assertEqual(result.duplicates[0][:2], ("arendt1958", "isbn"))
+            with self.assertRaises(ValueError):
+                importer_for(tmp / "c.xml", manager)
+
+            # Defektes JSON: Bisheriges wird angelegt, der Fehler gemeldet
+            (tmp / "d.json").write_text('[{"id": "d", "title": "Davor"}, {"id": x}]', encoding="utf-8")
+            result = importer_for(tmp / "d.json", manager).import_file(tmp / "d.json")
+            self.assertEqual([c.meta.title for c in result.created], ["Davor"])
+            self.assertTrue(result.errors[0].startswith("d.json: Ungültiges CSL-JSON"))
+
+    def test_abstract_bases(self):
+        from modules.bibliography import (
+            BibliographyWriter, BibTeXGenerator, CSLJSONWriter, RISWriter, SourceImporter
+        )
+        from modules.bibliography.importer import StreamReader
+
+        for abstract in (StreamReader, SourceImporter, BibliographyWriter):
+            with self.assertRaises(TypeError):
+                abstract()
+        for writer in (RISWriter(), CSLJSONWriter()):
+            self.assertIsInstance(writer, BibliographyWriter)
+            self.assertNotIsInstance(writer, BibTeXGenerator)
+            self.assertFalse(hasattr(writer, "TYPE_MAP"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,177 @@
+"""
+LitZentrum - Tests für Embeddings und semantische Suche
+Gegen einen lokalen Fake-Endpunkt im Ollama-Format (/api/embed)
+"""
+import sys
+from pathlib import Path
+
+# Pfad hinzufügen
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import unittest
+import tempfile
+import json
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+
+DIM = 64
+
+
+def _fake_embedding(text: str) -> list:
+    """Deterministisches Bag-of-Words-Embedding"""
+    vector = [0.0] * DIM
+    for word in text.lower().split():
+        vector[zlib.crc32(word.strip(".,").encode()) % DIM] += 1.0
+    return vector
+
+
+class _FakeOllama(BaseHTTPRequestHandler):
+    requests = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        _FakeOllama.requests.append(body)
+        payload = json.dumps({
+            "model": body["model"],
+            "embeddings": [_fake_embedding(t) for t in body["input"]],
+        }).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestChunking(unittest.TestCase):
+    """Tests für chunk_text"""
+
+    def test_chunks_overlap_at_sentence_boundaries(self):
+        from modules.ai.embeddings import chunk_text
+
+        text = " ".join(f"Satz Nummer {i} über Methoden." for i in range(200))
+        chunks = chunk_text(text, max_chars=300, overlap=60)
+        self.assertGreater(len(chunks), 10)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk.text), 300)
+            self.assertEqual(text[chunk.start:chunk.end].strip(), chunk.text)
+        self.assertTrue(chunks[0].text.endswith("."))
+        # Aufeinanderfolgende Chunks überlappen
+        self.assertLess(chunks[1].start, chunks[0].end)
+
+
+@unittest.skipUnless(HAS_NUMPY, "numpy nicht installiert")
+class TestSemanticSearch(unittest.TestCase):
+    """Tests für EmbeddingClient, VectorIndex und SemanticIndex"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = HTTPServer(("127.0.0.1", 0), _FakeOllama)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f"http://127.0.0.1:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        _FakeOllama.requests = []
+
+    def test_client_batches(self):
+        from modules.ai.embeddings import EmbeddingClient
+
+        client = EmbeddingClient(self.base_url, model="fake", batch_size=4)
+        vectors = client.embed([f"text {i}" for i in range(10)])
+        self.assertEqual(len(vectors), 10)
+        self.assertEqual([len(r["input"]) for r in _FakeOllama.requests], [4, 4, 2])
+
+    def test_vector_index_topk_and_persistence(self):
+        from modules.search.vector_index import VectorIndex, VectorEntry
+
+        rng = np.random.default_rng(1)
+        vectors = rng.standard_normal((3000, 32)).astype(np.float32)
+        entries = [VectorEntry(f"s{i % 100}", "pdf", start=i) for i in range(3000)]
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            index = VectorIndex(Path(tmpdir))
+            index.add(entries, vectors)
+            index.save()
+
+            loaded = VectorIndex(Path(tmpdir)).load()
+            self.assertEqual(len(loaded), 3000)
+            matches = loaded.search(vectors[1234] * 3, k=5)
+            self.assertEqual(matches[0].entry.start, 1234)
+            self.assertAlmostEqual(matches[0].score, 1.0, places=5)
+            self.assertEqual(len(matches), 5)
+
+            # Approximativ: gleicher bester Treffer über SimHash-Kandidaten
+            loaded.approximate = True
+            self.assertEqual(loaded.search(vectors[1234], k=5)[0].entry.start, 1234)
+
+            # Entfernen und Kompaktieren
+            for i in range(40):
+                loaded.remove(f"s{i}")
+            loaded.save()
+            reloaded = VectorIndex(Path(tmpdir)).load()
+            self.assertEqual(len(reloaded), 1800)
+            self.assertEqual(len(reloaded.entries), 1800)
+            self.assertNotEqual(reloaded.search(vectors[1234], k=1)[0].entry.start, 1234)
+
+    def test_semantic_index_end_to_end(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.ai.embeddings import EmbeddingClient
+        from modules.search.semantic import SemanticIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SourceManager(Path(tmpdir))
+            a = manager.create_source(LiMeta(title="A", year=2020, abstract="Bildungschancen von Kindern aus Arbeiterfamilien"))
+            b = manager.create_source(LiMeta(title="B", year=2021, abstract="Quantenmechanik und Teilchenphysik"))
+            quotes = manager.get_quotes(b)
+            quotes.add("Vergleich der Bildungschancen in Schulen", page=3)
+            manager.save_quotes(b, quotes)
+
+            client = EmbeddingClient(self.base_url, model="fake", batch_size=8)
+            index = SemanticIndex(Path(tmpdir) / ".index", manager.sources_path, client)
+            self.assertEqual(index.sync(manager.get_all_sources(), manager), 2)
+            self.assertEqual(index.sync(manager.get_all_sources(), manager), 0)
+
+            reopened = SemanticIndex(Path(tmpdir) / ".index", manager.sources_path, client)
+            results = reopened.search("Bildungschancen von Kindern", k=2)
+            self.assertEqual(results[0].title, "A")
+            self.assertEqual(results[0].match_type, "semantic")
+            self.assertEqual(results[1].page, 3)
+
+            # Modellwechsel verwirft alte Vektoren
+            other = SemanticIndex(Path(tmpdir) / ".index", manager.sources_path,
+                                  EmbeddingClient(self.base_url, model="other"))
+            self.assertEqual(len(other), 0)
+
+    def test_index_from_settings(self):
+        from modules.ai.embeddings import DEFAULT_EMBEDDING_MODEL
+        from modules.search import create_semantic_index
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            settings = {"ai_base_url": self.base_url, "ai_embedding_model": "fake"}
+            index = create_semantic_index(Path(tmpdir) / ".index", Path(tmpdir), settings)
+            self.assertEqual((index.client.base_url, index.client.model), (self.base_url, "fake"))
+            self.assertEqual(index.vectors.model, "fake")
+
+            index = create_semantic_index(Path(tmpdir) / ".index", Path(tmpdir), {})
+            self.assertEqual(index.client.model, DEFAULT_EMBEDDING_MODEL)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -184,6 +184,90 @@ class TestProjectManager(unittest.TestCase):
             # Neu öffnen
             reopened = pm.open_project(project.path)
             self.assertEqual(reopened.name, "Test Projekt")
+    
+    def test_save_smart_collections(self):
+        from core import ProjectManager
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pm = ProjectManager()
+            project = pm.create_project(path=Path(tmpdir) / "TestProjekt", name="Test")
+            project.config.smart_collections = [{"name": "Offen", "query": "tag:todo"}]
+            pm.save_project(project)
+            
+            reopened = pm.open_project(project.path)
+            self.assertEqual(reopened.config.smart_collections, [{"name": "Offen", "query": "tag:todo"}])
+
+
+class TestSmartCollections(unittest.TestCase):
+    """Tests für Smart Collections"""
+    
+    def test_query_parsing(self):
+        from core import compile_query, QueryError
+        from core.smart_collections import SourceFacts
+        from datetime import datetime
+        from formats import LiMeta
+        
+        now = datetime.now()
+        facts = SourceFacts(LiMeta(title="Bildung", tags=["todo"], year=2019), has_pdf=True)
+        self.assertTrue(compile_query("tag:todo AND NOT verified")(facts, now))
+        self.assertTrue(compile_query("has:pdf NOT has:summary")(facts, now))
+        self.assertTrue(compile_query("(year:>=2020 OR tag:TODO) bildung")(facts, now))
+        self.assertFalse(compile_query("year:<2019 OR is:verified")(facts, now))
+        self.assertEqual(compile_query("has:pdf AND has:overdue").needs, {"pdf", "tasks"})
+        
+        for query in ("", "tag:todo AND", "(has:pdf", "has:ufo", "foo:bar"):
+            with self.assertRaises(QueryError, msg=query):
+                compile_query(query)
+    
+    def test_incremental_membership(self):
+        from core import SourceManager, SmartCollection, SmartCollectionIndex, EventBus, EventType
+        from datetime import date, timedelta
+        from formats import LiMeta
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            manager = SourceManager(Path(tmpdir))
+            a = manager.create_source(LiMeta(title="A", tags=["todo"]))
+            b = manager.create_source(LiMeta(title="B", tags=["todo"], verified=True))
+            
+            index = SmartCollectionIndex([
+                SmartCollection("Offen", "tag:todo AND NOT verified"),
+                SmartCollection("Ohne Zusammenfassung", "NOT has:summary"),
+                SmartCollection("Überfällig", "has:overdue"),
+            ])
+            calls = []
+            index.on_changed = lambda: calls.append(1)
+            index.sync(manager.get_all_sources())
+            self.assertEqual(index.members_of("Offen"), {a.name})
+            self.assertEqual(index.count("Ohne Zusammenfassung"), 2)
+            self.assertEqual(len(calls), 1)
+            
+            bus = EventBus()
+            index.connect(bus)
+            summaries = manager.get_summaries(a)
+            summaries.add("Kurz", "Inhalt")
+            manager.save_summaries(a, summaries)
+            bus.emit(EventType.SUMMARY_ADDED, a)
+            self.assertEqual(index.members_of("Ohne Zusammenfassung"), {b.name})
+            
+            tomorrow = (date.today() + timedelta(days=1)).isoformat()
+            tasks = manager.get_tasks(b)
+            tasks.add("Lesen", due_date=tomorrow)
+            manager.save_tasks(b, tasks)
+            bus.emit(EventType.TASK_ADDED, b)
+            self.assertEqual(index.count("Überfällig"), 0)
+            # Am Folgetag wird nur aus den gecachten Fakten neu bewertet
+            index._now = lambda: datetime_after(tomorrow)
+            self.assertTrue(index.refresh_time(date.today() + timedelta(days=2)))
+            self.assertEqual(index.members_of("Überfällig"), {b.name})
+            
+            bus.emit(EventType.SOURCE_DELETED, a)
+            self.assertEqual(index.count("Offen"), 0)
+            index.disconnect()
+
+
+def datetime_after(day: str):
+    from datetime import datetime, timedelta
+    return datetime.fromisoformat(day) + timedelta(hours=1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,468 @@
+"""
+LitZentrum - Tests für die Such-Indizes
+"""
+import sys
+from pathlib import Path
+
+# Pfad hinzufügen
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import unittest
+
+
+class TestSourceNameIndex(unittest.TestCase):
+    """Tests für den Trigramm-Index"""
+    
+    def _index(self):
+        from formats import LiMeta
+        from modules.search.trigram import SourceNameIndex
+        
+        index = SourceNameIndex()
+        index.add_source("a", LiMeta(title="Literaturverwaltung im Studium", authors=["Müller, Hans"]))
+        index.add_source("b", LiMeta(title="Quantenphysik", authors=["Schmidt, Anna"]))
+        index.add_source("c", LiMeta(title="Soziale Ungleichheit", authors=["Peter Weber"]))
+        return index
+    
+    def test_umlaut_variants(self):
+        index = self._index()
+        for query in ("Müller", "Mueller", "Muller", "Müller, H."):
+            matches = index.search_authors(query)
+            self.assertEqual(matches[0].key, "a", query)
+            self.assertAlmostEqual(matches[0].score, 1.0)
+    
+    def test_typo_tolerance(self):
+        index = self._index()
+        matches = index.search_authors("Schmitt")
+        self.assertEqual(matches[0].key, "b")
+        self.assertLess(matches[0].score, 1.0)
+        
+        matches = index.search_titles("Ungleichhiet")
+        self.assertEqual(matches[0].key, "c")
+        
+        # Vorname ohne Komma -> Nachname wird indexiert
+        self.assertEqual(index.search_authors("Webber")[0].key, "c")
+    
+    def test_remove_and_update(self):
+        from formats import LiMeta
+        
+        index = self._index()
+        index.remove_source("a")
+        self.assertEqual(index.search_authors("Müller"), [])
+        
+        index.add_source("b", LiMeta(title="Quantenphysik", authors=["Müller, Eva"]))
+        self.assertEqual(index.search_authors("Schmidt"), [])
+        self.assertEqual(index.search_authors("Mueller")[0].key, "b")
+    
+    def test_bibtex_key_transliteration(self):
+        from formats import LiMeta
+        
+        meta = LiMeta(title="Über die Größe", authors=["Müller, Hans"], year=2023)
+        self.assertEqual(meta.bibtex_key, "mueller_2023_groesse")
+
+
+class TestTokenizer(unittest.TestCase):
+    """Tests für Tokenizer und Normalisierung"""
+    
+    def test_german_stemming(self):
+        from modules.search.tokenizer import get_tokenizer
+        
+        tokenizer = get_tokenizer("de")
+        self.assertEqual(tokenizer.terms("Methoden"), tokenizer.terms("Methode"))
+        self.assertEqual(tokenizer.terms("Übergänge"), tokenizer.terms("Uebergaenge"))
+        self.assertEqual(tokenizer.terms("Testen"), tokenizer.terms("Test"))
+        self.assertEqual(tokenizer.terms("Nester"), tokenizer.terms("Nest"))
+        self.assertEqual(tokenizer.terms("Interessen"), tokenizer.terms("Interesse"))
+        # Je Endungsklasse nur eine Endung: Stämme werden nicht angefressen
+        self.assertEqual(tokenizer.terms("Test Nest"), ["test", "nest"])
+        self.assertEqual(len(set(tokenizer.terms("Interessen Internet intern"))), 3)
+    
+    def test_compound_splitting(self):
+        from modules.search.tokenizer import get_tokenizer
+        
+        tokenizer = get_tokenizer("de")
+        query = tokenizer.terms("Verwaltung")[0]
+        tokens = tokenizer.tokenize("Die Literaturverwaltung")
+        
+        part = [t for t in tokens if t.term == query]
+        self.assertEqual(len(part), 1)
+        self.assertTrue(part[0].is_part)
+        # Teil teilt Position und Offsets mit dem Kompositum
+        self.assertEqual(part[0].position, 1)
+        self.assertEqual((part[0].start, part[0].end), (4, 23))
+    
+    def test_english_and_other_languages(self):
+        from modules.search.tokenizer import get_tokenizer
+        
+        english = get_tokenizer("en")
+        self.assertEqual(english.terms("methods studies"), ["method", "study"])
+        self.assertEqual(english.compound_parts("literaturverwaltung"), [])
+        
+        french = get_tokenizer("fr")
+        self.assertEqual(french.terms("Écoles"), ["ecoles"])
+        
+        # ae/oe/ue-Zusammenzug nur im Deutschen
+        self.assertEqual(english.terms("queue does"), ["queue", "doe"])
+        self.assertEqual(french.terms("Goethe"), ["goethe"])
+        self.assertEqual(get_tokenizer("de").terms("Goethe"), get_tokenizer("de").terms("Göthe"))
+
+
+class TestFullTextIndex(unittest.TestCase):
+    """Tests für Phrasen- und Näherungssuche"""
+
+    PAGES = [
+        "Einleitung zur Studie.",
+        "Die soziale Ungleichheit wächst. Ungleichheit ist nicht sozial.",
+    ]
+
+    def _index(self):
+        from modules.search.fulltext import FullTextIndex
+
+        index = FullTextIndex()
+        index.add_document("a", self.PAGES, language="de", stamp="h1")
+        index.add_document("b", ["Ungleichheit und soziale Fragen"], language="de")
+        index.add_document("c", ["Social inequality is growing"], language="en")
+        return index
+
+    def test_phrase_offsets(self):
+        index = self._index()
+        hits = index.search_phrase("Soziale Ungleichheiten")
+        self.assertEqual([h.key for h in hits], ["a"])
+        hit = hits[0]
+        self.assertEqual(hit.page, 1)
+        self.assertEqual(self.PAGES[1][hit.start:hit.end], "soziale Ungleichheit")
+
+        self.assertEqual([h.key for h in index.search('"social inequality"')], ["c"])
+
+    def test_near(self):
+        index = self._index()
+        hits = index.search_near("Ungleichheit", "sozial", 1)
+        self.assertEqual({h.key for h in hits}, {"a"})
+
+        hits = index.search("Ungleichheit NEAR/2 sozial")
+        self.assertEqual({h.key for h in hits}, {"a", "b"})
+        self.assertEqual(hits[0].key, "a")  # mehr Fundstellen zuerst
+
+    def test_punctuation_parts_ignored(self):
+        index = self._index()
+        expected = {h.key for h in index.search("soziale Fragen")}
+        self.assertEqual(expected, {"b"})
+        for query in ("soziale - Fragen", 'soziale "…" Fragen', "soziale Fragen –", "Fragen NEAR/3 -"):
+            self.assertEqual({h.key for h in index.search(query)}, expected, query)
+        self.assertEqual(index.search('- "…"'), [])
+
+    def test_persistence_and_remove(self):
+        import tempfile
+        from modules.search.fulltext import FullTextIndex
+
+        index = self._index()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "fulltext.json"
+            index.save(path)
+            loaded = FullTextIndex.load(path)
+
+        self.assertEqual(loaded.stamp("a"), "h1")
+        self.assertEqual(
+            [(h.key, h.page, h.start) for h in loaded.search('"soziale Ungleichheit"')],
+            [(h.key, h.page, h.start) for h in index.search('"soziale Ungleichheit"')],
+        )
+        loaded.remove_document("a")
+        self.assertEqual(loaded.search('"soziale Ungleichheit"'), [])
+        self.assertNotIn("a", loaded)
+
+
+class TestDuplicateDetector(unittest.TestCase):
+    """Tests für MinHash/LSH-Dublettenerkennung"""
+
+    BODY = (
+        "Wir untersuchen den Zusammenhang zwischen sozialer Herkunft und "
+        "Bildungserfolg anhand von Längsschnittdaten aus zwölf Bundesländern. "
+        "Die Ergebnisse zeigen stabile Unterschiede über alle Kohorten hinweg."
+    )
+
+    def _pdf_text(self, text):
+        from modules.pdf_workshop.text_cache import PDFText, PageText
+        return PDFText(content_hash=str(hash(text)), pages=[PageText(text=text)])
+
+    def test_meta_and_text_duplicates(self):
+        from formats import LiMeta
+        from modules.search.dedup import DuplicateDetector
+
+        detector = DuplicateDetector()
+        detector.add("published", LiMeta(
+            title="Soziale Herkunft und Bildungserfolg in Deutschland",
+            authors=["Müller, Hans"], year=2021, journal="ZfS", doi="10.1/abc",
+        ))
+        detector.add("preprint", LiMeta(
+            title="Soziale Herkunft und Bildungserfolg in Deutschland (Preprint)",
+            authors=["Mueller, H."],
+        ))
+        detector.add("scan_0042", LiMeta(title="scan_0042"), self._pdf_text(self.BODY))
+        detector.add("other", LiMeta(title="Quantenphysik für Einsteiger", authors=["Schmidt, Anna"]),
+                     self._pdf_text("Ein völlig anderer Text über Teilchen und Wellen im Labor."))
+
+        suggestions = detector.find_duplicates()
+        self.assertEqual(len(suggestions), 1)
+        self.assertEqual((suggestions[0].keep, suggestions[0].merge), ("published", "preprint"))
+        self.assertEqual(suggestions[0].reason, "meta")
+
+        # Gleicher Text, völlig andere Metadaten
+        published = LiMeta(
+            title="Soziale Herkunft und Bildungserfolg in Deutschland",
+            authors=["Müller, Hans"], year=2021, doi="10.1/abc",
+        )
+        detector.add("published", published, self._pdf_text(self.BODY.replace("zwölf", "12")))
+        matches = detector.duplicates_of("scan_0042")
+        self.assertEqual([(m.keep, m.reason) for m in matches], [("published", "text")])
+
+    def test_doi_and_persistence(self):
+        import tempfile
+        from formats import LiMeta
+        from modules.search.dedup import DuplicateDetector
+
+        detector = DuplicateDetector()
+        detector.add("a", LiMeta(title="Band 1", doi="10.5/X"))
+        detector.add("b", LiMeta(title="Ganz anderer Titel", doi="10.5/x"))
+        detector.add("c", LiMeta(title="Band 1", doi="10.5/other"))
+        reasons = {(s.keep, s.merge): s.reason for s in detector.find_duplicates()}
+        # Gleiche DOI gewinnt, verschiedene DOIs werden nie vorgeschlagen
+        self.assertEqual(reasons, {("a", "b"): "doi"})
+
+        with tempfile.TemporaryDirectory() as tmp:
+            detector.save(Path(tmp))
+            loaded = DuplicateDetector().load(Path(tmp))
+        self.assertEqual(len(loaded), 3)
+        self.assertEqual([s.merge for s in loaded.find_duplicates()], ["b"])
+
+    def test_follows_source_events(self):
+        from core import EventBus, EventType, LitSource
+        from formats import LiMeta
+        from modules.search.dedup import DuplicateDetector
+
+        detector = DuplicateDetector()
+        a = LitSource(Path("Quellen/a"), LiMeta(title="Soziale Herkunft und Bildungserfolg", authors=["Müller, Hans"]))
+        b = LitSource(Path("Quellen/b"), LiMeta(title="Quantenphysik für Einsteiger", authors=["Schmidt, Anna"]))
+        detector.sync([a, b])
+        self.assertEqual(detector.find_duplicates(), [])
+
+        bus = EventBus()
+        detector.connect(bus)
+        b.meta = LiMeta(title="Soziale Herkunft und Bildungserfolg", authors=["Mueller, H."])
+        bus.emit(EventType.SOURCE_UPDATED, b)
+        self.assertEqual([s.merge for s in detector.duplicates_of("a")], ["b"])
+
+        bus.emit(EventType.SOURCE_DELETED, b)
+        self.assertNotIn("b", detector)
+        detector.disconnect()
+        bus.emit(EventType.SOURCE_CREATED, b)
+        self.assertNotIn("b", detector)
+
+
+class TestFederatedSearch(unittest.TestCase):
+    """Tests für die projektübergreifende Suche"""
+
+    def _project(self, root, name, metas):
+        from core import ProjectManager, SourceManager
+
+        project = ProjectManager().create_project(root / name, name)
+        manager = SourceManager(project.path)
+        sources = [manager.create_source(meta) for meta in metas]
+        return project, manager, sources
+
+    def test_merged_project_tagged_results(self):
+        import tempfile
+        from formats import LiMeta
+        from modules.search.federated import FederatedSearch
+
+        with tempfile.TemporaryDirectory() as tmp:
+            first, _, _ = self._project(Path(tmp), "Erstes", [
+                LiMeta(title="Soziale Ungleichheit", authors=["Müller, Hans"], year=2020),
+                LiMeta(title="Quantenphysik", authors=["Schmidt, Anna"], year=2019),
+            ])
+            second, manager, sources = self._project(Path(tmp), "Zweites", [
+                LiMeta(title="Bildung", authors=["Weber, Eva"], year=2021,
+                       abstract="Ungleichheit im Schulsystem"),
+            ])
+
+            search = FederatedSearch(max_age=60)
+            projects = [first.path, second.path, Path(tmp) / "fehlt"]
+            results = search.search("Ungleichheit", projects)
+            self.assertEqual([(r.project, r.title) for r in results],
+                             [("Erstes", "Soziale Ungleichheit"), ("Zweites", "Bildung")])
+            self.assertEqual(results[1].match_type, "abstract")
+            self.assertEqual(results[1].project_path, second.path.resolve())
+
+            # Wiederholte Anfrage aus dem Cache
+            self.assertEqual(search.search("Ungleichheit", projects), results)
+            self.assertIs(search.snapshot(first.path), search.snapshot(first.path))
+
+            # Änderung wird nach invalidate() sichtbar
+            meta = sources[0].meta
+            meta.title = "Ungleichheit und Bildung"
+            meta.save(sources[0].path / "meta.limeta")
+            search.invalidate(second.path)
+            results = search.search("Ungleichheit", projects)
+            changed = [r for r in results if r.project == "Zweites"][0]
+            self.assertEqual(changed.title, "Ungleichheit und Bildung")
+            self.assertEqual(changed.match_type, "title")
+
+
+class TestSourceCatalog(unittest.TestCase):
+    """Tests für Präfix-Index und Quellenkatalog"""
+
+    def test_prefix_completion(self):
+        from modules.search.prefix_index import PrefixIndex
+
+        index = PrefixIndex()
+        for value in ["Methode", "Methodik", "Methodik", "methodik", "Medien", "Theorie"]:
+            index.add(value)
+        self.assertEqual(index.complete("meth"), [("Methodik", 3), ("Methode", 1)])
+        self.assertEqual(index.complete("Me", limit=1), [("Methodik", 3)])
+        self.assertEqual(index.complete("x"), [])
+
+        index.remove("Methode")
+        self.assertNotIn("Methode", index)
+        self.assertEqual(index.values(), ["Medien", "Methodik", "Theorie"])
+
+    def test_incremental_updates(self):
+        from core import EventBus, EventType, LitSource
+        from formats import LiMeta
+        from modules.search.catalog import SourceCatalog
+
+        catalog = SourceCatalog()
+        a = LitSource(Path("Quellen/a"), LiMeta(title="A", authors=["Müller, Hans"], tags=["todo", "theorie"]))
+        b = LitSource(Path("Quellen/b"), LiMeta(title="B", authors=["Mueller, Eva"], tags=["todo"], journal="ZfS"))
+        self.assertEqual(catalog.sync([a, b]), 2)
+        self.assertEqual(catalog.sync([a, b]), 0)
+        self.assertEqual(catalog.prefixes["tags"].complete("t"), [("todo", 2), ("theorie", 1)])
+        self.assertEqual(len(catalog.complete("authors", "Mü")), 2)
+        self.assertEqual(catalog.complete("journals", "z"), ["ZfS"])
+
+        bus = EventBus()
+        catalog.connect(bus)
+        b.meta.tags = ["methode"]
+        bus.emit(EventType.SOURCE_UPDATED, b)
+        self.assertEqual(catalog.values("tags"), ["methode", "theorie", "todo"])
+        self.assertEqual(catalog.prefixes["tags"].count("todo"), 1)
+
+        bus.emit(EventType.SOURCE_DELETED, a)
+        self.assertEqual(catalog.values("tags"), ["methode"])
+        self.assertEqual(catalog.names.search_authors("Muller")[0].key, "b")
+
+    def test_collation(self):
+        from modules.search.collation import collation_key, name_sort_key, split_name
+
+        self.assertEqual(split_name("von Goethe, Johann Wolfgang"), ("Goethe", "Johann Wolfgang", "von"))
+        self.assertEqual(split_name("Johannes van der Waals"), ("Waals", "Johannes", "van der"))
+        self.assertEqual(split_name("Weber, Max"), ("Weber", "Max", ""))
+
+        titles = ["Zeit", "Äpfel", "Apfel", "Straße", "Strasse", "Öl"]
+        self.assertEqual(sorted(titles, key=collation_key)[:3], ["Apfel", "Äpfel", "Öl"])
+        names = ["Müller, Eva", "Mueller, Anna", "Mahler, Gustav", "von Goethe, Johann", "Gauß, Carl"]
+        self.assertEqual(
+            sorted(names, key=name_sort_key),
+            ["Gauß, Carl", "von Goethe, Johann", "Mahler, Gustav", "Mueller, Anna", "Müller, Eva"],
+        )
+
+    def test_presorted_orders(self):
+        from core import LitSource
+        from formats import LiMeta
+        from modules.search.catalog import SourceCatalog
+
+        catalog = SourceCatalog()
+        sources = [
+            LitSource(Path("Quellen/a"), LiMeta(title="Über Medien", authors=["van Dijk, Jan"], year=2012)),
+            LitSource(Path("Quellen/b"), LiMeta(title="Alltag", authors=["Ärzte, Die"], year=2020)),
+            LitSource(Path("Quellen/c"), LiMeta(title="Zeit", year=1999)),
+        ]
+        catalog.sync(sources)
+        self.assertEqual(catalog.order("author"), ["b", "a", "c"])
+        self.assertEqual(catalog.order("year"), ["b", "a", "c"])
+        self.assertEqual(catalog.order("title"), ["b", "a", "c"])
+
+        sources[2].meta.authors = ["Adorno, Theodor"]
+        sources[2].meta.update()
+        catalog.add_source(sources[2], force=True)
+        self.assertEqual(catalog.order("author"), ["c", "b", "a"])
+        catalog.remove_source("b")
+        self.assertEqual(catalog.order("year"), ["a", "c"])
+        catalog.disconnect()
+
+
+class TestSnippets(unittest.TestCase):
+    """Tests für Textausschnitte aus den Wort-Offsets"""
+
+    TEXT = ("Am Anfang steht eine lange Einleitung über die Methode. "
+            "Danach folgt die soziale Ungleichheit als zentrales Thema "
+            "und am Ende ein kurzer Ausblick auf weitere Arbeiten.")
+
+    def _pdf_text(self):
+        import re
+        from modules.pdf_workshop.text_cache import PDFText, PageText
+
+        words = [(float(i), 0.0, float(i) + 1, 1.0, m.start(), m.end())
+                 for i, m in enumerate(re.finditer(r"\S+", self.TEXT))]
+        return PDFText(content_hash="h", pages=[PageText(text=self.TEXT, words=words)])
+
+    def _hit(self, word):
+        from modules.search.fulltext import FullTextHit
+        start = self.TEXT.index(word)
+        return FullTextHit(key="a", page=0, start=start, end=start + len(word), position=0)
+
+    def test_window_and_highlight(self):
+        from modules.search.snippets import SnippetBuilder
+
+        builder = SnippetBuilder(context_words=2)
+        snippet = builder.snippets([self._hit("Ungleichheit")], self._pdf_text)[0]
+        self.assertEqual(snippet.text, "die soziale Ungleichheit als zentrales")
+        self.assertTrue(snippet.cut_start and snippet.cut_end)
+        self.assertEqual(snippet.html(), "… die soziale <b>Ungleichheit</b> als zentrales …")
+        self.assertEqual(len(snippet.rects), 1)
+        self.assertEqual(snippet.hit_start, self.TEXT.index("Ungleichheit"))
+
+    def test_merge_limit_and_cache(self):
+        from modules.search.snippets import SnippetBuilder
+
+        builder = SnippetBuilder(context_words=2, max_snippets=1)
+        hits = [self._hit(w) for w in ("Einleitung", "Methode", "soziale", "Ungleichheit", "Ausblick")]
+        loads = []
+
+        def load():
+            loads.append(1)
+            return self._pdf_text()
+
+        snippets = builder.snippets(hits, load, stamp="a:h")
+        # Einleitung ... Ungleichheit überlappen, Ausblick fällt unter das Limit
+        self.assertEqual(len(snippets), 1)
+        self.assertEqual(len(snippets[0].highlights), 4)
+        self.assertIn("<b>soziale</b> <b>Ungleichheit</b>", snippets[0].html())
+
+        # Zweiter Durchlauf kommt ohne Textcache aus
+        again = builder.snippets(hits, load, stamp="a:h")
+        self.assertEqual(len(loads), 1)
+        self.assertEqual([s.text for s in again], [s.text for s in snippets])
+
+        # Limit nur für diesen Aufruf
+        self.assertEqual(len(builder.snippets(hits, load, stamp="a:h", max_snippets=5)), 2)
+        self.assertEqual(len(builder.snippets(hits, load, stamp="a:h")), 1)
+
+    def test_unsorted_word_offsets(self):
+        from modules.search.snippets import SnippetBuilder
+
+        pdf_text = self._pdf_text()
+        words = pdf_text.pages[0].words
+        # Textcache in abweichender Lesereihenfolge (z.B. zweite Spalte zuerst)
+        pdf_text.pages[0].words = words[10:] + words[:10]
+        for stamp in (None, "a:h"):
+            snippet = SnippetBuilder(context_words=2).build(
+                pdf_text, 0, *self._span("Ungleichheit"), stamp=stamp
+            )
+            self.assertEqual(snippet.text, "die soziale Ungleichheit als zentrales")
+            self.assertEqual(len(snippet.rects), 1)
+
+    def _span(self, word):
+        start = self.TEXT.index(word)
+        return start, start + len(word)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,329 @@
+"""
+LitZentrum - Tests für Backups und Git-Integration
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Pfad hinzufügen
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import unittest
+
+
+class TestSnapshotBackup(unittest.TestCase):
+    """Tests für die inkrementellen Snapshot-Backups"""
+
+    def _project(self, tmp: Path) -> Path:
+        project = tmp / "Projekt"
+        (project / "sources" / "weber").mkdir(parents=True)
+        (project / "sources" / "weber" / "weber.pdf").write_bytes(b"%PDF" + b"x" * 5000)
+        (project / "sources" / "weber" / "weber.limeta").write_text('{"title": "WuG"}', encoding="utf-8")
+        (project / "project.liproj").write_text("{}", encoding="utf-8")
+        (project / "exports").mkdir()
+        (project / ".index").mkdir()
+        (project / ".index" / "fulltext.json").write_text("{}", encoding="utf-8")
+        return project
+
+    def test_unchanged_files_are_hardlinked(self):
+        import os
+        from modules.sync import BackupManager
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = self._project(Path(tmpdir))
+            manager = BackupManager(project)
+
+            first = manager.create_backup()
+            self.assertEqual((manager.last_stats.files, manager.last_stats.copied), (3, 3))
+            self.assertTrue((first / "exports").is_dir())
+            self.assertFalse((first / ".index").exists())
+            self.assertFalse(manager.has_changes())
+
+            meta = project / "sources" / "weber" / "weber.limeta"
+            meta.write_text('{"title": "Wirtschaft und Gesellschaft"}', encoding="utf-8")
+            liproj = project / "project.liproj"
+            os.utime(liproj, ns=(0, liproj.stat().st_mtime_ns + 10**9))  # nur berührt
+            self.assertTrue(manager.has_changes())
+
+            from unittest import mock
+            from modules.sync import backup
+            copied = []
+            copy = backup.copy_with_digest
+            with mock.patch.object(backup, "copy_with_digest",
+                                   lambda source, *args: copied.append(source.name) or copy(source, *args)):
+                second = manager.create_backup()
+            self.assertEqual(copied, ["weber.limeta"])  # berührte Datei wird nicht kopiert
+            stats = manager.last_stats
+            self.assertNotEqual(first, second)
+            self.assertEqual((stats.linked, stats.copied), (2, 1))
+            self.assertEqual(stats.bytes_copied, meta.stat().st_size)
+            for rel in ("sources/weber/weber.pdf", "project.liproj"):
+                self.assertTrue((first / rel).samefile(second / rel), rel)
+            self.assertIn("Wirtschaft", (second / "sources/weber/weber.limeta").read_text(encoding="utf-8"))
+
+            # Ältere Snapshots lassen sich löschen, ohne neuere zu beschädigen
+            self.assertEqual(manager.list_backups(), [second, first])
+            manager.cleanup_old_backups(keep_count=1)
+            self.assertEqual(manager.list_backups(), [second])
+            self.assertEqual((second / "sources/weber/weber.pdf").stat().st_size, 5004)
+
+            meta.write_text("kaputt", encoding="utf-8")
+            self.assertTrue(manager.restore_backup(second))
+            self.assertIn("Wirtschaft", meta.read_text(encoding="utf-8"))
+            self.assertFalse((project / ".litbackup.json").exists())
+            self.assertFalse(meta.samefile(second / "sources/weber/weber.limeta"))
+
+
+class TestBackupRepository(unittest.TestCase):
+    """Tests für den deduplizierenden Backup-Speicher"""
+
+    def test_dedup_verify_and_prune(self):
+        from modules.sync import BackupManager
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            store = tmp / "store"
+            pdf = bytes(range(256)) * 40
+            projects = []
+            for name in ("Projekt", "Zweitprojekt"):
+                project = tmp / name / "Projekt"  # gleicher Ordnername, anderer Ort
+                (project / "sources" / "weber").mkdir(parents=True)
+                (project / "sources" / "weber" / "weber.pdf").write_bytes(pdf)
+                (project / "notes").mkdir()
+                (project / "project.liproj").write_text(name, encoding="utf-8")
+                projects.append(project)
+
+            manager = BackupManager(projects[0], store, deduplicate=True)
+            repository = manager.repository
+            repository.CHUNK_SIZE = 4096  # mehrere Blöcke je PDF
+            first = manager.create_backup()
+            self.assertEqual(manager.last_stats.copied, 2)
+            self.assertFalse(manager.has_changes())
+
+            # Dieselbe PDF im zweiten Projekt und im zweiten Snapshot: kein neuer Block
+            repository.create_snapshot(projects[1])
+            (projects[0] / "project.liproj").write_text("geändert", encoding="utf-8")
+            second = manager.create_backup("vorher")
+            self.assertEqual((manager.last_stats.linked, manager.last_stats.copied), (1, 1))
+            objects = [p for p in (store / "objects").rglob("*") if p.is_file()]
+            self.assertEqual(len(objects), 5)  # 2 PDF-Blöcke, 3 Fassungen von project.liproj
+            self.assertEqual(manager.list_backups(), [second, first])
+            self.assertEqual(len(BackupManager(projects[1], store, deduplicate=True).list_backups()), 1)
+            self.assertEqual(repository.verify(), [])
+
+            # Wiederherstellen inklusive leerer Ordner
+            (projects[0] / "sources" / "weber" / "weber.pdf").unlink()
+            self.assertTrue(manager.restore_backup(first))
+            self.assertEqual((projects[0] / "sources" / "weber" / "weber.pdf").read_bytes(), pdf)
+            self.assertEqual((projects[0] / "project.liproj").read_text(encoding="utf-8"), "Projekt")
+            self.assertTrue((projects[0] / "notes").is_dir())
+
+            # Prune: nur der Block des alten liproj ist unreferenziert
+            manager.cleanup_old_backups(keep_count=1)
+            self.assertEqual(manager.list_backups(), [second])
+            self.assertEqual(repository.prune(), (0, 0))
+            self.assertEqual(repository.verify(), [])
+
+            repository.object_path(repository.load_snapshot(second).files["project.liproj"][2][0]).write_bytes(b"x")
+            self.assertTrue(any("beschädigt" in p for p in repository.verify()))
+
+
+class TestProjectArchive(unittest.TestCase):
+    """Tests für das Projektarchiv (.litzip)"""
+
+    def test_archive_roundtrip_and_read_only_project(self):
+        import zipfile
+        from core import ProjectManager, SourceManager
+        from formats import LiMeta, LiNote
+        from modules.sync import BackupManager, ProjectArchive
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            project = ProjectManager().create_project(tmp / "Projekt", "Archivtest")
+            manager = SourceManager(project.path)
+            pdf = tmp / "weber.pdf"
+            pdf.write_bytes(b"%PDF-1.4" + bytes(range(256)) * 20)
+            weber = manager.create_source(LiMeta(title="Wirtschaft und Gesellschaft", authors=["Weber, Max"]), pdf)
+            notes = LiNote()
+            notes.add("Herrschaftstypen " * 50, page=3)
+            manager.save_notes(weber, notes)
+            manager.create_source(LiMeta(title="Vita activa", authors=["Arendt, Hannah"]))
+
+            backups = BackupManager(project.path, tmp / "backups")
+            archive_path = backups.create_archive()
+            self.assertEqual(archive_path.suffix, ".litzip")
+            self.assertEqual(backups.list_archives(), [archive_path])
+
+            with zipfile.ZipFile(archive_path) as zf:
+                infos = {info.filename: info for info in zf.infolist()}
+                self.assertIsNone(zf.testzip())
+            pdf_name = f"Quellen/{weber.name}/{weber.pdf_path.name}"
+            self.assertEqual(infos[pdf_name].compress_type, zipfile.ZIP_STORED)
+            notes = infos[f"Quellen/{weber.name}/notes.linote"]
+            self.assertEqual(notes.compress_type, zipfile.ZIP_DEFLATED)
+            self.assertLess(notes.compress_size, notes.file_size)
+
+            with ProjectArchive(archive_path) as archive:
+                self.assertEqual(archive.config.name, "Archivtest")
+                sources = {s.meta.title: s for s in archive.source_manager().get_all_sources()}
+                self.assertEqual(set(sources), {"Wirtschaft und Gesellschaft", "Vita activa"})
+                source = sources["Wirtschaft und Gesellschaft"]
+                self.assertEqual(source.pdf_path.read_bytes(), pdf.read_bytes())
+                self.assertEqual(archive.source_manager().get_notes(source).notes[0].page, 3)
+                with self.assertRaises(PermissionError):
+                    archive.source_manager().save_notes(source, LiNote())
+
+            # Einzelne Quelle wiederherstellen
+            notes_path = project.path / "Quellen" / weber.name / "notes.linote"
+            notes_path.unlink()
+            self.assertTrue(backups.restore_source(archive_path, weber.name))
+            self.assertIn("Herrschaftstypen", notes_path.read_text(encoding="utf-8"))
+            self.assertFalse(backups.restore_source(archive_path, "gibt_es_nicht"))
+
+            # Präparierte Einträge dürfen nicht aus dem Quellenordner herausschreiben
+            evil = tmp / "evil.litzip"
+            with zipfile.ZipFile(archive_path) as src, zipfile.ZipFile(evil, "w") as dst:
+                for info in src.infolist():
+                    dst.writestr(info, src.read(info))
+                dst.writestr(f"Quellen/{weber.name}/../../../draussen.txt", b"x")
+            self.assertFalse(backups.restore_source(evil, weber.name))
+            self.assertFalse((tmp / "draussen.txt").exists())
+            self.assertTrue(notes_path.exists())
+
+
+class TestBackupScheduler(unittest.TestCase):
+    """Tests für den Backup-Planer"""
+
+    def test_runs_only_after_changes(self):
+        from modules.sync import BackupScheduler, IOThrottle
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            project = tmp / "Projekt"
+            (project / "Quellen" / "weber").mkdir(parents=True)
+            (project / "Quellen" / "weber" / "weber.pdf").write_bytes(b"%PDF" * 50000)
+
+            scheduler = BackupScheduler(max_bytes_per_second=1 << 20)
+            scheduler.configure(False, 30, tmp / "backups", project)
+            first = scheduler.run_once()
+            self.assertEqual((first.files, first.bytes_copied, first.skipped), (1, 200000, False))
+            self.assertGreater(first.throttled, 0.0)  # 200 KB bei 1 MB/s
+            self.assertTrue(scheduler.run_once().skipped)
+
+            # Manuell ausgelöst: im Worker, auch ohne Änderung (stop wartet darauf)
+            scheduler.trigger()
+            scheduler.stop(timeout=10)
+            self.assertFalse(scheduler.history()[-1].skipped)
+
+            summary = scheduler.summary()
+            self.assertEqual((summary["runs"], summary["skipped"], summary["failed"]), (2, 1, 0))
+            self.assertEqual(summary["bytes_copied"], 200000)  # zweiter Lauf: nur Hardlinks
+            self.assertEqual(len(list((tmp / "backups").iterdir())), 2)
+
+            throttle = IOThrottle(0)
+            throttle(10 ** 9)
+            self.assertEqual(throttle.slept, 0.0)
+
+    def test_cancel_removes_partial_snapshot(self):
+        import time
+        from modules.sync import BackupScheduler
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            project = tmp / "Projekt"
+            project.mkdir()
+            for i in range(4):
+                (project / f"{i}.pdf").write_bytes(b"%PDF" * 65536)  # je 256 KB
+            backups = tmp / "backups"
+            stale = backups / ".Projekt_20200101_000000.tmp"
+            stale.mkdir(parents=True)
+
+            # 1 MB bei 256 KB/s: läuft, bis stop(cancel=True) abbricht
+            scheduler = BackupScheduler(max_bytes_per_second=256 << 10)
+            scheduler.configure(False, 30, backups, project)
+            scheduler.trigger()
+            deadline = time.monotonic() + 10
+            while not scheduler.is_running() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.3)
+            started = time.monotonic()
+            scheduler.stop(cancel=True)
+            self.assertLess(time.monotonic() - started, 2.0)
+
+            self.assertEqual(scheduler.history()[-1].error, "Backup abgebrochen")
+            self.assertEqual(list(backups.iterdir()), [])  # alter und neuer Rest entfernt
+            self.assertIsNone(scheduler.run_once(force=True))
+
+
+class TestGitSync(unittest.TestCase):
+    """Tests für Git-Status und Auto-Commit"""
+
+    def test_parse_status_v2(self):
+        from modules.sync import parse_status_v2
+
+        output = "\0".join([
+            "# branch.oid 1a2b3c", "# branch.head main", "# branch.upstream origin/main", "# branch.ab +2 -1",
+            "1 .M N... 100644 100644 100644 aaa bbb Quellen/Weber 1922/notes.linote",
+            "2 R. N... 100644 100644 100644 aaa aaa R100 Quellen/neu.limeta", "Quellen/alt.limeta",
+            "u UU N... 100644 100644 100644 100644 a b c konflikt.linote",
+            "? Quellen/Arendt/meta.limeta", "! .index/fulltext.json", "",
+        ])
+        status = parse_status_v2(output)
+        self.assertEqual((status.commit, status.branch, status.upstream, status.ahead, status.behind),
+                         ("1a2b3c", "main", "origin/main", 2, 1))
+        self.assertEqual([(e.kind, e.path) for e in status.entries], [
+            ("changed", "Quellen/Weber 1922/notes.linote"), ("renamed", "Quellen/neu.limeta"),
+            ("unmerged", "konflikt.linote"), ("untracked", "Quellen/Arendt/meta.limeta"),
+            ("ignored", ".index/fulltext.json"),
+        ])
+        self.assertEqual(status.entries[1].orig_path, "Quellen/alt.limeta")
+        self.assertEqual([e.staged for e in status.entries[:2]], [False, True])
+        self.assertFalse(status.clean)
+        self.assertIsNone(parse_status_v2("# branch.oid (initial)\0# branch.head (detached)\0").branch)
+
+    def test_worker_commits_touched_paths_once(self):
+        import subprocess
+        from modules.sync import GitSync, GitWorker
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            project = Path(tmpdir) / "Projekt"
+            project.mkdir()
+            git = GitSync(project)
+            if not git.init():
+                self.skipTest("Git nicht verfügbar")
+            for key, value in (("user.name", "Test"), ("user.email", "test@example.org")):
+                subprocess.run(["git", "config", key, value], cwd=project, check=True)
+
+            weber = project / "Quellen" / "Weber [1922]"
+            weber.mkdir(parents=True)
+            (weber / "meta.limeta").write_text("{}", encoding="utf-8")
+            (project / "projekt_notes.linote").write_text("{}", encoding="utf-8")
+            (project / ".index").mkdir()
+            (project / ".index" / "fulltext.json").write_text("{}", encoding="utf-8")
+
+            worker = GitWorker(project, quiet_period=0.2)
+            worker.touch(weber)
+            (weber / "notes.linote").write_text("{}", encoding="utf-8")
+            worker.touch(weber / "notes.linote", project / ".index")
+            self.assertEqual(len(worker.pending()), 3)
+            status = worker.submit(GitSync.status).result(10)
+            self.assertEqual(len([e for e in status.entries if e.kind == "untracked"]), 4)  # mit .gitignore
+
+            worker.stop()
+            log = subprocess.run(["git", "log", "--format=%H", "--name-only"], cwd=project,
+                                 capture_output=True, text=True).stdout.splitlines()
+            log = [line for line in log if line]
+            self.assertEqual(len(log), 3)  # ein Commit, zwei Dateien
+            self.assertEqual(sorted(log[1:]), ["Quellen/Weber [1922]/meta.limeta", "Quellen/Weber [1922]/notes.linote"])
+            self.assertEqual([e.path for e in git.status().entries],
+                             [".gitignore", "projekt_notes.linote"])
+
+            # Gelöschte Dateien werden ebenfalls übernommen
+            (weber / "notes.linote").unlink()
+            result = git.commit_paths([weber])
+            self.assertEqual((result.paths, result.error), (["Quellen/Weber [1922]/notes.linote"], None))
+            self.assertEqual(git.commit_paths([weber]).commit, None)  # nichts mehr zu tun
+
+
+if __name__ == "__main__":
+    unittest.main()
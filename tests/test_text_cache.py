@@ -0,0 +1,130 @@
+"""
+LitZentrum - Tests für den PDF-Textcache
+"""
+import sys
+from pathlib import Path
+
+# Pfad hinzufügen
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+import unittest
+import tempfile
+
+try:
+    import fitz
+    HAS_PYMUPDF = True
+except ImportError:
+    HAS_PYMUPDF = False
+
+
+def _make_pdf(path: Path, pages: list):
+    """Erstellt eine Test-PDF mit einer Textzeile pro Seite"""
+    doc = fitz.open()
+    for text in pages:
+        page = doc.new_page()
+        page.insert_text((72, 72), text)
+    doc.save(str(path))
+    doc.close()
+
+
+@unittest.skipUnless(HAS_PYMUPDF, "PyMuPDF nicht installiert")
+class TestPDFTextCache(unittest.TestCase):
+    """Tests für PDFTextCache"""
+    
+    def test_extract_and_reload(self):
+        from modules.pdf_workshop.text_cache import PDFTextCache
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf = Path(tmpdir) / "paper.pdf"
+            _make_pdf(pdf, ["Soziale Ungleichheit", "Zweite Seite"])
+            
+            cache = PDFTextCache(pdf)
+            self.assertIsNone(cache.load())
+            
+            data = cache.get()
+            self.assertTrue(cache.cache_path.exists())
+            self.assertEqual(data.page_count, 2)
+            self.assertIn("Ungleichheit", data.page_text(0))
+            
+            # Wortboxen verweisen auf Offsets im Seitentext
+            x0, y0, x1, y1, start, end = data.pages[0].words[1]
+            self.assertEqual(data.page_text(0)[start:end], "Ungleichheit")
+            self.assertLess(x0, x1)
+            
+            reloaded = PDFTextCache(pdf).load()
+            self.assertEqual(reloaded.content_hash, data.content_hash)
+    
+    def test_invalidated_by_content_change(self):
+        from modules.pdf_workshop.text_cache import PDFTextCache
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf = Path(tmpdir) / "paper.pdf"
+            _make_pdf(pdf, ["Alt"])
+            PDFTextCache(pdf).get()
+            
+            _make_pdf(pdf, ["Neuer Inhalt mit mehr Text"])
+            self.assertIsNone(PDFTextCache(pdf).load())
+            self.assertIn("Neuer", PDFTextCache(pdf).get().page_text(0))
+    
+    def test_extractor_uses_cache(self):
+        from modules.pdf_workshop import PDFExtractor, extract_pdf_text
+        from modules.pdf_workshop.text_cache import PDFTextCache
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf = Path(tmpdir) / "paper.pdf"
+            _make_pdf(pdf, ["Seite eins", "Seite zwei", "Seite drei"])
+            
+            with PDFExtractor(pdf) as extractor:
+                self.assertIn("zwei", extractor.extract_text(1))
+                self.assertIn("drei", extractor.extract_text_range(1, 5))
+            self.assertTrue(PDFTextCache(pdf).cache_path.exists())
+            
+            text = extract_pdf_text(pdf, max_pages=2)
+            self.assertIn("eins", text)
+            self.assertNotIn("drei", text)
+    
+    def test_background_queue(self):
+        from modules.pdf_workshop.text_cache import PDFTextCache, TextExtractionQueue
+        
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf = Path(tmpdir) / "paper.pdf"
+            _make_pdf(pdf, ["Hintergrund"])
+            
+            extraction_queue = TextExtractionQueue()
+            self.assertTrue(extraction_queue.enqueue(pdf))
+            extraction_queue.wait()
+            
+            self.assertTrue(PDFTextCache(pdf).is_valid())
+            self.assertFalse(extraction_queue.enqueue(pdf))
+
+    def test_project_search_index(self):
+        from core import SourceManager
+        from formats import LiMeta
+        from modules.pdf_workshop.text_cache import PDFTextCache
+        from modules.search.engine import ProjectSearchIndex
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            pdf = Path(tmpdir) / "import.pdf"
+            _make_pdf(pdf, ["Einleitung", "Die soziale Ungleichheit wächst"])
+            manager = SourceManager(Path(tmpdir) / "projekt")
+            source = manager.create_source(LiMeta(title="Studie", year=2020), pdf)
+            data = PDFTextCache(source.pdf_path).get()
+
+            index = ProjectSearchIndex(Path(tmpdir) / "projekt" / ".index", manager.sources_path)
+            self.assertEqual(index.sync(manager.get_all_sources()), 1)
+            self.assertEqual(index.sync(manager.get_all_sources()), 0)
+            index.save()
+
+            results = ProjectSearchIndex(index.index_dir, manager.sources_path).load().search('"soziale Ungleichheit"')
+            self.assertEqual(len(results), 1)
+            result = results[0]
+            self.assertEqual((result.title, result.year, result.page), ("Studie", 2020, 2))
+            self.assertEqual(result.source_path, source.path)
+
+            # Offsets führen zu den Wortboxen für die Hervorhebung
+            rects = data.rects_for_range(result.page - 1, result.char_start, result.char_end)
+            self.assertEqual(len(rects), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()